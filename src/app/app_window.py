@@ -1,3 +1,4 @@
+from typing import Optional
 import customtkinter as ctk
 from app.ui.views.main_view import MainView
 from app.ui.views.request_view import RequestView
@@ -8,14 +9,20 @@ class AppWindow(ctk.CTk):
     """
     アプリケーションウィンドウ
     """
-    def __init__(self):
+    def __init__(self, server_url: Optional[str] = None):
+        """
+        Args:
+            server_url (Optional[str]): PipelineServer の URL（指定時はサーバーのシンクライアントとして動く）
+        """
         super().__init__()
         self.title("論文調査ツール")
         self.geometry("600x700")
         self.resizable(False, False)
 
         # コントローラーの作成
-        self.controller = AppController(self)
+        self.controller = AppController(self, server_url=server_url)
+        # 閉じるときは実行中の処理を打ち切ってから終了
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # メインビューを表示
         self.main_view = MainView(
@@ -25,3 +32,10 @@ class AppWindow(ctk.CTk):
 
         # 初期画面として、リクエストビューを表示
         self.controller.show_view(RequestView)
+
+    def _on_close(self):
+        """ウィンドウを閉じる（バックグラウンド処理を停止してから破棄）"""
+        try:
+            self.controller.shutdown()
+        finally:
+            self.destroy()
@@ -1,16 +1,27 @@
 from __future__ import annotations
-from typing import Optional, Type, Callable, Union, List
+from typing import Dict, Optional, Type, Callable, Union, List, Tuple
+import asyncio
 import threading
 import customtkinter as ctk
 import logging
 
-from domain.models import SearchConfig, Paper
-from services.arxiv_service import ArxivService
-from services.notion_service import NotionService
-from services.translation_service import TranslationService, TranslationCanceledException
+from domain.models import SearchConfig, Paper, Watch
+from services.pipeline import EnqueueResult, PaperPipeline
+from services.remote_pipeline import RemotePipeline
+from services.rate_limiter import ThrottledError
+from services.translation_service import TranslationCanceledException
+from services.instrumentation import TraceMark, get_tracer
+from services.profiling import profile_run, profiled
+from services.async_runtime import AsyncRuntime
+from app.tk_bridge import TkBridge
 from app.ui.views.result_view import ResultView
 from app.ui.views.loading_view import LoadingView
 
+# 翻訳の途中経過を画面に反映する間隔（ミリ秒。この間の更新はまとめて1回で反映）
+_STREAM_FLUSH_MS = 50
+# 検索（取得・検索時の翻訳）を打ち切るまでの秒数
+_SEARCH_TIMEOUT_S = 300
+
 
 class AppController:
     """
@@ -21,15 +32,53 @@ class AppController:
     - 翻訳
     - Notion保存
     """
-    def __init__(self, window: ctk.CTk):
+    def __init__(self, window: ctk.CTk, server_url: Optional[str] = None):
+        """
+        Args:
+            window (ctk.CTk): ルートウィンドウ
+            server_url (Optional[str]): PipelineServer の URL（指定時は検索・翻訳・保存をサーバーに任せるシンクライアントとして動く）
+        """
         # AppWindowのインスタンス (ルートウィンドウ)
         self.window = window
-        # 実行中の非同期タスクがあれば管理 (将来拡張想定)
-        self._is_cancelling = False
-        # Notion サービス（必要時に初期化）
-        self.notion_service: Optional[NotionService] = None
+        # 検索・翻訳・保存は専用スレッドのイベントループで実行し、結果は window.after でメインスレッドに届ける
+        # arXiv・翻訳・Notion への問い合わせはループ上の非同期のクライアントで待つ（1件ごとにスレッドを使わない）
+        # グループ "search" / "translate" / "save" ごとにキャンセルできる
+        self.runtime = AsyncRuntime(name="app-core")
+        self.bridge = TkBridge(window, self.runtime)
+        # 検索の世代（再検索で古い検索の結果を表示しないため）
+        self._search_seq = 0
+        # 検索の開始時の計測の区切り（保存など並行する処理の計測を破棄せずに、検索の分のみを報告するため）
+        self._search_mark: Optional[TraceMark] = None
+        # 検索・翻訳・保存の処理（各サービスは必要時に初期化。サーバー指定時はサーバーのパイプラインを共有）
+        self.pipeline: Union[PaperPipeline, RemotePipeline] = RemotePipeline(server_url) if server_url else PaperPipeline()
         # 直近の検索結果（ResultView 再表示時に使用）
         self._last_papers: List[Paper] = []
+        # この起動中に保存を登録し、結果がまだ確定していない論文 {paper_id: Paper}（失敗時に一覧へ戻す）
+        self._pending_saves: dict[str, Paper] = {}
+        # 表示・選択時の翻訳（on_demand / top_k）中の論文ID
+        self._translating_ids: set[str] = set()
+        # 翻訳の途中経過 {paper_id: それまでの訳文}（イベントループのスレッドから書き込み、Tk のメインスレッドでまとめて反映）
+        self._stream_updates: dict[str, str] = {}
+        self._stream_lock = threading.Lock()
+        self._stream_flush_scheduled = False
+        # 表示中のビュー
+        self._current_view: Optional[ctk.CTkFrame] = None
+        # 翻訳のストリーミングの有無・Notion の保存先の名前（シンクライアントではサーバーに問い合わせるため、
+        # 起動時に1回だけバックグラウンドで取得する。取得前の保存先は load_notion_databases の呼び出し元に後で渡す）
+        self._streams_translations = False
+        self._notion_databases: Optional[List[str]] = None
+        self._notion_database_waiters: List[Callable[[List[str]], None]] = []
+        self.bridge.run(
+            self.runtime.run_blocking(self._load_capabilities),
+            on_done=self._on_capabilities_loaded,
+            on_error=self._on_capabilities_failed,
+            group="setup",
+        )
+        # 前回の未完了の Notion 保存があれば再開（Notion 未設定ならジョブは保存待ちのまま）
+        try:
+            self._start_outbox_worker()
+        except Exception:
+            logging.exception("Notion保存ジョブの再開に失敗しました")
 
     def show_view(
         self,
@@ -75,6 +124,7 @@ class AppController:
             except Exception:
                 pass
         instance.pack(fill="both", expand=True)
+        self._current_view = instance
 
     def submit_request(self, config: Optional[SearchConfig] = None):
         """
@@ -83,174 +133,415 @@ class AppController:
         Args:
             config (Optional[SearchConfig]): 検索設定
         """
-        self._is_cancelling = False
-
         # ローディング表示
         self.show_view(LoadingView)
 
         if config is None:
             return
 
-        # バックグラウンドで検索を実行
-        t = threading.Thread(target=self._run_search, args=(config,), daemon=True)
-        t.start()
+        # 実行中の古い検索は打ち切る（同じ通信・翻訳は共有される）
+        self.runtime.cancel_group("search")
+        self._search_seq += 1
+        seq = self._search_seq
+        self.bridge.run(
+            self._search(config, seq),
+            on_done=lambda papers: self._on_search_done(config, seq, papers),
+            on_error=lambda e: self._on_search_error(seq, e),
+            group="search",
+            timeout=_SEARCH_TIMEOUT_S,
+        )
 
-    def _run_search(self, config: SearchConfig):
+    async def _search(self, config: SearchConfig, seq: int) -> List[Paper]:
         """
-        別スレッドで arXiv 検索を実行し、完了後に結果ビューを表示する。
+        arXiv 検索（と検索時の翻訳）をイベントループで実行する
+        キャンセル・タイムアウト時は実行中の問い合わせ・翻訳のタスクも打ち切られる（is_cancelled は新しい検索が始まったときの打ち切り用）
         Args:
             config (SearchConfig): 検索設定
+            seq (int): 検索の世代（新しい検索が始まったら打ち切る）
+        Returns:
+            List[Paper]: 検索結果
         """
-        # サービス呼び出し
+        self._search_mark = get_tracer().mark()
+        self.pipeline.start_run()
+        stopped = threading.Event()
+
+        def is_cancelled() -> bool:
+            return stopped.is_set() or seq != self._search_seq
+
+        # ストリーミング時は翻訳を待たずに結果を表示し、検索時に翻訳する論文は表示後に翻訳しながら反映する
+        search_config = config.model_copy(update={"translation_mode": "on_demand"}) if self._streams(config) else config
         try:
-            service = ArxivService()
-            papers = service.search_papers(
-                keywords=config.keyword,
-                max_results=config.max_results,
-                start_date=config.start_date,
-                end_date=config.end_date,
-            )
+            return await profiled("search", self.pipeline.search_async)(search_config, is_cancelled=is_cancelled)
+        except asyncio.CancelledError:
+            stopped.set()
+            raise
 
-            logging.info(f"検索結果: {len(papers)}件")
-            # 翻訳（バッチ処理）
-            try:
-                translator = TranslationService()
-                translator.set_cancel_flag(lambda: self._is_cancelling)
-
-                # 全てのabstractをリストにまとめて翻訳
-                abstracts = [p.abstract for p in papers]
-                translated_abstracts = translator.translate_en_to_jp(abstracts)
-
-                # 翻訳結果を元の論文オブジェクトに設定
-                for paper, translated_abstract in zip(papers, translated_abstracts):
-                    paper.abstract_ja = translated_abstract
-
-            except Exception as e:
-                # キャンセル例外は特別扱い
-                if isinstance(e, TranslationCanceledException):
-                    logging.info("翻訳がキャンセルされました")
-                    return
-                else:
-                    # その他の例外はログに残す
-                    logging.exception("翻訳処理で例外が発生しました")
-
-        except Exception as e:
-            # エラー時はエラービューを表示
-            error_msg = f"検索中にエラーが発生しました: {e}"
-
-            def error_view(parent: ctk.CTkFrame) -> ctk.CTkFrame:
-                frame = ctk.CTkFrame(parent)
-                ctk.CTkLabel(frame, text=error_msg).pack(pady=20)
-                ctk.CTkButton(
-                    frame,
-                    text="戻る",
-                    command=self.cancel_request,
-                ).pack(pady=10)
-                return frame
-            self.window.after(0, lambda: self.show_view(error_view))
+    def _streams(self, config: SearchConfig) -> bool:
+        """検索時に翻訳する論文を、結果の表示後にストリーミングで翻訳するか"""
+        return config.translation_mode != "on_demand" and self._streams_translations
+
+    def _load_capabilities(self) -> Tuple[bool, List[str]]:
+        """翻訳のストリーミングの有無と Notion の保存先の名前を取得する（スレッドプールで実行）"""
+        return self.pipeline.streams_translations(), self.pipeline.notion_database_names()
+
+    def _on_capabilities_loaded(self, capabilities: Tuple[bool, List[str]]):
+        """取得した設定を保持し、保存先の名前を待っている画面に渡す（Tk のメインスレッド）"""
+        self._streams_translations, names = capabilities
+        self._notion_databases = list(names)
+        waiters, self._notion_database_waiters = self._notion_database_waiters, []
+        for on_done in waiters:
+            on_done(self._notion_databases)
+
+    def _on_capabilities_failed(self, error: BaseException):
+        """設定を取得できなければストリーミング・保存先の選択なしで動く"""
+        logging.warning("パイプラインの設定を取得できませんでした: %s", error)
+        self._on_capabilities_loaded((False, []))
+
+    def load_notion_databases(self, on_done: Callable[[List[str]], None]):
+        """
+        保存先の Notion データベースの名前を on_done に渡す（Tk のメインスレッドで呼ぶ。取得前なら取得後に渡す）
+        Args:
+            on_done (Callable[[List[str]], None]): 名前のリストを受け取る関数
+        """
+        if self._notion_databases is None:
+            self._notion_database_waiters.append(on_done)
+        else:
+            on_done(self._notion_databases)
+
+    def load_watches(self, on_done: Callable[[List[Watch]], None]):
+        """
+        保存済みのウォッチをバックグラウンドで取得し、on_done に渡す（取得に失敗したら空のリスト）
+        Args:
+            on_done (Callable[[List[Watch]], None]): ウォッチのリストを受け取る関数（Tk のメインスレッドで呼ぶ）
+        """
+        def _failed(e: BaseException):
+            logging.warning("保存済みキーワードの読み込みに失敗しました: %s", e)
+            on_done([])
+
+        self.bridge.run(
+            self.runtime.run_blocking(self.pipeline.watch_service.list), on_done=on_done, on_error=_failed, group="watches",
+        )
+
+    def add_watch(self, keyword: str, categories: List[str], on_done: Callable[[List[Watch]], None]):
+        """
+        キーワードとカテゴリの指定をウォッチとしてバックグラウンドで保存し、保存後のウォッチの一覧を on_done に渡す
+        Args:
+            keyword (str): キーワード
+            categories (List[str]): カテゴリの指定
+            on_done (Callable[[List[Watch]], None]): ウォッチのリストを受け取る関数（Tk のメインスレッドで呼ぶ）
+        """
+        async def _add() -> List[Watch]:
+            await self.runtime.run_blocking(self.pipeline.watch_service.add, keyword, categories)
+            return await self.runtime.run_blocking(self.pipeline.watch_service.list)
+
+        self.bridge.run(
+            _add(),
+            on_done=on_done,
+            on_error=lambda e: logging.warning("キーワードの保存に失敗しました: %s", e),
+            group="watches",
+        )
+
+    def _on_search_done(self, config: SearchConfig, seq: int, papers: List[Paper]):
+        """検索完了時に結果画面を表示する（Tk のメインスレッド。表示後に計測結果を出力）"""
+        if seq != self._search_seq:
             return
+        self._last_papers = papers
+        self._show_result_view()
+        get_tracer().report_run("search", since=self._search_mark)
+        if self._streams(config):
+            targets = papers if config.translation_mode == "eager" else papers[:max(0, config.translate_top_k)]
+            for paper in targets:
+                self.request_translation(paper, self._on_paper_translated)
 
-        if self._is_cancelling:
+    def _on_search_error(self, seq: int, error: BaseException):
+        """検索失敗時にエラービューを表示する（Tk のメインスレッド）"""
+        if isinstance(error, TranslationCanceledException):
+            # キャンセル例外は特別扱い
+            logging.info("翻訳がキャンセルされました")
+            return
+        if seq != self._search_seq:
             return
+        if isinstance(error, asyncio.TimeoutError):
+            error_msg = f"検索が{_SEARCH_TIMEOUT_S}秒以内に完了しませんでした"
+        elif isinstance(error, ThrottledError):
+            error_msg = "翻訳APIの流量制限が続いたため中止しました。しばらくしてから再度検索してください"
+        else:
+            logging.error("検索中に例外が発生しました", exc_info=error)
+            error_msg = f"検索中にエラーが発生しました: {error}"
 
-        # 検索結果を保持し、メインスレッドで結果表示
-        self._last_papers = papers
-        self.window.after(
-            0,
-            lambda: self.show_view(
+        def error_view(parent: ctk.CTkFrame) -> ctk.CTkFrame:
+            frame = ctk.CTkFrame(parent)
+            ctk.CTkLabel(frame, text=error_msg).pack(pady=20)
+            ctk.CTkButton(
+                frame,
+                text="戻る",
+                command=self.cancel_request,
+            ).pack(pady=10)
+            return frame
+        self.show_view(error_view)
+
+    def _show_result_view(self):
+        """直近の検索結果で ResultView を表示する（構築時間を計測）"""
+        with profile_run("result_view"), get_tracer().span("ui.result_view", papers=len(self._last_papers)):
+            self.show_view(
                 lambda parent: ResultView(
                     parent,
                     controller=self,
                     papers=self._last_papers,
                 )
-            ),
+            )
+        self._update_save_status()
+
+    def _refresh_result_view(self):
+        """直近の検索結果を結果画面に差分で反映する（結果画面以外なら作り直す）"""
+        view = self._current_view
+        if isinstance(view, ResultView) and view.winfo_exists():
+            with get_tracer().span("ui.result_view_diff", papers=len(self._last_papers)):
+                view.set_papers(self._last_papers)
+            self._update_save_status()
+        else:
+            self._show_result_view()
+
+    def is_translating(self, paper_id: str) -> bool:
+        """論文の翻訳（表示・選択時、ストリーミング）が実行中か"""
+        return paper_id in self._translating_ids
+
+    def request_translation(self, paper: Paper, on_done: Callable[[Paper], None]):
+        """
+        論文1件の abstract をバックグラウンドで翻訳し、完了後にメインスレッドで on_done を呼ぶ
+        翻訳済み・翻訳中の論文は何もしない（翻訳結果は TranslationService 側でキャッシュされる）
+        Args:
+            paper (Paper): 翻訳する論文
+            on_done (Callable[[Paper], None]): 翻訳完了時のコールバック（Tk のメインスレッドで実行）
+        """
+        if paper.abstract_ja or not paper.abstract or paper.id in self._translating_ids:
+            return
+        self._translating_ids.add(paper.id)
+
+        def _finish(_=None):
+            self._translating_ids.discard(paper.id)
+            if paper.abstract_ja:
+                on_done(paper)
+
+        def _failed(e: BaseException):
+            if not isinstance(e, TranslationCanceledException):
+                logging.error("翻訳中に例外が発生しました: %s", paper.id, exc_info=e)
+            _finish()
+
+        self.bridge.run(
+            self.pipeline.translate_papers_async([paper], on_chunk=self._queue_stream_update),
+            on_done=_finish,
+            on_error=_failed,
+            group="translate",
         )
 
+    def _on_paper_translated(self, paper: Paper):
+        """翻訳完了時に結果画面の abstract を訳文に差し替える"""
+        view = self._current_view
+        if isinstance(view, ResultView):
+            view.update_abstract(paper.id, paper.abstract_ja)
+
+    def _queue_stream_update(self, paper: Paper, text: str):
+        """
+        翻訳の途中経過を記録し、反映を予約する（イベントループのスレッドから呼ばれる）
+        同じ論文の途中経過は最新のみを残し、_STREAM_FLUSH_MS ごとにまとめて画面に反映する
+        """
+        with self._stream_lock:
+            self._stream_updates[paper.id] = text
+            if self._stream_flush_scheduled:
+                return
+            self._stream_flush_scheduled = True
+        self.bridge.post(self._flush_stream_updates, delay_ms=_STREAM_FLUSH_MS)
+
+    def _flush_stream_updates(self):
+        """記録された翻訳の途中経過を結果画面に反映する（Tk のメインスレッド）"""
+        with self._stream_lock:
+            updates, self._stream_updates = self._stream_updates, {}
+            self._stream_flush_scheduled = False
+        view = self._current_view
+        if isinstance(view, ResultView):
+            for paper_id, text in updates.items():
+                view.update_abstract(paper_id, text)
+
     def cancel_request(self):
         """
         実行中の処理をキャンセルし、リクエスト入力画面へ戻す。
         """
         from app.ui.views.request_view import RequestView  # 遅延インポートで循環参照回避
 
-        # 実際のキャンセル（ワーカー停止など）は今後の実装で対応
-        self._is_cancelling = True
+        # 実行中の検索を打ち切る（世代を進め、同期処理にも打ち切りを伝える）
+        self._search_seq += 1
+        self.runtime.cancel_group("search")
         self.show_view(RequestView)
 
-    def save_to_notion(self, papers: List[Paper]):
+    def save_to_notion(self, papers: List[Paper], full_text: bool = False):
         """
-        Notionに論文を保存する
+        Notionへの論文の保存を予約する（保存はワーカーがバックグラウンドで行い、結果画面は操作を続けられる）
+        保存待ちの論文は一覧から除外する。保存待ちのジョブはディスクに記録され、次回起動時にも再開される
         Args:
             papers (List[Paper]): 保存する論文オブジェクトのリスト
+            full_text (bool): 保存前に PDF から本文を取得・要約するかどうか
         """
         if not papers:
             self._show_error("保存する論文がありません")
             return
 
-        # ローディング表示
-        self.show_view(LoadingView, message="Notion保存中...")
+        # NotionService の遅延初期化（シンクライアントではサーバーに確認するため、バックグラウンドで行う）
+        def _not_configured(e: BaseException):
+            # 初期化失敗（環境変数未設定など）
+            logging.error("Notion保存の準備に失敗しました", exc_info=e)
+            self._show_error("Notionの設定が未完了です。環境変数を確認してください。")
 
-        # 非同期で保存処理
-        threading.Thread(
-            target=self._save_to_notion_thread,
-            args=(papers,),
-            daemon=True,  # デーモンスレッドとして設定
-        ).start()
+        self.bridge.run(
+            self.runtime.run_blocking(self.pipeline.get_notion_service),
+            on_done=lambda _: self._start_save(papers, full_text),
+            on_error=_not_configured,
+            group="save",
+        )
 
-    def _save_to_notion_thread(self, papers: List[Paper]):
+    def _start_save(self, papers: List[Paper], full_text: bool):
         """
-        バックグラウンドで論文をNotionに保存する
+        Notion の準備ができたら、論文を一覧から除いて保存の登録をバックグラウンドで始める（Tk のメインスレッド）
         Args:
             papers (List[Paper]): 保存する論文オブジェクトのリスト
+            full_text (bool): 保存前に PDF から本文を取得・要約するかどうか
         """
         try:
-            # NotionService の遅延初期化
-            if self.notion_service is None:
-                try:
-                    self.notion_service = NotionService()
-                except Exception:
-                    # 初期化失敗（環境変数未設定など）
-                    self.window.after(0, lambda: self._show_error("Notionの設定が未完了です。環境変数を確認してください。"))
-                    return
-            success_ids = []
-            for paper in papers:
-                if self._is_cancelling:
-                    break
-                ok = self.notion_service.create_page(paper)
-                if ok:
-                    success_ids.append(paper.id)
+            self._start_outbox_worker()
         except Exception:
-            logging.exception("Notion保存中に例外が発生しました")
-            self.window.after(0, lambda: self._show_error("Notion保存中にエラーが発生しました"))
-        finally:
-            # 成功した論文を一覧から除外
-            def _finish():
-                if isinstance(success_ids, list) and success_ids:
-                    self._last_papers = [p for p in self._last_papers if p.id not in success_ids]
-                # 更新後の一覧を表示
-                self.show_view(
-                    lambda parent: ResultView(
-                        parent,
-                        controller=self,
-                        papers=self._last_papers,
-                    )
-                )
-            self.window.after(0, _finish)
+            logging.exception("Notion保存の準備に失敗しました")
+            self._show_error("Notionの設定が未完了です。環境変数を確認してください。")
+            return
+
+        ids = {p.id for p in papers}
+        self._last_papers = [p for p in self._last_papers if p.id not in ids]
+        self._pending_saves.update({p.id: p for p in papers})
+        self._refresh_result_view()
+
+        # 全文の取得・要約とキューへの登録はバックグラウンドで行う
+        def _failed(e: BaseException):
+            logging.error("Notion保存の登録に失敗しました", exc_info=e)
+            self._show_error("Notion保存の登録に失敗しました")
+
+        self.bridge.run(
+            self._enqueue_save(papers, full_text),
+            on_done=self._on_save_enqueued,
+            on_error=_failed,
+            group="save",
+        )
+
+    async def _enqueue_save(self, papers: List[Paper], full_text: bool) -> EnqueueResult:
+        """
+        （必要なら全文を取得・要約してから）論文の保存をキューに登録する
+        Args:
+            papers (List[Paper]): 保存する論文オブジェクトのリスト
+            full_text (bool): 保存前に PDF から本文を取得・要約するかどうか
+        Returns:
+            EnqueueResult: 登録したジョブ数と、近似重複のため登録しなかった論文
+        """
+        if full_text:
+            self.bridge.post(self._set_save_status, f"PDF取得・要約中 {len(papers)}件")
+            try:
+                await profiled("full_texts", self.pipeline.fetch_full_texts_async)(papers)
+            except Exception:
+                # 本文が取得できなくても保存は続ける
+                logging.exception("PDFの取得中に例外が発生しました")
+        return await self.pipeline.enqueue_save_async(papers)
+
+    def _on_save_enqueued(self, result: EnqueueResult):
+        """
+        保存の登録後に状態を表示する（Tk のメインスレッド）
+        近似重複のため登録されなかった論文は保存待ちの追跡をやめ、一覧の先頭に戻して理由を表示する
+        """
+        skipped = [self._pending_saves.pop(pid) for pid in result.skipped if pid in self._pending_saves]
+        if skipped:
+            shown = {p.id for p in self._last_papers}
+            self._last_papers = [p for p in skipped if p.id not in shown] + self._last_papers
+            view = self._current_view
+            if isinstance(view, ResultView):
+                view.set_papers(self._last_papers)
+                for paper in skipped:
+                    view.mark_failed(paper.id, f"重複の可能性: {result.skipped[paper.id]}（保存しませんでした）")
+                view.show_message(f"重複の可能性があるため {len(skipped)}件を保存しませんでした")
+        self._update_save_status()
+
+    def shutdown(self):
+        """実行中の処理を打ち切り、イベントループと保存ワーカーを停止する（ウィンドウを閉じるときに呼ぶ）"""
+        self._search_seq += 1
+        self.runtime.shutdown(timeout=2.0, before_stop=self.pipeline.aclose)
+        if self.pipeline.outbox_worker is not None:
+            self.pipeline.outbox_worker.stop(timeout=2.0)
+
+    def _start_outbox_worker(self):
+        """Notion 保存ジョブのワーカーを開始（状態が変わるたびに結果画面の表示を更新）"""
+        self.pipeline.start_outbox_worker(on_change=lambda: self.bridge.post(self._update_save_status))
+
+    def _update_save_status(self):
+        """保存待ち・失敗の件数と保存待ちの論文の状態をバックグラウンドで取得し、結果画面に反映する"""
+        self.bridge.run(
+            self.runtime.run_blocking(self._fetch_save_status, list(self._pending_saves)),
+            on_done=self._apply_save_status,
+            on_error=lambda e: logging.debug("保存状態の取得に失敗しました", exc_info=e),
+            group="save_status",
+        )
+
+    def _fetch_save_status(self, paper_ids: List[str]) -> Tuple[Dict[str, int], Dict[str, str]]:
+        """保存キューの件数と論文ごとの最新の状態を取得する（スレッドプールで実行）"""
+        outbox = self.pipeline.get_outbox()
+        return outbox.counts(), outbox.latest_status(paper_ids)
+
+    def _apply_save_status(self, status: Tuple[Dict[str, int], Dict[str, str]]):
+        """保存待ち・失敗の件数を結果画面に表示し、保存に失敗した論文を一覧に戻す（Tk のメインスレッド）"""
+        counts, statuses = status
+        waiting = counts.get("pending", 0) + counts.get("inflight", 0)
+        parts = []
+        if waiting:
+            parts.append(f"Notion保存待ち {waiting}件")
+        if counts.get("failed"):
+            parts.append(f"保存失敗 {counts['failed']}件")
+        self._set_save_status(" / ".join(parts))
+
+        # 結果が確定した論文は追跡をやめ、失敗した論文は先頭に戻して失敗を表示する（再度選択して保存できる）
+        failed = []
+        for paper_id, state in statuses.items():
+            # 取得中に別の更新で追跡をやめた論文は飛ばす
+            if state in ("done", "failed") and paper_id in self._pending_saves:
+                paper = self._pending_saves.pop(paper_id)
+                if state == "failed":
+                    failed.append(paper)
+        if failed:
+            shown = {p.id for p in self._last_papers}
+            self._last_papers = [p for p in failed if p.id not in shown] + self._last_papers
+            view = self._current_view
+            if isinstance(view, ResultView):
+                view.set_papers(self._last_papers)
+                for paper in failed:
+                    view.mark_failed(paper.id)
+
+    def _set_save_status(self, text: str):
+        """結果画面の保存状態の表示を更新（結果画面以外では何もしない）"""
+        view = self._current_view
+        if isinstance(view, ResultView):
+            view.set_save_status(text)
 
     def _show_error(self, message: str):
-        """簡易的なエラービューを表示"""
+        """
+        エラーを表示する（結果画面ではメッセージとして表示し、画面は作り直さない）
+        Args:
+            message (str): 表示するメッセージ
+        """
+        view = self._current_view
+        if isinstance(view, ResultView) and view.winfo_exists():
+            view.show_message(message)
+            return
+
         def error_view(parent: ctk.CTkFrame) -> ctk.CTkFrame:
             frame = ctk.CTkFrame(parent)
             ctk.CTkLabel(frame, text=message).pack(pady=20)
             ctk.CTkButton(
                 frame,
                 text="戻る",
-                command=lambda: self.show_view(
-                    lambda p: ResultView(
-                        p,
-                        controller=self,
-                        papers=self._last_papers,
-                    )
-                ),
+                command=self._show_result_view,
             ).pack(pady=10)
             return frame
         self.show_view(error_view)
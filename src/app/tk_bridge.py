@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from concurrent.futures import CancelledError, Future
+import logging
+
+from services.async_runtime import AsyncRuntime
+
+T = TypeVar("T")
+
+
+class TkBridge:
+    """
+    AsyncRuntime のコルーチンの結果を Tk のメインスレッドに届ける橋渡し
+    - 結果・例外のコールバックは window.after で Tk のイベントループに投入する（ウィジェットはメインスレッドでのみ操作）
+    - キャンセルされたタスクのコールバックは呼ばない
+    """
+
+    def __init__(self, window, runtime: AsyncRuntime):
+        """
+        Args:
+            window: after(ms, func) を持つ Tk のウィンドウ
+            runtime (AsyncRuntime): コルーチンの実行基盤
+        """
+        self.window = window
+        self.runtime = runtime
+
+    def post(self, fn: Callable[..., Any], *args: Any, delay_ms: int = 0):
+        """関数を Tk のメインスレッドで実行する（どのスレッドからでも呼べる）"""
+        self.window.after(delay_ms, lambda: fn(*args))
+
+    def run(
+        self,
+        coro: Awaitable[T],
+        on_done: Optional[Callable[[T], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        group: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> "Future[T]":
+        """
+        コルーチンをループで実行し、完了後に on_done（例外なら on_error）を Tk のメインスレッドで呼ぶ
+        Args:
+            coro (Awaitable[T]): 実行するコルーチン
+            on_done (Optional[Callable[[T], None]]): 結果を受け取る関数
+            on_error (Optional[Callable[[BaseException], None]]): 例外を受け取る関数（省略時はログに出力）
+            group (Optional[str]): タスクのグループ（AsyncRuntime.cancel_group でキャンセル）
+            timeout (Optional[float]): 打ち切るまでの秒数（超えたら on_error に TimeoutError）
+        Returns:
+            Future[T]: 結果
+        """
+        fut = self.runtime.submit(coro, group=group, timeout=timeout)
+
+        def _deliver(f: "Future[T]"):
+            try:
+                result = f.result()
+            except CancelledError:
+                return
+            except BaseException as e:
+                if on_error is not None:
+                    self.post(on_error, e)
+                else:
+                    logging.error("バックグラウンド処理で例外が発生しました", exc_info=e)
+                return
+            if on_done is not None:
+                self.post(on_done, result)
+
+        fut.add_done_callback(_deliver)
+        return fut
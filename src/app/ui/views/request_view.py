@@ -1,6 +1,4 @@
-import os
-import json
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta
 import customtkinter as ctk
 from domain.models import SearchConfig
 from tkcalendar import DateEntry
@@ -13,9 +11,10 @@ class RequestView(ctk.CTkFrame):
     def __init__(self, master: ctk.CTkFrame, controller):
         super().__init__(master)
         self.controller = controller
-        # 保存先パスを用意(アプリ専用フォルダを~に用意し、keywords.jsonを保存する)
-        self._store_path = os.path.join("src", "config", "keywords.json")
-        self._saved_keywords = self._load_saved_keywords()
+        # 保存済みキーワード（ウォッチ）は WatchService で管理（src/config/watches.json）
+        # 読み込みはコントローラがバックグラウンドで行い、読み込み後に選択UIを更新する
+        self._saved_watches: dict = {}
+        self._saved_keywords: list[str] = []
 
         # キーワード入力フィールド
         self.keyword_frame = ctk.CTkFrame(self)
@@ -28,6 +27,17 @@ class RequestView(ctk.CTkFrame):
         )
         self.keyword_entry.pack(side="left", padx=5)
 
+        # カテゴリ入力フィールド（arXiv のクエリで絞り込み、指定外の論文は取得しない）
+        self.category_frame = ctk.CTkFrame(self)
+        self.category_frame.pack(pady=4, fill="x")
+        ctk.CTkLabel(self.category_frame, text="カテゴリ:").pack(side="left", padx=5)
+        self.category_entry = ctk.CTkEntry(
+            self.category_frame,
+            placeholder_text="例: cs.CL, cs.*（空なら全カテゴリ）",
+            width=300,
+        )
+        self.category_entry.pack(side="left", padx=5)
+
         # 保存済みキーワードの選択UI
         self.saved_frame = ctk.CTkFrame(self)
         self.saved_frame.pack(pady=4, fill="x")
@@ -41,6 +51,16 @@ class RequestView(ctk.CTkFrame):
             command=self._on_select_saved,
         )
         self.saved_menu.pack(side="left", padx=5)
+        controller.load_watches(self._on_watches_loaded)
+
+        # 新着のみ（前回の検索以降に投稿された論文のみを取得）
+        self.watch_only_var = ctk.BooleanVar(value=False)
+        self.watch_only_checkbox = ctk.CTkCheckBox(
+            self.saved_frame,
+            text="新着のみ",
+            variable=self.watch_only_var,
+        )
+        self.watch_only_checkbox.pack(side="left", padx=5)
 
         # キーワード保存チェックボックス
         self.save_keyword_var = ctk.BooleanVar(value=False)
@@ -78,6 +98,55 @@ class RequestView(ctk.CTkFrame):
         self.max_results_entry.insert(0, "5")
         self.max_results_entry.pack(side="left", padx=5)
 
+        # 関連度順（多めに取得し、キーワードとの関連度が高い上位のみを翻訳・表示）
+        self.rerank_var = ctk.BooleanVar(value=False)
+        self.rerank_checkbox = ctk.CTkCheckBox(
+            self.max_results_frame,
+            text="関連度順",
+            variable=self.rerank_var,
+        )
+        self.rerank_checkbox.pack(side="left", padx=5)
+
+        # ローカル検索（取り込み済みの arXiv スナップショットから検索）
+        self.local_search_var = ctk.BooleanVar(value=False)
+        self.local_search_checkbox = ctk.CTkCheckBox(
+            self.max_results_frame,
+            text="ローカル検索",
+            variable=self.local_search_var,
+        )
+        self.local_search_checkbox.pack(side="left", padx=5)
+
+        # Notion で読了にした論文を結果から除く
+        self.hide_read_var = ctk.BooleanVar(value=False)
+        self.hide_read_checkbox = ctk.CTkCheckBox(
+            self.max_results_frame,
+            text="読了を除く",
+            variable=self.hide_read_var,
+        )
+        self.hide_read_checkbox.pack(side="left", padx=5)
+
+        # 翻訳方針（全件を検索時に / 表示・選択時に / 上位5件のみ検索時に）
+        self.translation_mode_frame = ctk.CTkFrame(self)
+        self.translation_mode_frame.pack(pady=4, fill="x")
+        ctk.CTkLabel(self.translation_mode_frame, text="翻訳:").pack(side="left", padx=5)
+        self._translation_modes = {
+            "検索時に全件": "eager",
+            "表示・選択時": "on_demand",
+            "上位5件のみ検索時": "top_k",
+        }
+        self.translation_mode_var = ctk.StringVar(value="検索時に全件")
+        self.translation_mode_menu = ctk.CTkOptionMenu(
+            self.translation_mode_frame,
+            variable=self.translation_mode_var,
+            values=list(self._translation_modes.keys()),
+        )
+        self.translation_mode_menu.pack(side="left", padx=5)
+
+        # Notion の保存先（自動なら振り分けの規則・既定のデータベース）
+        self._notion_auto = "自動"
+        self.notion_database_var = ctk.StringVar(value=self._notion_auto)
+        controller.load_notion_databases(self._show_notion_databases)
+
         # スライダーとテキストボックスの連動
         self.max_results_slider.configure(command=self._update_max_results_entry)
         self.max_results_entry.bind("<Return>", self._update_max_results_slider)
@@ -164,46 +233,37 @@ class RequestView(ctk.CTkFrame):
         except ValueError:
             pass
 
-    def _ensure_store_dir(self):
-        """保存先ディレクトリを確保"""
-        os.makedirs(os.path.dirname(self._store_path), exist_ok=True)
+    def _show_notion_databases(self, notion_databases: list[str]):
+        """保存先が複数あれば Notion の保存先の選択UIを表示する（保存先の名前の取得後に呼ばれる）"""
+        if not self.winfo_exists() or len(notion_databases) <= 1:
+            return
+        ctk.CTkLabel(self.translation_mode_frame, text="保存先:").pack(side="left", padx=5)
+        self.notion_database_menu = ctk.CTkOptionMenu(
+            self.translation_mode_frame,
+            variable=self.notion_database_var,
+            values=[self._notion_auto] + notion_databases,
+        )
+        self.notion_database_menu.pack(side="left", padx=5)
 
-    def _load_saved_keywords(self) -> list[str]:
-        """保存済みキーワードを読み込む"""
-        try:
-            if not os.path.exists(self._store_path):
-                return []
-            with open(self._store_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            items = data.get("keywords", [])
-            return [str(x) for x in items if isinstance(x, str) and x.strip()]
-        except Exception:
-            return []
+    def _on_watches_loaded(self, watches: list):
+        """保存済みキーワード（ウォッチ）の読み込み後に選択UIを更新する（表示名 → ウォッチ の対応も更新）"""
+        if not self.winfo_exists():
+            return
+        self._saved_watches = {w.label(): w for w in watches}
+        self._saved_keywords = list(self._saved_watches)
+        self._update_saved_keywords_menu()
 
-    def _save_keyword(self, kw: str):
+    def _save_keyword(self, kw: str, categories: list[str]):
         """
-        キーワードを保存（重複は先頭に移動、最大10件）
+        キーワードとカテゴリの指定をウォッチとして保存（重複は先頭に移動。処理済みの記録は維持）
         Args:
             kw(str): 保存するキーワード
+            categories(list[str]): カテゴリの指定
         """
         kw = (kw or "").strip()
         if not kw:
             return
-        items = list(self._saved_keywords)
-        if kw in items:
-            items.remove(kw)
-        items.insert(0, kw)
-        if len(items) > 10:
-            items = items[:10]
-
-        self._ensure_store_dir()
-        try:
-            with open(self._store_path, "w", encoding="utf-8") as f:
-                json.dump({"keywords": items}, f, ensure_ascii=False, indent=2)
-            self._saved_keywords = items
-            self._update_saved_keywords_menu()
-        except Exception:
-            pass
+        self.controller.add_watch(kw, categories, self._on_watches_loaded)
 
     def _update_saved_keywords_menu(self):
         """保存済みキーワードの選択UIを更新"""
@@ -216,52 +276,49 @@ class RequestView(ctk.CTkFrame):
 
     def _on_select_saved(self, choice: str):
         """
-        保存済みキーワードを選択したときにキーワード入力欄を更新
+        保存済みキーワードを選択したときにキーワード・カテゴリの入力欄を更新
         Args:
-            choice(str): 選択されたキーワード
+            choice(str): 選択されたウォッチの表示名
         """
-        if choice and choice != "(なし)":
+        watch = self._saved_watches.get(choice)
+        if watch is not None:
             self.keyword_entry.delete(0, "end")
-            self.keyword_entry.insert(0, choice)
+            self.keyword_entry.insert(0, watch.keyword)
+            self.category_entry.delete(0, "end")
+            self.category_entry.insert(0, ", ".join(watch.categories))
 
     def submit_request(self):
         """
         リクエストを送信
         """
-        # 無期限チェックの状態に応じて処理
-        start_infinite = self.start_infinite_var.get()
-        end_infinite = self.end_infinite_var.get()
-
-        if start_infinite:
-            start_date = ""  # 無期限（下限なし）
-        else:
-            start_dt = self.start_date_entry.get_date()
-            start_date = self._to_relative_jp(start_dt)
-
-        if end_infinite:
-            end_date = ""  # 無期限（上限なし）
-        else:
-            end_dt = self.end_date_entry.get_date()
-            end_date = self._to_relative_jp(end_dt)
+        # 無期限チェックの状態に応じて処理（日付は YYYY-MM-DD のまま渡し、両端の日を含めて検索する）
+        start_date = "" if self.start_infinite_var.get() else self.start_date_entry.get_date().isoformat()
+        end_date = "" if self.end_infinite_var.get() else self.end_date_entry.get_date().isoformat()
 
         # 両方とも有効日付のときのみ前後関係を正す（空文字は無期限）
-        if start_date and end_date:
-            start_dt2 = self.start_date_entry.get_date()
-            end_dt2 = self.end_date_entry.get_date()
-            if end_dt2 < start_dt2:
-                # スワップして再計算
-                start_date, end_date = end_date, start_date
+        if start_date and end_date and end_date < start_date:
+            start_date, end_date = end_date, start_date
 
         config = SearchConfig(
             keyword=[self.keyword_entry.get()],
             max_results=int(self.max_results_entry.get()),
             start_date=start_date,
             end_date=end_date,
+            watch=self.watch_only_var.get(),
+            rerank=self.rerank_var.get(),
+            translation_mode=self._translation_modes.get(self.translation_mode_var.get(), "eager"),
+            translate_top_k=5,
+            source="local" if self.local_search_var.get() else "arxiv",
+            categories=self.category_entry.get().replace(",", " ").split(),
+            hide_read=self.hide_read_var.get(),
+            notion_database_name=(
+                None if self.notion_database_var.get() == self._notion_auto else self.notion_database_var.get()
+            ),
         )
 
-        # キーワード保存チェックが入っていいる場合、設定を保存
-        if self.save_keyword_var.get():
-            self._save_keyword(self.keyword_entry.get())
+        # キーワード保存チェックが入っていいる場合、設定を保存（新着のみの場合はウォッチとして必ず保存）
+        if self.save_keyword_var.get() or config.watch:
+            self._save_keyword(self.keyword_entry.get(), config.categories)
 
         # コントローラーに設定を渡す
         self.controller.submit_request(config)
@@ -285,71 +342,3 @@ class RequestView(ctk.CTkFrame):
                 self.end_date_entry.configure(state="normal")
         except Exception:
             pass
-
-    def _text_to_relative_jp(self, s: str) -> str | None:
-        """
-        ユーザー入力文字列を相対表現（X年Y月Z日前）に変換して返す。
-        サポート:
-        - 絶対日付: YYYY-MM-DD / YYYY/MM/DD / YYYY.MM.DD
-        - 相対表現: 「X年Y月Z日前」または「X年前」「Yヶ月前」「Z日前」等の部分指定
-        - キーワード: 今日 / yesterday(昨日) / today
-        - 簡易相対: -30d, -1m, -1y
-        変換できない場合は None を返す。
-        """
-        import re
-        s = (s or "").strip()
-        if not s:
-            return None
-        # today / 今日
-        if s in ("今日", "today"):
-            return "0年0月0日前"
-        if s in ("昨日", "yesterday"):
-            return "0年0月1日前"
-        # -Nd / -Nm / -Ny
-        m = re.fullmatch(r"-?\s*(\d+)\s*([dmyDMY])", s)
-        if m:
-            n = int(m.group(1))
-            unit = m.group(2).lower()
-            if unit == "d":
-                return f"0年0月{n}日前"
-            if unit == "m":
-                return f"0年{n}月0日前"
-            if unit == "y":
-                return f"{n}年0月0日前"
-        # 既に相対表現（完全形）
-        if re.fullmatch(r"\d+年\d+月\d+日前", s):
-            return s
-        # 部分指定（例: 1年前, 3ヶ月前, 10日前）を統合
-        y = mth = d = 0
-        for pat, attr in ((r"(\d+)年\s*前", "y"), (r"(\d+)ヶ月\s*前", "m"), (r"(\d+)月\s*前", "m"), (r"(\d+)日\s*前", "d")):
-            m2 = re.search(pat, s)
-            if m2:
-                val = int(m2.group(1))
-                if attr == "y":
-                    y = val
-                elif attr == "m":
-                    mth = val
-                else:
-                    d = val
-        if y or mth or d:
-            return f"{y}年{mth}月{d}日前"
-        # 絶対日付
-        for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"):
-            try:
-                dt = datetime.strptime(s, fmt).date()
-                return self._to_relative_jp(dt)
-            except Exception:
-                pass
-        return None
-
-    def _to_relative_jp(self, target: date) -> str:
-        """絶対日付を「X年Y月Z日前」に変換（365日=1年, 30日=1ヶ月の簡易換算）"""
-        today = date.today()
-        delta_days = (today - target).days
-        if delta_days < 0:
-            delta_days = 0
-        y = delta_days // 365
-        rem = delta_days % 365
-        m = rem // 30
-        d = rem % 30
-        return f"{y}年{m}月{d}日前"
@@ -1,8 +1,32 @@
 import customtkinter as ctk
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Iterable, Optional
 import webbrowser
 from datetime import datetime
 
+from services.result_index import ResultFilter, ResultIndex
+
+# 一覧の幅から折り返し幅を求めるときに差し引く幅
+# （行の左右余白 5+18、内側フレーム 4+4、保存チェックボックス欄 48+6+6、論文情報の余白 10+10、ラベルの余白 12+12 とスクロールバー分）
+_ROW_CHROME_PX = 160
+_MIN_WRAP_PX = 160
+# リサイズが落ち着いてから折り返し幅を反映するまでの時間（ミリ秒）
+_RESIZE_DEBOUNCE_MS = 80
+# 表示領域外の行の折り返し幅を1回のアイドル処理で更新する行数
+_WRAP_BATCH = 50
+# 絞り込み欄の入力が止まってから絞り込むまでの時間（ミリ秒）
+_FILTER_DEBOUNCE_MS = 150
+# カテゴリの選択肢に出す数（論文数の多い順）
+_MAX_CATEGORY_CHOICES = 30
+_ALL_CATEGORIES = "すべてのカテゴリ"
+# 並べ替えの表示名 → ResultIndex の並べ替え
+_SORT_CHOICES = {
+    "検索順": "original",
+    "新しい順": "date_desc",
+    "古い順": "date_asc",
+    "タイトル順": "title",
+    "関連度順": "relevance",
+}
+
 
 class ResultView(ctk.CTkFrame):
     """
@@ -15,15 +39,45 @@ class ResultView(ctk.CTkFrame):
     def __init__(self, master: ctk.CTkFrame, controller=None, papers: List[Any] | None = None, **kwargs):
         super().__init__(master, **kwargs)
         self.controller = controller
-        self.papers = papers or []
+        # 検索結果の論文（set_papers などの差分更新で変わるため、呼び出し元のリストとは別に持つ）
+        self.papers = list(papers or [])
+        # 絞り込み・並べ替え後に表示している論文（表示順）と、検索結果の索引（結果が変わるたびに1回だけ構築）
+        self.shown_papers: List[Any] = []
+        self._index = ResultIndex(())
+        self._filter_job = None
 
         # Notion保存チェックボックスの選択状態を管理する{paper_id: BooleanVar}
         self.save_notion_selected_vars: Dict[str, ctk.BooleanVar] = {}
+        # 論文ごとの行フレームとアブストラクトラベル（翻訳完了時の更新・表示判定に使用）
+        self._item_frames: Dict[str, ctk.CTkFrame] = {}
+        self._info_frames: Dict[str, ctk.CTkFrame] = {}
+        self._abstract_labels: Dict[str, ctk.CTkLabel] = {}
+        # 保存失敗などの行ごとの状態表示（必要になった行のみ生成）
+        self._status_labels: Dict[str, ctk.CTkLabel] = {}
+        # 折り返し幅（一覧の幅から1回だけ計算し、全行で共有）と、行ごとに反映済みの折り返し幅・文字列の幅の計測結果
+        self._title_labels: Dict[str, ctk.CTkLabel] = {}
+        self._wrap_width = 440
+        self._applied_wrap: Dict[str, int] = {}
+        self._text_widths: Dict[tuple, int] = {}
+        self._resize_job = None
+        self._wrap_job = None
+        self._wrap_queue: List[str] = []
+        # 全行で共有するフォント（行ごとに生成しない。文字列の幅の計測キャッシュのキーにもなる）
+        self._title_font = ctk.CTkFont(size=14, weight="bold")
+        self._body_font = ctk.CTkFont()
+        # 検索結果が無いときの表示
+        self._empty_label: Optional[ctk.CTkLabel] = None
+        # 一覧の上に表示するメッセージを消すジョブ（after のジョブID）
+        self._message_job = None
+        # 表示中の行の翻訳チェック（after のジョブID）
+        self._visible_check_job = None
 
         # UIコンポーネントを作成
         self._create_header()
+        self._create_filter_bar()
         self._create_result_list()
         self._create_notion_save_button()
+        self._setup_lazy_translation()
 
     def _create_header(self):
         """ヘッダー部分を作成"""
@@ -37,6 +91,13 @@ class ResultView(ctk.CTkFrame):
         )
         self.title_label.pack(side="left")
 
+        # Notion 保存の状態（保存待ち・失敗の件数）
+        self.save_status_label = ctk.CTkLabel(self.header_frame, text="", text_color="gray")
+        self.save_status_label.pack(side="left", padx=12)
+
+        # エラーなどのメッセージ（画面を作り直さずに一覧の上に表示。show_message で表示）
+        self.message_label = ctk.CTkLabel(self, text="", text_color="#c01c28", anchor="w", justify="left")
+
         if self.controller:
             self.back_button = ctk.CTkButton(
                 self.header_frame,
@@ -49,27 +110,151 @@ class ResultView(ctk.CTkFrame):
             self.back_button.configure(state="disabled")
             self.back_button.pack(side="right")
 
+    def _create_filter_bar(self):
+        """
+        絞り込み・並べ替えの欄を作成（再検索せず、検索結果の索引から一致する行のみを表示する）
+        絞り込み欄では cat: / author: / since: / until: と語を組み合わせられる
+        """
+        self.filter_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.filter_frame.pack(fill="x", padx=10)
+
+        # textvariable を渡すとプレースホルダが表示されないため、キー入力ごとに絞り込みを予約する
+        self.filter_entry = ctk.CTkEntry(
+            self.filter_frame,
+            placeholder_text="絞り込み（例: attention author:vaswani since:2024-01）",
+        )
+        self.filter_entry.pack(side="left", fill="x", expand=True)
+        self.filter_entry.bind("<KeyRelease>", lambda e: self._schedule_filter())
+
+        self.category_var = ctk.StringVar(value=_ALL_CATEGORIES)
+        self.category_menu = ctk.CTkOptionMenu(
+            self.filter_frame,
+            variable=self.category_var,
+            values=[_ALL_CATEGORIES],
+            command=lambda _: self._apply_filter(),
+            width=140,
+        )
+        self.category_menu.pack(side="left", padx=(8, 0))
+
+        self.sort_var = ctk.StringVar(value=next(iter(_SORT_CHOICES)))
+        self.sort_menu = ctk.CTkOptionMenu(
+            self.filter_frame,
+            variable=self.sort_var,
+            values=list(_SORT_CHOICES),
+            command=lambda _: self._apply_filter(),
+            width=110,
+        )
+        self.sort_menu.pack(side="left", padx=(8, 0))
+
+        # 表示件数（絞り込み中のみ「表示件数 / 全件数」）
+        self.count_label = ctk.CTkLabel(self.filter_frame, text="", text_color="gray")
+        self.count_label.pack(side="left", padx=(8, 0))
+
     def _create_result_list(self):
         """結果リスト部分を作成"""
         self.list_frame = ctk.CTkScrollableFrame(self, height=400)
         self.list_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        if not self.papers:
-            no_results_label = ctk.CTkLabel(
-                self.list_frame,
-                text="該当する論文が見つかりませんでした。"
-            )
-            no_results_label.pack(pady=20)
-            return
-
         for paper in self.papers:
             self._create_paper_item(paper)
+        self._rebuild_index()
+        self._apply_filter()
+        # 行ごとではなく一覧全体で1つのリサイズ処理（連続したリサイズはまとめて1回）
+        self.list_frame.bind("<Configure>", self._on_list_configure, add="+")
+
+    def _update_empty_label(self):
+        """表示する行が無ければ「見つかりませんでした」（絞り込み中は「一致する論文がありません」）を表示し、あれば隠す"""
+        if not self.shown_papers:
+            text = "該当する論文が見つかりませんでした。" if not self.papers else "条件に一致する論文がありません。"
+            if self._empty_label is None:
+                self._empty_label = ctk.CTkLabel(self.list_frame, text=text)
+                self._empty_label.pack(pady=20)
+            else:
+                self._empty_label.configure(text=text)
+        elif self._empty_label is not None:
+            self._empty_label.destroy()
+            self._empty_label = None
+
+    def _rebuild_index(self):
+        """検索結果の索引を作り直し、カテゴリの選択肢を更新する"""
+        self._index = ResultIndex(self.papers)
+        categories = [c for c, _ in self._index.category_counts()[:_MAX_CATEGORY_CHOICES]]
+        try:
+            self.category_menu.configure(values=[_ALL_CATEGORIES] + categories)
+        except Exception:
+            pass
+
+    def _current_filter(self) -> ResultFilter:
+        """絞り込み欄・カテゴリ・並べ替えの選択から条件を作る"""
+        filt = ResultFilter.parse(self.filter_entry.get(), sort=_SORT_CHOICES.get(self.sort_var.get(), "original"))
+        category = self.category_var.get()
+        if category and category != _ALL_CATEGORIES:
+            filt.categories.append(category)
+        return filt
+
+    def _schedule_filter(self):
+        """絞り込みを予約（入力が止まってから1回だけ）"""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(_FILTER_DEBOUNCE_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        """索引から条件に一致する論文を求め、その行のみを表示する（行は生成・破棄しない）"""
+        self._filter_job = None
+        filt = self._current_filter()
+        if filt.is_empty() and filt.sort == "original":
+            shown = self.papers
+        else:
+            shown = self._index.query(filt)
+        self._show_rows(shown)
+        self.count_label.configure(
+            text="" if filt.is_empty() else f"{len(self.shown_papers)} / {len(self.papers)} 件"
+        )
+        self._update_empty_label()
+        self._schedule_visible_check()
+
+    def _show_rows(self, papers: List[Any]):
+        """
+        指定した論文の行をこの順に表示し、それ以外の行は隠す（生成済みの行を pack し直すのみ）
+        Args:
+            papers (List[Any]): 表示する論文（生成済みの行があること）
+        """
+        current = [p.id for p in self.shown_papers]
+        target = [p.id for p in papers if p.id in self._item_frames]
+        if current == target:
+            return
+        current_set, target_set = set(current), set(target)
+        for pid in current:
+            if pid not in target_set:
+                self._item_frames[pid].pack_forget()
+        kept = [pid for pid in current if pid in target_set]
+        if [pid for pid in target if pid in current_set] == kept:
+            # 表示中の行の並びが変わらなければ、後ろから順に次の行の前に挿入する
+            next_frame: Optional[ctk.CTkFrame] = None
+            for pid in reversed(target):
+                frame = self._item_frames[pid]
+                if pid not in current_set:
+                    frame.pack(fill="x", padx=(5, 18), pady=6, before=next_frame)
+                next_frame = frame
+        else:
+            for pid in target:
+                self._item_frames[pid].pack_forget()
+            for pid in target:
+                self._item_frames[pid].pack(fill="x", padx=(5, 18), pady=6)
+        # 隠れていた間のリサイズを反映する
+        for pid in target:
+            if pid not in current_set:
+                self._apply_wrap(pid)
+        self.shown_papers = [p for p in papers if p.id in target_set]
 
     def _create_paper_item(self, paper):
-        """個々の論文アイテムを作成"""
+        """
+        個々の論文アイテムを作成（表示は _show_rows で行う）
+        Args:
+            paper: 論文
+        """
+        # 右側に余白を広めに取り、スクロールバーとの重なりを回避（pack は _show_rows で同じ余白で行う）
         item_frame = ctk.CTkFrame(self.list_frame)
-        # 右側に余白を広めに取り、スクロールバーとの重なりを回避
-        item_frame.pack(fill="x", padx=(5, 18), pady=6)
 
         # 水平配置用のメインフレーム
         content_frame = ctk.CTkFrame(item_frame)
@@ -98,12 +283,12 @@ class ResultView(ctk.CTkFrame):
         title_label = ctk.CTkLabel(
             info_frame,
             text=title,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=self._title_font,
             anchor="w",
             fg_color="transparent",
             text_color="#1a5fb4",
             justify="left",
-            wraplength=120,
+            wraplength=self._wrap_width,
         )
         title_label.pack(anchor="w", fill="x", padx=(12, 12), pady=(4, 2))
         # クリックでURLを開く
@@ -156,6 +341,24 @@ class ResultView(ctk.CTkFrame):
         else:
             meta_text = ""
 
+        # 関連度（並べ替えを行った場合のみ）
+        relevance = getattr(paper, "relevance", None)
+        if relevance is not None:
+            meta_text = f"{meta_text} || 関連度 {relevance:.2f}" if meta_text else f"関連度 {relevance:.2f}"
+
+        # Notion の読書状況（取り込み済みの場合のみ）
+        reading_status = getattr(paper, "reading_status", "")
+        if reading_status:
+            meta_text = f"{meta_text} || Notion: {reading_status}" if meta_text else f"Notion: {reading_status}"
+
+        # 近似重複（別IDの版・改題）
+        duplicate_of = getattr(paper, "duplicate_of", "")
+        duplicates = getattr(paper, "duplicates", [])
+        if duplicate_of:
+            meta_text = f"{meta_text} || 重複の可能性: {duplicate_of}" if meta_text else f"重複の可能性: {duplicate_of}"
+        elif duplicates:
+            meta_text = f"{meta_text} || 他{len(duplicates)}件の版を統合" if meta_text else f"他{len(duplicates)}件の版を統合"
+
         if meta_text:
             meta_label = ctk.CTkLabel(
                 info_frame,
@@ -170,63 +373,354 @@ class ResultView(ctk.CTkFrame):
         abstract_label = ctk.CTkLabel(
             info_frame,
             text=abstract,
+            font=self._body_font,
             anchor="w",
             justify="left",
-            # 初期値は小さくして、後続の<Configure>で動的に更新
-            wraplength=100
+            # 現在の一覧の幅に合わせた折り返し幅で生成（リサイズ時は _relayout でまとめて更新）
+            wraplength=self._wrap_width
         )
         # 右側に余白を追加（内部余白を少し広めに）
         abstract_label.pack(fill="x", padx=(12, 12), pady=(2, 6))
+        self._item_frames[paper.id] = item_frame
+        self._info_frames[paper.id] = info_frame
+        self._abstract_labels[paper.id] = abstract_label
 
-        # フレームのサイズに合わせて折り返し幅を更新（スクロールバー幅分を差し引く）
-        def _update_wraplength(event=None, lbl_abstract=abstract_label, lbl_title=title_label, frame=info_frame):
-            try:
-                w = frame.winfo_width()
-                if w and w > 0:
-                    # 右側のチェックボックス分と内部余白（左右 12px ずつ）を差し引く
-                    wl = max(w - (24 + 24), 160)
-                    lbl_abstract.configure(wraplength=wl)
-                    lbl_title.configure(wraplength=wl)
-            except Exception:
-                pass
-
-        info_frame.bind("<Configure>", _update_wraplength)
+        self._title_labels[paper.id] = title_label
+        self._applied_wrap[paper.id] = self._wrap_width
 
         # 選択状態管理用の変数
         var = ctk.BooleanVar(value=False)
         self.save_notion_selected_vars[paper.id] = var
 
-        # チェックボックス
+        # チェックボックス（チェック時に未翻訳なら翻訳する）
         checkbox = ctk.CTkCheckBox(
             notion_frame,
             text="",
             variable=var,
             width=20,
             height=20,
+            command=lambda p=paper: self._request_translation(p),
         )
         checkbox.pack(pady=10, padx=4)
 
+    def _setup_lazy_translation(self):
+        """
+        未翻訳の論文を、表示領域に入ったときに翻訳する（translation_mode が on_demand / top_k の場合）
+        スクロール・リサイズのたびに表示中の行を判定する
+        """
+        if not self.controller or not hasattr(self.controller, "request_translation"):
+            return
+        if all(getattr(p, "abstract_ja", "") for p in self.papers):
+            return
+        canvas = getattr(self.list_frame, "_parent_canvas", None)
+        scrollbar = getattr(self.list_frame, "_scrollbar", None)
+        if canvas is not None and scrollbar is not None:
+            def _on_scroll(first, last):
+                scrollbar.set(first, last)
+                self._schedule_visible_check()
+            try:
+                canvas.configure(yscrollcommand=_on_scroll)
+            except Exception:
+                pass
+        self.list_frame.bind("<Configure>", lambda e: self._schedule_visible_check(), add="+")
+        self._schedule_visible_check()
+
+    def _schedule_visible_check(self):
+        """表示中の行の翻訳チェックを予約（連続したスクロールはまとめて1回）"""
+        if self._visible_check_job is None:
+            self._visible_check_job = self.after(150, self._translate_visible_rows)
+
+    def _visible_papers(self) -> List[Any]:
+        """表示領域に入っている行の論文"""
+        canvas = getattr(self.list_frame, "_parent_canvas", None)
+        try:
+            top = canvas.canvasy(0)
+            bottom = canvas.canvasy(canvas.winfo_height())
+        except Exception:
+            return []
+        visible = []
+        for paper in self.shown_papers:
+            frame = self._item_frames.get(paper.id)
+            if frame is None:
+                continue
+            y = frame.winfo_y()
+            if y + frame.winfo_height() >= top and y <= bottom:
+                visible.append(paper)
+        return visible
+
+    def _translate_visible_rows(self):
+        """表示領域に入っている未翻訳の行を翻訳する"""
+        self._visible_check_job = None
+        for paper in self._visible_papers():
+            if not getattr(paper, "abstract_ja", ""):
+                self._request_translation(paper)
+
+    def _on_list_configure(self, event=None):
+        """一覧のリサイズ（連続したイベントはまとめて、落ち着いてから1回だけ折り返し幅を反映）"""
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(_RESIZE_DEBOUNCE_MS, self._relayout)
+
+    def _relayout(self):
+        """
+        一覧の幅から折り返し幅を1回だけ計算し、表示中の行に反映する（残りの行はアイドル時に少しずつ反映）
+        """
+        self._resize_job = None
+        try:
+            width = self.list_frame.winfo_width()
+        except Exception:
+            return
+        if width <= 1:
+            return
+        wrap = max(width - _ROW_CHROME_PX, _MIN_WRAP_PX)
+        if wrap == self._wrap_width and not self._wrap_queue:
+            return
+        self._wrap_width = wrap
+        visible = [p.id for p in self._visible_papers()]
+        for pid in visible:
+            self._apply_wrap(pid)
+        shown = set(visible)
+        # 隠れている行は表示するときに反映する
+        self._wrap_queue = [p.id for p in self.shown_papers if p.id not in shown]
+        if self._wrap_job is None and self._wrap_queue:
+            self._wrap_job = self.after_idle(self._apply_wrap_batch)
+
+    def _apply_wrap_batch(self):
+        """表示領域外の行に折り返し幅を _WRAP_BATCH 行ずつ反映する"""
+        self._wrap_job = None
+        batch, self._wrap_queue = self._wrap_queue[:_WRAP_BATCH], self._wrap_queue[_WRAP_BATCH:]
+        for pid in batch:
+            self._apply_wrap(pid)
+        if self._wrap_queue:
+            self._wrap_job = self.after_idle(self._apply_wrap_batch)
+
+    def _apply_wrap(self, paper_id: str):
+        """
+        1行に現在の折り返し幅を反映する
+        反映済みの幅と同じ、または文字列が新旧どちらの幅にも収まる（折り返しが変わらない）ラベルは更新しない
+        """
+        old = self._applied_wrap.get(paper_id)
+        wrap = self._wrap_width
+        if old == wrap or paper_id not in self._item_frames:
+            return
+        for label in (self._title_labels.get(paper_id), self._abstract_labels.get(paper_id)):
+            if label is None:
+                continue
+            try:
+                if old is not None and self._text_width(label) <= min(old, wrap):
+                    continue
+                label.configure(wraplength=wrap)
+            except Exception:
+                continue
+        self._applied_wrap[paper_id] = wrap
+
+    def _text_width(self, label: ctk.CTkLabel) -> int:
+        """ラベルの文字列を1行で描いたときの幅（フォント・文字列ごとに計測結果をキャッシュ）"""
+        text = label.cget("text")
+        font = label.cget("font")
+        key = (str(font), text)
+        width = self._text_widths.get(key)
+        if width is None:
+            if not hasattr(font, "measure"):
+                font = ctk.CTkFont()
+            width = font.measure(text)
+            self._text_widths[key] = width
+        return width
+
+    def _request_translation(self, paper):
+        """未翻訳の論文の翻訳をコントローラに依頼"""
+        if not self.controller or not hasattr(self.controller, "request_translation"):
+            return
+        if getattr(paper, "abstract_ja", "") or not getattr(paper, "abstract", ""):
+            return
+        self.controller.request_translation(paper, self._on_translated)
+
+    def _is_translating(self, paper_id: str) -> bool:
+        """コントローラで論文の翻訳が実行中か（途中経過の訳文を表示している）"""
+        return bool(self.controller and hasattr(self.controller, "is_translating") and self.controller.is_translating(paper_id))
+
+    def _on_translated(self, paper):
+        """翻訳完了時にアブストラクトを日本語に差し替える"""
+        self.update_abstract(paper.id, paper.abstract_ja)
+
+    def update_abstract(self, paper_id: str, text: str):
+        """
+        指定した論文のアブストラクト表示を訳文（途中経過を含む）に更新し、語による絞り込みの索引にも反映する
+        Args:
+            paper_id (str): 論文ID
+            text (str): 表示するテキスト
+        """
+        label = self._abstract_labels.get(paper_id)
+        try:
+            if label is not None and label.winfo_exists():
+                label.configure(text=text)
+        except Exception:
+            pass
+        # 語で絞り込み中なら、訳文で一致・不一致が変わるため絞り込み直す（連続した更新はまとめて1回）
+        if self._index.update_translation(paper_id, text) and self._current_filter().text.strip():
+            self._schedule_filter()
+
+    def set_papers(self, papers: List[Any]):
+        """
+        検索結果の論文を差分で更新する（画面を作り直さず、追加・削除された行のみを生成・破棄する。スクロール位置は維持）
+        索引を作り直し、現在の絞り込み・並べ替えで表示する
+        Args:
+            papers (List[Any]): 検索結果の論文（検索順）
+        """
+        new_ids = {p.id for p in papers}
+        self._destroy_rows([p.id for p in self.papers if p.id not in new_ids])
+        for paper in papers:
+            if paper.id in self._item_frames:
+                self._sync_abstract(paper)
+            else:
+                self._create_paper_item(paper)
+        self.papers = list(papers)
+        self._rebuild_index()
+        self._apply_filter()
+
+    def insert_papers(self, papers: Iterable[Any], index: int = 0):
+        """
+        論文の行を index の位置に挿入する（表示済みの論文は無視）
+        Args:
+            papers (Iterable[Any]): 挿入する論文
+            index (int): 挿入位置
+        """
+        shown = {p.id for p in self.papers}
+        added = [p for p in papers if p.id not in shown]
+        if added:
+            self.set_papers(self.papers[:index] + added + self.papers[index:])
+
+    def remove_papers(self, paper_ids: Iterable[str]):
+        """
+        論文の行を破棄する（残りの行はそのまま。件数の表示は現在の絞り込みで更新する）
+        Args:
+            paper_ids (Iterable[str]): 削除する論文ID
+        """
+        removed = set(paper_ids)
+        if not removed:
+            return
+        self._destroy_rows(removed)
+        self._rebuild_index()
+        self._apply_filter()
+
+    def _destroy_rows(self, paper_ids: Iterable[str]):
+        """論文の行を破棄し、検索結果・表示中の論文から外す"""
+        removed = set(paper_ids)
+        if not removed:
+            return
+        for pid in removed:
+            frame = self._item_frames.pop(pid, None)
+            if frame is not None:
+                frame.destroy()
+            for widgets in (
+                self._info_frames, self._abstract_labels, self._title_labels, self._status_labels,
+                self._applied_wrap, self.save_notion_selected_vars,
+            ):
+                widgets.pop(pid, None)
+        self.papers = [p for p in self.papers if p.id not in removed]
+        self.shown_papers = [p for p in self.shown_papers if p.id not in removed]
+
+    def _sync_abstract(self, paper):
+        """表示中の行のアブストラクトを論文の現在の値に合わせる（翻訳中なら途中経過の訳文を残す）"""
+        text = getattr(paper, "abstract_ja", "")
+        if not text and self._is_translating(paper.id):
+            return
+        text = text or getattr(paper, "abstract", "")
+        label = self._abstract_labels.get(paper.id)
+        try:
+            if label is not None and label.cget("text") != text:
+                label.configure(text=text)
+        except Exception:
+            pass
+
+    def mark_failed(self, paper_id: str, message: str = "Notionへの保存に失敗しました"):
+        """
+        行に失敗の表示を付ける（赤枠とメッセージ）
+        Args:
+            paper_id (str): 論文ID
+            message (str): 表示するメッセージ（空なら表示を消す）
+        """
+        frame = self._item_frames.get(paper_id)
+        info_frame = self._info_frames.get(paper_id)
+        if frame is None or info_frame is None:
+            return
+        label = self._status_labels.get(paper_id)
+        if not message:
+            if label is not None:
+                label.destroy()
+                del self._status_labels[paper_id]
+            frame.configure(border_width=0)
+            return
+        if label is None:
+            label = ctk.CTkLabel(info_frame, text="", text_color="#c01c28", anchor="w")
+            first = info_frame.winfo_children()[0]
+            label.pack(anchor="w", fill="x", padx=(12, 12), pady=(4, 0), before=first)
+            self._status_labels[paper_id] = label
+        label.configure(text=message)
+        frame.configure(border_width=2, border_color="#c01c28")
+
+    def show_message(self, text: str, duration_ms: int = 8000):
+        """
+        一覧の上にメッセージを表示する（duration_ms 後に消す。空文字なら消す）
+        Args:
+            text (str): 表示するテキスト
+            duration_ms (int): 表示する時間（ミリ秒）
+        """
+        if self._message_job is not None:
+            self.after_cancel(self._message_job)
+            self._message_job = None
+        if not text:
+            self.message_label.pack_forget()
+            return
+        self.message_label.configure(text=text)
+        self.message_label.pack(fill="x", padx=20, before=self.list_frame)
+        self._message_job = self.after(duration_ms, lambda: self.show_message(""))
+
+    def set_save_status(self, text: str):
+        """
+        Notion 保存の状態の表示を更新する
+        Args:
+            text (str): 表示するテキスト（空なら非表示）
+        """
+        try:
+            if self.save_status_label.winfo_exists():
+                self.save_status_label.configure(text=text)
+        except Exception:
+            pass
+
     def _create_notion_save_button(self):
         """
         Notion保存ボタンを作成する
         ボタンを押すと、self.save_notion_selected_varsでチェックされた論文をNotionに保存する
+        「PDF全文を取得・要約」をチェックすると、保存前に本文を取得して要約する
         """
+        save_frame = ctk.CTkFrame(self, fg_color="transparent")
+        save_frame.pack(pady=10)
+
+        self.full_text_var = ctk.BooleanVar(value=False)
+        self.full_text_checkbox = ctk.CTkCheckBox(
+            save_frame,
+            text="PDF全文を取得・要約",
+            variable=self.full_text_var,
+        )
+        self.full_text_checkbox.pack(side="left", padx=(0, 12))
+
         self.notion_save_button = ctk.CTkButton(
-            self,
+            save_frame,
             text="Notion DBに保存",
             command=self._save_to_notion,
         )
-        self.notion_save_button.pack(pady=10)
+        self.notion_save_button.pack(side="left")
 
     def _save_to_notion(self):
         """ 選択されたPaperをcontrollerに渡してNotionに保存する"""
         selected_papers = [
             paper for paper in self.papers
-            if self.save_notion_selected_vars[paper.id].get()
+            if paper.id in self.save_notion_selected_vars and self.save_notion_selected_vars[paper.id].get()
         ]
 
         if not selected_papers:
             return
 
         # コントローラーに保存処理を依頼
-        self.controller.save_to_notion(selected_papers)
+        self.controller.save_to_notion(selected_papers, full_text=self.full_text_var.get())
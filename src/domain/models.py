@@ -1,5 +1,16 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Literal, Optional, Tuple
+from datetime import date
+import json
+
+
+def _one_year_ago() -> str:
+    """1年前の同じ日（ISO形式。2月29日は2月28日）"""
+    today = date.today()
+    try:
+        return today.replace(year=today.year - 1).isoformat()
+    except ValueError:
+        return today.replace(year=today.year - 1, day=28).isoformat()
 
 
 class SearchConfig(BaseModel):
@@ -7,15 +18,112 @@ class SearchConfig(BaseModel):
     検索リクエスト
     - keyword: str
     - max_results: int
-    - start_date: str
-    - end_date: str
-    - notion_database_name: Optional[str]
+    - start_date: str (投稿日の下限 "YYYY-MM-DD"。両端を含む。空なら無期限。旧形式の「X年Y月Z日前」も可)
+    - end_date: str (投稿日の上限 "YYYY-MM-DD"。空なら無期限)
+    - notion_database_name: Optional[str] (検索結果の保存先の Notion データベースの名前。None なら振り分けの規則・既定の保存先)
+    - watch: bool (True なら保存済みウォッチの前回以降の新着のみを検索)
+    - rerank: bool (True ならクエリとの関連度で並べ替え、上位 max_results 件に絞り込む)
+    - rerank_overfetch: int (rerank 時に max_results の何倍を取得するか)
+    - min_relevance: float (rerank 時の関連度の下限)
+    - translation_mode: "eager" | "on_demand" | "top_k" (翻訳方針: 全件を検索時に / 表示・選択時に / 上位のみ検索時に)
+    - translate_top_k: int (translation_mode="top_k" のときに検索時に翻訳する件数)
+    - source: "arxiv" | "local" (検索先: arXiv API / ローカルストア)
+    - categories: List[str] (カテゴリの指定。例: ["cs.CL", "cs.*"]。空なら全カテゴリ。arXiv のクエリに cat: 条件として含める)
+    - dedup: "fold" | "flag" | "off" (近似重複: 結果内の重複をまとめ、保存済みの論文の訳文を流用する / 印を付けるのみ / 判定しない)
+    - hide_read: bool (True なら Notion で「読了」の論文を結果から除く)
     """
     keyword: List[str]
     max_results: int = 10
-    start_date: str = "1y0m0w0d"
-    end_date: str = "0y0m0w0d"
+    start_date: str = Field(default_factory=_one_year_ago)
+    end_date: str = Field(default_factory=lambda: date.today().isoformat())
     notion_database_name: Optional[str] = None
+    watch: bool = False
+    rerank: bool = False
+    rerank_overfetch: int = 3
+    min_relevance: float = 0.0
+    translation_mode: Literal["eager", "on_demand", "top_k"] = "eager"
+    translate_top_k: int = 5
+    source: Literal["arxiv", "local"] = "arxiv"
+    categories: List[str] = []
+    dedup: Literal["fold", "flag", "off"] = "fold"
+    hide_read: bool = False
+
+
+class CanonicalQuery(BaseModel):
+    """
+    正規化した検索条件（入力の表記ゆれに依らない、キャッシュ・同時リクエストの集約・ウォッチのキー）
+    - terms: Tuple[str, ...] (小文字化・空白を正規化し、重複を除いて並べ替えたキーワード)
+    - ids: Tuple[str, ...] (arXiv ID。重複を除いて並べ替え)
+    - categories: Tuple[str, ...] (カテゴリの指定。重複を除いて並べ替え)
+    - start_date: Optional[date] (投稿日の下限。両端を含む。None なら無期限)
+    - end_date: Optional[date] (投稿日の上限。None なら無期限)
+    - source: "arxiv" | "local"
+    """
+    model_config = ConfigDict(frozen=True)
+
+    terms: Tuple[str, ...] = ()
+    ids: Tuple[str, ...] = ()
+    categories: Tuple[str, ...] = ()
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    source: Literal["arxiv", "local"] = "arxiv"
+
+    def key(self) -> str:
+        """安定したキー（同じ条件なら常に同じ文字列）"""
+        return json.dumps(self.model_dump(mode="json"), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+class Watch(BaseModel):
+    """
+    ウォッチ（新着を繰り返し確認する保存済み検索。キーワードとカテゴリの組ごとに1つ）
+    - keyword: str  # 入力されたキーワード（表示用）
+    - terms: List[str]  # 正規化したキーワード（CanonicalQuery.terms。ウォッチのキー・新着の問い合わせに使う）
+    - categories: List[str]  # 正規化したカテゴリの指定（CanonicalQuery.categories）
+    - last_published: Optional[str]  # 処理済みの最新の published（ISO形式）
+    - known_ids: List[str]  # 処理済みの直近の論文ID（前回と同じ日時の論文の除外用）
+    - last_run_at: Optional[str]  # 最終実行日時（ISO形式）
+    """
+    keyword: str
+    terms: List[str] = []
+    categories: List[str] = []
+    last_published: Optional[str] = None
+    known_ids: List[str] = []
+    last_run_at: Optional[str] = None
+
+    def query(self) -> CanonicalQuery:
+        """ウォッチの検索条件（期間は持たない。前回以降の新着はハイウォーターマークで決める）"""
+        return CanonicalQuery(terms=tuple(self.terms), categories=tuple(self.categories))
+
+    def label(self) -> str:
+        """表示名（カテゴリの指定があれば併記）"""
+        return f"{self.keyword} [{', '.join(self.categories)}]" if self.categories else self.keyword
+
+
+# Notion のデータベースのプロパティ名の既定（論文の項目 → プロパティ名）
+DEFAULT_NOTION_PROPERTIES: Dict[str, str] = {
+    "title": "名前",
+    "status": "Progress",
+    "authors": "Authors",
+    "published": "Time",
+    "url": "URL",
+}
+
+
+class NotionDatabase(BaseModel):
+    """
+    論文の保存先の Notion データベース（src/config/notion_databases.json で複数指定できる）
+    - name: str (保存先の名前。SearchConfig.notion_database_name で指定する)
+    - database_id: str
+    - properties: Dict[str, str] (論文の項目 → プロパティ名。項目は title / status / authors / published / url / category。
+      空文字の項目は書き込まない)
+    - keywords: List[str] (タイトル・abstract にいずれかを含む論文をこのデータベースに保存する。大文字小文字は区別しない)
+    - categories: List[str] (いずれかのカテゴリ（ワイルドカード可）の論文をこのデータベースに保存する)
+    """
+    name: str
+    database_id: str
+    properties: Dict[str, str] = Field(default_factory=lambda: dict(DEFAULT_NOTION_PROPERTIES))
+    keywords: List[str] = []
+    categories: List[str] = []
 
 
 class Paper(BaseModel):
@@ -29,6 +137,14 @@ class Paper(BaseModel):
     - category: str
     - abstract: str
     - abstract_ja: str (ローカルLMによる翻訳後)
+    - relevance: Optional[float] (クエリとの関連度。並べ替えを行った場合のみ)
+    - full_text: str (PDFから抽出した本文。全文を取得した場合のみ)
+    - sections: Dict[str, str] (本文の章 {見出し: 本文})
+    - summary_ja: str (本文の要約。全文を取得した場合のみ)
+    - duplicate_of: str (近似重複と判定した元の論文ID。重複でなければ空)
+    - duplicates: List[str] (この論文にまとめた近似重複の論文ID)
+    - reading_status: str (Notion の読書状況「未読」「途中」「読了」。Notion に無ければ空)
+    - notion_database: str (保存先の Notion データベースの名前。空なら振り分けの規則・既定の保存先)
     """
     id: str
     title: str
@@ -38,3 +154,11 @@ class Paper(BaseModel):
     category: str
     abstract: str
     abstract_ja: str
+    relevance: Optional[float] = None
+    full_text: str = ""
+    sections: Dict[str, str] = {}
+    summary_ja: str = ""
+    duplicate_of: str = ""
+    duplicates: List[str] = []
+    reading_status: str = ""
+    notion_database: str = ""
@@ -1,6 +1,7 @@
 import os
+import argparse
 import logging
-from app.app_window import AppWindow
+from datetime import date
 
 # .env の読み込み（存在しない/未インストールでもアプリは起動可能）
 try:
@@ -9,10 +10,135 @@ try:
 except Exception:
     pass
 
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="arXivの論文を収集し、Notionに保存するツール")
+    parser.add_argument(
+        "--run-watches",
+        action="store_true",
+        help="GUIを起動せず、保存済みウォッチの新着論文を取得・翻訳してNotionに保存する（cron等での定期実行用）",
+    )
+    parser.add_argument(
+        "--max-results",
+        type=int,
+        default=50,
+        help="--run-watches 時のウォッチごとの最大取得数",
+    )
+    parser.add_argument(
+        "--no-save",
+        action="store_true",
+        help="--run-watches 時にNotionへ保存しない",
+    )
+    parser.add_argument(
+        "--import-snapshot",
+        metavar="PATH",
+        help="GUIを起動せず、arXivメタデータスナップショット（JSON Lines）をローカルストアに取り込む",
+    )
+    parser.add_argument("--categories", nargs="*", default=[], help="取り込むカテゴリ（例: cs.* stat.ML）")
+    parser.add_argument("--keywords", nargs="*", default=[], help="取り込むキーワード（タイトル・abstract）")
+    parser.add_argument("--since", type=date.fromisoformat, help="取り込む投稿日の下限（YYYY-MM-DD）")
+    parser.add_argument("--until", type=date.fromisoformat, help="取り込む投稿日の上限（YYYY-MM-DD）")
+    parser.add_argument("--workers", type=int, default=None, help="取り込みのワーカープロセス数")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="GUIを起動せず、検索・翻訳・保存をHTTPで提供するサーバーとして常駐する（研究室内でキャッシュ・予算を共有）",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="--serve 時に待ち受けるアドレス")
+    parser.add_argument("--port", type=int, default=8765, help="--serve 時に待ち受けるポート")
+    parser.add_argument(
+        "--server",
+        default=os.getenv("PAPER_SERVER_URL"),
+        metavar="URL",
+        help="GUIを --serve で起動したサーバーのクライアントとして動かす（例: http://127.0.0.1:8765。環境変数 PAPER_SERVER_URL でも指定可）",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=os.getenv("PAPER_TO_NOTION_PROFILE_DIR"),
+        help="検索・保存・結果画面の構築を cProfile / tracemalloc で計測し、DIR にプロファイルを出力する（環境変数 PAPER_TO_NOTION_PROFILE_DIR でも指定可）",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=None,
+        metavar="N",
+        help="--profile 時にログ・サマリに出す上位の件数",
+    )
+    return parser.parse_args()
+
+
+def run_watches(max_results: int, save: bool):
+    """保存済みウォッチを順に実行し、結果をログに出力"""
+    from services.pipeline import PaperPipeline
+    from services.instrumentation import get_tracer
+    from services.profiling import profile_run
+
+    pipeline = PaperPipeline()
+    with profile_run("watches"):
+        result = pipeline.run_watches(max_results=max_results, save=save)
+    logging.info("ウォッチ実行完了: %d件のウォッチ, 新着 合計%d件", len(result), sum(result.values()))
+    get_tracer().report_run("watches")
+
+
+def import_snapshot(args: argparse.Namespace):
+    """スナップショットをローカルストアに取り込み、結果をログに出力"""
+    from services.paper_store import PaperStore
+    from services.snapshot_importer import SnapshotFilter, import_snapshot as _import
+    from services.near_duplicate import NearDuplicateDetector
+    from services.instrumentation import get_tracer
+    from services.profiling import profile_run
+
+    store = PaperStore()
+    filt = SnapshotFilter(
+        categories=args.categories,
+        start_date=args.since,
+        end_date=args.until,
+        keywords=args.keywords,
+    )
+    with profile_run("import"):
+        _import(args.import_snapshot, store, filt, workers=args.workers)
+    logging.info("ローカルストアの論文数: %d件", store.count())
+    # 取り込んだ論文を近似重複の判定の対象にする（署名の無い論文のみ）
+    with profile_run("dedup_backfill"):
+        indexed = NearDuplicateDetector(store).backfill()
+    logging.info("近似重複の索引に登録した論文: %d件", indexed)
+    store.close()
+    get_tracer().report_run("import")
+
+
+def serve(host: str, port: int):
+    """パイプラインサーバーを起動し、終了（Ctrl+C）まで常駐する"""
+    from services.pipeline_server import PipelineServer
+
+    server = PipelineServer(host=host, port=port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("パイプラインサーバーを停止します")
+    finally:
+        server.shutdown()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     # ログ設定（INFO以上を標準出力に）
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
+    # プロファイルの設定は各処理が環境変数から読む（サーバー・GUIのスレッドにも同じ設定を渡す）
+    if args.profile:
+        os.environ["PAPER_TO_NOTION_PROFILE_DIR"] = args.profile
+        if args.profile_top:
+            os.environ["PAPER_TO_NOTION_PROFILE_TOP"] = str(args.profile_top)
 
-    # エントリーポイント
-    app = AppWindow()
-    app.mainloop()
+    if args.import_snapshot:
+        import_snapshot(args)
+    elif args.run_watches:
+        run_watches(max_results=args.max_results, save=not args.no_save)
+    elif args.serve:
+        serve(args.host, args.port)
+    else:
+        # エントリーポイント
+        from app.app_window import AppWindow
+        app = AppWindow(server_url=args.server)
+        app.mainloop()
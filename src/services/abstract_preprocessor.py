@@ -0,0 +1,206 @@
+from __future__ import annotations
+from typing import Iterable, List, Optional
+from dataclasses import dataclass
+import re
+
+from services.usage_ledger import estimate_tokens
+
+
+@dataclass
+class PreprocessConfig:
+    """翻訳前の abstract の前処理の設定"""
+    enabled: bool = True
+    # LaTeX の数式・記号を平文にする（$\mathcal{O}(n)$ → O(n)）
+    simplify_latex: bool = True
+    # URL を取り除く
+    strip_urls: bool = True
+    # 定型文（コード公開先・採択先など）の文を取り除く
+    strip_boilerplate: bool = True
+    # 最大文字数（0 なら打ち切らない）
+    max_chars: int = 0
+    # 打ち切り方（"sentence": 文単位で末尾の文を落とす / "char": 文字数で切る）
+    truncate: str = "sentence"
+
+
+# LaTeX の記号（よく使われるもののみ。それ以外のコマンドは名前を残す）
+_LATEX_SYMBOLS = {
+    "times": "×", "cdot": "·", "le": "≤", "leq": "≤", "ge": "≥", "geq": "≥", "neq": "≠", "ne": "≠",
+    "approx": "≈", "sim": "~", "pm": "±", "infty": "∞", "to": "→", "rightarrow": "→", "leftarrow": "←",
+    "in": "∈", "sum": "Σ", "prod": "Π", "sqrt": "√", "log": "log", "exp": "exp", "ldots": "...", "dots": "...",
+    "alpha": "α", "beta": "β", "gamma": "γ", "delta": "δ", "epsilon": "ε", "varepsilon": "ε", "zeta": "ζ",
+    "eta": "η", "theta": "θ", "kappa": "κ", "lambda": "λ", "mu": "μ", "nu": "ν", "xi": "ξ", "pi": "π",
+    "rho": "ρ", "sigma": "σ", "tau": "τ", "phi": "φ", "varphi": "φ", "chi": "χ", "psi": "ψ", "omega": "ω",
+    "Gamma": "Γ", "Delta": "Δ", "Theta": "Θ", "Lambda": "Λ", "Sigma": "Σ", "Phi": "Φ", "Omega": "Ω",
+}
+# 引数の中身だけを残すコマンド（\mathcal{O} → O）
+_LATEX_WRAPPER_RE = re.compile(
+    r"\\(?:math(?:cal|bf|rm|it|bb|sf|tt|frak)|text(?:bf|it|rm|tt|sc)?|emph|operatorname|boldsymbol)\s*\{([^{}]*)\}"
+)
+_LATEX_COMMAND_RE = re.compile(r"\\([A-Za-z]+)")
+_LATEX_ESCAPE_RE = re.compile(r"\\([%&#_$])")
+_LATEX_SPACE_RE = re.compile(r"\\[,;:! ]")
+_MATH_RE = re.compile(r"\$([^$]*)\$")
+# 上付き・下付きの波括弧（2^{-8} → 2^-8、単一文字ならそのまま）
+_SCRIPT_BRACE_RE = re.compile(r"([\^_])\{([^{}]*)\}")
+
+_URL_RE = re.compile(r"\(?\b(?:https?://|www\.)\S+?(?=[.,;:)]*(?:\s|$))\)?")
+# ハイフンの直後の改行（"zero-\npadding"、折り返された URL "https://github.com/example/kv-\nevict"）
+_HYPHEN_BREAK_RE = re.compile(r"(\S-)\n(\S)")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z(\[])")
+# 定型文とみなす文
+_BOILERPLATE_RES = [
+    re.compile(r"\b(?:code|codes|implementation|models?|weights|scripts|data(?:sets?)?|benchmark suite|project page)\b"
+               r"[^.]{0,80}\b(?:(?:is|are|will be)\s+(?:made\s+)?(?:publicly\s+|freely\s+)?(?:available|released)"
+               r"|can be found)", re.I),
+    re.compile(r"^(?:code|project page|website|github|data)\s*:", re.I),
+    re.compile(r"\baccepted (?:to|at|by|for|in)\b[^.]{0,80}"
+               r"\b(?:conference|workshop|journal|proceedings|symposium|[A-Z]{3,}\s*'?\d{2,4})", re.I),
+    re.compile(r"\bto appear in\b", re.I),
+    re.compile(r"^\d+\s+pages\b", re.I),
+]
+# URL を含む文のうち、これらの語があれば定型文とみなす（無ければ URL だけを取り除く）
+_URL_SENTENCE_HINT_RE = re.compile(
+    r"\b(?:code|available|release[ds]?|implementation|github|project|page|website|repository|data|open[- ]source)\b",
+    re.I,
+)
+
+
+def simplify_latex(text: str) -> str:
+    """
+    LaTeX の数式・記号を平文にする
+    Args:
+        text (str): テキスト
+    Returns:
+        str: $ を外し、記号を Unicode に、書式コマンドを中身に置き換えたテキスト
+    """
+    def _math(m: re.Match) -> str:
+        inner = _LATEX_WRAPPER_RE.sub(r"\1", m.group(1))
+        inner = _SCRIPT_BRACE_RE.sub(r"\1\2", inner)
+        inner = _LATEX_SPACE_RE.sub(" ", inner)
+        inner = _LATEX_COMMAND_RE.sub(lambda c: _LATEX_SYMBOLS.get(c.group(1), c.group(1)), inner)
+        inner = _LATEX_ESCAPE_RE.sub(r"\1", inner)
+        return inner.replace("{", "").replace("}", "").strip()
+
+    text = _MATH_RE.sub(_math, text)
+    # 数式の外のエスケープ（"8\%"）と書式コマンド
+    text = _LATEX_WRAPPER_RE.sub(r"\1", text)
+    return _LATEX_ESCAPE_RE.sub(r"\1", text)
+
+
+def split_sentences(text: str) -> List[str]:
+    """空白を正規化したテキストを文に分割する（大文字・括弧で始まる文の直前の終止符で区切る）"""
+    return [s for s in _SENTENCE_SPLIT_RE.split(text) if s]
+
+
+def is_boilerplate(sentence: str) -> bool:
+    """コード公開先・採択先などの定型文か"""
+    if _URL_RE.search(sentence) and _URL_SENTENCE_HINT_RE.search(sentence):
+        return True
+    return any(r.search(sentence) for r in _BOILERPLATE_RES)
+
+
+def _strip_urls(sentence: str) -> str:
+    """文から URL を取り除き、残った空白・句読点を整える"""
+    sentence = _URL_RE.sub("", sentence)
+    sentence = re.sub(r"\s+([.,;:])", r"\1", sentence)
+    return " ".join(sentence.split())
+
+
+def truncate_text(text: str, max_chars: int, policy: str = "sentence") -> str:
+    """
+    テキストを max_chars 以内に打ち切る
+    Args:
+        text (str): テキスト
+        max_chars (int): 最大文字数（0 なら打ち切らない）
+        policy (str): "sentence" なら収まる文までを残す（最初の文が収まらなければ文字数で切る）、"char" なら単語の境界で切る
+    Returns:
+        str: 打ち切ったテキスト
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    if policy == "sentence":
+        kept: List[str] = []
+        length = 0
+        for s in split_sentences(text):
+            if length + len(s) + (1 if kept else 0) > max_chars:
+                break
+            kept.append(s)
+            length += len(s) + (1 if len(kept) > 1 else 0)
+        if kept:
+            return " ".join(kept)
+    head = text[:max_chars]
+    cut = head.rfind(" ")
+    return head[:cut] if cut > 0 else head
+
+
+def preprocess_abstract(text: str, cfg: Optional[PreprocessConfig] = None) -> str:
+    """
+    翻訳に送る前の abstract を整える（空白の正規化・LaTeX の平文化・URL と定型文の除去・打ち切り）
+    Args:
+        text (str): arXiv の abstract（改行・LaTeX を含む原文）
+        cfg (Optional[PreprocessConfig]): 前処理の設定（省略時は既定値）
+    Returns:
+        str: 前処理後の abstract
+    """
+    cfg = cfg or PreprocessConfig()
+    if not cfg.enabled or not text:
+        return text
+    text = _HYPHEN_BREAK_RE.sub(r"\1\2", text)
+    if cfg.simplify_latex:
+        text = simplify_latex(text)
+    text = " ".join(text.split())
+    if cfg.strip_boilerplate or cfg.strip_urls:
+        sentences = split_sentences(text)
+        if cfg.strip_boilerplate:
+            sentences = [s for s in sentences if not is_boilerplate(s)]
+        if cfg.strip_urls:
+            sentences = [_strip_urls(s) for s in sentences]
+        text = " ".join(s for s in sentences if s)
+    return truncate_text(text, cfg.max_chars, cfg.truncate)
+
+
+@dataclass
+class ReductionReport:
+    """前処理による削減量"""
+    documents: int = 0
+    chars_before: int = 0
+    chars_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def char_reduction(self) -> float:
+        """文字数の削減率（0〜1）"""
+        return 1 - self.chars_after / self.chars_before if self.chars_before else 0.0
+
+    @property
+    def token_reduction(self) -> float:
+        """概算トークン数の削減率（0〜1）"""
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+    def format(self) -> str:
+        """ログ出力用のテキスト"""
+        return (
+            f"{self.documents}件: 文字数 {self.chars_before} → {self.chars_after} (-{self.char_reduction:.1%}), "
+            f"概算トークン数 {self.tokens_before} → {self.tokens_after} (-{self.token_reduction:.1%})"
+        )
+
+
+def measure_reduction(texts: Iterable[str], cfg: Optional[PreprocessConfig] = None) -> ReductionReport:
+    """
+    abstract のコーパスで前処理による文字数・概算トークン数の削減量を計測する
+    Args:
+        texts (Iterable[str]): abstract の原文
+        cfg (Optional[PreprocessConfig]): 前処理の設定（省略時は既定値）
+    Returns:
+        ReductionReport: 削減量
+    """
+    report = ReductionReport()
+    for text in texts:
+        after = preprocess_abstract(text, cfg)
+        report.documents += 1
+        report.chars_before += len(text)
+        report.chars_after += len(after)
+        report.tokens_before += estimate_tokens(text)
+        report.tokens_after += estimate_tokens(after)
+    return report
@@ -1,13 +1,152 @@
-from typing import List
-from datetime import datetime, timedelta, timezone, date
+from typing import Iterable, List, Optional, Set, Tuple
+from datetime import datetime, time, timedelta, timezone, date
+import asyncio
+import fnmatch
+import logging
 import re
+import httpx
 import requests
 import feedparser
 
-from domain.models import Paper
+from domain.models import CanonicalQuery, Paper
+from services.instrumentation import get_tracer
+from services.single_flight import SingleFlight
+
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+# submittedDate の範囲の下限を省略したときの値（arXiv の開設より前）
+_EARLIEST_SUBMITTED = datetime(1991, 1, 1, tzinfo=timezone.utc)
+
+# カテゴリの指定（ワイルドカード * ? を含められる。例: "cs.CL", "cs.*", "astro-ph*"）
+_CATEGORY_RE = re.compile(r"^[A-Za-z0-9*?][A-Za-z0-9.\-*?]*$")
+# arXiv のクエリに含められる指定（ワイルドカードは末尾の * のみ）
+_PUSHDOWN_CATEGORY_RE = re.compile(r"^[A-Za-z][A-Za-z0-9.\-]*\*?$")
+
+
+def normalize_categories(categories: Optional[Iterable[str]]) -> List[str]:
+    """
+    カテゴリの指定を正規化する（空白・カンマ区切りの文字列も可。空の指定と重複は除く）
+    Args:
+        categories (Optional[Iterable[str]]): カテゴリの指定
+    Returns:
+        List[str]: カテゴリの指定
+    Raises:
+        ValueError: カテゴリとして使えない文字を含む
+    """
+    result: List[str] = []
+    for item in categories or []:
+        for cat in re.split(r"[\s,]+", str(item or "")):
+            if not cat:
+                continue
+            if not _CATEGORY_RE.match(cat):
+                raise ValueError(f"カテゴリの指定が不正です: {cat}")
+            if cat not in result:
+                result.append(cat)
+    return result
+
+
+def matches_categories(category: str, patterns: List[str]) -> bool:
+    """
+    論文のカテゴリ（Paper.category のカンマ区切り）がいずれかの指定に一致するか（指定が無ければ True）
+    Args:
+        category (str): 論文のカテゴリ
+        patterns (List[str]): カテゴリの指定（ワイルドカード可）
+    Returns:
+        bool: 一致するか
+    """
+    if not patterns:
+        return True
+    cats = [c.strip() for c in (category or "").split(",") if c.strip()]
+    return any(fnmatch.fnmatchcase(c, pat) for c in cats for pat in patterns)
 
 
 class ArxivService:
+    """
+    arXiv API の検索
+    - search_papers などはスレッドから、search_papers_async などはイベントループから呼ぶ
+      （非同期版は httpx.AsyncClient で通信し、フィードのパースのみスレッドプールで行う）
+    """
+
+    def __init__(self, session=None, async_session=None):
+        """
+        Args:
+            session: requests.Session 互換の HTTP クライアント（省略時は requests モジュール）
+            async_session: httpx.AsyncClient 互換の HTTP クライアント（*_async で使用。省略時は初回に生成する）
+        """
+        self.session = session or requests
+        self._async_session = async_session
+        self._owns_async_session = async_session is None
+        # 同じクエリの同時リクエストは1回にまとめる（連打・再検索時。同期・非同期の呼び出しの間でも共有）
+        self._flight = SingleFlight("arxiv")
+
+    def _get_async_session(self):
+        """非同期の HTTP クライアントを取得（未生成なら生成。生成したループで使い続ける）"""
+        if self._async_session is None:
+            self._async_session = httpx.AsyncClient(follow_redirects=True)
+        return self._async_session
+
+    async def aclose(self):
+        """生成した非同期の HTTP クライアントを閉じる（渡されたクライアントは閉じない）"""
+        if self._owns_async_session and self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    def _query_key(self, params: dict) -> tuple:
+        """クエリの正規化キー（検索式は大文字小文字・空白の違いを無視）"""
+        items = []
+        for k, v in sorted(params.items()):
+            v = str(v)
+            if k == "search_query":
+                v = " ".join(v.lower().split())
+            items.append((k, v))
+        return tuple(items)
+
+    def _fetch_feed_entries(self, params: dict) -> list:
+        """
+        arXiv API にリクエストし、フィードの entries を返す（同じクエリが実行中なら結果を共有）
+        Args:
+            params (dict): クエリパラメータ
+        Returns:
+            list: FeedParserDict のリスト（共有されるため変更しないこと）
+        """
+        return self._flight.do(self._query_key(params), self._request_feed_entries, params)
+
+    def _request_feed_entries(self, params: dict) -> list:
+        """arXiv API にリクエストし、フィードの entries を返す（通信・パースを計測）"""
+        tracer = get_tracer()
+        with tracer.span("arxiv.fetch") as span:
+            resp = self.session.get(ARXIV_API_URL, params=params, timeout=20)
+            span["status"] = resp.status_code
+            span["bytes"] = len(resp.content)
+            resp.raise_for_status()
+        tracer.incr("arxiv.requests")
+        tracer.incr("arxiv.bytes", len(resp.content))
+        return self._parse_feed(resp.text)
+
+    async def _fetch_feed_entries_async(self, params: dict) -> list:
+        """arXiv API にリクエストし、フィードの entries を返す（_fetch_feed_entries の非同期版）"""
+        return await self._flight.do_async(self._query_key(params), self._request_feed_entries_async, params)
+
+    async def _request_feed_entries_async(self, params: dict) -> list:
+        """arXiv API に非同期でリクエストし、フィードの entries を返す（パースは CPU 処理のためスレッドプールで行う）"""
+        tracer = get_tracer()
+        with tracer.span("arxiv.fetch") as span:
+            resp = await self._get_async_session().get(ARXIV_API_URL, params=params, timeout=20)
+            span["status"] = resp.status_code
+            span["bytes"] = len(resp.content)
+            resp.raise_for_status()
+        tracer.incr("arxiv.requests")
+        tracer.incr("arxiv.bytes", len(resp.content))
+        return await asyncio.get_running_loop().run_in_executor(None, self._parse_feed, resp.text)
+
+    def _parse_feed(self, text: str) -> list:
+        """フィードをパースして entries を返す（パースを計測）"""
+        with get_tracer().span("arxiv.parse") as span:
+            feed = feedparser.parse(text)
+            entries = getattr(feed, "entries", [])
+            span["entries"] = len(entries)
+        return entries
+
     def _extract_arxiv_id(self, s: str) -> str | None:
         """
         文字列から arXiv の識別子を抽出する。
@@ -39,17 +178,10 @@ class ArxivService:
             pass
         return None
 
-    def _fetch_entries_by_id_list(
-        self,
-        ids: list[str],
-        max_results: int,
-    ) -> list:
-        """id_list で arXiv API から entries を取得（最大 max_results 件まで）"""
-        if not ids:
-            return []
-        url = "http://export.arxiv.org/api/query"
+    def _id_list_params(self, ids: list[str], max_results: int) -> dict:
+        """id_list で arXiv API から entries を取得するクエリ（最大 max_results 件まで）"""
         # arXiv API は id_list をカンマ区切りで指定
-        params = {
+        return {
             # 念のためサイズを制限
             "id_list": ",".join(ids)[:2048],
             "start": 0,
@@ -57,14 +189,23 @@ class ArxivService:
             "sortBy": "submittedDate",
             "sortOrder": "descending",
         }
-        resp = requests.get(url, params=params, timeout=20)
-        resp.raise_for_status()
-        feed = feedparser.parse(resp.text)
-        return getattr(feed, "entries", [])
+
+    def _parse_date(self, expr: str) -> date:
+        """
+        検索期間の指定を日付に変換（"YYYY-MM-DD" はそのまま。旧形式の「X年Y月Z日前」は今日からの相対日付）
+        Args:
+            expr (str): "YYYY-MM-DD" または「X年Y月Z日前」
+        Returns:
+            date: 日付
+        """
+        try:
+            return date.fromisoformat(expr.strip())
+        except ValueError:
+            return self._parse_relative_jp(expr)
 
     def _parse_relative_jp(self, expr: str) -> date:
         """
-        「X年Y月Z日前」の形式を今日からの相対日付に変換
+        「X年Y月Z日前」の形式を今日からの相対日付に変換（旧形式の検索期間の互換用）
         欠損は0として扱う
         例: "1年0月0日前" -> 今日から365日引いた日（簡易換算）
         Args:
@@ -79,6 +220,29 @@ class ArxivService:
         days = y * 365 + m * 30 + d  # 簡易換算
         return datetime.now().date() - timedelta(days=days)
 
+    def resolve_date_range(self, start_date: str, end_date: str) -> tuple[date, date]:
+        """
+        検索期間の文字列を日付の範囲に変換（空文字は無期限、前後が逆なら入れ替える）
+        Args:
+            start_date (str): 検索開始（例: "2025-01-01"）
+            end_date (str): 検索終了（例: "2025-01-31"。この日を含む）
+        Returns:
+            tuple[date, date]: (開始日, 終了日)
+        """
+        # 日付の解釈と範囲正規化（空文字は無期限として扱う）
+        if not start_date:
+            start_d = date.min
+        else:
+            start_d = self._parse_date(start_date)
+
+        if not end_date:
+            end_d = date.max
+        else:
+            end_d = self._parse_date(end_date)
+        if end_d < start_d:
+            start_d, end_d = end_d, start_d
+        return start_d, end_d
+
     def _within_range(self, pub: datetime, start_d: date, end_d: date) -> bool:
         """
         期間内かどうかを判定
@@ -92,6 +256,115 @@ class ArxivService:
         pub_d = pub.date()
         return start_d <= pub_d <= end_d
 
+    def _parse_published(self, e) -> Optional[datetime]:
+        """
+        エントリの published を UTC の datetime に変換（解釈できなければ None）
+        Args:
+            e (FeedParserDict): arXivのRSSエントリ
+        Returns:
+            Optional[datetime]: 発表日時
+        """
+        try:
+            return datetime.strptime(e.get("published", ""), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        except Exception:
+            return None
+
+    def _split_keywords(self, keywords: List[str]) -> tuple[list[str], list[str]]:
+        """
+        キーワードを arXiv ID/URL と テキスト に分離
+        Args:
+            keywords (List[str]): 検索キーワード
+        Returns:
+            tuple[list[str], list[str]]: (arXiv ID のリスト, テキストのリスト)
+        """
+        ids: list[str] = []
+        text_terms: list[str] = []
+        for kw in keywords:
+            # 前後・連続する空白を正規化
+            kw = " ".join(str(kw or "").split())
+            if not kw:
+                continue
+            arx_id = self._extract_arxiv_id(kw)
+            if arx_id:
+                ids.append(arx_id)
+            else:
+                text_terms.append(kw)
+        return ids, text_terms
+
+    def canonical_query(
+        self,
+        keywords: List[str],
+        start_date: str = "",
+        end_date: str = "",
+        categories: Optional[List[str]] = None,
+        source: str = "arxiv",
+    ) -> CanonicalQuery:
+        """
+        検索条件を正規化する（キーワードの大文字小文字・空白・順序、期間の表記に依らない）
+        Args:
+            keywords (List[str]): 検索キーワード（arXiv ID/URL を含めてよい）
+            start_date (str): 検索開始（"YYYY-MM-DD"。空なら無期限）
+            end_date (str): 検索終了（"YYYY-MM-DD"。空なら無期限）
+            categories (Optional[List[str]]): カテゴリの指定
+            source (str): 検索先（"arxiv" / "local"）
+        Returns:
+            CanonicalQuery: 正規化した検索条件
+        """
+        ids, text_terms = self._split_keywords(keywords)
+        start_d, end_d = self.resolve_date_range(start_date, end_date)
+        return CanonicalQuery(
+            terms=tuple(sorted({t.lower() for t in text_terms})),
+            ids=tuple(sorted(set(ids))),
+            categories=tuple(sorted(normalize_categories(categories))),
+            start_date=None if start_d == date.min else start_d,
+            end_date=None if end_d == date.max else end_d,
+            source=source,
+        )
+
+    def _category_clause(self, categories: List[str]) -> Optional[str]:
+        """
+        カテゴリの指定を cat: の OR にする
+        arXiv のクエリで表せない指定（先頭・途中のワイルドカードなど）を含むなら None（取得後に絞り込む）
+        Args:
+            categories (List[str]): 正規化済みのカテゴリの指定
+        Returns:
+            Optional[str]: cat: の条件
+        """
+        if not categories:
+            return None
+        if not all(_PUSHDOWN_CATEGORY_RE.match(c) for c in categories):
+            logging.info("カテゴリの指定をクエリに含められないため、取得後に絞り込みます: %s", categories)
+            return None
+        return " OR ".join(f"cat:{c}" for c in categories)
+
+    def _build_search_query(
+        self,
+        text_terms: List[str],
+        since: Optional[datetime] = None,
+        categories: Optional[List[str]] = None,
+        until: Optional[datetime] = None,
+    ) -> str:
+        """
+        search_query を組み立てる（abs: に対する OR、カテゴリ指定時は cat: の OR を、since / until 指定時は submittedDate の範囲を AND）
+        演算子は空白区切り（requests が "+" にエンコードし、arXiv 側で空白に戻る）
+        Args:
+            text_terms (List[str]): テキストのキーワード
+            since (Optional[datetime]): 投稿日時の下限
+            categories (Optional[List[str]]): 正規化済みのカテゴリの指定
+            until (Optional[datetime]): 投稿日時の上限（省略時は現在）
+        Returns:
+            str: search_query
+        """
+        query = " OR ".join([f"abs:{kw}" for kw in text_terms])
+        cat_clause = self._category_clause(categories or [])
+        if cat_clause:
+            query = f"({query}) AND ({cat_clause})" if query else f"({cat_clause})"
+        if since is not None or until is not None:
+            lower = (since or _EARLIEST_SUBMITTED).astimezone(timezone.utc).strftime("%Y%m%d%H%M")
+            upper = (until or datetime.now(timezone.utc)).astimezone(timezone.utc).strftime("%Y%m%d%H%M")
+            query = f"({query}) AND submittedDate:[{lower} TO {upper}]"
+        return query
+
     def _entry_to_paper(self, e) -> Paper:
         """
         検索結果をPaperモデルに変換
@@ -134,77 +407,98 @@ class ArxivService:
         max_results: int,
         start_date: str,
         end_date: str,
+        categories: Optional[List[str]] = None,
     ) -> List[Paper]:
         """
         arXiv API を使って論文を検索する
+        検索条件は正規化してからクエリにする（表記ゆれがあっても同じクエリになり、同時リクエストの集約が効く）
+        カテゴリの指定と検索期間はクエリの cat: / submittedDate 条件として arXiv 側で絞り込む（範囲外の論文はダウンロードしない）
 
         Args:
             keywords (List[str]): 検索キーワード
             max_results (int): 最大検索数
-            start_date (str): 検索開始（例: "1年0月0日前"）
-            end_date (str): 検索終了（例: "0年0月0日前"）
+            start_date (str): 検索開始（例: "2025-01-01"。空なら無期限）
+            end_date (str): 検索終了（例: "2025-01-31"。この日を含む。空なら無期限）
+            categories (Optional[List[str]]): カテゴリの指定（ワイルドカード可。arXiv ID の指定には適用しない）
 
         Returns:
             List[Paper]: 検索結果リスト
         """
-        # キーワードを arXiv ID/URL と テキスト に分離
-        ids: list[str] = []
-        text_terms: list[str] = []
-        for kw in keywords:
-            if not kw:
-                continue
-            arx_id = self._extract_arxiv_id(str(kw))
-            if arx_id:
-                ids.append(arx_id)
-            else:
-                text_terms.append(str(kw))
+        # キーワードを arXiv ID/URL と テキスト に分離し、正規化
+        q = self.canonical_query(keywords, start_date, end_date, categories)
+        id_params, text_params = self._search_params(q, max_results)
+        id_entries = self._fetch_feed_entries(id_params) if id_params else []
+        text_entries = self._fetch_feed_entries(text_params) if text_params else []
+        return self._collect_papers(q, id_entries, text_entries)
+
+    async def search_papers_async(
+        self,
+        keywords: List[str],
+        max_results: int,
+        start_date: str,
+        end_date: str,
+        categories: Optional[List[str]] = None,
+    ) -> List[Paper]:
+        """
+        arXiv API を使って論文を検索する（search_papers の非同期版。ID 指定とテキスト検索は同時に問い合わせる）
+        Returns:
+            List[Paper]: 検索結果リスト
+        """
+        q = self.canonical_query(keywords, start_date, end_date, categories)
+        id_params, text_params = self._search_params(q, max_results)
+
+        async def _fetch(params: Optional[dict]) -> list:
+            return await self._fetch_feed_entries_async(params) if params else []
+
+        id_entries, text_entries = await asyncio.gather(_fetch(id_params), _fetch(text_params))
+        return self._collect_papers(q, id_entries, text_entries)
 
-        entries = []
+    def _search_params(self, q: CanonicalQuery, max_results: int) -> Tuple[Optional[dict], Optional[dict]]:
+        """
+        検索のクエリ
+        Returns:
+            Tuple[Optional[dict], Optional[dict]]: (id_list で取得するクエリ, テキスト検索のクエリ)（不要なら None）
+        """
+        ids, text_terms, categories = list(q.ids), list(q.terms), list(q.categories)
         # 1) id_list で取得
-        if ids:
-            entries.extend(self._fetch_entries_by_id_list(ids, max_results))
-
-        # 2) テキスト検索（abs: に対する OR）
-        if text_terms:
-            url = "http://export.arxiv.org/api/query"
-            query = "+OR+".join([f"abs:{kw}" for kw in text_terms])
-            params = {
+        id_params = self._id_list_params(ids, max_results) if ids else None
+        # 2) テキスト検索（abs: に対する OR。キーワードが無くカテゴリのみの指定ならカテゴリの新着）
+        text_params = None
+        if text_terms or (categories and not ids):
+            query = self._build_search_query(
+                text_terms,
+                since=datetime.combine(q.start_date, time.min, timezone.utc) if q.start_date else None,
+                categories=categories,
+                until=datetime.combine(q.end_date, time.max, timezone.utc) if q.end_date else None,
+            )
+            text_params = {
                 "search_query": query,
                 "start": 0,
                 "max_results": max_results,
                 "sortBy": "submittedDate",
                 "sortOrder": "descending",
             }
-            resp = requests.get(url, params=params, timeout=20)
-            resp.raise_for_status()
-            feed = feedparser.parse(resp.text)
-            entries.extend(getattr(feed, "entries", []))
-
-        # 相対日付の解釈と範囲正規化（空文字は無期限として扱う）
-        if not start_date:
-            start_d = date.min
-        else:
-            start_d = self._parse_relative_jp(start_date)
+        return id_params, text_params
 
-        if not end_date:
-            end_d = date.max
-        else:
-            end_d = self._parse_relative_jp(end_date)
-        if end_d < start_d:
-            start_d, end_d = end_d, start_d
+    def _collect_papers(self, q: CanonicalQuery, id_entries: list, text_entries: list) -> List[Paper]:
+        """
+        取得した entries を期間・カテゴリで絞り込み、重複を除いて Paper にする
+        Args:
+            q (CanonicalQuery): 正規化した検索条件
+            id_entries (list): id_list で取得した entries
+            text_entries (list): テキスト検索で取得した entries
+        Returns:
+            List[Paper]: 検索結果リスト
+        """
+        categories = list(q.categories)
+        start_d, end_d = q.start_date or date.min, q.end_date or date.max
+        entries = list(id_entries) + list(text_entries)
 
         # 重複排除（idでユニーク化）
         seen_ids: set[str] = set()
         papers: List[Paper] = []
-        for e in entries:
-            pub_raw = e.get("published", "")
-            try:
-                fmt = "%Y-%m-%dT%H:%M:%SZ"
-                published_dt = datetime.strptime(pub_raw, fmt).replace(
-                    tzinfo=timezone.utc
-                )
-            except Exception:
-                published_dt = None
+        for i, e in enumerate(entries):
+            published_dt = self._parse_published(e)
             if published_dt is not None and not self._within_range(
                 published_dt, start_d, end_d
             ):
@@ -213,6 +507,133 @@ class ArxivService:
             if pid in seen_ids:
                 continue
             seen_ids.add(pid)
-            papers.append(self._entry_to_paper(e))
+            paper = self._entry_to_paper(e)
+            # クエリに含められなかったカテゴリの指定はここで絞り込む（ID で指定した論文は除外しない）
+            if i >= len(id_entries) and not matches_categories(paper.category, categories):
+                get_tracer().incr("arxiv.category_filtered")
+                continue
+            papers.append(paper)
+
+        get_tracer().incr("arxiv.papers", len(papers))
+        return papers
+
+    def search_new_papers(
+        self,
+        keywords: List[str],
+        since: Optional[datetime],
+        known_ids: Iterable[str] = (),
+        max_results: int = 100,
+        page_size: int = 50,
+        categories: Optional[List[str]] = None,
+    ) -> List[Paper]:
+        """
+        since 以降に投稿された新着論文のみを取得する（ウォッチの差分検索）
+        - submittedDate の下限とカテゴリの指定をクエリに含め、古い論文・指定外の論文はダウンロードしない
+        - since があれば古い順にページングする（新着が max_results を超えた場合も、次回は残りの新しい論文から続けられる）
+        - since が無ければ（初回）新しい順に max_results 件を取得する
+
+        Args:
+            keywords (List[str]): 検索キーワード（arXiv ID は対象外）
+            since (Optional[datetime]): 処理済みの最新の投稿日時（None なら下限なし）
+            known_ids (Iterable[str]): 処理済みの論文ID（since と同じ日時の論文の除外に使う）
+            max_results (int): 最大取得数
+            page_size (int): 1リクエストあたりの取得数
+            categories (Optional[List[str]]): カテゴリの指定（ワイルドカード可）
+
+        Returns:
+            List[Paper]: 新着論文リスト（新しい順）
+        """
+        q = self.canonical_query(keywords, categories=categories)
+        if not q.terms:
+            return []
+        query = self._build_search_query(list(q.terms), since=since, categories=list(q.categories))
+        known = set(known_ids)
+
+        papers: List[Paper] = []
+        seen_ids: set[str] = set()
+        start = 0
+        while len(papers) < max_results:
+            size = min(page_size, max_results - len(papers))
+            entries = self._fetch_feed_entries(self._new_papers_params(query, since, start, size))
+            self._take_new_papers(entries, q, since, known, seen_ids, papers, max_results)
+            if len(entries) < size:
+                break
+            start += size
+        return self._sorted_new_papers(papers)
+
+    async def search_new_papers_async(
+        self,
+        keywords: List[str],
+        since: Optional[datetime],
+        known_ids: Iterable[str] = (),
+        max_results: int = 100,
+        page_size: int = 50,
+        categories: Optional[List[str]] = None,
+    ) -> List[Paper]:
+        """
+        since 以降に投稿された新着論文のみを取得する（search_new_papers の非同期版）
+        Returns:
+            List[Paper]: 新着論文リスト（新しい順）
+        """
+        q = self.canonical_query(keywords, categories=categories)
+        if not q.terms:
+            return []
+        query = self._build_search_query(list(q.terms), since=since, categories=list(q.categories))
+        known = set(known_ids)
+
+        papers: List[Paper] = []
+        seen_ids: set[str] = set()
+        start = 0
+        while len(papers) < max_results:
+            size = min(page_size, max_results - len(papers))
+            entries = await self._fetch_feed_entries_async(self._new_papers_params(query, since, start, size))
+            self._take_new_papers(entries, q, since, known, seen_ids, papers, max_results)
+            if len(entries) < size:
+                break
+            start += size
+        return self._sorted_new_papers(papers)
+
+    def _new_papers_params(self, query: str, since: Optional[datetime], start: int, size: int) -> dict:
+        """新着論文の1ページ分のクエリ（since があれば古い順、無ければ新しい順）"""
+        return {
+            "search_query": query,
+            "start": start,
+            "max_results": size,
+            "sortBy": "submittedDate",
+            "sortOrder": "descending" if since is None else "ascending",
+        }
+
+    def _take_new_papers(
+        self,
+        entries: list,
+        q: CanonicalQuery,
+        since: Optional[datetime],
+        known: Set[str],
+        seen_ids: Set[str],
+        papers: List[Paper],
+        max_results: int,
+    ):
+        """1ページ分の entries から処理済み・since より前・カテゴリ外の論文を除いて papers に追加する（max_results 件まで）"""
+        categories = list(q.categories)
+        for e in entries:
+            pid = e.get("id", "")
+            published_dt = self._parse_published(e)
+            if pid in known or pid in seen_ids:
+                continue
+            # クエリの下限は分単位のため、since より前の論文はここで除く
+            if since is not None and published_dt is not None and published_dt < since:
+                continue
+            seen_ids.add(pid)
+            paper = self._entry_to_paper(e)
+            if not matches_categories(paper.category, categories):
+                get_tracer().incr("arxiv.category_filtered")
+                continue
+            papers.append(paper)
+            if len(papers) >= max_results:
+                break
 
+    def _sorted_new_papers(self, papers: List[Paper]) -> List[Paper]:
+        """新着論文を新しい順に並べる"""
+        papers.sort(key=lambda p: p.published_date, reverse=True)
+        get_tracer().incr("arxiv.papers", len(papers))
         return papers
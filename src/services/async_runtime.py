@@ -0,0 +1,142 @@
+"""
+専用スレッドのイベントループで検索・翻訳・保存を実行する基盤
+
+同時実行数の上限について:
+- arXiv・翻訳・Notion への問い合わせは非同期のクライアント（httpx・genai.Client.aio・notion_client.AsyncClient）で
+  ループのスレッド上で待つため、数百件の問い合わせでもスレッドは1本のまま
+  （各 API の同時実行数は rate_limiter のリミッタで抑える）
+- run_blocking はローカルストア・ファイルの読み書き・パースなどディスク・CPU の処理をスレッドプールに逃がす用途に限る
+  （同時に実行できるのは max_blocking（既定 32）件まで）
+"""
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import functools
+import logging
+import threading
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """
+    専用スレッドでイベントループを回す非同期処理の実行基盤（GUI 非依存）
+    - コルーチンは submit でループに投入し、concurrent.futures.Future で結果・例外を受け取る
+    - グループ（"search" など）ごとにタスクを管理し、cancel_group でまとめてキャンセルする
+    - timeout を指定すると asyncio.wait_for で打ち切る（TimeoutError）
+    - ネットワークの待ちは非同期のクライアントで行い、ディスク・CPU の処理のみ run_blocking で
+      上限付きのスレッドプールに逃がしてループのスレッドを塞がない（同時実行数は max_blocking まで）
+    """
+
+    def __init__(self, name: str = "async-core", max_blocking: int = 32):
+        """
+        Args:
+            name (str): ループのスレッド名
+            max_blocking (int): run_blocking で同時に実行する同期処理の上限（プールのスレッド数）
+        """
+        self.name = name
+        self._loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=max_blocking, thread_name_prefix=f"{name}-io")
+        self._loop.set_default_executor(self._executor)
+        # グループ名 → 実行中のタスクの Future（Future.cancel でループ内のタスクもキャンセルされる）
+        self._groups: Dict[str, Set[Future]] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """イベントループ"""
+        return self._loop
+
+    def submit(
+        self,
+        coro: Awaitable[T],
+        group: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> "Future[T]":
+        """
+        コルーチンをループのスレッドで実行する（どのスレッドからでも呼べる）
+        Args:
+            coro (Awaitable[T]): 実行するコルーチン
+            group (Optional[str]): タスクのグループ（cancel_group でまとめてキャンセルする）
+            timeout (Optional[float]): 打ち切るまでの秒数（超えたら TimeoutError）
+        Returns:
+            Future[T]: 結果（キャンセル時は cancelled() が True）
+        """
+        fut = asyncio.run_coroutine_threadsafe(self._with_timeout(coro, timeout), self._loop)
+        if group is not None:
+            with self._lock:
+                self._groups.setdefault(group, set()).add(fut)
+            fut.add_done_callback(lambda f: self._forget(group, f))
+        return fut
+
+    @staticmethod
+    async def _with_timeout(coro: Awaitable[T], timeout: Optional[float]) -> T:
+        if timeout is not None:
+            return await asyncio.wait_for(coro, timeout)
+        return await coro
+
+    def _forget(self, group: str, fut: Future):
+        """完了したタスクをグループから外す"""
+        with self._lock:
+            self._groups.get(group, set()).discard(fut)
+
+    def cancel_group(self, group: str) -> int:
+        """
+        グループの実行中のタスクをキャンセルする（どのスレッドからでも呼べる）
+        Returns:
+            int: キャンセルしたタスク数
+        """
+        with self._lock:
+            futures = list(self._groups.get(group, ()))
+        return sum(1 for f in futures if f.cancel())
+
+    def running(self, group: str) -> int:
+        """グループの実行中のタスク数"""
+        with self._lock:
+            return len(self._groups.get(group, ()))
+
+    async def run_blocking(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        同期関数（ディスク・CPU の処理）をスレッドプールで実行して待つ（ループ内のコルーチンから呼ぶ）
+        プールのスレッドがすべて使用中なら空くまで待つ（同時実行数は max_blocking まで）
+        キャンセルされても実行中の呼び出しは止まらないため、長い処理には is_cancelled を渡して打ち切らせる
+        """
+        return await self._loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(
+        self,
+        timeout: Optional[float] = 5.0,
+        before_stop: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """
+        全タスクをキャンセルしてループを停止する
+        Args:
+            timeout (Optional[float]): タスクの終了・スレッドの停止を待つ秒数
+            before_stop (Optional[Callable[[], Awaitable[Any]]]): タスクの終了後、停止の前にループで実行する処理
+                （非同期のクライアントを閉じるなど）
+        """
+        if not self._loop.is_running():
+            return
+
+        async def _cancel_all():
+            tasks = [t for t in asyncio.all_tasks(self._loop) if t is not asyncio.current_task()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if before_stop is not None:
+                await before_stop()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_all(), self._loop).result(timeout)
+        except Exception:
+            logging.exception("%s: タスクの停止を待てませんでした", self.name)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+import json
+import logging
+import os
+import threading
+import time
+
+# 保持する区間の上限（常駐するサーバー・GUI で計測が増え続けないよう、古いものから破棄する）
+MAX_SPANS = 50_000
+
+
+@dataclass
+class Span:
+    """計測区間（開始時刻・所要時間は秒。seq は記録順の通し番号）"""
+    name: str
+    start: float
+    duration: float = 0.0
+    thread_id: int = 0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0
+
+
+@dataclass(frozen=True)
+class TraceMark:
+    """
+    計測の区切り（Tracer.mark）
+    集計・出力に渡すと、区切り以降に終了した区間とカウンタの増分のみを対象にする
+    （他の処理の計測を破棄せずに、1回分の実行を報告するため）
+    """
+    seq: int
+    counters: Dict[str, float]
+
+
+class Tracer:
+    """
+    パイプラインの軽量トレーサ
+    - span: 区間の所要時間（+任意属性: bytes, chars など）
+    - counter: 加算カウンタ（リトライ回数、キャッシュヒットなど）
+    - gauge: 最新値（同時実行数など）
+    スレッドセーフで、Chrome trace 形式（chrome://tracing, Perfetto）に出力できる。
+    1回分の実行の報告は mark で区切る（reset は他のスレッドで実行中の処理の計測も破棄する）
+    区間は直近の max_spans 件のみを保持する（破棄した件数はカウンタ tracer.dropped_spans）
+    """
+
+    def __init__(self, max_spans: int = MAX_SPANS):
+        """
+        Args:
+            max_spans (int): 保持する区間の上限
+        """
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._seq = 0
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+
+    def reset(self):
+        """計測結果を破棄して計測を開始し直す"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._spans.clear()
+            self._counters = {}
+            self._gauges = {}
+
+    def mark(self) -> TraceMark:
+        """
+        現在位置の区切りを返す（以降の区間・カウンタの増分のみを集計・出力するときに渡す）
+        Returns:
+            TraceMark: 区切り
+        """
+        with self._lock:
+            return TraceMark(seq=self._seq, counters=dict(self._counters))
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        区間を計測するコンテキストマネージャ
+        with 内で返り値の dict に属性を追加できる（例: attrs["bytes"] = 1024）
+        Args:
+            name (str): 区間名（例: "arxiv.fetch"）
+            **attrs: 区間の属性
+        """
+        span_attrs: Dict[str, Any] = dict(attrs)
+        start = time.perf_counter()
+        try:
+            yield span_attrs
+        except BaseException as e:
+            span_attrs["error"] = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._seq += 1
+                if len(self._spans) == self._spans.maxlen:
+                    self._counters["tracer.dropped_spans"] = self._counters.get("tracer.dropped_spans", 0) + 1
+                self._spans.append(
+                    Span(
+                        name=name,
+                        start=start - self._origin,
+                        duration=duration,
+                        thread_id=threading.get_ident(),
+                        attrs=span_attrs,
+                        seq=self._seq,
+                    )
+                )
+
+    def incr(self, name: str, value: float = 1):
+        """カウンタを加算する"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """ゲージ（最新値）を設定する"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def spans(self, since: Optional[TraceMark] = None) -> List[Span]:
+        """記録済みの区間一覧（コピー。since 指定時はそれ以降に終了した区間）"""
+        with self._lock:
+            if since is None:
+                return list(self._spans)
+            return [s for s in self._spans if s.seq > since.seq]
+
+    def counters(self, since: Optional[TraceMark] = None) -> Dict[str, float]:
+        """カウンタ一覧（コピー。since 指定時はそれ以降の増分。増えていないカウンタは除く）"""
+        with self._lock:
+            counters = dict(self._counters)
+        if since is None:
+            return counters
+        deltas = {name: value - since.counters.get(name, 0) for name, value in counters.items()}
+        return {name: value for name, value in deltas.items() if value}
+
+    def gauges(self) -> Dict[str, float]:
+        """ゲージ一覧（コピー）"""
+        with self._lock:
+            return dict(self._gauges)
+
+    def summary(self, since: Optional[TraceMark] = None) -> Dict[str, Dict[str, float]]:
+        """
+        区間名ごとの集計
+        Args:
+            since (Optional[TraceMark]): 指定時はそれ以降に終了した区間のみ
+        Returns:
+            Dict[str, Dict[str, float]]: {name: {count, total, mean, p50, p95, max}}（時間は秒）
+        """
+        grouped: Dict[str, List[float]] = {}
+        for s in self.spans(since):
+            grouped.setdefault(s.name, []).append(s.duration)
+        result: Dict[str, Dict[str, float]] = {}
+        for name, durations in grouped.items():
+            durations.sort()
+            n = len(durations)
+            total = sum(durations)
+            result[name] = {
+                "count": n,
+                "total": total,
+                "mean": total / n,
+                "p50": durations[(n - 1) // 2],
+                "p95": durations[min(n - 1, int(n * 0.95))],
+                "max": durations[-1],
+            }
+        return result
+
+    def format_summary(self, since: Optional[TraceMark] = None) -> str:
+        """ログ出力用の集計テキスト（since 指定時はそれ以降の区間・カウンタの増分）"""
+        lines = ["--- 計測サマリ ---"]
+        for name, st in sorted(self.summary(since).items(), key=lambda kv: -kv[1]["total"]):
+            lines.append(
+                f"{name}: n={int(st['count'])} total={st['total'] * 1000:.1f}ms "
+                f"mean={st['mean'] * 1000:.1f}ms p95={st['p95'] * 1000:.1f}ms max={st['max'] * 1000:.1f}ms"
+            )
+        for name, value in sorted(self.counters(since).items()):
+            lines.append(f"{name} = {value:g}")
+        for name, value in sorted(self.gauges().items()):
+            lines.append(f"{name} (gauge) = {value:g}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self, since: Optional[TraceMark] = None) -> Dict[str, Any]:
+        """
+        Chrome trace 形式の dict を生成（since 指定時はそれ以降の区間・カウンタの増分）
+        traceEvents 以外のキー（summary, counters, gauges）はビューアからは無視される
+        """
+        pid = os.getpid()
+        counters = self.counters(since)
+        events: List[Dict[str, Any]] = []
+        for s in self.spans(since):
+            events.append({
+                "name": s.name,
+                "cat": s.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": s.start * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {k: _jsonable(v) for k, v in s.attrs.items()},
+            })
+        end_ts = max((e["ts"] + e["dur"] for e in events), default=0.0)
+        for name, value in counters.items():
+            events.append({"name": name, "ph": "C", "ts": end_ts, "pid": pid, "args": {"value": value}})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "summary": self.summary(since),
+            "counters": counters,
+            "gauges": self.gauges(),
+        }
+
+    def export_chrome_trace(self, path: str, since: Optional[TraceMark] = None) -> str:
+        """
+        Chrome trace 形式の JSON ファイルを書き出す
+        Args:
+            path (str): 出力先パス
+            since (Optional[TraceMark]): 指定時はそれ以降の区間・カウンタの増分のみ
+        Returns:
+            str: 出力先パス
+        """
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(since), f, ensure_ascii=False)
+        return path
+
+    def report_run(self, run_name: str, since: Optional[TraceMark] = None) -> Optional[str]:
+        """
+        1回分の実行結果をログに出力し、PAPER_TO_NOTION_TRACE_DIR が設定されていればトレースを書き出す
+        Args:
+            run_name (str): 実行名（ファイル名に使用。例: "search"）
+            since (Optional[TraceMark]): 実行の開始時の区切り（指定時はそれ以降の計測のみ。省略時はすべて）
+        Returns:
+            Optional[str]: 書き出したファイルパス（未出力なら None）
+        """
+        logging.info("[%s]\n%s", run_name, self.format_summary(since))
+        trace_dir = os.getenv("PAPER_TO_NOTION_TRACE_DIR", "")
+        if not trace_dir:
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(trace_dir, f"trace-{run_name}-{stamp}.json")
+        try:
+            self.export_chrome_trace(path, since)
+            logging.info("トレースを出力しました: %s", path)
+            return path
+        except Exception:
+            logging.exception("トレースの出力に失敗しました")
+            return None
+
+
+def _jsonable(v: Any) -> Any:
+    """JSON 化できない値は文字列にする"""
+    if isinstance(v, (str, int, float, bool)) or v is None:
+        return v
+    return str(v)
+
+
+# アプリ全体で共有するトレーサ
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """共有トレーサを取得"""
+    return _tracer
@@ -0,0 +1,229 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+from dataclasses import dataclass
+import hashlib
+import logging
+import zlib
+
+import numpy as np
+
+from domain.models import Paper
+from services.instrumentation import get_tracer
+from services.paper_store import PaperStore
+from services.ranking_service import tokenize
+
+# MinHash のハッシュ関数 (a*x + b) mod P の法（メルセンヌ素数 2^31-1。a*x が uint64 に収まる）
+_PRIME = (1 << 31) - 1
+
+
+@dataclass
+class DuplicateConfig:
+    """
+    近似重複の判定設定
+    - threshold: 重複とみなす類似度（タイトル+abstract の語の連なりの Jaccard 係数の推定値）の下限
+    - num_perm: MinHash の署名の長さ
+    - bands: LSH のバンド数（num_perm を割り切ること。1バンドの行数は num_perm / bands）
+        既定の 25×4 行では類似度 0.6 の組を約97%、0.3 の組を約18%の確率で比較対象にする
+    - shingle_size: 何語の連なりを1単位として比較するか
+    - skip_saved: Notion に保存済み・保存待ちの論文の近似重複は保存キューに登録しない
+    """
+    threshold: float = 0.6
+    num_perm: int = 100
+    bands: int = 25
+    shingle_size: int = 3
+    skip_saved: bool = True
+
+
+@dataclass
+class DuplicateMatch:
+    """
+    近似重複の判定結果
+    - paper_id: 重複と判定した論文
+    - duplicate_of: 元とみなした論文（同じ一覧の先の論文、またはローカルストアの論文）
+    - similarity: 類似度の推定値
+    - in_batch: 元の論文が同じ一覧の中にあるか
+    """
+    paper_id: str
+    duplicate_of: str
+    similarity: float
+    in_batch: bool
+
+
+def paper_text(paper: Paper) -> str:
+    """重複の判定に使うテキスト（タイトル+abstract）"""
+    return f"{paper.title}\n{paper.abstract}"
+
+
+class MinHasher:
+    """語の連なり（shingle）の集合の MinHash 署名と、LSH のバンドのキーを計算する"""
+
+    def __init__(self, num_perm: int = 100, bands: int = 25, shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm}) は bands({bands}) で割り切れる必要があります")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # 署名の互換性のため係数は固定のシードから生成する（ストアの署名と比較する）
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> Set[str]:
+        """テキストを shingle_size 語の連なりの集合にする（語数が足りなければ全体を1つに）"""
+        tokens = tokenize(text)
+        k = self.shingle_size
+        if len(tokens) <= k:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash 署名
+        Args:
+            text (str): テキスト
+        Returns:
+            Optional[np.ndarray]: (num_perm,) の uint32 配列（語が無ければ None）
+        """
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        values = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return values.min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        """LSH のバンドごとのキー（バンド番号を含めてハッシュ化した符号付き64bit整数。SQLite の INTEGER に収まる）"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(4, "little")).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """2つの署名から Jaccard 係数を推定する（一致する要素の割合）"""
+        return float(np.count_nonzero(a == b)) / len(a)
+
+
+class NearDuplicateDetector:
+    """
+    タイトル+abstract の近似重複（別IDの版・改題・Notion に保存済みの同じ論文）を検出する
+    - 論文ごとの MinHash 署名と LSH のバンドのキーをローカルストアに保存する
+    - 判定時はバンドのキーが一致する論文（索引で検索）の署名とのみ比較する（ストアの件数によらない）
+    """
+
+    def __init__(self, store: PaperStore, config: Optional[DuplicateConfig] = None):
+        self.store = store
+        self.cfg = config or DuplicateConfig()
+        self.hasher = MinHasher(self.cfg.num_perm, self.cfg.bands, self.cfg.shingle_size)
+
+    def _decode(self, blob: bytes) -> Optional[np.ndarray]:
+        if len(blob) != self.cfg.num_perm * 4:
+            return None
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    def find(self, papers: Sequence[Paper]) -> List[DuplicateMatch]:
+        """
+        近似重複を判定する
+        同じ一覧の中では先の論文を元とし、それ以外はローカルストアの論文と比較する（同じIDの論文は除く）
+        Args:
+            papers (Sequence[Paper]): 論文リスト
+        Returns:
+            List[DuplicateMatch]: 重複と判定した論文（一覧の順。1件につき最も類似する1件）
+        """
+        tracer = get_tracer()
+        matches: List[DuplicateMatch] = []
+        # 一覧内の LSH（重複でない論文のみ。バンドのキー → 位置）
+        batch_buckets: Dict[int, List[int]] = {}
+        sigs: List[Optional[np.ndarray]] = []
+        with tracer.span("dedup.find", papers=len(papers)) as span:
+            for i, paper in enumerate(papers):
+                sig = self.hasher.signature(paper_text(paper))
+                sigs.append(sig)
+                if sig is None:
+                    continue
+                keys = self.hasher.band_keys(sig)
+                match = self._best_in_batch(paper, sig, keys, papers, sigs, batch_buckets)
+                if match is None:
+                    match = self._best_in_store(paper, sig, keys)
+                if match is not None:
+                    matches.append(match)
+                    continue
+                for key in keys:
+                    batch_buckets.setdefault(key, []).append(i)
+            span["duplicates"] = len(matches)
+        tracer.incr("dedup.in_batch", sum(1 for m in matches if m.in_batch))
+        tracer.incr("dedup.stored", sum(1 for m in matches if not m.in_batch))
+        return matches
+
+    def _best_in_batch(
+        self,
+        paper: Paper,
+        sig: np.ndarray,
+        keys: List[int],
+        papers: Sequence[Paper],
+        sigs: List[Optional[np.ndarray]],
+        buckets: Dict[int, List[int]],
+    ) -> Optional[DuplicateMatch]:
+        candidates = {j for key in keys for j in buckets.get(key, ())}
+        best: Optional[DuplicateMatch] = None
+        for j in sorted(candidates):
+            if papers[j].id == paper.id:
+                continue
+            sim = self.hasher.similarity(sig, sigs[j])
+            if sim >= self.cfg.threshold and (best is None or sim > best.similarity):
+                best = DuplicateMatch(paper.id, papers[j].id, sim, True)
+        return best
+
+    def _best_in_store(self, paper: Paper, sig: np.ndarray, keys: List[int]) -> Optional[DuplicateMatch]:
+        candidates = self.store.lsh_candidates(keys) - {paper.id}
+        if not candidates:
+            return None
+        best: Optional[DuplicateMatch] = None
+        for other_id, blob in self.store.get_signatures(candidates).items():
+            other = self._decode(blob)
+            if other is None:
+                continue
+            sim = self.hasher.similarity(sig, other)
+            if sim >= self.cfg.threshold and (best is None or sim > best.similarity):
+                best = DuplicateMatch(paper.id, other_id, sim, False)
+        return best
+
+    def index(self, papers: Iterable[Paper]) -> int:
+        """
+        論文の署名をローカルストアに登録する（以降の判定で比較対象になる）
+        Args:
+            papers (Iterable[Paper]): 論文リスト
+        Returns:
+            int: 登録した件数
+        """
+        items = []
+        for paper in papers:
+            sig = self.hasher.signature(paper_text(paper))
+            if sig is None:
+                # 語が無い論文も署名済みとして記録する（backfill で繰り返し対象にしない）
+                items.append((paper.id, b"", []))
+            else:
+                items.append((paper.id, sig.tobytes(), self.hasher.band_keys(sig)))
+        return self.store.put_signatures(items)
+
+    def backfill(self, batch_size: int = 2000) -> int:
+        """
+        署名の無い（スナップショットから取り込んだ・内容が更新された）ストアの論文を登録する
+        Args:
+            batch_size (int): 1度に処理する件数
+        Returns:
+            int: 登録した件数
+        """
+        total = 0
+        with get_tracer().span("dedup.backfill") as span:
+            while True:
+                papers = self.store.unsigned_papers(batch_size)
+                if not papers:
+                    break
+                total += self.index(papers)
+                logging.info("近似重複の索引を作成中: %d件", total)
+            span["papers"] = total
+        return total
@@ -0,0 +1,360 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from domain.models import Paper
+from services.instrumentation import get_tracer
+from services.notion_schema import NotionValidationError
+from services.profiling import profile_run
+from services.rate_limiter import TokenBucket
+
+# 保存先（論文ストアと同じディレクトリ）
+DEFAULT_OUTBOX_PATH = os.path.join("src", "data", "outbox.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    paper_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, next_attempt_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_open_paper ON jobs(paper_id) WHERE status IN ('pending', 'inflight');
+"""
+
+
+@dataclass
+class OutboxJob:
+    """保存ジョブ"""
+    id: int
+    paper: Paper
+    attempts: int
+
+
+class NotionOutbox:
+    """
+    Notion 保存ジョブの永続キュー（SQLite WAL）
+    - 状態は pending → inflight → done / failed（失敗は再試行回数まで pending に戻す）
+    - 同じ論文の未完了ジョブは1つだけ（二重登録は無視）
+    - 起動時、前回 inflight のまま終了したジョブは pending に戻す
+      （Notion 側で作成済みの可能性があるため、再送前に存在を確認する: attempts > 0）
+    """
+
+    def __init__(self, path: str = DEFAULT_OUTBOX_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            recovered = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', next_attempt_at = 0 WHERE status = 'inflight'"
+            ).rowcount
+            self._conn.commit()
+        if recovered:
+            logging.info("未完了のNotion保存ジョブを再開します: %d件", recovered)
+
+    def close(self):
+        """接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, papers: List[Paper]) -> int:
+        """
+        論文の保存ジョブを登録する（未完了のジョブがある論文は無視。失敗したジョブは新しいジョブに置き換える）
+        Args:
+            papers (List[Paper]): 保存する論文
+        Returns:
+            int: 登録したジョブ数
+        """
+        now = time.time()
+        # 本文はページに書き込まないため保存しない（要約・翻訳は含める）
+        rows = [
+            (p.id, p.model_dump_json(exclude={"full_text", "sections"}), now, now)
+            for p in papers
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM jobs WHERE paper_id = ? AND status = 'failed'", [(p.id,) for p in papers]
+            )
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (paper_id, payload, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def claim(self) -> Optional[OutboxJob]:
+        """
+        実行可能な最も古いジョブを inflight にして取り出す（無ければ None）
+        Returns:
+            Optional[OutboxJob]: ジョブ
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'inflight', attempts = attempts + 1, updated_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT 1) "
+                "RETURNING id, payload, attempts",
+                (now, now),
+            ).fetchone()
+            self._conn.commit()
+        if row is None:
+            return None
+        return OutboxJob(id=row[0], paper=Paper.model_validate_json(row[1]), attempts=row[2])
+
+    def mark_done(self, job_id: int):
+        """ジョブを完了にする"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', last_error = '', updated_at = ? WHERE id = ?",
+                (time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def mark_failed(self, job_id: int, error: str, retry_at: Optional[float] = None):
+        """
+        ジョブの失敗を記録する
+        Args:
+            job_id (int): ジョブID
+            error (str): エラー内容
+            retry_at (Optional[float]): 再試行する時刻（None なら再試行しない）
+        """
+        status = "pending" if retry_at is not None else "failed"
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, last_error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                (status, error, retry_at or 0, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def retry_failed(self) -> int:
+        """失敗したジョブ（同じ論文の未完了ジョブが無いもの）を再試行対象に戻す"""
+        with self._lock:
+            n = self._conn.execute(
+                "UPDATE OR IGNORE jobs SET status = 'pending', next_attempt_at = 0 WHERE status = 'failed'"
+            ).rowcount
+            self._conn.commit()
+        return n
+
+    def counts(self) -> Dict[str, int]:
+        """状態ごとのジョブ数"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def latest_status(self, paper_ids: List[str]) -> Dict[str, str]:
+        """
+        論文ごとの最新のジョブの状態
+        Args:
+            paper_ids (List[str]): 論文ID
+        Returns:
+            Dict[str, str]: {論文ID: 状態}（ジョブの無い論文は含まない）
+        """
+        if not paper_ids:
+            return {}
+        placeholders = ",".join("?" * len(paper_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT paper_id, status FROM jobs WHERE id IN "
+                f"(SELECT MAX(id) FROM jobs WHERE paper_id IN ({placeholders}) GROUP BY paper_id)",
+                list(paper_ids),
+            ).fetchall()
+        return dict(rows)
+
+    def has_ready(self) -> bool:
+        """すぐに実行できるジョブがあるか"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM jobs WHERE status = 'pending' AND next_attempt_at <= ? LIMIT 1", (time.time(),)
+            ).fetchone()
+        return row is not None
+
+    def next_attempt_in(self) -> Optional[float]:
+        """次に実行できるジョブまでの秒数（pending が無ければ None）"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_attempt_at) FROM jobs WHERE status = 'pending'").fetchone()
+        if row is None or row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+
+class OutboxWorker:
+    """
+    NotionOutbox のジョブを順に Notion へ保存するワーカー（バックグラウンドスレッド）
+    - 複数のジョブを並行して処理し、リクエストはトークンバケットでレート制限（Notion API の平均 3 リクエスト/秒に合わせる）
+    - 再送時は URL で作成済みのページを確認し、二重作成を防ぐ
+    - 失敗時は指数バックオフで max_attempts 回まで再試行する
+    """
+
+    def __init__(
+        self,
+        outbox: NotionOutbox,
+        get_notion_service: Callable[[], object],
+        rate_per_sec: float = 3.0,
+        max_attempts: int = 5,
+        backoff: float = 2.0,
+        on_change: Optional[Callable[[], None]] = None,
+        max_concurrency: int = 3,
+    ):
+        """
+        Args:
+            outbox (NotionOutbox): ジョブのキュー
+            get_notion_service (Callable[[], NotionService]): Notion サービスを返す関数（未設定なら例外）
+            rate_per_sec (float): 1秒あたりの最大保存数
+            max_attempts (int): 1ジョブの最大試行回数
+            backoff (float): 再試行間隔の基準（秒。試行ごとに2倍）
+            on_change (Optional[Callable[[], None]]): ジョブの状態が変わったときに呼ぶ関数（ワーカースレッドで実行）
+            max_concurrency (int): 同時に処理するジョブ数の上限
+        """
+        self.outbox = outbox
+        self.get_notion_service = get_notion_service
+        self.limiter = TokenBucket(rate_per_sec, burst=max(1, int(rate_per_sec)))
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.on_change = on_change
+        self.max_concurrency = max_concurrency
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """ワーカースレッドを開始（起動済みなら何もしない）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="notion-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """ワーカースレッドを停止（処理中のジョブは完了を待つ）"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self):
+        """ジョブの登録をワーカーに知らせる"""
+        self._wakeup.set()
+
+    def _notify_change(self):
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception:
+                logging.exception("保存状態の通知に失敗しました")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                mark = get_tracer().mark()
+                if self.drain(stop=self._stop):
+                    get_tracer().report_run("save", since=mark)
+                delay = self.outbox.next_attempt_in()
+            except Exception:
+                # Notion の設定不備など。次の登録（または1分後）まで待つ
+                logging.exception("Notion保存ジョブの処理を中断しました")
+                delay = None
+            self._wakeup.wait(60 if delay is None else max(delay, 0.05))
+
+    def drain(self, stop: Optional[threading.Event] = None) -> int:
+        """
+        実行可能なジョブが無くなるまで処理する（CLI・テストでは同期的に呼ぶ）
+        Args:
+            stop (Optional[threading.Event]): 停止要求
+        Returns:
+            int: 処理したジョブ数
+        """
+        # ジョブがあるときだけ Notion サービスを生成（未設定なら例外）
+        if not self.outbox.has_ready():
+            return 0
+        with profile_run("save"):
+            return self._drain_ready(stop)
+
+    def _drain_ready(self, stop: Optional[threading.Event]) -> int:
+        notion_service = self.get_notion_service()
+        processed = 0
+        lock = threading.Lock()
+
+        def _run():
+            nonlocal processed
+            while stop is None or not stop.is_set():
+                job = self.outbox.claim()
+                if job is None:
+                    break
+                self._process(notion_service, job)
+                with lock:
+                    processed += 1
+                self._notify_change()
+
+        # 実際の同時リクエスト数は NotionService の制限器が流量制限に応じて調整する
+        if self.max_concurrency <= 1:
+            _run()
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="notion-outbox") as pool:
+                for fut in [pool.submit(_run) for _ in range(self.max_concurrency)]:
+                    fut.result()
+        return processed
+
+    def _process(self, notion_service, job: OutboxJob):
+        """1件のジョブを処理する"""
+        try:
+            self._send(notion_service, job)
+        except NotionValidationError as e:
+            # 設定・スキーマの不一致は再試行しても成功しないため、すぐに失敗とする
+            logging.error("Notionに保存できない論文です（%s）: %s", e, job.paper.id)
+            self.outbox.mark_failed(job.id, str(e))
+            get_tracer().incr("outbox.invalid")
+
+    def _send(self, notion_service, job: OutboxJob):
+        tracer = get_tracer()
+        paper = job.paper
+        # 再送時は作成済みか確認（前回、作成後・完了記録前に終了した場合）
+        if job.attempts > 1:
+            self.limiter.acquire()
+            try:
+                if notion_service.find_page(paper):
+                    logging.info("Notionに作成済みのため完了扱いにします: %s", paper.id)
+                    tracer.incr("outbox.already_created")
+                    self.outbox.mark_done(job.id)
+                    return
+            except NotionValidationError:
+                raise
+            except Exception:
+                logging.exception("Notionの既存ページの確認に失敗しました: %s", paper.id)
+                self._fail(job, "既存ページの確認に失敗")
+                return
+
+        self.limiter.acquire()
+        if notion_service.create_page(paper):
+            self.outbox.mark_done(job.id)
+            tracer.incr("outbox.done")
+        else:
+            self._fail(job, "ページの作成に失敗")
+
+    def _fail(self, job: OutboxJob, error: str):
+        """失敗を記録（試行回数が残っていればバックオフして再試行）"""
+        tracer = get_tracer()
+        if job.attempts < self.max_attempts:
+            delay = self.backoff * (2 ** (job.attempts - 1))
+            self.outbox.mark_failed(job.id, error, retry_at=time.time() + delay)
+            tracer.incr("outbox.retried")
+        else:
+            logging.error("Notion保存を諦めました（%d回失敗）: %s", job.attempts, job.paper.id)
+            self.outbox.mark_failed(job.id, error)
+            tracer.incr("outbox.failed")
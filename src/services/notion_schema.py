@@ -0,0 +1,226 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import re
+import threading
+import time
+
+from domain.models import NotionDatabase, Paper
+from services.arxiv_service import matches_categories
+from services.instrumentation import get_tracer
+from services.single_flight import SingleFlight
+
+# 保存先の設定（無ければ環境変数 NOTION_DATABASE_ID の1つ）
+DEFAULT_DATABASES_PATH = os.path.join("src", "config", "notion_databases.json")
+# 環境変数から作る保存先の名前
+DEFAULT_DATABASE_NAME = "default"
+# Notion API の上限（rich_text 1要素の文字数、rich_text の要素数、select の選択肢名の文字数）
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+MAX_OPTION_LENGTH = 100
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+class NotionValidationError(ValueError):
+    """保存先・プロパティの設定がデータベースのスキーマと合わないことを送信前に検出した（再試行しても成功しない）"""
+    pass
+
+
+def load_databases(path: str = DEFAULT_DATABASES_PATH) -> Tuple[List[NotionDatabase], Optional[str]]:
+    """
+    保存先の設定を読み込む
+    {"default": "論文", "databases": [{"name": "論文", "database_id": "...", "keywords": [...], ...}]}
+    Args:
+        path (str): 設定ファイル
+    Returns:
+        Tuple[List[NotionDatabase], Optional[str]]: (保存先のリスト, 既定の保存先の名前)。ファイルが無ければ ([], None)
+    """
+    if not os.path.exists(path):
+        return [], None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [NotionDatabase(**d) for d in data.get("databases", [])], data.get("default")
+
+
+class NotionRouter:
+    """
+    論文を保存するデータベースを決める
+    1. 論文に保存先の名前（Paper.notion_database）があればそのデータベース
+    2. keywords / categories の規則に一致する最初のデータベース
+    3. 既定のデータベース
+    """
+
+    def __init__(self, databases: List[NotionDatabase], default: Optional[str] = None):
+        """
+        Args:
+            databases (List[NotionDatabase]): 保存先（1つ以上）
+            default (Optional[str]): 既定の保存先の名前（省略時は先頭）
+        """
+        if not databases:
+            raise ValueError("Notionの保存先がありません")
+        self.databases = list(databases)
+        self._by_name = {db.name: db for db in self.databases}
+        self.default = self._by_name.get(default or "", self.databases[0])
+
+    def names(self) -> List[str]:
+        """保存先の名前"""
+        return [db.name for db in self.databases]
+
+    def get(self, name: str) -> NotionDatabase:
+        """名前で保存先を取得（無ければ NotionValidationError）"""
+        db = self._by_name.get(name)
+        if db is None:
+            raise NotionValidationError(f"Notionの保存先「{name}」が設定されていません（設定: {', '.join(self.names())}）")
+        return db
+
+    def route(self, paper: Paper) -> NotionDatabase:
+        """
+        論文の保存先を決める
+        Args:
+            paper (Paper): 論文
+        Returns:
+            NotionDatabase: 保存先
+        """
+        if paper.notion_database:
+            return self.get(paper.notion_database)
+        text = f"{paper.title}\n{paper.abstract}".lower()
+        for db in self.databases:
+            if db.keywords and any(k.lower() in text for k in db.keywords if k):
+                return db
+            if db.categories and matches_categories(paper.category, db.categories):
+                return db
+        return self.default
+
+
+class SchemaCache:
+    """
+    データベースのスキーマ（プロパティ名 → 定義）のキャッシュ（有効期限付き、スレッドセーフ）
+    - 期限切れ・未取得のデータベースのみ取得する（同時に取得が必要になっても1回だけ）
+    - 送信した内容がスキーマと合わず失敗した場合は invalidate して次回取得し直す
+    """
+
+    def __init__(self, fetch: Callable[[str], dict], ttl: float = 600.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            fetch (Callable[[str], dict]): データベースIDから databases.retrieve の結果を返す関数
+            ttl (float): 有効期限（秒）
+            clock (Callable[[], float]): 時刻（テスト用）
+        """
+        self._fetch = fetch
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+        self._flight = SingleFlight("notion.schema")
+
+    def get(self, database_id: str) -> Dict[str, dict]:
+        """
+        スキーマを取得する（有効期限内ならキャッシュから）
+        Args:
+            database_id (str): データベースID
+        Returns:
+            Dict[str, dict]: プロパティ名 → 定義（"type" と型ごとの設定）
+        """
+        tracer = get_tracer()
+        with self._lock:
+            entry = self._entries.get(database_id)
+            if entry is not None and self._clock() - entry[0] < self.ttl:
+                tracer.incr("notion.schema_hit")
+                return entry[1]
+        tracer.incr("notion.schema_miss")
+        properties = self._flight.do(database_id, self._load, database_id)
+        return properties
+
+    def _load(self, database_id: str) -> Dict[str, dict]:
+        with get_tracer().span("notion.retrieve_schema"):
+            properties = dict(self._fetch(database_id).get("properties") or {})
+        with self._lock:
+            self._entries[database_id] = (self._clock(), properties)
+        return properties
+
+    def invalidate(self, database_id: str):
+        """キャッシュを破棄する（次回取得し直す）"""
+        with self._lock:
+            self._entries.pop(database_id, None)
+
+
+def _paper_fields(paper: Paper, status: str) -> Dict[str, Tuple[str, List[str]]]:
+    """論文の項目ごとの (文字列の値, 複数選択用の値)"""
+    categories = [c.strip() for c in (paper.category or "").split(",") if c.strip()]
+    return {
+        "title": (paper.title, [paper.title]),
+        "status": (status, [status]),
+        "authors": (", ".join(paper.authors), list(paper.authors)),
+        "published": (str(paper.published_date), [str(paper.published_date)]),
+        "url": (paper.url, [paper.url]),
+        "category": (", ".join(categories), categories),
+    }
+
+
+def _rich_text(text: str) -> List[dict]:
+    chunks = [text[i:i + MAX_TEXT_LENGTH] for i in range(0, len(text), MAX_TEXT_LENGTH)][:MAX_RICH_TEXT_ITEMS]
+    return [{"text": {"content": c}} for c in chunks]
+
+
+def _option(name: str) -> dict:
+    # 選択肢の名前にカンマは使えない
+    return {"name": name.replace(",", " ").strip()[:MAX_OPTION_LENGTH]}
+
+
+def _property_value(db: NotionDatabase, field: str, prop_name: str, spec: dict, value: Tuple[str, List[str]]) -> dict:
+    """項目の値をプロパティの型に合わせた形式にする（合わなければ NotionValidationError）"""
+    text, items = value
+    kind = spec.get("type")
+    if kind == "title":
+        return {"title": _rich_text(text)}
+    if kind == "rich_text":
+        return {"rich_text": _rich_text(text)}
+    if kind == "url":
+        return {"url": text or None}
+    if kind == "select":
+        return {"select": _option(items[0]) if items and items[0] else None}
+    if kind == "multi_select":
+        return {"multi_select": [_option(i) for i in items if i]}
+    if kind == "date":
+        if not _DATE_RE.match(text):
+            raise NotionValidationError(f"{db.name}: 「{prop_name}」（日付）に {field} の値 {text!r} を書き込めません")
+        return {"date": {"start": text[:10]}}
+    if kind == "status":
+        options = [o.get("name") for o in (spec.get("status") or {}).get("options") or []]
+        if text not in options:
+            raise NotionValidationError(
+                f"{db.name}: 「{prop_name}」（ステータス）に選択肢「{text}」がありません（選択肢: {', '.join(options)}）"
+            )
+        return {"status": {"name": text}}
+    raise NotionValidationError(f"{db.name}: 「{prop_name}」の型 {kind} には {field} を書き込めません")
+
+
+def build_properties(paper: Paper, db: NotionDatabase, schema: Dict[str, dict], status: str) -> dict:
+    """
+    論文をデータベースのプロパティに対応付け、スキーマと照合する（送信前に検出できる誤りは NotionValidationError）
+    Args:
+        paper (Paper): 論文
+        db (NotionDatabase): 保存先
+        schema (Dict[str, dict]): 保存先のスキーマ（SchemaCache.get）
+        status (str): 読書状況の初期値
+    Returns:
+        dict: pages.create の properties
+    """
+    if not db.properties.get("title"):
+        raise NotionValidationError(f"{db.name}: タイトルのプロパティが設定されていません")
+    fields = _paper_fields(paper, status)
+    properties = {}
+    for field, prop_name in db.properties.items():
+        if not prop_name:
+            continue
+        if field not in fields:
+            raise NotionValidationError(f"{db.name}: 未対応の項目「{field}」が設定されています（{', '.join(fields)}）")
+        spec = schema.get(prop_name)
+        if spec is None:
+            raise NotionValidationError(f"{db.name}: プロパティ「{prop_name}」がデータベースにありません（{field}）")
+        if (field == "title") != (spec.get("type") == "title"):
+            raise NotionValidationError(f"{db.name}: タイトルのプロパティは「{prop_name}」ではありません")
+        properties[prop_name] = _property_value(db, field, prop_name, spec, fields[field])
+    return properties
@@ -1,40 +1,338 @@
 import os
-from notion_client import Client
+import re
+import logging
+from typing import AsyncIterator, Iterator, List, Optional
+from notion_client import AsyncClient, Client
 
-from domain.models import Paper
+from domain.models import DEFAULT_NOTION_PROPERTIES, NotionDatabase, Paper
+from services.instrumentation import get_tracer
+from services.notion_schema import (
+    DEFAULT_DATABASE_NAME,
+    MAX_TEXT_LENGTH,
+    NotionRouter,
+    NotionValidationError,
+    SchemaCache,
+    build_properties,
+    load_databases,
+)
+from services.rate_limiter import AimdLimiter
+
+# Notion API の上限（1リクエストあたりの子ブロック数）
+MAX_BLOCKS_PER_REQUEST = 100
+
+# 読書状況（既定のプロパティ名は Progress）
+STATUS_PROPERTY = DEFAULT_NOTION_PROPERTIES["status"]
+STATUS_UNREAD = "未読"
+STATUS_IN_PROGRESS = "途中"
+STATUS_READ = "読了"
+
+_SENTENCE_END_RE = re.compile(r"(?<=[。．.!?！？])\s*")
+
+
+def split_text(text: str, limit: int = MAX_TEXT_LENGTH) -> List[str]:
+    """
+    テキストを limit 文字以内の断片に分割する（なるべく文の区切りで分割）
+    Args:
+        text (str): テキスト
+        limit (int): 1断片の最大文字数
+    Returns:
+        List[str]: 断片のリスト（空文字なら空リスト）
+    """
+    text = text.strip()
+    chunks: List[str] = []
+    while len(text) > limit:
+        head = text[:limit]
+        # 後半にある最後の文末で切る（無ければ空白、それも無ければ limit で切る）
+        cut = max((m.end() for m in _SENTENCE_END_RE.finditer(head) if m.end() > limit // 2), default=0)
+        if not cut:
+            cut = head.rfind(" ", limit // 2) + 1 or limit
+        chunks.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def _heading(text: str) -> dict:
+    """見出しブロック"""
+    return {"object": "block", "type": "heading_2", "heading_2": {"rich_text": [{"type": "text", "text": {"content": text}}]}}
+
+
+def _paragraphs(text: str) -> List[dict]:
+    """段落ごと・上限文字数ごとに分割した段落ブロック"""
+    blocks = []
+    for para in re.split(r"\n\s*\n", text or ""):
+        # 段落内の改行（フィードの折り返し）は空白にまとめる
+        para = " ".join(para.split()) if para.isascii() else para.strip()
+        for chunk in split_text(para):
+            blocks.append({
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {"rich_text": [{"type": "text", "text": {"content": chunk}}]},
+            })
+    return blocks
+
+
+def build_blocks(paper: Paper) -> List[dict]:
+    """
+    ページ本文のブロック（本文の要約・abstract の翻訳・abstract 原文）
+    Args:
+        paper (Paper): 論文
+    Returns:
+        List[dict]: ブロックのリスト
+    """
+    blocks: List[dict] = []
+    for title, text in (
+        ("本文の要約", paper.summary_ja),
+        ("Abstract（日本語）", paper.abstract_ja),
+        ("Abstract", paper.abstract),
+    ):
+        body = _paragraphs(text)
+        if body:
+            blocks.append(_heading(title))
+            blocks.extend(body)
+    return blocks
+
+
+def page_reading_status(page: dict, db: NotionDatabase | None = None) -> tuple[str, str, str] | None:
+    """
+    データベースのページから (URL, 読書状況, 最終編集日時) を取り出す
+    Args:
+        page (dict): databases.query の結果のページ
+        db (NotionDatabase | None): ページのデータベース（プロパティ名の対応。省略時は既定のプロパティ名）
+    Returns:
+        tuple[str, str, str] | None: URL の無いページは None（状況が未設定なら空文字）
+    """
+    names = db.properties if db is not None else DEFAULT_NOTION_PROPERTIES
+    props = page.get("properties") or {}
+    url = (props.get(names.get("url") or "") or {}).get("url")
+    if not url:
+        return None
+    # ステータス型・セレクト型のどちらのプロパティでも読めるようにする
+    prop = props.get(names.get("status") or "") or {}
+    status = (prop.get("status") or prop.get("select") or {}).get("name") or ""
+    return url, status, page.get("last_edited_time", "")
 
 
 class NotionService:
-    def __init__(self):
-        api_key = os.getenv("NOTION_API_KEY", "")
-        database_id = os.getenv("NOTION_DATABASE_ID", "")
-        # 必須チェック（未設定だと 401 になりやすいので明示）
-        if not api_key or not database_id:
-            raise EnvironmentError("NOTION_API_KEY または NOTION_DATABASE_ID が未設定です。")
+    """
+    Notion のデータベースへの保存・読書状況の取得
+    - 同期の呼び出しは client、*_async の呼び出しは async_client で送信し、同時実行数の上限（limiter）は共有する
+    """
+
+    def __init__(
+        self,
+        client=None,
+        database_id: str | None = None,
+        max_concurrency: int = 3,
+        retry_base_delay: float = 1.0,
+        databases: Optional[List[NotionDatabase]] = None,
+        default_database: str | None = None,
+        schema_ttl: float = 600.0,
+        async_client=None,
+    ):
+        """
+        保存先は databases、database_id、src/config/notion_databases.json、NOTION_DATABASE_ID の順に決める
+        Args:
+            client: notion_client.Client 互換のクライアント（テスト・ベンチマーク用。省略時は NOTION_API_KEY から生成）
+            database_id (str | None): 保存先DBのID（省略時は NOTION_DATABASE_ID）
+            max_concurrency (int): 同時リクエスト数の上限（流量制限（429）に応じて 1 まで自動で下げる）
+            retry_base_delay (float): 流量制限時の再送待ちの基準の秒数
+            databases (Optional[List[NotionDatabase]]): 保存先（複数）と振り分けの規則
+            default_database (str | None): 規則に一致しない論文の保存先の名前（省略時は先頭）
+            schema_ttl (float): データベースのスキーマのキャッシュの有効期限（秒）
+            async_client: notion_client.AsyncClient 互換のクライアント
+                （*_async で使用。client も省略した場合は NOTION_API_KEY から生成。無ければ *_async は EnvironmentError）
+        """
+        if not databases:
+            if not database_id:
+                databases, default_database = load_databases()
+            database_id = database_id or os.getenv("NOTION_DATABASE_ID", "")
+            if not databases and database_id:
+                databases = [NotionDatabase(name=DEFAULT_DATABASE_NAME, database_id=database_id)]
+        owns_async_client = False
+        if client is None:
+            api_key = os.getenv("NOTION_API_KEY", "")
+            # 必須チェック（未設定だと 401 になりやすいので明示）
+            if not api_key or not databases:
+                raise EnvironmentError("NOTION_API_KEY または NOTION_DATABASE_ID が未設定です。")
+
+            # Notion-Version を 2022-06-28 に固定（ユーザーの正常動作例に合わせる）
+            client = Client(auth=api_key, notion_version="2022-06-28")
+            if async_client is None:
+                async_client = AsyncClient(auth=api_key, notion_version="2022-06-28")
+                owns_async_client = True
+        if not databases:
+            raise EnvironmentError("NOTION_DATABASE_ID が未設定です。")
+        self.client = client
+        self.async_client = async_client
+        self._owns_async_client = owns_async_client
+        self.router = NotionRouter(databases, default_database)
+        self.database_id = self.router.default.database_id
+        self.schemas = SchemaCache(self._retrieve_database, ttl=schema_ttl)
+        self.limiter = AimdLimiter("notion", initial=1, max_limit=max_concurrency)
+        self.retry_base_delay = retry_base_delay
+
+    def _call(self, fn, **kwargs):
+        """流量制限に応じて同時実行数を調整し、制限時はバックオフして再送する"""
+        return self.limiter.call(fn, base_delay=self.retry_base_delay, **kwargs)
+
+    async def _call_async(self, fn, **kwargs):
+        """_call の非同期版（バックオフ中もイベントループを塞がない）"""
+        return await self.limiter.call_async(fn, base_delay=self.retry_base_delay, **kwargs)
+
+    def _get_async_client(self):
+        """非同期のクライアントを取得（無ければ EnvironmentError）"""
+        if self.async_client is None:
+            raise EnvironmentError("非同期の Notion クライアントが設定されていません。")
+        return self.async_client
+
+    async def aclose(self):
+        """生成した非同期のクライアントの接続を閉じる（渡されたクライアントは閉じない）"""
+        if self._owns_async_client and self.async_client is not None:
+            await self.async_client.aclose()
+
+    def _retrieve_database(self, database_id: str) -> dict:
+        return self._call(self.client.databases.retrieve, database_id=database_id)
 
-        # Notion-Version を 2022-06-28 に固定（ユーザーの正常動作例に合わせる）
-        self.client = Client(auth=api_key, notion_version="2022-06-28")
-        self.database_id = database_id
+    def database_names(self) -> List[str]:
+        """保存先のデータベースの名前"""
+        return self.router.names()
 
     def create_page(self, paper: Paper) -> bool:
         """
         Notionに論文を保存する
+        保存先のデータベースを振り分け、キャッシュしたスキーマでプロパティを照合してから送信する
+        本文（要約・翻訳・abstract）のブロックは作成リクエストに含め、
+        100ブロックを超える分は blocks.children.append で100件ずつ追加する
         Args:
             paper (Paper): 保存する論文オブジェクト
         Returns:
             bool: 保存に成功したかどうか
+        Raises:
+            NotionValidationError: 保存先・プロパティがスキーマと合わない（送信しない。再試行しても成功しない）
         """
+        tracer = get_tracer()
+        db = self.router.route(paper)
         try:
-            self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties={
-                    "名前": {"title": [{"text": {"content": paper.title}}]},
-                    "Progress": {"status": {"name": "未読"}},
-                    "Authors": {"rich_text": [{"text": {"content": ", ".join(paper.authors)}}]},
-                    "Time": {"rich_text": [{"text": {"content": str(paper.published_date)}}]},
-                    "URL": {"url": paper.url},
-                },
-            )
-            return True
+            schema = self.schemas.get(db.database_id)
         except Exception:
+            logging.exception("Notionのデータベースのスキーマの取得に失敗しました: %s", db.name)
+            tracer.incr("notion.failed")
+            return False
+        try:
+            properties = build_properties(paper, db, schema, STATUS_UNREAD)
+        except NotionValidationError:
+            tracer.incr("notion.invalid")
+            raise
+        blocks = build_blocks(paper)
+        try:
+            with tracer.span("notion.create_page", blocks=len(blocks), database=db.name):
+                page = self._call(
+                    self.client.pages.create,
+                    parent={"database_id": db.database_id},
+                    properties=properties,
+                    children=blocks[:MAX_BLOCKS_PER_REQUEST],
+                )
+            tracer.incr("notion.pages_created")
+        except Exception as e:
+            logging.exception("Notionへの保存に失敗しました: %s", paper.id)
+            tracer.incr("notion.failed")
+            if getattr(e, "status", None) == 400:
+                # スキーマが変更された可能性があるため、次回は取得し直す
+                self.schemas.invalidate(db.database_id)
             return False
+
+        # ページは作成済みのため、追加に失敗しても保存は成功として扱う（ログに残す）
+        try:
+            for start in range(MAX_BLOCKS_PER_REQUEST, len(blocks), MAX_BLOCKS_PER_REQUEST):
+                with tracer.span("notion.append_blocks"):
+                    self._call(
+                        self.client.blocks.children.append,
+                        block_id=page["id"],
+                        children=blocks[start:start + MAX_BLOCKS_PER_REQUEST],
+                    )
+        except Exception:
+            logging.exception("Notionページへの本文の追加に失敗しました: %s", paper.id)
+            tracer.incr("notion.append_failed")
+        return True
+
+    def find_page(self, paper: Paper) -> str | None:
+        """
+        保存先のデータベースで URL が一致するページを探す（保存の再送時に二重作成を防ぐため）
+        Args:
+            paper (Paper): 論文
+        Returns:
+            str | None: ページID（無ければ None。URL のプロパティが無いデータベースも None）
+        Raises:
+            NotionValidationError: 論文の保存先が設定されていない
+        """
+        db = self.router.route(paper)
+        url_property = db.properties.get("url")
+        if not url_property:
+            return None
+        with get_tracer().span("notion.find_page", database=db.name):
+            res = self._call(
+                self.client.databases.query,
+                database_id=db.database_id,
+                filter={"property": url_property, "url": {"equals": paper.url}},
+                page_size=1,
+            )
+        results = res.get("results") or []
+        return results[0]["id"] if results else None
+
+    def query_changes(
+        self, since: str | None = None, page_size: int = 100, database_id: str | None = None
+    ) -> Iterator[dict]:
+        """
+        最終編集日時が since 以降のページを、編集の古い順に返す（next_cursor で自動的にページングする）
+        Notion の最終編集日時は分単位のため、since と同じ分に編集されたページも含める
+        Args:
+            since (str | None): 最終編集日時の下限（ISO 形式。None なら全ページ）
+            page_size (int): 1リクエストで取得するページ数（最大100）
+            database_id (str | None): データベースID（省略時は既定の保存先）
+        Returns:
+            Iterator[dict]: ページ
+        """
+        params = self._changes_params(since, page_size, database_id)
+        cursor = None
+        while True:
+            with get_tracer().span("notion.query_changes"):
+                res = self._call(self.client.databases.query, **params, **({"start_cursor": cursor} if cursor else {}))
+            yield from res.get("results") or []
+            cursor = res.get("next_cursor")
+            if not res.get("has_more") or not cursor:
+                break
+
+    async def query_changes_async(
+        self, since: str | None = None, page_size: int = 100, database_id: str | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        最終編集日時が since 以降のページを、編集の古い順に返す（query_changes の非同期版）
+        Returns:
+            AsyncIterator[dict]: ページ
+        Raises:
+            EnvironmentError: 非同期のクライアントが無い
+        """
+        client = self._get_async_client()
+        params = self._changes_params(since, page_size, database_id)
+        cursor = None
+        while True:
+            with get_tracer().span("notion.query_changes"):
+                res = await self._call_async(client.databases.query, **params, **({"start_cursor": cursor} if cursor else {}))
+            for page in res.get("results") or []:
+                yield page
+            cursor = res.get("next_cursor")
+            if not res.get("has_more") or not cursor:
+                break
+
+    def _changes_params(self, since: str | None, page_size: int, database_id: str | None) -> dict:
+        """最終編集日時が since 以降のページを編集の古い順に取得するクエリ"""
+        params = {
+            "database_id": database_id or self.database_id,
+            "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+            "page_size": page_size,
+        }
+        if since:
+            params["filter"] = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}
+        return params
@@ -0,0 +1,131 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import asyncio
+import re
+
+from domain.models import NotionDatabase, Paper
+from services.instrumentation import get_tracer
+from services.notion_service import NotionService, page_reading_status
+from services.paper_store import PaperStore
+
+# sync_state に記録する差分取り込みの位置の名前（データベースIDを付ける）
+_CURSOR_NAME = "notion_reading_status"
+
+_ARXIV_URL_RE = re.compile(r"arxiv\.org/(?:abs|pdf|html)/([^\s?#]+?)(?:v\d+)?(?:\.pdf)?/?$", re.IGNORECASE)
+_ARXIV_ID_RE = re.compile(r"(\d{4}\.\d{4,5}|[a-zA-Z\-\.]+/\d{7})(?:v\d+)?")
+
+
+def reading_key(url_or_id: str) -> str:
+    """
+    読書状況を対応付ける論文のキー（arXiv の URL・ID なら版を除いた ID。同じ論文の別の版も同じ状況にする）
+    Args:
+        url_or_id (str): 論文の URL または ID
+    Returns:
+        str: キー（arXiv の論文でなければ入力のまま）
+    """
+    s = (url_or_id or "").strip()
+    m = _ARXIV_URL_RE.search(s) or _ARXIV_ID_RE.fullmatch(s)
+    return m.group(1) if m else s
+
+
+class NotionStatusSync:
+    """
+    Notion の読書状況（Progress: 未読 / 途中 / 読了）をローカルストアに差分で取り込む
+    - 前回取り込んだページの最終編集日時を位置として記録し、それ以降に編集されたページのみを取得する
+    - 検索結果への状況の付与はローカルストアのみを参照する（論文ごとの API 呼び出しは無い）
+    - pull_async はイベントループから呼ぶ（Notion へは非同期のクライアントで問い合わせ、ローカルストアの読み書きのみスレッドプールで行う）
+    """
+
+    def __init__(self, notion_service: NotionService, store: PaperStore, page_size: int = 100):
+        """
+        Args:
+            notion_service (NotionService): Notion サービス
+            store (PaperStore): 取り込み先のローカルストア
+            page_size (int): 1リクエストで取得するページ数
+        """
+        self.notion = notion_service
+        self.store = store
+        self.page_size = page_size
+
+    def pull(self) -> int:
+        """
+        前回以降に編集されたページの読書状況を取り込む（保存先のデータベースごとに位置を記録する）
+        Returns:
+            int: 取り込んだ論文数
+        """
+        return sum(self._pull_database(db) for db in self._status_databases())
+
+    async def pull_async(self) -> int:
+        """
+        前回以降に編集されたページの読書状況を取り込む（pull の非同期版。データベースごとに並行して問い合わせる）
+        Returns:
+            int: 取り込んだ論文数
+        Raises:
+            EnvironmentError: Notion の非同期のクライアントが無い
+        """
+        counts = await asyncio.gather(*(self._pull_database_async(db) for db in self._status_databases()))
+        return sum(counts)
+
+    def _status_databases(self) -> List[NotionDatabase]:
+        """取り込みの対象のデータベース（URL・読書状況のプロパティが無いデータベースは対象外）"""
+        return [db for db in self.notion.router.databases if db.properties.get("url") and db.properties.get("status")]
+
+    def _pull_database(self, db: NotionDatabase) -> int:
+        cursor_name = f"{_CURSOR_NAME}:{db.database_id}"
+        since = self.store.get_sync_cursor(cursor_name)
+        cursor = since or ""
+        rows: Dict[str, Tuple[str, str, str, str]] = {}
+        with get_tracer().span("notion.status_pull", database=db.name, since=since or "") as span:
+            # 編集の古い順に取得するため、同じ論文のページが複数あれば最後に編集されたものが残る
+            pages = self.notion.query_changes(since=since, page_size=self.page_size, database_id=db.database_id)
+            for page in pages:
+                cursor = self._take_page(page, db, rows, cursor)
+            self._store_rows(cursor_name, rows, cursor)
+            span["papers"] = len(rows)
+        get_tracer().incr("notion.status_pulled", len(rows))
+        return len(rows)
+
+    async def _pull_database_async(self, db: NotionDatabase) -> int:
+        loop = asyncio.get_running_loop()
+        cursor_name = f"{_CURSOR_NAME}:{db.database_id}"
+        since = await loop.run_in_executor(None, self.store.get_sync_cursor, cursor_name)
+        cursor = since or ""
+        rows: Dict[str, Tuple[str, str, str, str]] = {}
+        with get_tracer().span("notion.status_pull", database=db.name, since=since or "") as span:
+            pages = self.notion.query_changes_async(since=since, page_size=self.page_size, database_id=db.database_id)
+            async for page in pages:
+                cursor = self._take_page(page, db, rows, cursor)
+            await loop.run_in_executor(None, self._store_rows, cursor_name, rows, cursor)
+            span["papers"] = len(rows)
+        get_tracer().incr("notion.status_pulled", len(rows))
+        return len(rows)
+
+    def _take_page(self, page: dict, db: NotionDatabase, rows: Dict[str, Tuple[str, str, str, str]], cursor: str) -> str:
+        """ページの読書状況を rows に記録し、取り込みの位置（最終編集日時の最大）を返す"""
+        parsed = page_reading_status(page, db)
+        if parsed is None:
+            return cursor
+        url, status, edited = parsed
+        key = reading_key(url)
+        rows[key] = (key, page.get("id", ""), status, edited)
+        return max(cursor, edited)
+
+    def _store_rows(self, cursor_name: str, rows: Dict[str, Tuple[str, str, str, str]], cursor: str):
+        """取り込んだ読書状況と位置をローカルストアに保存する"""
+        self.store.put_reading_statuses(list(rows.values()))
+        if cursor:
+            self.store.set_sync_cursor(cursor_name, cursor)
+
+    def annotate(self, papers: List[Paper]) -> List[Paper]:
+        """
+        取り込み済みの読書状況を reading_status に設定する
+        Args:
+            papers (List[Paper]): 論文リスト
+        Returns:
+            List[Paper]: 引数と同じ論文リスト
+        """
+        keys = [reading_key(p.url or p.id) for p in papers]
+        statuses = self.store.reading_statuses(set(keys))
+        for paper, key in zip(papers, keys):
+            paper.reading_status = statuses.get(key, "")
+        return papers
@@ -0,0 +1,357 @@
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from contextlib import contextmanager
+from datetime import date, timedelta
+import json
+import os
+import sqlite3
+import threading
+
+from domain.models import Paper
+from services.arxiv_service import normalize_categories
+
+# 保存先（スナップショットの取り込みで数GBになりうるため config とは分ける）
+DEFAULT_STORE_PATH = os.path.join("src", "data", "papers.db")
+
+# papers テーブルの列（upsert_rows に渡すタプルの順序。本文 full_text は set_full_text で別途登録）
+PAPER_COLUMNS = ("id", "title", "url", "authors", "published_date", "category", "abstract", "abstract_ja")
+
+_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, abstract, full_text) VALUES (new.rowid, new.title, new.abstract, new.full_text);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, full_text)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.full_text);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE OF title, abstract, full_text ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, full_text)
+    VALUES ('delete', old.rowid, old.title, old.abstract, old.full_text);
+    INSERT INTO papers_fts(rowid, title, abstract, full_text) VALUES (new.rowid, new.title, new.abstract, new.full_text);
+END;
+"""
+
+_DROP_TRIGGERS = "DROP TRIGGER IF EXISTS papers_ai; DROP TRIGGER IF EXISTS papers_au; DROP TRIGGER IF EXISTS papers_ad;"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    published_date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    abstract_ja TEXT NOT NULL DEFAULT '',
+    full_text TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_papers_published ON papers(published_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, full_text, content='papers', content_rowid='rowid'
+);
+CREATE TABLE IF NOT EXISTS minhash (
+    paper_id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    key INTEGER NOT NULL,
+    paper_id TEXT NOT NULL,
+    PRIMARY KEY (key, paper_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_lsh_buckets_paper ON lsh_buckets(paper_id);
+CREATE TABLE IF NOT EXISTS reading_status (
+    paper_key TEXT PRIMARY KEY,
+    page_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_edited_time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS papers_minhash_au AFTER UPDATE OF title, abstract ON papers
+WHEN old.title != new.title OR old.abstract != new.abstract BEGIN
+    DELETE FROM minhash WHERE paper_id = old.id;
+END;
+""" + _TRIGGERS
+
+
+class PaperStore:
+    """
+    論文のローカルストア（SQLite + FTS5 全文検索）
+    - arXiv メタデータスナップショットの取り込み先
+    - arXiv API を使わないローカル検索に使用
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate()
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def _migrate(self):
+        """本文列の無い旧スキーマのストアに full_text を追加し、全文検索インデックスを作り直す"""
+        cols = [r[1] for r in self._conn.execute("PRAGMA table_info(papers)")]
+        if not cols or "full_text" in cols:
+            return
+        self._conn.execute("ALTER TABLE papers ADD COLUMN full_text TEXT NOT NULL DEFAULT ''")
+        self._conn.executescript(_DROP_TRIGGERS + " DROP TABLE IF EXISTS papers_fts;")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("INSERT INTO papers_fts(papers_fts) VALUES('rebuild')")
+
+    def close(self):
+        """接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def bulk_load(self) -> Iterator["PaperStore"]:
+        """
+        大量登録用のモード（with 内では全文検索インデックスを行ごとに更新せず、最後にまとめて再構築する）
+        行ごとのトリガーによる更新より大幅に速い
+        """
+        with self._lock:
+            self._conn.executescript(_DROP_TRIGGERS)
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._conn.execute("INSERT INTO papers_fts(papers_fts) VALUES('rebuild')")
+                self._conn.executescript(_TRIGGERS)
+                self._conn.commit()
+
+    def upsert_rows(self, rows: Sequence[tuple]) -> int:
+        """
+        行タプル（PAPER_COLUMNS の順）をまとめて登録・更新する
+        翻訳済みの abstract_ja は空文字で上書きしない
+        Args:
+            rows (Sequence[tuple]): 行タプルのリスト
+        Returns:
+            int: 処理した行数
+        """
+        if not rows:
+            return 0
+        placeholders = ",".join("?" * len(PAPER_COLUMNS))
+        sql = (
+            f"INSERT INTO papers ({','.join(PAPER_COLUMNS)}) VALUES ({placeholders}) "
+            "ON CONFLICT(id) DO UPDATE SET title=excluded.title, url=excluded.url, authors=excluded.authors, "
+            "published_date=excluded.published_date, category=excluded.category, abstract=excluded.abstract, "
+            "abstract_ja=CASE WHEN excluded.abstract_ja != '' THEN excluded.abstract_ja ELSE papers.abstract_ja END"
+        )
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+        return len(rows)
+
+    def upsert_papers(self, papers: Iterable[Paper]) -> int:
+        """
+        論文を登録・更新する
+        Args:
+            papers (Iterable[Paper]): 論文リスト
+        Returns:
+            int: 処理した件数
+        """
+        return self.upsert_rows([_paper_to_row(p) for p in papers])
+
+    def set_full_text(self, paper_id: str, text: str) -> bool:
+        """
+        論文の本文を登録する（全文検索の対象になる）
+        Args:
+            paper_id (str): 論文ID（登録済みであること）
+            text (str): 本文
+        Returns:
+            bool: 更新できたかどうか
+        """
+        with self._lock:
+            cur = self._conn.execute("UPDATE papers SET full_text = ? WHERE id = ?", (text, paper_id))
+            self._conn.commit()
+        return cur.rowcount > 0
+
+    def get(self, paper_id: str) -> Optional[Paper]:
+        """IDで論文を取得"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {','.join(PAPER_COLUMNS)} FROM papers WHERE id = ?", (paper_id,)
+            ).fetchone()
+        return _row_to_paper(row) if row else None
+
+    def count(self) -> int:
+        """登録済みの論文数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def search(
+        self,
+        keywords: List[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: int = 50,
+        categories: Optional[List[str]] = None,
+    ) -> List[Paper]:
+        """
+        ローカルストアを検索する（タイトル・abstract・本文の全文検索、キーワード間は OR）
+        Args:
+            keywords (List[str]): 検索キーワード（空なら日付・カテゴリのみで絞り込み）
+            start_date (Optional[date]): 投稿日の下限
+            end_date (Optional[date]): 投稿日の上限
+            limit (int): 最大件数
+            categories (Optional[List[str]]): カテゴリの指定（ワイルドカード可。いずれかを含む）
+        Returns:
+            List[Paper]: 検索結果（新しい順）
+        """
+        cols = ",".join(f"p.{c}" for c in PAPER_COLUMNS)
+        where: List[str] = []
+        params: List[object] = []
+        terms = [k.strip() for k in keywords if k and k.strip()]
+        if terms:
+            sql = f"SELECT {cols} FROM papers_fts f JOIN papers p ON p.rowid = f.rowid"
+            where.append("papers_fts MATCH ?")
+            # 各キーワードをフレーズとして扱う（FTS5 の演算子として解釈させない）
+            params.append(" OR ".join('"' + t.replace('"', '""') + '"' for t in terms))
+        else:
+            sql = f"SELECT {cols} FROM papers p"
+        if start_date is not None and start_date != date.min:
+            where.append("p.published_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None and end_date != date.max:
+            where.append("p.published_date < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        cats = normalize_categories(categories)
+        if cats:
+            # カンマ区切りのカテゴリの前後にカンマを付け、要素単位で GLOB（* ? はそのままワイルドカード）
+            where.append("(" + " OR ".join("(',' || p.category || ',') GLOB ?" for _ in cats) + ")")
+            params.extend(f"*,{c},*" for c in cats)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.published_date DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_row_to_paper(r) for r in rows]
+
+    def put_signatures(self, items: Sequence[Tuple[str, bytes, Sequence[int]]]) -> int:
+        """
+        近似重複の判定用の署名と LSH のバンドのキーを登録・更新する（NearDuplicateDetector から使用）
+        Args:
+            items (Sequence[Tuple[str, bytes, Sequence[int]]]): (論文ID, 署名, バンドのキー) のリスト
+        Returns:
+            int: 処理した件数
+        """
+        if not items:
+            return 0
+        with self._lock:
+            self._conn.executemany("DELETE FROM lsh_buckets WHERE paper_id = ?", [(pid,) for pid, _, _ in items])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO minhash (paper_id, signature) VALUES (?, ?)",
+                [(pid, sig) for pid, sig, _ in items],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (key, paper_id) VALUES (?, ?)",
+                [(key, pid) for pid, _, keys in items for key in keys],
+            )
+            self._conn.commit()
+        return len(items)
+
+    def lsh_candidates(self, keys: Sequence[int]) -> Set[str]:
+        """LSH のバンドのキーのいずれかが一致する論文ID（索引で検索）"""
+        if not keys:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT paper_id FROM lsh_buckets WHERE key IN ({','.join('?' * len(keys))})", list(keys)
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def get_signatures(self, paper_ids: Iterable[str]) -> Dict[str, bytes]:
+        """論文IDごとの署名（未登録・内容の更新で無効になった論文は含まない）"""
+        ids = list(paper_ids)
+        result: Dict[str, bytes] = {}
+        with self._lock:
+            # SQLite の変数の上限を超えないよう分割
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                result.update(self._conn.execute(
+                    f"SELECT paper_id, signature FROM minhash WHERE paper_id IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        return result
+
+    def unsigned_papers(self, limit: int) -> List[Paper]:
+        """署名が未登録の論文（スナップショットから取り込んだ・内容が更新された論文）"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {','.join('p.' + c for c in PAPER_COLUMNS)} FROM papers p "
+                "WHERE NOT EXISTS (SELECT 1 FROM minhash m WHERE m.paper_id = p.id) LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [_row_to_paper(r) for r in rows]
+
+    def put_reading_statuses(self, rows: Sequence[Tuple[str, str, str, str]]) -> int:
+        """
+        論文ごとの Notion の読書状況を登録・更新する（NotionStatusSync から使用）
+        Args:
+            rows (Sequence[Tuple[str, str, str, str]]): (論文のキー, ページID, 状況, 最終編集日時) のリスト
+        Returns:
+            int: 処理した件数
+        """
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO reading_status (paper_key, page_id, status, last_edited_time) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def reading_statuses(self, keys: Iterable[str]) -> Dict[str, str]:
+        """論文のキーごとの読書状況（取り込んでいない論文は含まない）"""
+        keys = list(keys)
+        result: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                result.update(self._conn.execute(
+                    f"SELECT paper_key, status FROM reading_status WHERE paper_key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall())
+        return result
+
+    def get_sync_cursor(self, name: str) -> Optional[str]:
+        """差分取り込みの位置（未取り込みなら None）"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_sync_cursor(self, name: str, value: str):
+        """差分取り込みの位置を記録する"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", (name, value))
+            self._conn.commit()
+
+
+def _paper_to_row(p: Paper) -> tuple:
+    """Paper を行タプルに変換"""
+    return (
+        p.id,
+        p.title,
+        p.url,
+        json.dumps(p.authors, ensure_ascii=False),
+        p.published_date,
+        p.category,
+        p.abstract,
+        p.abstract_ja,
+    )
+
+
+def _row_to_paper(row: tuple) -> Paper:
+    """行タプルを Paper に変換"""
+    data = dict(zip(PAPER_COLUMNS, row))
+    data["authors"] = json.loads(data["authors"])
+    return Paper(**data)
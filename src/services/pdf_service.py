@@ -0,0 +1,397 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from domain.models import Paper
+from services.instrumentation import get_tracer
+from services.rate_limiter import TokenBucket
+
+# PDF・抽出結果のキャッシュ先
+DEFAULT_PDF_CACHE_DIR = os.path.join("src", "data", "pdf")
+ARXIV_PDF_URL = "https://arxiv.org/pdf/{}"
+
+# 章見出しとみなす行（"1 Introduction", "2. Related Work", "Abstract", "References" など）
+_HEADING_RE = re.compile(
+    r"^(?:\d{1,2}\.?\s+([A-Z][A-Za-z][A-Za-z \-&:,]{1,60})"
+    r"|(Abstract|References|Bibliography|Acknowledg(?:e)?ments?|Appendix(?: [A-Z])?))\s*$",
+    re.MULTILINE,
+)
+# 行末のハイフネーション（"trans-\nformer"）
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\n(\w)")
+# 要約に使う章（見出しを小文字にして前方一致）
+_SUMMARY_SECTIONS = ("abstract", "introduction", "conclusion", "discussion")
+
+
+@dataclass
+class PdfConfig:
+    """PDF取得・抽出の設定"""
+    cache_dir: str = DEFAULT_PDF_CACHE_DIR
+    # arxiv.org へのリクエストレート（1秒あたり）と連続送信数
+    rate_per_sec: float = 1.0
+    burst: int = 4
+    # 同時ダウンロード数（コネクションプールの大きさ）
+    max_connections: int = 8
+    # テキスト抽出のワーカープロセス数（0 ならダウンロードスレッド内で抽出）
+    extract_workers: int = 2
+    timeout: float = 60.0
+
+
+def paper_key(paper: Paper) -> str:
+    """
+    キャッシュのキー（arXiv ID+バージョン。旧形式IDの "/" は "_" に置換）
+    Args:
+        paper (Paper): 論文
+    Returns:
+        str: キー（例: 2401.00001v2, hep-th_9901001v1）
+    """
+    raw = paper.id.split("/abs/", 1)[-1] if "/abs/" in paper.id else paper.id
+    return raw.strip().replace("/", "_")
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    本文を章見出しで分割する（見出しが無ければ空の辞書）
+    Args:
+        text (str): 本文
+    Returns:
+        Dict[str, str]: {見出し: 本文}（出現順）
+    """
+    sections: Dict[str, str] = {}
+    matches = list(_HEADING_RE.finditer(text))
+    for i, m in enumerate(matches):
+        title = (m.group(1) or m.group(2)).strip()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[m.end():end].strip()
+        if title in sections:
+            sections[title] += "\n" + body
+        else:
+            sections[title] = body
+    return sections
+
+
+def extract_pdf_text(path: str) -> Tuple[str, Dict[str, str]]:
+    """
+    PDF から本文と章を抽出する（プロセスプールのワーカーで実行）
+    Args:
+        path (str): PDF ファイル
+    Returns:
+        Tuple[str, Dict[str, str]]: (本文, {見出し: 本文})
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = [(page.extract_text() or "") for page in reader.pages]
+    text = _HYPHEN_BREAK_RE.sub(r"\1\2", "\n".join(pages))
+    return text, split_sections(text)
+
+
+def summary_source(paper: Paper, max_chars: int = 12000) -> str:
+    """
+    要約に渡すテキスト（Abstract・Introduction・Conclusion を優先し、max_chars で打ち切る）
+    Args:
+        paper (Paper): 全文取得済みの論文
+        max_chars (int): 最大文字数
+    Returns:
+        str: 要約対象のテキスト（全文が無ければ abstract）
+    """
+    if not paper.full_text:
+        return paper.abstract
+    picked = [
+        f"{title}\n{body}" for title, body in paper.sections.items()
+        if title.lower().startswith(_SUMMARY_SECTIONS)
+    ]
+    if not picked:
+        picked = [paper.full_text]
+    if not any(t.lower().startswith("abstract") for t in paper.sections) and paper.abstract:
+        picked.insert(0, f"Abstract\n{paper.abstract}")
+    return "\n\n".join(picked)[:max_chars]
+
+
+class PdfService:
+    """
+    arXiv の PDF を取得し、本文を抽出するサービス
+    - ダウンロードはコネクションプール付きのセッションとトークンバケットでレート制限し、スレッドで並列化
+    - PDF と抽出結果は arXiv ID+バージョンごとにディスクへキャッシュ
+    - テキスト抽出は CPU 処理のためプロセスプールで並列化（ダウンロード完了順に投入）
+    - fetch_full_texts_async はイベントループから呼ぶ（ダウンロードは httpx.AsyncClient で行い、
+      ファイルの読み書きと抽出のみスレッドプール・プロセスプールで行う）
+    """
+
+    def __init__(self, cfg: Optional[PdfConfig] = None, session=None, async_session=None):
+        """
+        Args:
+            cfg (Optional[PdfConfig]): 設定
+            session: requests.Session 互換のセッション（テスト用。省略時はプール付きセッションを生成）
+            async_session: httpx.AsyncClient 互換のクライアント（*_async で使用。省略時は初回に生成する）
+        """
+        self.cfg = cfg or PdfConfig()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.cfg.max_connections)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = "paper-to-notion (pdf fetch)"
+        self.session = session
+        self._async_session = async_session
+        self._owns_async_session = async_session is None
+        self.limiter = TokenBucket(self.cfg.rate_per_sec, self.cfg.burst)
+        self._extract_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        os.makedirs(self.cfg.cache_dir, exist_ok=True)
+
+    def close(self):
+        """抽出用のプロセスプールを停止する"""
+        with self._pool_lock:
+            if self._extract_pool is not None:
+                self._extract_pool.shutdown(cancel_futures=True)
+                self._extract_pool = None
+
+    async def aclose(self):
+        """生成した非同期の HTTP クライアントを閉じる（渡されたクライアントは閉じない）"""
+        if self._owns_async_session and self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    def _get_async_session(self):
+        """非同期の HTTP クライアントを取得（未生成なら、同時ダウンロード数を上限とするプール付きで生成）"""
+        if self._async_session is None:
+            self._async_session = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.cfg.max_connections),
+                headers={"User-Agent": "paper-to-notion (pdf fetch)"},
+            )
+        return self._async_session
+
+    def _get_extract_pool(self) -> ProcessPoolExecutor:
+        """抽出用のプロセスプールを取得（未生成なら生成）"""
+        with self._pool_lock:
+            if self._extract_pool is None:
+                # GUI のスレッドから fork するとロックを持ったまま複製されうるため spawn で起動
+                self._extract_pool = ProcessPoolExecutor(
+                    max_workers=self.cfg.extract_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._extract_pool
+
+    def pdf_path(self, paper: Paper) -> str:
+        """PDF のキャッシュパス"""
+        return os.path.join(self.cfg.cache_dir, f"{paper_key(paper)}.pdf")
+
+    def _text_path(self, paper: Paper) -> str:
+        """抽出結果のキャッシュパス"""
+        return os.path.join(self.cfg.cache_dir, f"{paper_key(paper)}.json")
+
+    def download(self, paper: Paper) -> Optional[str]:
+        """
+        PDF を取得してキャッシュに保存する（キャッシュ済みなら取得しない）
+        Args:
+            paper (Paper): 論文
+        Returns:
+            Optional[str]: PDF のパス（失敗時は None）
+        """
+        tracer = get_tracer()
+        path = self.pdf_path(paper)
+        if os.path.exists(path):
+            tracer.incr("pdf.cache_hit")
+            return path
+        url = ARXIV_PDF_URL.format(paper_key(paper).replace("_", "/"))
+        self.limiter.acquire()
+        try:
+            with tracer.span("pdf.download", paper=paper_key(paper)) as span:
+                res = self.session.get(url, timeout=self.cfg.timeout)
+                res.raise_for_status()
+                data = res.content
+                span["bytes"] = len(data)
+            return self._store_pdf(path, url, data)
+        except Exception:
+            logging.exception("PDFの取得に失敗しました: %s", paper.id)
+            tracer.incr("pdf.failed")
+            return None
+
+    async def download_async(self, paper: Paper) -> Optional[str]:
+        """
+        PDF を取得してキャッシュに保存する（download の非同期版。保存はスレッドプールで行う）
+        Args:
+            paper (Paper): 論文
+        Returns:
+            Optional[str]: PDF のパス（失敗時は None）
+        """
+        tracer = get_tracer()
+        path = self.pdf_path(paper)
+        if os.path.exists(path):
+            tracer.incr("pdf.cache_hit")
+            return path
+        url = ARXIV_PDF_URL.format(paper_key(paper).replace("_", "/"))
+        await self.limiter.acquire_async()
+        try:
+            with tracer.span("pdf.download", paper=paper_key(paper)) as span:
+                res = await self._get_async_session().get(url, timeout=self.cfg.timeout)
+                res.raise_for_status()
+                data = res.content
+                span["bytes"] = len(data)
+            return await asyncio.get_running_loop().run_in_executor(None, self._store_pdf, path, url, data)
+        except Exception:
+            logging.exception("PDFの取得に失敗しました: %s", paper.id)
+            tracer.incr("pdf.failed")
+            return None
+
+    def _store_pdf(self, path: str, url: str, data: bytes) -> str:
+        """取得した PDF をキャッシュに保存する（PDF でなければ ValueError）"""
+        if not data.startswith(b"%PDF"):
+            raise ValueError(f"PDF ではない応答です: {url}")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        tracer = get_tracer()
+        tracer.incr("pdf.downloaded")
+        tracer.incr("pdf.bytes", len(data))
+        return path
+
+    def _load_text(self, paper: Paper) -> Optional[Tuple[str, Dict[str, str]]]:
+        """キャッシュ済みの抽出結果を読み込む（無ければ None）"""
+        try:
+            with open(self._text_path(paper), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["text"], data["sections"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_text(self, paper: Paper, text: str, sections: Dict[str, str]):
+        """抽出結果をキャッシュに保存する"""
+        path = self._text_path(paper)
+        # 同じ論文を同時に取得しても一時ファイルが衝突しないよう、スレッドごとの名前にする
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"text": text, "sections": sections}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _apply(self, paper: Paper, text: str, sections: Dict[str, str]):
+        """抽出結果を論文に設定する"""
+        paper.full_text = text
+        paper.sections = sections
+
+    def fetch_full_texts(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[Paper]:
+        """
+        論文の PDF を取得して本文を抽出し、full_text / sections に設定する
+        取得・抽出に失敗した論文は full_text が空のまま
+        Args:
+            papers (List[Paper]): 論文リスト
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+        Returns:
+            List[Paper]: 全文を取得できた論文
+        """
+        tracer = get_tracer()
+        done: List[Paper] = []
+
+        def _download(p: Paper) -> Optional[str]:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            return self.download(p)
+
+        with tracer.span("pdf.fetch_full_texts", papers=len(papers)):
+            pending: List[Paper] = []
+            for p in papers:
+                cached = self._load_text(p)
+                if cached is not None:
+                    tracer.incr("pdf.text_cache_hit")
+                    self._apply(p, *cached)
+                    done.append(p)
+                else:
+                    pending.append(p)
+
+            extract_futures = {}
+            with ThreadPoolExecutor(max_workers=self.cfg.max_connections, thread_name_prefix="pdf") as pool:
+                downloads = {pool.submit(_download, p): p for p in pending}
+                for fut in as_completed(downloads):
+                    p = downloads[fut]
+                    path = fut.result()
+                    if path is None:
+                        continue
+                    if self.cfg.extract_workers > 0:
+                        # ダウンロード完了順に抽出を開始（残りのダウンロードと並行して処理）
+                        extract_futures[self._get_extract_pool().submit(extract_pdf_text, path)] = p
+                    else:
+                        extract_futures[pool.submit(extract_pdf_text, path)] = p
+
+            for fut in as_completed(extract_futures):
+                p = extract_futures[fut]
+                try:
+                    text, sections = fut.result()
+                except Exception:
+                    logging.exception("PDFのテキスト抽出に失敗しました: %s", p.id)
+                    tracer.incr("pdf.extract_failed")
+                    continue
+                self._save_text(p, text, sections)
+                self._apply(p, text, sections)
+                tracer.incr("pdf.extracted")
+                done.append(p)
+        return done
+
+    async def fetch_full_texts_async(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[Paper]:
+        """
+        論文の PDF を取得して本文を抽出し、full_text / sections に設定する（fetch_full_texts の非同期版）
+        ダウンロードは cfg.max_connections 件まで同時に行い、完了したものから抽出する
+        Args:
+            papers (List[Paper]): 論文リスト
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+        Returns:
+            List[Paper]: 全文を取得できた論文
+        """
+        tracer = get_tracer()
+        loop = asyncio.get_running_loop()
+        done: List[Paper] = []
+        slots = asyncio.Semaphore(max(1, self.cfg.max_connections))
+
+        async def _fetch(p: Paper) -> Optional[Paper]:
+            async with slots:
+                if is_cancelled is not None and is_cancelled():
+                    return None
+                path = await self.download_async(p)
+            if path is None:
+                return None
+            pool = self._get_extract_pool() if self.cfg.extract_workers > 0 else None
+            try:
+                text, sections = await loop.run_in_executor(pool, extract_pdf_text, path)
+            except Exception:
+                logging.exception("PDFのテキスト抽出に失敗しました: %s", p.id)
+                tracer.incr("pdf.extract_failed")
+                return None
+            await loop.run_in_executor(None, self._save_text, p, text, sections)
+            self._apply(p, text, sections)
+            tracer.incr("pdf.extracted")
+            return p
+
+        with tracer.span("pdf.fetch_full_texts", papers=len(papers)):
+            cached = await loop.run_in_executor(None, lambda: [self._load_text(p) for p in papers])
+            pending: List[Paper] = []
+            for p, texts in zip(papers, cached):
+                if texts is not None:
+                    tracer.incr("pdf.text_cache_hit")
+                    self._apply(p, *texts)
+                    done.append(p)
+                else:
+                    pending.append(p)
+            fetched = await asyncio.gather(*(_fetch(p) for p in pending))
+            done.extend(p for p in fetched if p is not None)
+        return done
@@ -0,0 +1,751 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+from domain.models import SearchConfig, Paper
+from services.arxiv_service import ArxivService
+from services.notion_schema import NotionValidationError
+from services.rate_limiter import ThrottledError
+from services.notion_service import STATUS_READ, NotionService
+from services.notion_sync import NotionStatusSync
+from services.translation_service import (
+    TranslationConfig,
+    TranslationService,
+    TranslationCanceledException,
+)
+from services.watch_service import WatchService
+from services.ranking_service import RelevanceRanker
+from services.paper_store import PaperStore
+from services.pdf_service import PdfService, summary_source
+from services.notion_outbox import NotionOutbox, OutboxWorker
+from services.near_duplicate import DuplicateConfig, NearDuplicateDetector
+from services.instrumentation import get_tracer
+from services.usage_ledger import UsageRun
+
+# 検索時に Notion の読書状況を取り込む間隔（秒。それ以内の検索は取り込み済みの状況を使う）
+STATUS_SYNC_INTERVAL_S = 300.0
+
+
+@dataclass
+class EnqueueResult:
+    """
+    Notion 保存の登録結果（enqueue_save）
+    - enqueued: 登録したジョブ数
+    - skipped: 近似重複のため登録しなかった論文 {論文ID: 重複と判定した保存済み・保存待ちの論文ID}
+    """
+    enqueued: int
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+
+class PaperPipeline:
+    """
+    arXiv検索 → 翻訳 → Notion保存 の一連の処理（GUI 非依存）
+    - AppController はイベントループから *_async を呼び出す（arXiv・翻訳・Notion への問い合わせは非同期のクライアントで行い、
+      ローカルストア・近似重複の判定・並べ替えなどのディスク・CPU の処理のみスレッドプールで行う）
+    - PipelineServer・定期実行はスレッドから同期版を呼び出す
+    - ベンチマークではフェイクのサービスを差し込んで利用する
+    """
+
+    def __init__(
+        self,
+        arxiv_service: Optional[ArxivService] = None,
+        translator: Optional[TranslationService] = None,
+        notion_service: Optional[NotionService] = None,
+        translation_config: Optional[TranslationConfig] = None,
+        watch_service: Optional[WatchService] = None,
+        ranker: Optional[RelevanceRanker] = None,
+        paper_store: Optional[PaperStore] = None,
+        pdf_service: Optional[PdfService] = None,
+        outbox: Optional[NotionOutbox] = None,
+        duplicate_config: Optional[DuplicateConfig] = None,
+    ):
+        self.arxiv_service = arxiv_service or ArxivService()
+        # 翻訳・Notion サービスは API キーが必要なため必要時に初期化
+        self.translator = translator
+        self.notion_service = notion_service
+        self.translation_config = translation_config
+        self.watch_service = watch_service or WatchService(arxiv_service=self.arxiv_service)
+        self.ranker = ranker or RelevanceRanker()
+        # ローカルストアは使用時に開く
+        self.paper_store = paper_store
+        # PDF の取得は全文取得時のみ使用
+        self.pdf_service = pdf_service
+        # Notion 保存ジョブの永続キューは使用時に開く
+        self.outbox = outbox
+        self.outbox_worker: Optional[OutboxWorker] = None
+        # 近似重複の判定（署名はローカルストアに保存）
+        self.duplicate_config = duplicate_config or DuplicateConfig()
+        self.deduplicator: Optional[NearDuplicateDetector] = None
+        # Notion の読書状況の取り込み（同時に1つのみ）
+        self.status_sync: Optional[NotionStatusSync] = None
+        self._status_lock = threading.Lock()
+        self._status_synced_at: Optional[float] = None
+        # 必要時に初期化するサービスを、同時に呼ばれても1つだけ生成する（PipelineServer で複数のジョブが共有するため）
+        self._init_lock = threading.RLock()
+
+    def streams_translations(self) -> bool:
+        """翻訳をストリーミングで受け取れる設定か（GUI で途中経過を表示するかの判定に使用）"""
+        cfg = self.translator.cfg if self.translator is not None else (self.translation_config or TranslationConfig())
+        return cfg.stream
+
+    def _get_translator(self) -> TranslationService:
+        """翻訳サービスを取得（未生成なら生成）"""
+        with self._init_lock:
+            if self.translator is None:
+                self.translator = TranslationService(self.translation_config)
+        return self.translator
+
+    def start_run(self):
+        """実行（検索1回・ウォッチ実行1回）の開始を記録する（トークン使用量の実行ごとの集計・予算を0に戻す）"""
+        if self.translator is not None:
+            self.translator.usage.start_run()
+
+    def get_paper_store(self) -> PaperStore:
+        """ローカルストアを取得（未オープンなら開く）"""
+        with self._init_lock:
+            if self.paper_store is None:
+                self.paper_store = PaperStore()
+        return self.paper_store
+
+    def get_deduplicator(self) -> NearDuplicateDetector:
+        """近似重複の判定を取得（未生成ならローカルストアを開いて生成）"""
+        with self._init_lock:
+            if self.deduplicator is None:
+                self.deduplicator = NearDuplicateDetector(self.get_paper_store(), self.duplicate_config)
+        return self.deduplicator
+
+    def get_status_sync(self) -> NotionStatusSync:
+        """読書状況の取り込みを取得（未生成なら生成。Notion 未設定なら EnvironmentError）"""
+        with self._init_lock:
+            if self.status_sync is None:
+                self.status_sync = NotionStatusSync(self.get_notion_service(), self.get_paper_store())
+        return self.status_sync
+
+    def sync_reading_status(self, max_age: float = 0.0) -> int:
+        """
+        Notion の読書状況の変更（前回の取り込み以降に編集されたページ）をローカルストアに取り込む
+        Args:
+            max_age (float): 前回の取り込みからこの秒数以内なら取り込まない
+        Returns:
+            int: 取り込んだ論文数（Notion 未設定・失敗時は 0）
+        """
+        with self._status_lock:
+            if self._status_synced_at is not None and time.monotonic() - self._status_synced_at < max_age:
+                return 0
+            try:
+                n = self.get_status_sync().pull()
+            except EnvironmentError:
+                logging.debug("Notionが未設定のため読書状況を取り込みません")
+                n = 0
+            except Exception:
+                logging.exception("Notionの読書状況の取り込みに失敗しました")
+                n = 0
+            self._status_synced_at = time.monotonic()
+        return n
+
+    async def sync_reading_status_async(self, max_age: float = 0.0) -> int:
+        """
+        Notion の読書状況の変更をローカルストアに取り込む（sync_reading_status の非同期版）
+        ループのスレッドを塞がないよう、他の取り込みが実行中なら待たずに 0 を返す（取り込み済みの状況を使う）
+        Args:
+            max_age (float): 前回の取り込みからこの秒数以内なら取り込まない
+        Returns:
+            int: 取り込んだ論文数（Notion 未設定・失敗・他の取り込みの実行中は 0）
+        """
+        if not self._status_lock.acquire(blocking=False):
+            return 0
+        try:
+            if self._status_synced_at is not None and time.monotonic() - self._status_synced_at < max_age:
+                return 0
+            try:
+                status_sync = await asyncio.get_running_loop().run_in_executor(None, self.get_status_sync)
+                n = await status_sync.pull_async()
+            except EnvironmentError:
+                logging.debug("Notionが未設定のため読書状況を取り込みません")
+                n = 0
+            except Exception:
+                logging.exception("Notionの読書状況の取り込みに失敗しました")
+                n = 0
+            self._status_synced_at = time.monotonic()
+        finally:
+            self._status_lock.release()
+        return n
+
+    def annotate_reading_status(self, papers: List[Paper], hide_read: bool = False) -> List[Paper]:
+        """
+        取り込み済みの Notion の読書状況を reading_status に設定する（必要なら先に差分を取り込む）
+        Args:
+            papers (List[Paper]): 論文リスト
+            hide_read (bool): 「読了」の論文を除くかどうか
+        Returns:
+            List[Paper]: 論文リスト（hide_read なら読了の論文を除いたもの）
+        """
+        self.sync_reading_status(max_age=STATUS_SYNC_INTERVAL_S)
+        return self._apply_reading_status(papers, hide_read)
+
+    def _apply_reading_status(self, papers: List[Paper], hide_read: bool = False) -> List[Paper]:
+        """取り込み済みの読書状況を reading_status に設定する（hide_read なら読了の論文を除く）"""
+        try:
+            self.get_status_sync().annotate(papers)
+        except EnvironmentError:
+            return papers
+        except Exception:
+            logging.exception("読書状況の付与に失敗しました")
+            return papers
+        if hide_read:
+            papers = [p for p in papers if p.reading_status != STATUS_READ]
+        return papers
+
+    def get_pdf_service(self) -> PdfService:
+        """PDF サービスを取得（未生成なら生成）"""
+        with self._init_lock:
+            if self.pdf_service is None:
+                self.pdf_service = PdfService()
+        return self.pdf_service
+
+    def get_notion_service(self) -> NotionService:
+        """Notion サービスを取得（未生成なら生成。環境変数未設定なら EnvironmentError）"""
+        with self._init_lock:
+            if self.notion_service is None:
+                self.notion_service = NotionService()
+        return self.notion_service
+
+    def notion_database_names(self) -> List[str]:
+        """保存先の Notion データベースの名前（Notion 未設定なら空）"""
+        try:
+            return self.get_notion_service().database_names()
+        except EnvironmentError:
+            return []
+
+    def get_outbox(self) -> NotionOutbox:
+        """Notion 保存ジョブのキューを取得（未オープンなら開く）"""
+        with self._init_lock:
+            if self.outbox is None:
+                self.outbox = NotionOutbox()
+        return self.outbox
+
+    def start_outbox_worker(self, on_change: Optional[Callable[[], None]] = None) -> OutboxWorker:
+        """
+        Notion 保存ジョブのワーカーを開始する（前回の未完了・失敗ジョブも再開する）
+        Args:
+            on_change (Optional[Callable[[], None]]): ジョブの状態が変わったときに呼ぶ関数（ワーカースレッドで実行）
+        Returns:
+            OutboxWorker: ワーカー
+        """
+        if self.outbox_worker is None:
+            outbox = self.get_outbox()
+            outbox.retry_failed()
+            self.outbox_worker = OutboxWorker(outbox, self.get_notion_service, on_change=on_change)
+        self.outbox_worker.start()
+        return self.outbox_worker
+
+    def enqueue_save(self, papers: List[Paper]) -> EnqueueResult:
+        """
+        論文の Notion 保存をキューに登録する（保存はワーカーが順に行う）
+        Args:
+            papers (List[Paper]): 保存する論文
+        Returns:
+            EnqueueResult: 登録したジョブ数（保存待ちの論文は登録しない）と、近似重複のため登録しなかった論文
+        Notion に保存済み・保存待ちの論文の近似重複は登録しない（duplicate_config.skip_saved）
+        """
+        skipped: Dict[str, str] = {}
+        if self.duplicate_config.skip_saved and papers:
+            papers, skipped = self._skip_saved_duplicates(papers)
+        n = self.get_outbox().enqueue(papers)
+        if self.outbox_worker is not None:
+            self.outbox_worker.notify()
+        try:
+            # 以降の検索・保存で比較できるよう、保存する論文をローカルストアと近似重複の索引に登録
+            self.get_paper_store().upsert_papers(papers)
+            self.get_deduplicator().index(papers)
+        except Exception:
+            logging.exception("保存する論文の近似重複の索引への登録に失敗しました")
+        return EnqueueResult(enqueued=n, skipped=skipped)
+
+    async def enqueue_save_async(self, papers: List[Paper]) -> EnqueueResult:
+        """論文の Notion 保存をキューに登録する（enqueue_save の非同期版。ローカルのキューへの登録のためスレッドプールで行う）"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.enqueue_save, papers)
+
+    def _skip_saved_duplicates(self, papers: List[Paper]) -> Tuple[List[Paper], Dict[str, str]]:
+        """
+        Notion に保存済み・保存待ちの論文（または同じ一覧の先の論文）と近似重複の論文を除く
+        Returns:
+            Tuple[List[Paper], Dict[str, str]]: (登録する論文, 除いた論文 {論文ID: 重複と判定した論文ID})
+        """
+        try:
+            matches = self.get_deduplicator().find(papers)
+            if not matches:
+                return papers, {}
+            statuses = self.get_outbox().latest_status([m.duplicate_of for m in matches if not m.in_batch])
+        except Exception:
+            logging.exception("近似重複の判定に失敗しました")
+            return papers, {}
+        skipped: Dict[str, str] = {}
+        for m in matches:
+            if m.in_batch or statuses.get(m.duplicate_of) in ("done", "pending", "inflight"):
+                skipped[m.paper_id] = m.duplicate_of
+                logging.info(
+                    "保存済み・保存待ちの論文 %s と重複するため保存しません: %s（類似度 %.2f）",
+                    m.duplicate_of, m.paper_id, m.similarity,
+                )
+        return [p for p in papers if p.id not in skipped], skipped
+
+    def mark_duplicates(self, papers: List[Paper], fold: bool = True) -> List[Paper]:
+        """
+        近似重複の論文の duplicate_of に元の論文IDを設定する（判定に失敗した場合はそのまま返す）
+        fold が True なら、結果内の重複は元の論文の duplicates に記録して除き、
+        ローカルストアの翻訳済みの論文と重複する論文はその訳文を流用する（翻訳しない）
+        Args:
+            papers (List[Paper]): 論文リスト
+            fold (bool): 重複をまとめるかどうか（False なら印を付けるのみ）
+        Returns:
+            List[Paper]: 論文リスト（fold なら結果内の重複を除いたもの）
+        """
+        try:
+            matches = self.get_deduplicator().find(papers)
+        except Exception:
+            logging.exception("近似重複の判定に失敗しました")
+            return papers
+        if not matches:
+            return papers
+        by_id = {p.id: p for p in papers}
+        folded: Set[str] = set()
+        for m in matches:
+            paper = by_id[m.paper_id]
+            paper.duplicate_of = m.duplicate_of
+            if not fold:
+                continue
+            if m.in_batch:
+                by_id[m.duplicate_of].duplicates.append(paper.id)
+                folded.add(paper.id)
+            elif not paper.abstract_ja:
+                original = self.get_paper_store().get(m.duplicate_of)
+                if original is not None and original.abstract_ja:
+                    paper.abstract_ja = original.abstract_ja
+        logging.info("近似重複: %d件（結果内でまとめた論文 %d件）", len(matches), len(folded))
+        return [p for p in papers if p.id not in folded]
+
+    def search(
+        self,
+        config: SearchConfig,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        arXiv を検索し、abstract を翻訳した論文リストを返す
+        config.translation_mode に従い、全件・上位のみ・翻訳なし のいずれかで翻訳する
+        翻訳に失敗した場合は未翻訳のまま返す（キャンセル時は TranslationCanceledException、流量制限が続いた場合は ThrottledError）
+        config.watch が True で処理済みの記録があるウォッチなら、前回以降の新着のみを検索する
+        config.rerank が True なら多めに取得して関連度で並べ替え、上位のみを翻訳する
+        config.source が "local" なら arXiv API ではなくローカルストアを検索する
+        config.dedup に従い、近似重複（別IDの版・改題）を翻訳前にまとめる・印を付ける
+        Notion の読書状況を reading_status に付与し、config.hide_read なら読了の論文を除く
+        config.notion_database_name があれば、各論文の保存先（notion_database）をそのデータベースにする
+        Args:
+            config (SearchConfig): 検索設定
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): トークン使用量の集計・予算を適用する実行（省略時は start_run で始めた実行）
+        Returns:
+            List[Paper]: 検索結果リスト
+        """
+        tracer = get_tracer()
+        watch = self._search_watch(config)
+        fetch_size = self._fetch_size(config)
+        with tracer.span("pipeline.search", max_results=fetch_size, watch=watch is not None) as span:
+            if config.source == "local":
+                papers = self._search_local(config, fetch_size)
+            elif watch is not None and watch.last_published:
+                papers = self.watch_service.fetch_new(watch, fetch_size)
+            else:
+                papers = self.arxiv_service.search_papers(
+                    keywords=config.keyword,
+                    max_results=fetch_size,
+                    start_date=config.start_date,
+                    end_date=config.end_date,
+                    categories=config.categories,
+                )
+            span["papers"] = len(papers)
+        fetched = papers
+
+        # 別IDの版・改題などの近似重複をまとめる（翻訳・並べ替えの前に）
+        if config.dedup != "off" and papers:
+            papers = self.mark_duplicates(papers, fold=config.dedup == "fold")
+        # Notion の読書状況を付与する（読了を除く指定なら翻訳・並べ替えの前に除く）
+        if papers:
+            papers = self.annotate_reading_status(papers, hide_read=config.hide_read)
+        papers = self._select_results(config, papers)
+
+        targets = self._translation_targets(config, papers)
+        if targets:
+            self.translate_papers(targets, is_cancelled=is_cancelled, usage_run=usage_run)
+
+        # ウォッチのハイウォーターマークを更新（次回はこれより新しい論文のみ取得。絞り込みで除外した論文も処理済み）
+        if watch is not None:
+            self.watch_service.mark_processed(config.keyword, fetched, categories=config.categories)
+        return papers
+
+    async def search_async(
+        self,
+        config: SearchConfig,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        arXiv を検索し、abstract を翻訳した論文リストを返す（search の非同期版）
+        arXiv・Notion・翻訳への問い合わせはループで待ち、ローカルストア・近似重複の判定・並べ替えはスレッドプールで行う。
+        呼び出し元のタスクをキャンセルすると、実行中の問い合わせ・翻訳も打ち切る
+        Args:
+            config (SearchConfig): 検索設定
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): トークン使用量の集計・予算を適用する実行
+        Returns:
+            List[Paper]: 検索結果リスト
+        """
+        loop = asyncio.get_running_loop()
+        tracer = get_tracer()
+        watch = self._search_watch(config)
+        fetch_size = self._fetch_size(config)
+        with tracer.span("pipeline.search", max_results=fetch_size, watch=watch is not None) as span:
+            if config.source == "local":
+                papers = await loop.run_in_executor(None, self._search_local, config, fetch_size)
+            elif watch is not None and watch.last_published:
+                papers = await self.watch_service.fetch_new_async(watch, fetch_size)
+            else:
+                papers = await self.arxiv_service.search_papers_async(
+                    keywords=config.keyword,
+                    max_results=fetch_size,
+                    start_date=config.start_date,
+                    end_date=config.end_date,
+                    categories=config.categories,
+                )
+            span["papers"] = len(papers)
+        fetched = papers
+
+        if config.dedup != "off" and papers:
+            papers = await loop.run_in_executor(
+                None, functools.partial(self.mark_duplicates, papers, fold=config.dedup == "fold")
+            )
+        if papers:
+            await self.sync_reading_status_async(max_age=STATUS_SYNC_INTERVAL_S)
+            papers = await loop.run_in_executor(None, self._apply_reading_status, papers, config.hide_read)
+        papers = await loop.run_in_executor(None, self._select_results, config, papers)
+
+        targets = self._translation_targets(config, papers)
+        if targets:
+            await self.translate_papers_async(targets, is_cancelled=is_cancelled, usage_run=usage_run)
+
+        if watch is not None:
+            await loop.run_in_executor(
+                None, functools.partial(self.watch_service.mark_processed, config.keyword, fetched, categories=config.categories)
+            )
+        return papers
+
+    def _search_watch(self, config: SearchConfig):
+        """差分検索に使うウォッチ（config.watch で、処理済みの記録があるもの。無ければ None）"""
+        if config.watch and config.source == "arxiv":
+            return self.watch_service.get(config.keyword, config.categories)
+        return None
+
+    def _fetch_size(self, config: SearchConfig) -> int:
+        """取得する件数（並べ替える場合は多めに取得する）"""
+        return config.max_results * max(1, config.rerank_overfetch) if config.rerank else config.max_results
+
+    def _search_local(self, config: SearchConfig, fetch_size: int) -> List[Paper]:
+        """ローカルストアを検索する"""
+        q = self.arxiv_service.canonical_query(
+            config.keyword, config.start_date, config.end_date, config.categories, source="local"
+        )
+        return self.get_paper_store().search(
+            list(q.terms + q.ids), q.start_date, q.end_date, limit=fetch_size, categories=list(q.categories)
+        )
+
+    def _select_results(self, config: SearchConfig, papers: List[Paper]) -> List[Paper]:
+        """保存先を設定し、指定があれば関連度で並べ替えて上位を残す"""
+        # 保存先の指定（無ければ保存時に振り分けの規則で決める）
+        if config.notion_database_name:
+            for paper in papers:
+                paper.notion_database = config.notion_database_name
+
+        # 関連度で並べ替え、上位のみを翻訳対象にする
+        if config.rerank and papers:
+            query = " ".join(str(k) for k in config.keyword if k)
+            papers = self.ranker.rank(query, papers, top_k=config.max_results, min_score=config.min_relevance)
+
+        logging.info(f"検索結果: {len(papers)}件")
+        return papers
+
+    def _translation_targets(self, config: SearchConfig, papers: List[Paper]) -> List[Paper]:
+        """翻訳方針に応じて検索時に翻訳する論文を決める（残りは表示・選択時に翻訳）"""
+        if config.translation_mode == "eager":
+            targets = papers
+        elif config.translation_mode == "top_k":
+            targets = papers[:max(0, config.translate_top_k)]
+        else:
+            targets = []
+        # 訳文のある論文（ローカルストア・近似重複の訳文の流用）は翻訳しない
+        return [p for p in targets if not p.abstract_ja]
+
+    def translate_papers(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_chunk: Optional[Callable[[Paper, str], None]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        論文の abstract を翻訳して abstract_ja に設定する
+        翻訳に失敗した場合は未翻訳のまま返す（キャンセル時は TranslationCanceledException、
+        流量制限が続いた場合は ThrottledError。翻訳できた訳文はキャッシュされ、再試行時は送信しない）
+        Args:
+            papers (List[Paper]): 翻訳する論文リスト
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+            on_chunk (Optional[Callable[[Paper, str], None]]): 翻訳の途中経過を (論文, それまでの訳文) で受け取る関数
+            usage_run (Optional[UsageRun]): トークン使用量の集計・予算を適用する実行
+        Returns:
+            List[Paper]: 翻訳後の論文リスト（引数と同じオブジェクト）
+        """
+        try:
+            translator = self._get_translator()
+
+            # 全てのabstractをリストにまとめて翻訳
+            abstracts = [p.abstract for p in papers]
+            with get_tracer().span("pipeline.translate", papers=len(abstracts)):
+                translated_abstracts = translator.translate_en_to_jp(
+                    abstracts,
+                    on_chunk=None if on_chunk is None else (lambda i, partial: on_chunk(papers[i], partial)),
+                    is_cancelled=is_cancelled,
+                    usage_run=usage_run,
+                )
+
+            # 翻訳結果を元の論文オブジェクトに設定
+            for paper, translated_abstract in zip(papers, translated_abstracts):
+                paper.abstract_ja = translated_abstract
+        except (TranslationCanceledException, ThrottledError):
+            raise
+        except Exception:
+            # その他の例外はログに残し、未翻訳のまま返す
+            logging.exception("翻訳処理で例外が発生しました")
+        return papers
+
+    async def translate_papers_async(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_chunk: Optional[Callable[[Paper, str], None]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        論文の abstract を翻訳して abstract_ja に設定する（translate_papers の非同期版。on_chunk はループのスレッドから呼ばれる）
+        Returns:
+            List[Paper]: 翻訳後の論文リスト（引数と同じオブジェクト）
+        """
+        try:
+            translator = self._get_translator()
+            abstracts = [p.abstract for p in papers]
+            with get_tracer().span("pipeline.translate", papers=len(abstracts)):
+                translated_abstracts = await translator.translate_en_to_jp_async(
+                    abstracts,
+                    on_chunk=None if on_chunk is None else (lambda i, partial: on_chunk(papers[i], partial)),
+                    is_cancelled=is_cancelled,
+                    usage_run=usage_run,
+                )
+            for paper, translated_abstract in zip(papers, translated_abstracts):
+                paper.abstract_ja = translated_abstract
+        except (TranslationCanceledException, ThrottledError):
+            raise
+        except Exception:
+            logging.exception("翻訳処理で例外が発生しました")
+        return papers
+
+    def fetch_full_texts(
+        self,
+        papers: List[Paper],
+        summarize: bool = True,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        論文の PDF から本文を抽出し、ローカルストアの全文検索に登録する
+        summarize が True なら本文（抜粋）を要約して summary_ja に設定する
+        取得・要約に失敗した論文はそのまま返す（キャンセル時は TranslationCanceledException、流量制限が続いた場合は ThrottledError）
+        Args:
+            papers (List[Paper]): 論文リスト
+            summarize (bool): 本文を要約するかどうか
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): 要約のトークン使用量の集計・予算を適用する実行
+        Returns:
+            List[Paper]: 本文を取得できた論文
+        """
+        with get_tracer().span("pipeline.full_text", papers=len(papers)):
+            fetched = self.get_pdf_service().fetch_full_texts(papers, is_cancelled=is_cancelled)
+            if not fetched:
+                return fetched
+            self._store_full_texts(fetched)
+            if summarize:
+                self.summarize_papers(fetched, is_cancelled=is_cancelled, usage_run=usage_run)
+        return fetched
+
+    async def fetch_full_texts_async(
+        self,
+        papers: List[Paper],
+        summarize: bool = True,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        論文の PDF から本文を抽出し、ローカルストアの全文検索に登録する（fetch_full_texts の非同期版）
+        Returns:
+            List[Paper]: 本文を取得できた論文
+        """
+        with get_tracer().span("pipeline.full_text", papers=len(papers)):
+            fetched = await self.get_pdf_service().fetch_full_texts_async(papers, is_cancelled=is_cancelled)
+            if not fetched:
+                return fetched
+            await asyncio.get_running_loop().run_in_executor(None, self._store_full_texts, fetched)
+            if summarize:
+                await self.summarize_papers_async(fetched, is_cancelled=is_cancelled, usage_run=usage_run)
+        return fetched
+
+    def _store_full_texts(self, papers: List[Paper]):
+        """本文をローカルストアの全文検索に登録する（失敗はログに残して続ける）"""
+        try:
+            store = self.get_paper_store()
+            store.upsert_papers(papers)
+            for p in papers:
+                store.set_full_text(p.id, p.full_text)
+        except Exception:
+            logging.exception("本文のローカルストアへの登録に失敗しました")
+
+    def summarize_papers(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """
+        全文取得済みの論文の本文（Abstract・Introduction・Conclusion）を要約して summary_ja に設定する
+        Args:
+            papers (List[Paper]): 論文リスト
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): トークン使用量の集計・予算を適用する実行
+        Returns:
+            List[Paper]: 要約後の論文リスト（引数と同じオブジェクト）
+        """
+        targets = [p for p in papers if p.full_text]
+        if not targets:
+            return papers
+        try:
+            translator = self._get_translator()
+            with get_tracer().span("pipeline.summarize", papers=len(targets)):
+                summaries = translator.summarize_en_to_jp(
+                    [summary_source(p) for p in targets], is_cancelled=is_cancelled, usage_run=usage_run
+                )
+            for paper, summary in zip(targets, summaries):
+                paper.summary_ja = summary
+        except (TranslationCanceledException, ThrottledError):
+            raise
+        except Exception:
+            logging.exception("要約処理で例外が発生しました")
+        return papers
+
+    async def summarize_papers_async(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[Paper]:
+        """全文取得済みの論文の本文を要約して summary_ja に設定する（summarize_papers の非同期版）"""
+        targets = [p for p in papers if p.full_text]
+        if not targets:
+            return papers
+        try:
+            translator = self._get_translator()
+            with get_tracer().span("pipeline.summarize", papers=len(targets)):
+                summaries = await translator.summarize_en_to_jp_async(
+                    [summary_source(p) for p in targets], is_cancelled=is_cancelled, usage_run=usage_run
+                )
+            for paper, summary in zip(targets, summaries):
+                paper.summary_ja = summary
+        except (TranslationCanceledException, ThrottledError):
+            raise
+        except Exception:
+            logging.exception("要約処理で例外が発生しました")
+        return papers
+
+    async def aclose(self):
+        """各サービスが生成した非同期の HTTP クライアントを閉じる（イベントループの停止前に呼ぶ）"""
+        await self.arxiv_service.aclose()
+        if self.pdf_service is not None:
+            await self.pdf_service.aclose()
+        if self.notion_service is not None:
+            await self.notion_service.aclose()
+
+    def save(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[str]:
+        """
+        論文を Notion に保存する
+        Args:
+            papers (List[Paper]): 保存する論文オブジェクトのリスト
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+        Returns:
+            List[str]: 保存に成功した論文IDのリスト（保存先の設定・スキーマと合わない論文は送信せずに除く）
+        """
+        notion_service = self.get_notion_service()
+        success_ids: List[str] = []
+        with get_tracer().span("pipeline.save", papers=len(papers)):
+            for paper in papers:
+                if is_cancelled is not None and is_cancelled():
+                    break
+                try:
+                    if notion_service.create_page(paper):
+                        success_ids.append(paper.id)
+                except NotionValidationError as e:
+                    logging.error("Notionに保存できない論文です（%s）: %s", e, paper.id)
+        return success_ids
+
+    def run_watches(self, max_results: int = 50, save: bool = True) -> Dict[str, int]:
+        """
+        全ウォッチの新着論文を取得・翻訳し、Notion に保存する（定期実行用）
+        Args:
+            max_results (int): ウォッチごとの最大取得数
+            save (bool): Notion に保存するかどうか
+        Returns:
+            Dict[str, int]: {ウォッチの表示名: 新着件数}
+        """
+        result: Dict[str, int] = {}
+        self.start_run()
+        for watch in self.watch_service.list():
+            # 保存したキーワード・カテゴリで検索する（ウォッチのキーと同じ条件）
+            config = SearchConfig(
+                keyword=list(watch.terms),
+                categories=list(watch.categories),
+                max_results=max_results,
+                start_date="",
+                end_date="",
+                watch=True,
+            )
+            try:
+                papers = self.search(config)
+            except Exception:
+                logging.exception("ウォッチの実行に失敗しました: %s", watch.label())
+                continue
+            result[watch.label()] = len(papers)
+            logging.info("ウォッチ「%s」: 新着 %d件", watch.label(), len(papers))
+            if save and papers:
+                self.enqueue_save(papers)
+        # 保存は永続キュー経由（途中で終了しても次回の実行で続きから保存される）
+        if save:
+            try:
+                OutboxWorker(self.get_outbox(), self.get_notion_service).drain()
+            except Exception:
+                # Notion 未設定など。登録済みのジョブは保存待ちのまま残り、次回の実行・GUI の起動時に再開する
+                logging.exception("Notionへの保存に失敗しました（保存待ちのジョブは次回に再開します）")
+        return result
@@ -0,0 +1,437 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+
+from domain.models import Paper, SearchConfig
+from services.pipeline import PaperPipeline
+from services.profiling import profile_run
+from services.translation_service import TranslationCanceledException
+from services.usage_ledger import UsageRun
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# イベントが無いときに送る生存確認の間隔（秒。クライアントはこの間隔でキャンセルを確認できる）
+HEARTBEAT_S = 1.0
+# 保持する完了済みジョブの数（古いものから破棄）
+MAX_FINISHED_JOBS = 200
+
+
+@dataclass
+class Job:
+    """
+    サーバーで実行するジョブ（検索・翻訳・全文取得）
+    - status: "running" | "done" | "error" | "cancelled"
+    - error_type: 失敗時の例外のクラス名（クライアントが ThrottledError などを送出し直す）
+    - events: 途中経過（翻訳の訳文の差分など）。/jobs/<id>/events で順に配信する
+    - usage_run: トークン使用量の集計・実行ごとの予算（並行する他の利用者のジョブとは別に数える）
+    """
+    id: str
+    kind: str
+    status: str = "running"
+    result: Any = None
+    error: str = ""
+    error_type: str = ""
+    events: List[dict] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    usage_run: UsageRun = field(default_factory=UsageRun, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def cancelled(self) -> bool:
+        """キャンセルされたか（パイプラインの is_cancelled に渡す）"""
+        return self._cancel.is_set()
+
+    def emit(self, event: dict):
+        """途中経過を追加する（ジョブのスレッドから呼ぶ）"""
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, status: str, result: Any = None, error: str = "", error_type: str = "") -> bool:
+        """
+        ジョブを完了にする（キャンセル済みなら何もしない。"cancelled" なら実行中の処理にも打ち切りを伝える）
+        Returns:
+            bool: 完了にしたかどうか
+        """
+        with self._cond:
+            if self.finished:
+                return False
+            self.status, self.result, self.error, self.error_type = status, result, error, error_type
+            if status == "cancelled":
+                self._cancel.set()
+            self._cond.notify_all()
+            return True
+
+    def wait_events(self, after: int, timeout: float) -> Tuple[List[dict], bool]:
+        """
+        after 番目以降の途中経過を、追加されるか完了するまで待って返す
+        Returns:
+            Tuple[List[dict], bool]: (途中経過, 完了したかどうか)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.events) > after or self.finished, timeout)
+            return self.events[after:], self.finished
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "error_type": self.error_type,
+            "events": len(self.events),
+        }
+
+
+class JobManager:
+    """ジョブを上限付きのスレッドプールで実行し、完了済みのジョブを一定数保持する"""
+
+    def __init__(self, max_workers: int = 8, keep: int = MAX_FINISHED_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.keep = keep
+
+    def start(self, kind: str, fn: Callable[[Job], Any]) -> Job:
+        """
+        ジョブを開始する
+        Args:
+            kind (str): 種類（"search" など）
+            fn (Callable[[Job], Any]): 処理（戻り値が結果。JSON に変換できる値）
+        Returns:
+            Job: 開始したジョブ
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]):
+        try:
+            job.finish("done", result=fn(job))
+        except TranslationCanceledException:
+            job.finish("cancelled")
+        except Exception as e:
+            logging.exception("ジョブの実行に失敗しました: %s %s", job.kind, job.id)
+            job.finish("error", error=str(e), error_type=type(e).__name__)
+
+    def _prune(self):
+        """完了済みのジョブを古いものから破棄する（ロック内で呼ぶ）"""
+        finished = [jid for jid, j in self._jobs.items() if j.finished]
+        for jid in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[jid]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        ジョブをキャンセルする（結果は破棄し、未送信の翻訳・PDF の取得は送信しない。
+        送信済みの通信・他の利用者と共有している翻訳は最後まで実行し、キャッシュに残す）
+        Returns:
+            bool: キャンセルしたかどうか（完了済み・存在しないなら False）
+        """
+        job = self.get(job_id)
+        return job is not None and job.finish("cancelled")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PipelineServer:
+    """
+    PaperPipeline を HTTP/JSON で公開するローカルサーバー（複数の利用者で1つのパイプラインを共有する）
+    - arXiv の同時リクエストの集約・翻訳のキャッシュ・流量制限・トークン予算・Notion クライアントと保存キューを全員で共有する
+    - 検索・翻訳・全文取得はジョブとして実行し、ジョブIDで結果と途中経過（NDJSON のストリーム）を取得する
+
+    エンドポイント:
+        GET    /health                 生存確認
+        GET    /capabilities           翻訳のストリーミング・Notion の設定の有無・保存先のデータベースの名前
+        POST   /search                 {"config": SearchConfig} → {"job_id"}
+        POST   /translate              {"papers": [Paper]} → {"job_id"}
+                                       （途中経過 {"type": "chunk", "index", "delta"}。続きでない訳文は "text" で全文）
+        POST   /full_texts             {"papers": [Paper], "summarize": bool} → {"job_id"}
+        GET    /jobs/<id>              ジョブの状態と結果（失敗時は error と例外のクラス名 error_type）
+        GET    /jobs/<id>/events       途中経過の NDJSON ストリーム（?after=N から。最後に {"type": "end", ...}）
+        DELETE /jobs/<id>              ジョブのキャンセル
+        POST   /save                   {"papers": [Paper]} → {"enqueued", "skipped"}（Notion 保存キューに登録。
+                                       skipped は近似重複のため登録しなかった論文 {論文ID: 重複先の論文ID}）
+        POST   /save/status            {"paper_ids": [str]} → {"counts", "statuses"}
+        GET    /watches                {"keywords", "watches": [{"keyword", "categories"}]}
+        POST   /watches                {"keyword", "categories"} → ウォッチを追加
+    """
+
+    def __init__(
+        self,
+        pipeline: Optional[PaperPipeline] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_jobs: int = 8,
+    ):
+        """
+        Args:
+            pipeline (Optional[PaperPipeline]): 共有するパイプライン（省略時は生成）
+            host (str): 待ち受けるアドレス（既定はローカルのみ）
+            port (int): 待ち受けるポート（0 なら空いているポート）
+            max_jobs (int): 同時に実行するジョブ数の上限
+        """
+        self.pipeline = pipeline or PaperPipeline()
+        self.jobs = JobManager(max_workers=max_jobs)
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable[..., Tuple[int, Any]]]] = [
+            ("GET", re.compile(r"^/health$"), lambda body, q: (200, {"status": "ok"})),
+            ("GET", re.compile(r"^/capabilities$"), self._capabilities),
+            ("POST", re.compile(r"^/search$"), self._search),
+            ("POST", re.compile(r"^/translate$"), self._translate),
+            ("POST", re.compile(r"^/full_texts$"), self._full_texts),
+            ("GET", re.compile(r"^/jobs/(?P<job_id>\w+)$"), self._job),
+            ("DELETE", re.compile(r"^/jobs/(?P<job_id>\w+)$"), self._cancel),
+            ("POST", re.compile(r"^/save$"), self._save),
+            ("POST", re.compile(r"^/save/status$"), self._save_status),
+            ("GET", re.compile(r"^/watches$"), self._watches),
+            ("POST", re.compile(r"^/watches$"), self._add_watch),
+        ]
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """待ち受けているアドレスとポート"""
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def _start_outbox_worker(self):
+        """Notion 保存ジョブのワーカーを開始（Notion 未設定ならジョブは保存待ちのまま）"""
+        try:
+            self.pipeline.start_outbox_worker()
+        except Exception:
+            logging.exception("Notion保存ジョブのワーカーを開始できませんでした")
+
+    def serve_forever(self):
+        """サーバーを実行する（shutdown まで戻らない）"""
+        self._start_outbox_worker()
+        logging.info("パイプラインサーバーを起動しました: %s", self.url)
+        self._httpd.serve_forever()
+
+    def start(self) -> "PipelineServer":
+        """サーバーをバックグラウンドのスレッドで実行する"""
+        self._thread = threading.Thread(target=self.serve_forever, name="pipeline-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """サーバーを停止する"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.jobs.shutdown()
+        if self.pipeline.outbox_worker is not None:
+            self.pipeline.outbox_worker.stop(timeout=2.0)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def route(self, method: str, path: str) -> Tuple[Optional[Callable[..., Tuple[int, Any]]], Dict[str, str]]:
+        """メソッドとパスから処理を探す"""
+        for m, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if m == method and match:
+                return handler, match.groupdict()
+        return None, {}
+
+    # ---- エンドポイント（(ステータスコード, JSON に変換する値) を返す） ----
+
+    def _capabilities(self, body: dict, query: dict) -> Tuple[int, Any]:
+        try:
+            self.pipeline.get_notion_service()
+            notion = True
+        except Exception:
+            notion = False
+        return 200, {
+            "streams_translations": self.pipeline.streams_translations(),
+            "notion": notion,
+            "notion_databases": self.pipeline.notion_database_names() if notion else [],
+        }
+
+    def _search(self, body: dict, query: dict) -> Tuple[int, Any]:
+        config = SearchConfig.model_validate(body.get("config") or {})
+
+        def _run(job: Job) -> dict:
+            # トークン使用量の実行ごとの集計・予算はジョブごと（共有の集計を0に戻すと並行する他の利用者の分も消える）
+            with profile_run("search"):
+                papers = self.pipeline.search(config, is_cancelled=job.cancelled, usage_run=job.usage_run)
+            return {"papers": [p.model_dump() for p in papers]}
+        return 202, {"job_id": self.jobs.start("search", _run).id}
+
+    def _translate(self, body: dict, query: dict) -> Tuple[int, Any]:
+        papers = [Paper.model_validate(p) for p in body.get("papers") or []]
+        index = {id(p): i for i, p in enumerate(papers)}
+
+        def _run(job: Job) -> dict:
+            # 途中経過は前回からの差分のみを保持する（全文を毎回保持するとメモリが訳文の長さの2乗で増える）
+            sent: Dict[int, str] = {}
+
+            def _on_chunk(p: Paper, text: str):
+                i = index[id(p)]
+                prev = sent.get(i, "")
+                if text == prev:
+                    return
+                sent[i] = text
+                if prev and text.startswith(prev):
+                    job.emit({"type": "chunk", "index": i, "paper_id": p.id, "delta": text[len(prev):]})
+                else:
+                    # 最初のチャンク・流量制限による生成のやり直しは全文を送る
+                    job.emit({"type": "chunk", "index": i, "paper_id": p.id, "text": text})
+
+            self.pipeline.translate_papers(
+                papers, is_cancelled=job.cancelled, on_chunk=_on_chunk, usage_run=job.usage_run
+            )
+            return {"papers": [p.model_dump() for p in papers]}
+        return 202, {"job_id": self.jobs.start("translate", _run).id}
+
+    def _full_texts(self, body: dict, query: dict) -> Tuple[int, Any]:
+        papers = [Paper.model_validate(p) for p in body.get("papers") or []]
+        summarize = bool(body.get("summarize", True))
+
+        def _run(job: Job) -> dict:
+            with profile_run("full_texts"):
+                fetched = self.pipeline.fetch_full_texts(
+                    papers, summarize=summarize, is_cancelled=job.cancelled, usage_run=job.usage_run
+                )
+            return {"papers": [p.model_dump() for p in fetched]}
+        return 202, {"job_id": self.jobs.start("full_texts", _run).id}
+
+    def _job(self, body: dict, query: dict, job_id: str) -> Tuple[int, Any]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return 404, {"error": f"ジョブが見つかりません: {job_id}"}
+        return 200, job.to_dict()
+
+    def _cancel(self, body: dict, query: dict, job_id: str) -> Tuple[int, Any]:
+        if self.jobs.get(job_id) is None:
+            return 404, {"error": f"ジョブが見つかりません: {job_id}"}
+        return 200, {"cancelled": self.jobs.cancel(job_id)}
+
+    def _save(self, body: dict, query: dict) -> Tuple[int, Any]:
+        papers = [Paper.model_validate(p) for p in body.get("papers") or []]
+        result = self.pipeline.enqueue_save(papers)
+        return 200, {"enqueued": result.enqueued, "skipped": result.skipped}
+
+    def _save_status(self, body: dict, query: dict) -> Tuple[int, Any]:
+        outbox = self.pipeline.get_outbox()
+        ids = [str(i) for i in body.get("paper_ids") or []]
+        return 200, {"counts": outbox.counts(), "statuses": outbox.latest_status(ids)}
+
+    def _watches(self, body: dict, query: dict) -> Tuple[int, Any]:
+        watches = self.pipeline.watch_service.list()
+        return 200, {
+            "keywords": [w.keyword for w in watches],
+            "watches": [{"keyword": w.keyword, "categories": w.categories} for w in watches],
+        }
+
+    def _add_watch(self, body: dict, query: dict) -> Tuple[int, Any]:
+        categories = [str(c) for c in body.get("categories") or []]
+        watch = self.pipeline.watch_service.add(str(body.get("keyword") or ""), categories)
+        return 200, {"keyword": watch.keyword if watch else None}
+
+    def stream_events(self, handler: BaseHTTPRequestHandler, job_id: str, after: int):
+        """
+        ジョブの途中経過を NDJSON で配信する（完了したら結果を含む {"type": "end"} を送って閉じる）
+        イベントが無い間は HEARTBEAT_S ごとに {"type": "ping"} を送る
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            _send_json(handler, 404, {"error": f"ジョブが見つかりません: {job_id}"})
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+        try:
+            while True:
+                events, finished = job.wait_events(after, HEARTBEAT_S)
+                lines = [json.dumps(e, ensure_ascii=False) for e in events]
+                after += len(events)
+                if finished:
+                    lines.append(json.dumps({"type": "end", **job.to_dict()}, ensure_ascii=False))
+                elif not events:
+                    lines.append('{"type": "ping"}')
+                handler.wfile.write(("\n".join(lines) + "\n").encode("utf-8"))
+                handler.wfile.flush()
+                if finished:
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            # クライアントが切断した（ジョブは続行し、結果は /jobs/<id> で取得できる）
+            return
+
+
+def _send_json(handler: BaseHTTPRequestHandler, status: int, payload: Any):
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json; charset=utf-8")
+    handler.send_header("Content-Length", str(len(data)))
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+def _make_handler(server: PipelineServer):
+    """PipelineServer にリクエストを振り分けるハンドラのクラスを作る"""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def _dispatch(self, method: str):
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            m = re.match(r"^/jobs/(\w+)/events$", url.path)
+            if method == "GET" and m:
+                server.stream_events(self, m.group(1), int(query.get("after", 0) or 0))
+                return
+            handler, params = server.route(method, url.path)
+            if handler is None:
+                _send_json(self, 404, {"error": f"見つかりません: {method} {url.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                status, payload = handler(body, query, **params)
+            except ValueError as e:
+                # JSON・SearchConfig・Paper の検証エラー
+                status, payload = 400, {"error": str(e)}
+            except Exception as e:
+                logging.exception("リクエストの処理に失敗しました: %s %s", method, url.path)
+                status, payload = 500, {"error": str(e)}
+            _send_json(self, status, payload)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        def log_message(self, format: str, *args):
+            logging.debug("pipeline-server: " + format, *args)
+
+    return _Handler
@@ -0,0 +1,167 @@
+from __future__ import annotations
+from typing import Callable, Iterator, Optional, TypeVar
+from contextlib import contextmanager
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+T = TypeVar("T")
+
+# 出力先のディレクトリ（設定されていれば計測する。main.py の --profile でも設定される）
+PROFILE_DIR_ENV = "PAPER_TO_NOTION_PROFILE_DIR"
+# ログ・サマリに出す上位の件数
+PROFILE_TOP_ENV = "PAPER_TO_NOTION_PROFILE_TOP"
+DEFAULT_TOP_N = 25
+# tracemalloc で記録するスタックの深さ
+_TRACEMALLOC_FRAMES = 10
+
+_local = threading.local()
+_seq = itertools.count(1)
+# tracemalloc はプロセス全体で1つのため、計測中の区間の数で開始・停止する
+_memory_lock = threading.Lock()
+_memory_users = 0
+
+
+def profile_dir() -> str:
+    """プロファイルの出力先（未設定なら空文字で、計測しない）"""
+    return os.getenv(PROFILE_DIR_ENV, "")
+
+
+def _top_n() -> int:
+    try:
+        return max(1, int(os.getenv(PROFILE_TOP_ENV, "") or DEFAULT_TOP_N))
+    except ValueError:
+        return DEFAULT_TOP_N
+
+
+def _start_memory():
+    global _memory_users
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+        _memory_users += 1
+
+
+def _stop_memory():
+    global _memory_users
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def format_profile(profiler: cProfile.Profile, top_n: int) -> str:
+    """cProfile の結果の上位（累積時間順）をテキストにする"""
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    return out.getvalue()
+
+
+def format_memory(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top_n: int) -> str:
+    """区間の前後の tracemalloc スナップショットの差分の上位（増加量順）をテキストにする"""
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"現在 {current / 1024 / 1024:.1f}MiB / ピーク {peak / 1024 / 1024:.1f}MiB（計測開始から）"]
+    lines.extend(str(stat) for stat in diff[:top_n])
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_run(name: str) -> Iterator[None]:
+    """
+    区間を cProfile と tracemalloc で計測し、PAPER_TO_NOTION_PROFILE_DIR にファイルを書き出す
+    未設定なら何もしない（計測のオーバーヘッドは無い）
+    - profile-<name>-<日時>-<連番>.prof: pstats 形式（snakeviz などで開ける）
+    - profile-<name>-<日時>-<連番>.txt: 累積時間の上位と、メモリの増加量の上位（ログにも出力）
+    cProfile は呼び出したスレッドのみを計測する（翻訳のワーカースレッドの待ち時間は呼び出し元の待機として現れる）
+    同じスレッドで入れ子になった区間は外側の区間に含める
+    Args:
+        name (str): 区間名（ファイル名に使用。例: "search"）
+    """
+    out_dir = profile_dir()
+    if not out_dir or getattr(_local, "active", False):
+        yield
+        return
+    _local.active = True
+    _start_memory()
+    before = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+    finally:
+        elapsed = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+        _stop_memory()
+        _local.active = False
+        _write_profile(out_dir, name, elapsed, profiler, before, after)
+
+
+def _write_profile(
+    out_dir: str,
+    name: str,
+    elapsed: float,
+    profiler: cProfile.Profile,
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+) -> Optional[str]:
+    """プロファイルをファイルに書き出し、上位をログに出力する（失敗しても処理は止めない）"""
+    top_n = _top_n()
+    base = os.path.join(out_dir, f"profile-{name}-{time.strftime('%Y%m%d-%H%M%S')}-{next(_seq)}")
+    try:
+        summary = (
+            f"[profile {name}] {elapsed * 1000:.1f}ms\n"
+            f"--- cProfile（累積時間の上位{top_n}件）---\n{format_profile(profiler, top_n)}"
+            f"--- tracemalloc（増加量の上位{top_n}件）---\n{format_memory(before, after, top_n)}\n"
+        )
+        os.makedirs(out_dir, exist_ok=True)
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(summary)
+        logging.info("%s\nプロファイルを出力しました: %s.prof", summary, base)
+        return base + ".prof"
+    except Exception:
+        logging.exception("プロファイルの出力に失敗しました: %s", name)
+        return None
+
+
+def profiled(name: str, fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    関数の呼び出しを profile_run で計測する関数を返す（別スレッドで実行する関数を、そのスレッドで計測するために使う）
+    fn がコルーチン関数なら、完了までを計測するコルーチン関数を返す
+    （計測はイベントループのスレッドで行うため、同じループで並行するタスクの処理も含む）
+    Args:
+        name (str): 区間名
+        fn (Callable[..., T]): 計測する関数
+    Returns:
+        Callable[..., T]: fn と同じ引数・戻り値の関数
+    """
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def _async_wrapper(*args, **kwargs):
+            with profile_run(name):
+                return await fn(*args, **kwargs)
+        return _async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(fn)
+    def _wrapper(*args, **kwargs) -> T:
+        with profile_run(name):
+            return fn(*args, **kwargs)
+    return _wrapper
@@ -0,0 +1,151 @@
+from __future__ import annotations
+from typing import List, Optional
+from collections import OrderedDict
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from domain.models import Paper
+from services.instrumentation import get_tracer
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# 関連度に寄与しない頻出語
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were we which with "
+    "our their these those can also using use based via than into over such show shows propose proposed paper "
+    "results method methods approach new".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """英文を小文字の単語列に分割（ストップワード・1文字語を除外）"""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class RelevanceRanker:
+    """
+    検索結果をクエリとの関連度で並べ替える（CPU のみ、外部モデル不要）
+    - 論文（タイトル+abstract）を特徴量ハッシングした TF ベクトルに変換し、論文IDごとにキャッシュ
+    - 並べ替え時に結果集合から IDF を求め、TF-IDF のコサイン類似度で採点（NumPy でまとめて計算）
+    """
+
+    def __init__(self, dim: int = 4096, cache_size: int = 10000, batch_size: int = 256):
+        """
+        Args:
+            dim (int): ハッシュ次元数
+            cache_size (int): キャッシュする論文ベクトルの最大数（超えたら古いものから破棄）
+            batch_size (int): 1度にベクトル化する論文数
+        """
+        self.dim = dim
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _hash_tokens(self, tokens: List[str], out: np.ndarray):
+        """単語列をハッシュ次元に集計し、対数 TF に変換して out（1行）に書き込む"""
+        for t in tokens:
+            out[zlib.crc32(t.encode("utf-8")) % self.dim] += 1.0
+        np.log1p(out, out=out)
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        テキストを TF ベクトルに変換
+        Args:
+            texts (List[str]): テキストのリスト
+        Returns:
+            np.ndarray: (len(texts), dim) の行列
+        """
+        mat = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            self._hash_tokens(tokenize(text), mat[i])
+        return mat
+
+    def embed_papers(self, papers: List[Paper]) -> np.ndarray:
+        """
+        論文を TF ベクトルに変換（論文IDごとにキャッシュし、未計算分のみバッチで計算）
+        Args:
+            papers (List[Paper]): 論文リスト
+        Returns:
+            np.ndarray: (len(papers), dim) の行列
+        """
+        tracer = get_tracer()
+        mat = np.zeros((len(papers), self.dim), dtype=np.float32)
+        missing: List[int] = []
+        with self._lock:
+            for i, p in enumerate(papers):
+                vec = self._cache.get(p.id)
+                if vec is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(p.id)
+                    mat[i] = vec
+        tracer.incr("ranking.cache_hit", len(papers) - len(missing))
+        tracer.incr("ranking.cache_miss", len(missing))
+
+        for b in range(0, len(missing), self.batch_size):
+            idx = missing[b:b + self.batch_size]
+            vecs = self.embed_texts([f"{papers[i].title}\n{papers[i].abstract}" for i in idx])
+            mat[idx] = vecs
+            with self._lock:
+                for i, vec in zip(idx, vecs):
+                    self._cache[papers[i].id] = vec
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return mat
+
+    def score(self, query: str, papers: List[Paper]) -> np.ndarray:
+        """
+        クエリと各論文の関連度（0〜1 のコサイン類似度）
+        Args:
+            query (str): 検索クエリ
+            papers (List[Paper]): 論文リスト
+        Returns:
+            np.ndarray: 関連度の配列
+        """
+        if not papers:
+            return np.zeros(0, dtype=np.float32)
+        docs = self.embed_papers(papers)
+        q = self.embed_texts([query])[0]
+        # 結果集合内の文書頻度から IDF を計算
+        df = np.count_nonzero(docs, axis=0).astype(np.float32)
+        idf = np.log((1.0 + len(papers)) / (1.0 + df)) + 1.0
+        docs = docs * idf
+        q = q * idf
+        norms = np.linalg.norm(docs, axis=1) * (np.linalg.norm(q) or 1.0)
+        norms[norms == 0] = 1.0
+        return (docs @ q) / norms
+
+    def rank(
+        self,
+        query: str,
+        papers: List[Paper],
+        top_k: Optional[int] = None,
+        min_score: float = 0.0,
+    ) -> List[Paper]:
+        """
+        関連度の高い順に並べ替え、上位 top_k 件（min_score 未満は除外）を返す
+        各論文の relevance に関連度を設定する
+        Args:
+            query (str): 検索クエリ
+            papers (List[Paper]): 論文リスト
+            top_k (Optional[int]): 返す最大件数（None なら全件）
+            min_score (float): 関連度の下限
+        Returns:
+            List[Paper]: 並べ替え後の論文リスト
+        """
+        with get_tracer().span("ranking.rank", papers=len(papers)):
+            scores = self.score(query, papers)
+            # 同点は元の順（新しい順）を維持
+            order = np.argsort(-scores, kind="stable")
+            ranked: List[Paper] = []
+            for i in order:
+                if scores[i] < min_score:
+                    break
+                papers[i].relevance = float(scores[i])
+                ranked.append(papers[i])
+                if top_k is not None and len(ranked) >= top_k:
+                    break
+        return ranked
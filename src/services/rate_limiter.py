@@ -0,0 +1,301 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import logging
+import random
+import threading
+import time
+
+from services.instrumentation import get_tracer
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレート制限（スレッドセーフ）
+    - rate: 1秒あたりに補充するトークン数（平均リクエスト数）
+    - burst: 貯められるトークンの上限（連続して送信できる数）
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """経過時間分のトークンを補充"""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        トークンがあれば1つ消費する（待たない）
+        Returns:
+            bool: 消費できたかどうか
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        トークンが補充されるまで待って1つ消費する
+        Args:
+            timeout (Optional[float]): 最大待ち時間（秒。None なら無制限）
+        Returns:
+            bool: 消費できたかどうか（タイムアウト時は False）
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """トークンが補充されるまで待って1つ消費する（イベントループのスレッドを塞がない acquire）"""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+class ThrottledError(Exception):
+    """再試行しても API の流量制限が解除されなかったことを示す例外"""
+    pass
+
+
+def is_throttle_error(e: BaseException) -> bool:
+    """
+    流量制限（HTTP 429 / RESOURCE_EXHAUSTED / rate_limited）による例外か
+    google-genai の APIError（code, status）と notion-client の APIResponseError（status, code）に対応
+    """
+    for attr in ("code", "status", "status_code"):
+        value = getattr(e, attr, None)
+        if value in (429, "429", "RESOURCE_EXHAUSTED", "rate_limited"):
+            return True
+    return False
+
+
+def retry_after_seconds(e: BaseException) -> Optional[float]:
+    """例外のレスポンスに Retry-After ヘッダーがあれば秒数を返す"""
+    headers = getattr(e, "headers", None) or getattr(getattr(e, "response", None), "headers", None)
+    try:
+        value = headers.get("retry-after") if headers is not None else None
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    再試行までの待ち時間（指数バックオフ + フルジッター）
+    Args:
+        attempt (int): 再試行の回数（1始まり）
+        base (float): 基準の秒数
+        cap (float): 最大の秒数
+    Returns:
+        float: 0〜min(cap, base*2^(attempt-1)) の一様乱数
+    """
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class AimdLimiter:
+    """
+    同時実行数を AIMD（加算増加・乗算減少）で調整する制限器（スレッドセーフ）
+    - スレッドからは call、イベントループのコルーチンからは call_async で呼び、同じ上限を共有する
+    - 成功するたびに上限を increase / 上限 ずつ増やす（上限分の成功で +increase）
+    - 流量制限の応答で上限を decrease 倍にする（同じ時期に送信したリクエストによる減少は1回のみ）
+    - 現在の上限は計測のゲージ "<name>.concurrency_limit" に出力する
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: float = 2,
+        min_limit: float = 1,
+        max_limit: float = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(min(max(initial, min_limit), self.max_limit))
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        # 枠の空きを待っているコルーチン（release でループに起こしてもらう）
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+        get_tracer().set_gauge(f"{self.name}.concurrency_limit", self._limit)
+
+    @property
+    def limit(self) -> float:
+        """現在の同時実行数の上限"""
+        with self._cond:
+            return self._limit
+
+    def acquire(self) -> float:
+        """
+        同時実行数が上限未満になるまで待って枠を確保する
+        Returns:
+            float: 確保した時刻（release に渡す）
+        """
+        with self._cond:
+            while self._in_flight >= max(1, int(self._limit)):
+                self._cond.wait()
+            self._in_flight += 1
+            return time.monotonic()
+
+    async def acquire_async(self) -> float:
+        """
+        同時実行数が上限未満になるまで待って枠を確保する（イベントループのスレッドを塞がない acquire）
+        Returns:
+            float: 確保した時刻（release に渡す）
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._in_flight < max(1, int(self._limit)):
+                    self._in_flight += 1
+                    return time.monotonic()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self, started: float, throttled: bool = False, ok: bool = True):
+        """
+        枠を解放し、結果に応じて上限を調整する
+        Args:
+            started (float): acquire の戻り値
+            throttled (bool): 流量制限の応答だったかどうか
+            ok (bool): 成功したかどうか（流量制限以外の失敗では上限を変えない）
+        """
+        tracer = get_tracer()
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                tracer.incr(f"{self.name}.throttled")
+                if started >= self._last_decrease:
+                    self._limit = max(self.min_limit, self._limit * self.decrease)
+                    self._last_decrease = time.monotonic()
+            elif ok:
+                self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+            tracer.set_gauge(f"{self.name}.concurrency_limit", self._limit)
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        **kwargs,
+    ) -> Any:
+        """
+        枠を確保して fn を呼び出す
+        流量制限の例外なら枠を解放してバックオフ後に再送し（Retry-After があれば従う）、それ以外の例外はそのまま送出する
+        Args:
+            fn (Callable[..., Any]): 呼び出す関数
+            max_retries (int): 流量制限時の最大再送回数
+            base_delay (float): バックオフの基準の秒数
+            max_delay (float): バックオフの最大の秒数
+        Returns:
+            Any: fn の戻り値
+        """
+        attempt = 0
+        while True:
+            started = self.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                self.release(started, throttled=throttled, ok=False)
+                if not throttled:
+                    raise
+                attempt += 1
+                if attempt > max_retries:
+                    raise ThrottledError(f"{self.name}: 流量制限が続いたため中止しました") from e
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = backoff_delay(attempt, base_delay, max_delay)
+                logging.info("%s: 流量制限のため %.1f 秒後に再送します（%d回目）", self.name, delay, attempt)
+                time.sleep(delay)
+                continue
+            self.release(started)
+            return result
+
+    async def call_async(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        **kwargs,
+    ) -> Any:
+        """
+        枠を確保してコルーチン関数 fn を呼び出す（call の非同期版。バックオフ中もループのスレッドを塞がない）
+        Args:
+            fn (Callable[..., Awaitable[Any]]): 呼び出すコルーチン関数
+            max_retries (int): 流量制限時の最大再送回数
+            base_delay (float): バックオフの基準の秒数
+            max_delay (float): バックオフの最大の秒数
+        Returns:
+            Any: fn の戻り値
+        """
+        attempt = 0
+        while True:
+            started = await self.acquire_async()
+            try:
+                result = await fn(*args, **kwargs)
+            except asyncio.CancelledError:
+                self.release(started, ok=False)
+                raise
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                self.release(started, throttled=throttled, ok=False)
+                if not throttled:
+                    raise
+                attempt += 1
+                if attempt > max_retries:
+                    raise ThrottledError(f"{self.name}: 流量制限が続いたため中止しました") from e
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = backoff_delay(attempt, base_delay, max_delay)
+                logging.info("%s: 流量制限のため %.1f 秒後に再送します（%d回目）", self.name, delay, attempt)
+                await asyncio.sleep(delay)
+                continue
+            self.release(started)
+            return result
+
+
+def _wake(waiter: "asyncio.Future[None]"):
+    """枠の空きを待っているコルーチンを起こす（待ちがキャンセル済みなら何もしない）"""
+    if not waiter.done():
+        waiter.set_result(None)
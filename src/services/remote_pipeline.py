@@ -0,0 +1,457 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import threading
+
+import httpx
+import requests
+
+from domain.models import Paper, SearchConfig, Watch
+from services.pipeline import EnqueueResult
+from services.rate_limiter import ThrottledError
+from services.translation_service import TranslationCanceledException
+
+# ストリームの読み取りを打ち切るまでの秒数（サーバーは HEARTBEAT_S ごとに生存確認を送る）
+_STREAM_READ_TIMEOUT_S = 30.0
+
+
+class RemotePipelineError(Exception):
+    """サーバーでジョブが失敗した・サーバーがエラーを返したことを示す例外"""
+    pass
+
+
+class RemotePipeline:
+    """
+    PipelineServer のクライアント（AppController から PaperPipeline の代わりに使う）
+    - 検索・翻訳・全文取得はサーバーのジョブとして実行し、途中経過をストリームで受け取る
+    - キャンセルされたらサーバーのジョブをキャンセルして TranslationCanceledException
+    - サーバーで流量制限が続いたジョブは PaperPipeline と同じく ThrottledError
+    - 保存はサーバーの保存キューに登録し、状態はポーリングで取得する
+    - *_async はイベントループから呼ぶ（httpx.AsyncClient で通信し、タスクのキャンセル時はサーバーのジョブもキャンセルする）
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session=None,
+        timeout: float = 10.0,
+        poll_interval: float = 2.0,
+        async_session=None,
+    ):
+        """
+        Args:
+            base_url (str): サーバーの URL（例: "http://127.0.0.1:8765"）
+            session: requests.Session 互換の HTTP クライアント（省略時は生成。接続を使い回す）
+            timeout (float): 1リクエストの接続・応答待ちの秒数
+            poll_interval (float): 保存状態を確認する間隔（秒）
+            async_session: httpx.AsyncClient 互換の HTTP クライアント（*_async で使用。省略時は初回に生成する）
+        """
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self._async_session = async_session
+        self._owns_async_session = async_session is None
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.watch_service = _RemoteWatchService(self)
+        self.outbox_worker: Optional[_SaveStatusPoller] = None
+        self._capabilities: Optional[dict] = None
+
+    def _get_async_session(self):
+        """非同期の HTTP クライアントを取得（未生成なら生成。生成したループで使い続ける）"""
+        if self._async_session is None:
+            self._async_session = httpx.AsyncClient()
+        return self._async_session
+
+    async def aclose(self):
+        """生成した非同期の HTTP クライアントを閉じる（渡されたクライアントは閉じない）"""
+        if self._owns_async_session and self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None) -> dict:
+        resp = self.session.request(method, self.base_url + path, json=payload, timeout=self.timeout)
+        return _response_data(resp, method, path)
+
+    async def _request_async(self, method: str, path: str, payload: Optional[dict] = None) -> dict:
+        resp = await self._get_async_session().request(method, self.base_url + path, json=payload, timeout=self.timeout)
+        return _response_data(resp, method, path)
+
+    def _run_job(
+        self,
+        path: str,
+        payload: dict,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_event: Optional[Callable[[dict], None]] = None,
+    ) -> Any:
+        """
+        ジョブを開始し、途中経過を on_event に渡しながら完了を待つ
+        Returns:
+            Any: ジョブの結果
+        Raises:
+            TranslationCanceledException: キャンセルされた（サーバーのジョブもキャンセルする）
+            ThrottledError: サーバーで流量制限が続いた
+            RemotePipelineError: その他の理由でジョブが失敗した
+        """
+        job_id = self._request("POST", path, payload)["job_id"]
+        url = f"{self.base_url}/jobs/{job_id}/events"
+        with self.session.get(url, stream=True, timeout=(self.timeout, _STREAM_READ_TIMEOUT_S)) as resp:
+            if resp.status_code >= 400:
+                raise RemotePipelineError(f"HTTP {resp.status_code}: GET /jobs/{job_id}/events")
+            for line in resp.iter_lines():
+                if is_cancelled is not None and is_cancelled():
+                    self.cancel_job(job_id)
+                    raise TranslationCanceledException()
+                if not line:
+                    continue
+                ended, result = _job_event(json.loads(line), on_event)
+                if ended:
+                    return result
+        raise RemotePipelineError(f"ジョブの完了前に接続が切れました: {job_id}")
+
+    async def _run_job_async(
+        self,
+        path: str,
+        payload: dict,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_event: Optional[Callable[[dict], None]] = None,
+    ) -> Any:
+        """
+        ジョブを開始し、途中経過を on_event に渡しながら完了を待つ（_run_job の非同期版）
+        呼び出し元のタスクがキャンセルされた場合もサーバーのジョブをキャンセルする
+        """
+        job_id = (await self._request_async("POST", path, payload))["job_id"]
+        url = f"{self.base_url}/jobs/{job_id}/events"
+        timeout = httpx.Timeout(self.timeout, read=_STREAM_READ_TIMEOUT_S)
+        try:
+            async with self._get_async_session().stream("GET", url, timeout=timeout) as resp:
+                if resp.status_code >= 400:
+                    raise RemotePipelineError(f"HTTP {resp.status_code}: GET /jobs/{job_id}/events")
+                async for line in resp.aiter_lines():
+                    if is_cancelled is not None and is_cancelled():
+                        await self.cancel_job_async(job_id)
+                        raise TranslationCanceledException()
+                    if not line:
+                        continue
+                    ended, result = _job_event(json.loads(line), on_event)
+                    if ended:
+                        return result
+        except asyncio.CancelledError:
+            await asyncio.shield(self.cancel_job_async(job_id))
+            raise
+        raise RemotePipelineError(f"ジョブの完了前に接続が切れました: {job_id}")
+
+    def cancel_job(self, job_id: str):
+        """サーバーのジョブをキャンセルする（失敗しても無視）"""
+        try:
+            self._request("DELETE", f"/jobs/{job_id}")
+        except Exception:
+            logging.debug("ジョブのキャンセルに失敗しました: %s", job_id, exc_info=True)
+
+    async def cancel_job_async(self, job_id: str):
+        """サーバーのジョブをキャンセルする（cancel_job の非同期版）"""
+        try:
+            await self._request_async("DELETE", f"/jobs/{job_id}")
+        except Exception:
+            logging.debug("ジョブのキャンセルに失敗しました: %s", job_id, exc_info=True)
+
+    def capabilities(self) -> dict:
+        """サーバーの設定（翻訳のストリーミング・Notion の設定の有無・保存先のデータベースの名前。初回のみ取得する）"""
+        if self._capabilities is None:
+            self._capabilities = self._request("GET", "/capabilities")
+        return self._capabilities
+
+    def streams_translations(self) -> bool:
+        """翻訳をストリーミングで受け取れる設定か"""
+        try:
+            return bool(self.capabilities().get("streams_translations"))
+        except Exception:
+            return False
+
+    def notion_database_names(self) -> List[str]:
+        """サーバーに設定された保存先の Notion データベースの名前"""
+        try:
+            return list(self.capabilities().get("notion_databases") or [])
+        except Exception:
+            return []
+
+    def start_run(self):
+        """トークン使用量の実行ごとの集計・予算はサーバーがジョブごとに持つため何もしない"""
+        pass
+
+    def get_notion_service(self):
+        """サーバーで Notion が設定されているか確認する（未設定なら EnvironmentError。設定は起動後1回だけ取得する）"""
+        if not self.capabilities().get("notion"):
+            raise EnvironmentError("サーバーのNotionの設定が未完了です")
+        return None
+
+    def get_outbox(self) -> "_RemoteOutbox":
+        """サーバーの Notion 保存キュー"""
+        return _RemoteOutbox(self)
+
+    def start_outbox_worker(self, on_change: Optional[Callable[[], None]] = None) -> "_SaveStatusPoller":
+        """保存はサーバーのワーカーが行うため、状態の変化をポーリングして on_change を呼ぶ"""
+        if self.outbox_worker is None:
+            self.outbox_worker = _SaveStatusPoller(self, on_change, self.poll_interval)
+        self.outbox_worker.start()
+        return self.outbox_worker
+
+    def search(self, config: SearchConfig, is_cancelled: Optional[Callable[[], bool]] = None) -> List[Paper]:
+        """
+        サーバーで検索する（PaperPipeline.search と同じ）
+        Args:
+            config (SearchConfig): 検索設定
+            is_cancelled (Optional[Callable[[], bool]]): キャンセル状態を返す関数
+        Returns:
+            List[Paper]: 検索結果リスト
+        """
+        result = self._run_job("/search", {"config": config.model_dump()}, is_cancelled=is_cancelled)
+        return [Paper.model_validate(p) for p in result["papers"]]
+
+    async def search_async(self, config: SearchConfig, is_cancelled: Optional[Callable[[], bool]] = None) -> List[Paper]:
+        """サーバーで検索する（search の非同期版）"""
+        result = await self._run_job_async("/search", {"config": config.model_dump()}, is_cancelled=is_cancelled)
+        return [Paper.model_validate(p) for p in result["papers"]]
+
+    def translate_papers(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_chunk: Optional[Callable[[Paper, str], None]] = None,
+    ) -> List[Paper]:
+        """
+        サーバーで abstract を翻訳して abstract_ja に設定する（PaperPipeline.translate_papers と同じ。
+        キャンセル時は TranslationCanceledException、流量制限が続いた場合は ThrottledError）
+        Returns:
+            List[Paper]: 翻訳後の論文リスト（引数と同じオブジェクト）
+        """
+        try:
+            result = self._run_job(
+                "/translate",
+                {"papers": [p.model_dump() for p in papers]},
+                is_cancelled=is_cancelled,
+                on_event=_chunk_events(papers, on_chunk),
+            )
+            _apply_translations(papers, result)
+        except (TranslationCanceledException, ThrottledError):
+            raise
+        except Exception:
+            logging.exception("翻訳処理で例外が発生しました")
+        return papers
+
+    async def translate_papers_async(
+        self,
+        papers: List[Paper],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        on_chunk: Optional[Callable[[Paper, str], None]] = None,
+    ) -> List[Paper]:
+        """サーバーで abstract を翻訳して abstract_ja に設定する（translate_papers の非同期版）"""
+        try:
+            result = await self._run_job_async(
+                "/translate",
+                {"papers": [p.model_dump() for p in papers]},
+                is_cancelled=is_cancelled,
+                on_event=_chunk_events(papers, on_chunk),
+            )
+            _apply_translations(papers, result)
+        except (TranslationCanceledException, ThrottledError):
+            raise
+        except Exception:
+            logging.exception("翻訳処理で例外が発生しました")
+        return papers
+
+    def fetch_full_texts(
+        self,
+        papers: List[Paper],
+        summarize: bool = True,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[Paper]:
+        """
+        サーバーで PDF から本文を抽出・要約する（PaperPipeline.fetch_full_texts と同じ）
+        Returns:
+            List[Paper]: 本文を取得できた論文（引数のオブジェクト）
+        """
+        result = self._run_job(
+            "/full_texts",
+            {"papers": [p.model_dump() for p in papers], "summarize": summarize},
+            is_cancelled=is_cancelled,
+        )
+        return _apply_full_texts(papers, result)
+
+    async def fetch_full_texts_async(
+        self,
+        papers: List[Paper],
+        summarize: bool = True,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> List[Paper]:
+        """サーバーで PDF から本文を抽出・要約する（fetch_full_texts の非同期版）"""
+        result = await self._run_job_async(
+            "/full_texts",
+            {"papers": [p.model_dump() for p in papers], "summarize": summarize},
+            is_cancelled=is_cancelled,
+        )
+        return _apply_full_texts(papers, result)
+
+    def enqueue_save(self, papers: List[Paper]) -> EnqueueResult:
+        """論文の Notion 保存をサーバーのキューに登録する（PaperPipeline.enqueue_save と同じ）"""
+        result = self._request("POST", "/save", {"papers": [p.model_dump() for p in papers]})
+        return EnqueueResult(enqueued=int(result["enqueued"]), skipped=dict(result.get("skipped") or {}))
+
+    async def enqueue_save_async(self, papers: List[Paper]) -> EnqueueResult:
+        """論文の Notion 保存をサーバーのキューに登録する（enqueue_save の非同期版）"""
+        result = await self._request_async("POST", "/save", {"papers": [p.model_dump() for p in papers]})
+        return EnqueueResult(enqueued=int(result["enqueued"]), skipped=dict(result.get("skipped") or {}))
+
+
+def _response_data(resp, method: str, path: str) -> dict:
+    """応答の JSON（エラーの応答なら RemotePipelineError。requests・httpx のどちらの応答も受け付ける）"""
+    try:
+        data = resp.json()
+    except ValueError:
+        data = {}
+    if resp.status_code >= 400:
+        raise RemotePipelineError(data.get("error") or f"HTTP {resp.status_code}: {method} {path}")
+    return data
+
+
+def _job_event(event: dict, on_event: Optional[Callable[[dict], None]]) -> Tuple[bool, Any]:
+    """
+    ジョブのイベントを1件処理する
+    Returns:
+        Tuple[bool, Any]: (ジョブが終了したか, ジョブの結果)
+    Raises:
+        TranslationCanceledException: ジョブがキャンセルされた
+        ThrottledError: サーバーで流量制限が続いた
+        RemotePipelineError: その他の理由でジョブが失敗した
+    """
+    kind = event.get("type")
+    if kind == "end":
+        if event.get("status") == "cancelled":
+            raise TranslationCanceledException()
+        if event.get("status") == "error":
+            raise _job_error(event)
+        return True, event.get("result")
+    if kind != "ping" and on_event is not None:
+        on_event(event)
+    return False, None
+
+
+def _chunk_events(
+    papers: List[Paper], on_chunk: Optional[Callable[[Paper, str], None]]
+) -> Callable[[dict], None]:
+    """翻訳ジョブの途中経過を (論文, それまでの訳文) で on_chunk に渡す関数"""
+    # サーバーは訳文の差分（delta）を送る（続きでない訳文は全文 text）
+    texts: Dict[int, str] = {}
+
+    def _on_event(event: dict):
+        if on_chunk is not None and event.get("type") == "chunk":
+            i = event["index"]
+            texts[i] = event["text"] if "text" in event else texts.get(i, "") + event.get("delta", "")
+            on_chunk(papers[i], texts[i])
+    return _on_event
+
+
+def _apply_translations(papers: List[Paper], result: dict):
+    """翻訳ジョブの結果を abstract_ja に設定する"""
+    for paper, translated in zip(papers, result["papers"]):
+        paper.abstract_ja = translated.get("abstract_ja", "")
+
+
+def _apply_full_texts(papers: List[Paper], result: dict) -> List[Paper]:
+    """全文取得ジョブの結果を論文に設定し、本文を取得できた論文を返す"""
+    by_id = {p.id: p for p in papers}
+    fetched = []
+    for data in result["papers"]:
+        paper = by_id.get(data.get("id"))
+        if paper is None:
+            continue
+        for key in ("full_text", "sections", "summary_ja"):
+            setattr(paper, key, data.get(key, getattr(paper, key)))
+        fetched.append(paper)
+    return fetched
+
+
+def _job_error(event: dict) -> Exception:
+    """失敗したジョブの例外（サーバーの例外のクラス名から PaperPipeline と同じ例外に戻す）"""
+    message = event.get("error") or "サーバーでジョブが失敗しました"
+    if event.get("error_type") == ThrottledError.__name__:
+        return ThrottledError(message)
+    return RemotePipelineError(message)
+
+
+class _RemoteOutbox:
+    """サーバーの Notion 保存キューの状態（NotionOutbox.counts / latest_status と同じ）"""
+
+    def __init__(self, remote: RemotePipeline):
+        self._remote = remote
+
+    def _status(self, paper_ids: List[str]) -> dict:
+        return self._remote._request("POST", "/save/status", {"paper_ids": list(paper_ids)})
+
+    def counts(self) -> Dict[str, int]:
+        return self._status([])["counts"]
+
+    def latest_status(self, paper_ids: List[str]) -> Dict[str, str]:
+        return self._status(paper_ids)["statuses"]
+
+
+class _RemoteWatchService:
+    """サーバーのウォッチ（RequestView が使う WatchService.list / keywords / add と同じ）"""
+
+    def __init__(self, remote: RemotePipeline):
+        self._remote = remote
+
+    def list(self) -> List[Watch]:
+        return [Watch.model_validate(w) for w in self._remote._request("GET", "/watches").get("watches") or []]
+
+    def keywords(self) -> List[str]:
+        return list(self._remote._request("GET", "/watches")["keywords"])
+
+    def add(self, keyword: str, categories: Optional[List[str]] = None):
+        payload = {"keyword": keyword, "categories": list(categories or [])}
+        return self._remote._request("POST", "/watches", payload).get("keyword")
+
+
+class _SaveStatusPoller:
+    """サーバーの保存キューの件数を定期的に確認し、変わったら on_change を呼ぶ（OutboxWorker の代わり）"""
+
+    def __init__(self, remote: RemotePipeline, on_change: Optional[Callable[[], None]], interval: float):
+        self._remote = remote
+        self._on_change = on_change
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last: Optional[dict] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="remote-save-status", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self):
+        """すぐに状態を確認する（次の確認まで待たない）"""
+        self._check()
+
+    def _check(self):
+        try:
+            counts = self._remote.get_outbox().counts()
+        except Exception:
+            logging.debug("保存状態の取得に失敗しました", exc_info=True)
+            return
+        if counts != self._last:
+            self._last = counts
+            if self._on_change is not None:
+                self._on_change()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._check()
+            self._stop.wait(self._interval)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+import fnmatch
+import re
+
+from domain.models import Paper
+
+# 並べ替え（"original": 検索結果の順）
+SORT_KEYS = ("original", "date_desc", "date_asc", "title", "relevance")
+
+_WORD_RE = re.compile(r"\w+")
+_DATE_PREFIX_RE = re.compile(r"^\d{4}(-\d{2}(-\d{2})?)?$")
+# 読書状況の絞り込みで Notion に無い論文を指す値
+_NO_STATUS = "なし"
+
+
+@dataclass
+class ResultFilter:
+    """
+    検索結果の絞り込み条件（未指定の条件は絞り込まない。条件間は AND）
+    - text: タイトル・abstract・訳文・著者に全ての語を含む
+    - categories: いずれかのカテゴリ（ワイルドカード可。例: "cs.*"）を含む
+    - authors: 全ての著者名（姓・名の前方一致）を含む
+    - statuses: Notion の読書状況がいずれかに一致する（例: "未読"。"なし" は Notion に無い論文）
+    - start_date / end_date: 投稿日の範囲（"YYYY", "YYYY-MM", "YYYY-MM-DD"。両端を含む）
+    - sort: 並べ替え（SORT_KEYS のいずれか）
+    """
+    text: str = ""
+    categories: List[str] = field(default_factory=list)
+    authors: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    sort: str = "original"
+
+    @classmethod
+    def parse(cls, query: str, sort: str = "original") -> "ResultFilter":
+        """
+        絞り込み欄の入力から条件を作る
+        "cat:cs.CL author:vaswani status:未読 since:2024-01 until:2024-12 attention" のように指定する
+        Args:
+            query (str): 入力
+            sort (str): 並べ替え
+        Returns:
+            ResultFilter: 条件
+        """
+        filt = cls(sort=sort)
+        words: List[str] = []
+        for token in query.split():
+            prefix, _, value = token.partition(":")
+            prefix = prefix.lower()
+            if value and prefix in ("cat", "category"):
+                filt.categories.append(value)
+            elif value and prefix in ("author", "au"):
+                filt.authors.append(value)
+            elif value and prefix in ("status", "progress"):
+                filt.statuses.append(value)
+            elif value and prefix in ("since", "from") and _DATE_PREFIX_RE.match(value):
+                filt.start_date = value
+            elif value and prefix in ("until", "to") and _DATE_PREFIX_RE.match(value):
+                filt.end_date = value
+            else:
+                words.append(token)
+        filt.text = " ".join(words)
+        return filt
+
+    def is_empty(self) -> bool:
+        """絞り込み条件が無いか（並べ替えは含めない）"""
+        return not (
+            self.text.strip() or self.categories or self.authors or self.statuses or self.start_date or self.end_date
+        )
+
+
+def _search_text(paper: Paper, abstract_ja: str) -> str:
+    """語による絞り込みの対象テキスト（タイトル・abstract・訳文・著者。小文字化済み）"""
+    return " ".join((paper.title, paper.abstract, abstract_ja, " ".join(paper.authors))).lower()
+
+
+class ResultIndex:
+    """
+    検索結果のメモリ上の索引（結果が変わるたびに1回だけ構築する）
+    - カテゴリ・著者名の語・読書状況 → 論文の位置 の転置インデックス
+    - 投稿日で並べた位置の配列（範囲は二分探索、日付順の並べ替えはそのまま走査）
+    - 語による絞り込みは他の条件で残った論文の小文字化済みテキストのみを走査する
+      （索引の構築後に訳文が届いた論文は update_translation でテキストのみを更新する）
+    """
+
+    def __init__(self, papers: Iterable[Paper]):
+        self.papers: List[Paper] = list(papers)
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_author_word: Dict[str, Set[int]] = {}
+        self._by_status: Dict[str, Set[int]] = {}
+        self._text: List[str] = []
+        self._position: Dict[str, int] = {}
+        for i, p in enumerate(self.papers):
+            self._position[p.id] = i
+            for cat in (c.strip() for c in (p.category or "").split(",")):
+                if cat:
+                    self._by_category.setdefault(cat, set()).add(i)
+            for author in p.authors:
+                for word in _WORD_RE.findall(author.lower()):
+                    self._by_author_word.setdefault(word, set()).add(i)
+            self._by_status.setdefault(p.reading_status or _NO_STATUS, set()).add(i)
+            self._text.append(_search_text(p, p.abstract_ja))
+        self._date_order = sorted(range(len(self.papers)), key=lambda i: self.papers[i].published_date[:10])
+        self._date_keys = [self.papers[i].published_date[:10] for i in self._date_order]
+        self._title_order: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def update_translation(self, paper_id: str, abstract_ja: str) -> bool:
+        """
+        論文の訳文を語による絞り込みの対象テキストに反映する（表示時・ストリーミングの翻訳の後に呼ぶ）
+        Args:
+            paper_id (str): 論文ID
+            abstract_ja (str): 訳文（途中経過でもよい）
+        Returns:
+            bool: 索引に含まれる論文か
+        """
+        i = self._position.get(paper_id)
+        if i is None:
+            return False
+        self._text[i] = _search_text(self.papers[i], abstract_ja)
+        return True
+
+    def category_counts(self) -> List[Tuple[str, int]]:
+        """カテゴリごとの論文数（多い順）"""
+        return sorted(((c, len(ids)) for c, ids in self._by_category.items()), key=lambda kv: (-kv[1], kv[0]))
+
+    def _match_categories(self, patterns: List[str]) -> Set[int]:
+        matched: Set[int] = set()
+        for pat in patterns:
+            for cat, ids in self._by_category.items():
+                if fnmatch.fnmatchcase(cat.lower(), pat.lower()):
+                    matched |= ids
+        return matched
+
+    def _match_author(self, name: str) -> Set[int]:
+        """著者名の全ての語に前方一致する著者を持つ論文"""
+        result: Optional[Set[int]] = None
+        for word in _WORD_RE.findall(name.lower()):
+            ids: Set[int] = set()
+            for key, key_ids in self._by_author_word.items():
+                if key.startswith(word):
+                    ids |= key_ids
+            result = ids if result is None else result & ids
+        return result or set()
+
+    def _match_dates(self, start: Optional[str], end: Optional[str]) -> List[int]:
+        """投稿日が範囲内の論文の位置（日付順）"""
+        lo = bisect_left(self._date_keys, start) if start else 0
+        # "2024-05" のような前方の指定はその月の末日までを含める
+        hi = bisect_right(self._date_keys, end + "\uffff") if end else len(self._date_keys)
+        return self._date_order[lo:hi]
+
+    def query(self, filt: Optional[ResultFilter] = None) -> List[Paper]:
+        """
+        条件に一致する論文を返す
+        Args:
+            filt (Optional[ResultFilter]): 条件（省略時は全件を検索結果の順で）
+        Returns:
+            List[Paper]: 一致した論文（filt.sort の順）
+        """
+        filt = filt or ResultFilter()
+        candidates: Optional[Set[int]] = None
+
+        def _narrow(ids: Iterable[int]):
+            nonlocal candidates
+            ids = set(ids)
+            candidates = ids if candidates is None else candidates & ids
+
+        if filt.categories:
+            _narrow(self._match_categories(filt.categories))
+        for name in filt.authors:
+            _narrow(self._match_author(name))
+        if filt.statuses:
+            _narrow(i for s in filt.statuses for i in self._by_status.get(s, ()))
+        if filt.start_date or filt.end_date:
+            _narrow(self._match_dates(filt.start_date, filt.end_date))
+        words = filt.text.lower().split()
+        if words:
+            pool = range(len(self.papers)) if candidates is None else candidates
+            _narrow(i for i in pool if all(w in self._text[i] for w in words))
+
+        return [self.papers[i] for i in self._ordered(candidates, filt.sort)]
+
+    def _ordered(self, candidates: Optional[Set[int]], sort: str) -> List[int]:
+        """位置を並べ替える（candidates が None なら全件）"""
+        if sort in ("date_desc", "date_asc"):
+            order = self._date_order if sort == "date_asc" else list(reversed(self._date_order))
+        elif sort == "title":
+            if self._title_order is None:
+                self._title_order = sorted(range(len(self.papers)), key=lambda i: self.papers[i].title.lower())
+            order = self._title_order
+        elif sort == "relevance":
+            order = sorted(
+                range(len(self.papers)),
+                key=lambda i: -(self.papers[i].relevance if self.papers[i].relevance is not None else float("-inf")),
+            )
+        else:
+            order = range(len(self.papers))
+        if candidates is None:
+            return list(order)
+        return [i for i in order if i in candidates]
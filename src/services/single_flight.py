@@ -0,0 +1,89 @@
+from __future__ import annotations
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from concurrent.futures import Future
+import asyncio
+import threading
+
+from services.instrumentation import get_tracer
+
+
+class SingleFlight:
+    """
+    同じキーの処理が実行中なら、新たに実行せず実行中の結果を共有する（スレッドセーフ）
+    - 最初の呼び出し元（リーダー）が処理を実行し、同時に来た呼び出し元は完了を待って同じ結果（例外）を受け取る
+    - 完了後はキーを破棄する（結果のキャッシュは行わない）
+    - スレッドからは do、イベントループのコルーチンからは do_async で呼び、実行中の処理を互いに共有する
+    - 共有した回数はカウンタ "<name>.coalesced" に出力する
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        key ごとに fn を1回だけ実行する
+        Args:
+            key (Hashable): 処理を識別するキー
+            fn (Callable[..., Any]): 実行する関数
+        Returns:
+            Any: fn の戻り値（実行中の処理があればその戻り値）
+        """
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._calls[key] = fut
+        if not leader:
+            get_tracer().incr(f"{self.name}.coalesced")
+            return fut.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        key ごとにコルーチン関数 fn を1回だけ実行する（do の非同期版。待つ間もループのスレッドを塞がない）
+        リーダーがキャンセルされた場合、待っていた呼び出し元には CancelledError を送出する
+        Args:
+            key (Hashable): 処理を識別するキー
+            fn (Callable[..., Awaitable[Any]]): 実行するコルーチン関数
+        Returns:
+            Any: fn の戻り値（実行中の処理があればその戻り値）
+        """
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._calls[key] = fut
+        if not leader:
+            get_tracer().incr(f"{self.name}.coalesced")
+            # 待っている呼び出し元のキャンセルで共有の処理を止めない
+            return await asyncio.shield(asyncio.wrap_future(fut))
+
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                fut.cancel()
+            else:
+                fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
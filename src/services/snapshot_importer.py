@@ -0,0 +1,223 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, timezone
+from email.utils import parsedate_to_datetime
+import fnmatch
+import logging
+import mmap
+import os
+import time
+
+try:
+    import ujson as json  # type: ignore
+except ImportError:  # pragma: no cover - ujson が無くても動作する
+    import json  # type: ignore
+
+from services.paper_store import PaperStore
+from services.instrumentation import get_tracer
+
+
+@dataclass
+class SnapshotFilter:
+    """
+    取り込み条件（未指定の条件は絞り込まない）
+    - categories: カテゴリ（ワイルドカード可。例: "cs.*", "stat.ML"）のいずれかを含む
+    - start_date / end_date: 初版の投稿日の範囲
+    - keywords: タイトルまたは abstract にいずれかを含む（大文字小文字を区別しない）
+    """
+    categories: List[str] = field(default_factory=list)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    keywords: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ImportStats:
+    """取り込み結果"""
+    scanned: int = 0
+    imported: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def split_chunks(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    ファイルを行境界で区切ったバイト範囲に分割する（mmap で改行位置のみを探索）
+    Args:
+        path (str): JSON Lines ファイル
+        chunk_size (int): 1チャンクのおおよそのバイト数
+    Returns:
+        List[Tuple[int, int]]: (開始, 終了) のリスト
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    chunks: List[Tuple[int, int]] = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                nl = mm.find(b"\n", end)
+                end = size if nl == -1 else nl + 1
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def _record_to_row(rec: dict) -> Optional[tuple]:
+    """スナップショットの1レコードを PaperStore の行タプルに変換（不正なら None）"""
+    arxiv_id = rec.get("id")
+    if not arxiv_id:
+        return None
+    versions = rec.get("versions") or []
+    latest = versions[-1].get("version", "v1") if versions else "v1"
+    published = ""
+    if versions:
+        try:
+            published = parsedate_to_datetime(versions[0]["created"]).astimezone(timezone.utc).isoformat()
+        except Exception:
+            published = ""
+    if not published and rec.get("update_date"):
+        published = f"{rec['update_date']}T00:00:00+00:00"
+    parsed = rec.get("authors_parsed") or []
+    if parsed:
+        authors = [" ".join(x for x in (a[1] if len(a) > 1 else "", a[0]) if x) for a in parsed]
+    else:
+        authors = [a.strip() for a in (rec.get("authors") or "").split(",") if a.strip()]
+    url = f"http://arxiv.org/abs/{arxiv_id}{latest}"
+    return (
+        url,
+        " ".join((rec.get("title") or "").split()),
+        url,
+        json.dumps(authors, ensure_ascii=False),
+        published,
+        ",".join((rec.get("categories") or "").split()),
+        (rec.get("abstract") or "").strip(),
+        "",
+    )
+
+
+def _matches(row: tuple, rec: dict, filt: SnapshotFilter) -> bool:
+    """取り込み条件に一致するか"""
+    if filt.categories:
+        cats = (rec.get("categories") or "").split()
+        if not any(fnmatch.fnmatchcase(c, pat) for c in cats for pat in filt.categories):
+            return False
+    if filt.start_date or filt.end_date:
+        published = row[4][:10]
+        if not published:
+            return False
+        if filt.start_date and published < filt.start_date.isoformat():
+            return False
+        if filt.end_date and published > filt.end_date.isoformat():
+            return False
+    if filt.keywords:
+        # abstract の改行・連続空白を1つの空白として比較
+        text = " ".join(f"{row[1]} {row[6]}".lower().split())
+        if not any(" ".join(k.lower().split()) in text for k in filt.keywords):
+            return False
+    return True
+
+
+def parse_chunk(path: str, start: int, end: int, filt: SnapshotFilter) -> Tuple[List[tuple], int, int]:
+    """
+    バイト範囲内の行をパースし、条件に一致したレコードを行タプルで返す（プロセスプールのワーカーで実行）
+    Args:
+        path (str): JSON Lines ファイル
+        start (int): 開始バイト
+        end (int): 終了バイト（行境界）
+        filt (SnapshotFilter): 取り込み条件
+    Returns:
+        Tuple[List[tuple], int, int]: (行タプルのリスト, 読んだ行数, エラー行数)
+    """
+    # JSON を解析する前にバイト列で粗く絞り込む（キーワード条件のみ）
+    # 各キーワードの最長の単語を含まない行は解析しない（複数語は JSON 内で改行をまたぐため単語単位で判定）
+    prefilter = [max(k.lower().split(), key=len).encode("utf-8") for k in filt.keywords if k.strip()]
+    if not all(k.isascii() for k in prefilter):
+        prefilter = []
+    rows: List[tuple] = []
+    scanned = errors = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            line_end = end if nl == -1 else nl
+            line = mm[pos:line_end]
+            pos = line_end + 1
+            if not line.strip():
+                continue
+            scanned += 1
+            if prefilter:
+                lowered = line.lower()
+                if not any(k in lowered for k in prefilter):
+                    continue
+            try:
+                rec = json.loads(line)
+                row = _record_to_row(rec)
+            except Exception:
+                errors += 1
+                continue
+            if row is not None and _matches(row, rec, filt):
+                rows.append(row)
+    return rows, scanned, errors
+
+
+def import_snapshot(
+    path: str,
+    store: PaperStore,
+    filt: Optional[SnapshotFilter] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 32 * 1024 * 1024,
+) -> ImportStats:
+    """
+    arXiv メタデータスナップショット（JSON Lines）を PaperStore に取り込む
+    - ファイルを行境界のチャンクに分割し、プロセスプールで並列にパースする
+    - 同時に処理中のチャンク数を workers*2 までに抑え、メモリ使用量を一定に保つ
+    - 書き込み中は全文検索インデックスを更新せず、最後にまとめて再構築する
+    Args:
+        path (str): arxiv-metadata-oai-snapshot.json のパス
+        store (PaperStore): 取り込み先
+        filt (Optional[SnapshotFilter]): 取り込み条件
+        workers (Optional[int]): ワーカープロセス数（省略時は CPU 数）
+        chunk_size (int): 1チャンクのおおよそのバイト数
+    Returns:
+        ImportStats: 取り込み結果
+    """
+    filt = filt or SnapshotFilter()
+    workers = workers or os.cpu_count() or 1
+    stats = ImportStats()
+    tracer = get_tracer()
+    t0 = time.perf_counter()
+    chunks = split_chunks(path, chunk_size)
+    logging.info("スナップショット取り込み開始: %s (%d チャンク, %d プロセス)", path, len(chunks), workers)
+
+    with tracer.span("snapshot.import", chunks=len(chunks), workers=workers), store.bulk_load(), \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < workers * 2:
+                s, e = chunks[next_chunk]
+                pending.add(pool.submit(parse_chunk, path, s, e, filt))
+                next_chunk += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                rows, scanned, errors = fut.result()
+                with tracer.span("snapshot.write", rows=len(rows)):
+                    store.upsert_rows(rows)
+                stats.scanned += scanned
+                stats.errors += errors
+                stats.imported += len(rows)
+            logging.info("取り込み中: %d件読み込み, %d件取り込み", stats.scanned, stats.imported)
+
+    stats.seconds = time.perf_counter() - t0
+    tracer.incr("snapshot.scanned", stats.scanned)
+    tracer.incr("snapshot.imported", stats.imported)
+    logging.info(
+        "スナップショット取り込み完了: %d件読み込み, %d件取り込み, エラー%d件, %.1f秒",
+        stats.scanned, stats.imported, stats.errors, stats.seconds,
+    )
+    return stats
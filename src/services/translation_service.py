@@ -1,10 +1,28 @@
 from __future__ import annotations
-from typing import Optional, List, Callable
-from dataclasses import dataclass
+from typing import Optional, List, Callable, Iterable, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from google import genai
 from dotenv import load_dotenv
+import asyncio
 import os
+import hashlib
 import logging
+import threading
+import time
+
+from services.abstract_preprocessor import PreprocessConfig, preprocess_abstract
+from services.instrumentation import get_tracer
+from services.rate_limiter import AimdLimiter, ThrottledError
+from services.single_flight import SingleFlight
+from services.usage_ledger import (
+    DEFAULT_USAGE_PATH,
+    UsageLedger,
+    UsageRun,
+    estimate_tokens,
+    usage_from_response,
+)
 
 
 @dataclass
@@ -12,94 +30,625 @@ class TranslationConfig:
     """翻訳モデル設定"""
     model: str = "gemini-1.5-flash"
     system_prompt: str = "以下の英文を日本語に翻訳し、100字以内に要約した結果のみを出力してください。"
+    # 論文本文（PDFから抽出）の要約に使う指示文
+    summary_prompt: str = "以下は英語論文の本文の抜粋です。目的・手法・結果がわかるよう、日本語で400字以内に要約した結果のみを出力してください。"
     temperature: float = 1.0
+    # 1リクエストの出力トークン数の上限（max_output_tokens として送信）
     max_tokens: int = 512
+    # 翻訳に送る前の abstract の前処理（空白・LaTeX・URL・定型文の除去と打ち切り）
+    preprocess: PreprocessConfig = field(default_factory=PreprocessConfig)
+    # 同時に送信するリクエスト数の上限（1 なら逐次）
+    # 実際の同時実行数は initial_concurrency から始め、成功で増やし流量制限（429）で半減させる
+    max_workers: int = 8
+    initial_concurrency: int = 2
+    # 流量制限時の最大再送回数（超えたら ThrottledError）
+    max_retries: int = 6
+    retry_base_delay: float = 1.0
+    # 途中経過を受け取る場合（on_chunk 指定時）にストリーミングで生成するか
+    stream: bool = True
+    # 翻訳結果をキャッシュする件数（同じ abstract は再送信しない）
+    cache_size: int = 2000
+    # 料金（100万トークンあたりの米ドル。コストの集計・予算の判定に使用）
+    input_cost_per_mtok: float = 0.075
+    output_cost_per_mtok: float = 0.30
+    # 予算（0 なら無制限）。超える翻訳は送信せず未翻訳のまま（入力順＝優先度順に割り当てる）
+    run_token_budget: int = 0
+    daily_token_budget: int = 0
+    daily_cost_budget: float = 0.0
+    # 日ごとの使用量の保存先（None なら保存しない）
+    usage_path: Optional[str] = DEFAULT_USAGE_PATH
 
 
 class TranslationService:
     """
     ローカルLMを使った翻訳サービス
+    - translate_en_to_jp などはスレッドから、translate_en_to_jp_async などはイベントループから呼ぶ
+      （非同期版は client.aio で送信し、1本のスレッドで多数のリクエストを待つ）
     """
 
-    def __init__(self, cfg: Optional[TranslationConfig] = None):
+    def __init__(self, cfg: Optional[TranslationConfig] = None, client=None, usage: Optional[UsageLedger] = None):
+        """
+        Args:
+            cfg (Optional[TranslationConfig]): 翻訳モデル設定
+            client: genai.Client 互換のクライアント（テスト・ベンチマーク用。省略時は GEMINI_API_KEY から生成）
+            usage (Optional[UsageLedger]): トークン使用量の記録先（省略時は cfg から生成。client 指定時は保存しない）
+        """
         self.cfg = cfg or TranslationConfig()
-        # .env から GEMINI_API_KEY を読み込み
-        load_dotenv()
-        api_key = os.getenv("GEMINI_API_KEY", "")
-        if not api_key:
-            logging.error("GEMINI_API_KEY が .env に設定されていません")
-            raise ValueError("GEMINI_API_KEY is not set in .env")
-
-        # Google GenAI クライアントを初期化
-        self.client = genai.Client(api_key=api_key)
+        if usage is None:
+            usage = UsageLedger(
+                path=self.cfg.usage_path if client is None else None,
+                input_cost_per_mtok=self.cfg.input_cost_per_mtok,
+                output_cost_per_mtok=self.cfg.output_cost_per_mtok,
+                run_token_budget=self.cfg.run_token_budget,
+                daily_token_budget=self.cfg.daily_token_budget,
+                daily_cost_budget=self.cfg.daily_cost_budget,
+            )
+        self.usage = usage
+        if client is None:
+            # .env から GEMINI_API_KEY を読み込み
+            load_dotenv()
+            api_key = os.getenv("GEMINI_API_KEY", "")
+            if not api_key:
+                logging.error("GEMINI_API_KEY が .env に設定されていません")
+                raise ValueError("GEMINI_API_KEY is not set in .env")
+
+            # Google GenAI クライアントを初期化
+            client = genai.Client(api_key=api_key)
+        self.client = client
         logging.info(f"モデルの読み込み完了: {self.cfg.model}")
         self._is_cancelled = False
         self._is_cancelled_getter = None
+        # 翻訳結果のキャッシュ {キー: 翻訳結果}（古いものから破棄）
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # 同じ英文・指示文の翻訳が実行中なら結果を共有（再検索・表示時の翻訳との重複）
+        self._flight = SingleFlight("translation")
+        # API キーの実際の割り当てに合わせて同時実行数を調整
+        self.limiter = AimdLimiter(
+            "translation",
+            initial=self.cfg.initial_concurrency,
+            max_limit=max(1, self.cfg.max_workers),
+        )
 
     def set_cancel_flag(self, flag_getter: Callable[[], bool]):
         """
-        キャンセル状態を取得する関数を設定
+        キャンセル状態を取得する関数を設定（全ての呼び出しで共有される。
+        並行する検索・翻訳ごとに打ち切るときは translate_en_to_jp などに is_cancelled を渡す）
         Args:
             flag_getter: キャンセル状態を返す関数
         """
         self._is_cancelled_getter = flag_getter
 
-    def translate_en_to_jp(self, texts: List[str]) -> List[str]:
+    def _check_cancelled(self, is_cancelled: Optional[Callable[[], bool]] = None):
+        """キャンセルされていれば TranslationCanceledException を送出（is_cancelled 省略時は set_cancel_flag の関数）"""
+        getter = is_cancelled or self._is_cancelled_getter
+        if getter and getter():
+            logging.info("翻訳処理がキャンセルされました")
+            raise TranslationCanceledException("翻訳がユーザーによりキャンセルされました")
+
+    def _cache_key(self, text: str, instruction: Optional[str] = None) -> str:
+        """キャッシュのキー（モデル・指示文・英文のハッシュ）"""
+        raw = f"{self.cfg.model}\0{instruction or self.cfg.system_prompt}\0{text}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_cached(self, text: str, instruction: Optional[str] = None) -> Optional[str]:
+        """
+        キャッシュ済みの翻訳結果を取得（未翻訳なら None）
+        Args:
+            text (str): 英文
+            instruction (Optional[str]): 指示文（省略時は cfg.system_prompt）
+        Returns:
+            Optional[str]: 翻訳結果
+        """
+        key = self._cache_key(text, instruction)
+        with self._cache_lock:
+            out = self._cache.get(key)
+            if out is not None:
+                self._cache.move_to_end(key)
+            return out
+
+    def _put_cache(self, text: str, out_text: str, instruction: Optional[str] = None):
+        """翻訳結果をキャッシュに保存"""
+        with self._cache_lock:
+            self._cache[self._cache_key(text, instruction)] = out_text
+            while len(self._cache) > self.cfg.cache_size:
+                self._cache.popitem(last=False)
+
+    def _translate_one(
+        self,
+        text: str,
+        instruction: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> str:
+        """
+        1件の英文を翻訳する（失敗時は空文字。流量制限が続いた場合は ThrottledError）
+        Args:
+            text (str): 翻訳したい英文
+            instruction (Optional[str]): 指示文（省略時は cfg.system_prompt）
+            on_chunk (Optional[Callable[[str], None]]): 途中経過（それまでに生成された全文）を受け取る関数
+            is_cancelled (Optional[Callable[[], bool]]): この呼び出しのキャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): トークン使用量を集計する実行（省略時は既定の実行）
+        Returns:
+            str: 翻訳した日本語
+        """
+        cached = self._lookup(text, instruction, on_chunk, is_cancelled)
+        if cached is not None:
+            return cached
+
+        instruction = instruction or self.cfg.system_prompt
+        out_text = self._flight.do(
+            self._cache_key(text, instruction), self._request, text, instruction, on_chunk, usage_run
+        )
+        # 実行中の同じ翻訳を共有した場合は途中経過を受け取れないため、完了時に全文を渡す
+        if on_chunk is not None and out_text:
+            on_chunk(out_text)
+        return out_text
+
+    async def _translate_one_async(
+        self,
+        text: str,
+        instruction: Optional[str] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> str:
+        """1件の英文を翻訳する（_translate_one の非同期版）"""
+        cached = self._lookup(text, instruction, on_chunk, is_cancelled)
+        if cached is not None:
+            return cached
+
+        instruction = instruction or self.cfg.system_prompt
+        out_text = await self._flight.do_async(
+            self._cache_key(text, instruction), self._request_async, text, instruction, on_chunk, usage_run
+        )
+        if on_chunk is not None and out_text:
+            on_chunk(out_text)
+        return out_text
+
+    def _lookup(
+        self,
+        text: str,
+        instruction: Optional[str],
+        on_chunk: Optional[Callable[[str], None]],
+        is_cancelled: Optional[Callable[[], bool]],
+    ) -> Optional[str]:
+        """
+        送信せずに済む英文の訳文を返す（空文字なら空文字、キャッシュ済みなら訳文。送信が必要なら None）
+        Raises:
+            TranslationCanceledException: キャンセルされている
+        """
+        tracer = get_tracer()
+        self._check_cancelled(is_cancelled)
+
+        # 空文字の場合は、空文字を返す
+        if not text:
+            tracer.incr("translation.skipped_empty")
+            return ""
+
+        cached = self.get_cached(text, instruction)
+        if cached is not None:
+            tracer.incr("translation.cache_hit")
+            if on_chunk is not None:
+                on_chunk(cached)
+        return cached
+
+    def _generate_stream(
+        self, contents: list, on_chunk: Callable[[str], None], span: dict, usage_run: Optional[UsageRun] = None
+    ) -> str:
+        """
+        ストリーミングで生成し、チャンクを受け取るたびにそれまでの全文を on_chunk に渡す
+        最初のチャンクまでの時間を span["ttft_ms"] に記録する（流量制限で再送した場合は最初から生成し直す）
+        """
+        parts: List[str] = []
+        t0 = time.perf_counter()
+        stream: Iterable = self.client.models.generate_content_stream(
+            model=self.cfg.model, contents=contents, config=self._generation_config()
+        )
+        last = None
+        for chunk in stream:
+            last = chunk
+            piece = getattr(chunk, "text", None) or ""
+            if piece:
+                if not parts:
+                    span["ttft_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                parts.append(piece)
+                on_chunk("".join(parts))
+        # 使用量・終了理由は最後のチャンクに入る
+        self._record_usage(last, span, usage_run)
+        return "".join(parts)
+
+    async def _generate_stream_async(
+        self, contents: list, on_chunk: Callable[[str], None], span: dict, usage_run: Optional[UsageRun] = None
+    ) -> str:
+        """ストリーミングで生成する（_generate_stream の非同期版。client.aio で受信する）"""
+        parts: List[str] = []
+        t0 = time.perf_counter()
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.cfg.model, contents=contents, config=self._generation_config()
+        )
+        last = None
+        async for chunk in stream:
+            last = chunk
+            piece = getattr(chunk, "text", None) or ""
+            if piece:
+                if not parts:
+                    span["ttft_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                parts.append(piece)
+                on_chunk("".join(parts))
+        self._record_usage(last, span, usage_run)
+        return "".join(parts)
+
+    async def _generate_async(self, contents: list, span: dict, usage_run: Optional[UsageRun] = None) -> str:
+        """ストリーミングせずに生成する（client.aio で送信する）"""
+        res = await self.client.aio.models.generate_content(
+            model=self.cfg.model, contents=contents, config=self._generation_config()
+        )
+        self._record_usage(res, span, usage_run)
+        return self._response_text(res)
+
+    @staticmethod
+    def _contents(text: str, instruction: str) -> list:
+        """送信する contents（指示文は models.generate_content に system_instruction 引数が無いため前置する）"""
+        return [
+            {
+                "role": "user",
+                "parts": [
+                    {"text": f"{instruction}\n\n{text}"}
+                ]
+            }
+        ]
+
+    @staticmethod
+    def _response_text(res) -> str:
+        """レスポンステキストを安全に抽出"""
+        out_text = getattr(res, "text", None)
+        if not out_text:
+            out_text = getattr(res, "output_text", "") or ""
+        return out_text
+
+    def _generation_config(self) -> dict:
+        """生成の設定（出力トークン数の上限・温度）"""
+        return {"max_output_tokens": self.cfg.max_tokens, "temperature": self.cfg.temperature}
+
+    def _record_usage(self, res, span: dict, usage_run: Optional[UsageRun] = None):
+        """応答のトークン数を記録し、出力上限で打ち切られていれば数える"""
+        tracer = get_tracer()
+        usage = usage_from_response(res)
+        if usage is not None:
+            span["tokens_in"] = usage.prompt_tokens
+            span["tokens_out"] = usage.output_tokens
+            self.usage.record(usage, usage_run)
+        candidates = getattr(res, "candidates", None) or []
+        if candidates and "MAX_TOKENS" in str(getattr(candidates[0], "finish_reason", "")):
+            logging.info("出力トークン数の上限（%d）で打ち切られました", self.cfg.max_tokens)
+            tracer.incr("translation.truncated")
+
+    def _request(
+        self,
+        text: str,
+        instruction: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> str:
         """
-        英文を日本語に翻訳する
+        Gemini に1件の翻訳を依頼する（失敗時は空文字。流量制限が続いた場合は ThrottledError）
+        Args:
+            text (str): 翻訳したい英文
+            instruction (str): 指示文
+            on_chunk (Optional[Callable[[str], None]]): 途中経過を受け取る関数（指定時かつ cfg.stream ならストリーミング）
+            usage_run (Optional[UsageRun]): トークン使用量を集計する実行
+        Returns:
+            str: 翻訳した日本語
+        """
+        tracer = get_tracer()
+        # 進捗ログ
+        logging.info(f"翻訳中: {text[:20]}...")
+
+        try:
+            contents = self._contents(text, instruction)
+            streaming = on_chunk is not None and self.cfg.stream
+            with tracer.span("translation.request", model=self.cfg.model, chars_in=len(text), stream=streaming) as span:
+                # 流量制限時は枠を返してバックオフ後に再送（取りこぼさない）
+                if streaming:
+                    out_text = self.limiter.call(
+                        self._generate_stream,
+                        contents,
+                        on_chunk,
+                        span,
+                        usage_run,
+                        max_retries=self.cfg.max_retries,
+                        base_delay=self.cfg.retry_base_delay,
+                    )
+                else:
+                    # Gemini へ送信（google-genai 最新API）
+                    res = self.limiter.call(
+                        self.client.models.generate_content,
+                        max_retries=self.cfg.max_retries,
+                        base_delay=self.cfg.retry_base_delay,
+                        model=self.cfg.model,
+                        contents=contents,
+                        config=self._generation_config(),
+                    )
+                    self._record_usage(res, span, usage_run)
+                    out_text = self._response_text(res)
+                span["chars_out"] = len(out_text)
+            return self._finish_request(text, instruction, out_text)
+        except ThrottledError:
+            # 空の訳文にすると未翻訳のまま表示・保存されるため、呼び出し元に再試行・報告させる
+            logging.warning("流量制限が続いたため翻訳を中止しました: %s...", text[:20])
+            tracer.incr("translation.throttled_out")
+            raise
+        except Exception as e:
+            logging.exception("翻訳失敗: %s", e)
+            tracer.incr("translation.failed")
+            return ""
+
+    async def _request_async(
+        self,
+        text: str,
+        instruction: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> str:
+        """Gemini に1件の翻訳を依頼する（_request の非同期版。流量制限のバックオフ中もループを塞がない）"""
+        tracer = get_tracer()
+        logging.info(f"翻訳中: {text[:20]}...")
+        try:
+            contents = self._contents(text, instruction)
+            streaming = on_chunk is not None and self.cfg.stream
+            with tracer.span("translation.request", model=self.cfg.model, chars_in=len(text), stream=streaming) as span:
+                if streaming:
+                    out_text = await self.limiter.call_async(
+                        self._generate_stream_async,
+                        contents,
+                        on_chunk,
+                        span,
+                        usage_run,
+                        max_retries=self.cfg.max_retries,
+                        base_delay=self.cfg.retry_base_delay,
+                    )
+                else:
+                    out_text = await self.limiter.call_async(
+                        self._generate_async,
+                        contents,
+                        span,
+                        usage_run,
+                        max_retries=self.cfg.max_retries,
+                        base_delay=self.cfg.retry_base_delay,
+                    )
+                span["chars_out"] = len(out_text)
+            return self._finish_request(text, instruction, out_text)
+        except ThrottledError:
+            logging.warning("流量制限が続いたため翻訳を中止しました: %s...", text[:20])
+            tracer.incr("translation.throttled_out")
+            raise
+        except Exception as e:
+            logging.exception("翻訳失敗: %s", e)
+            tracer.incr("translation.failed")
+            return ""
+
+    def _finish_request(self, text: str, instruction: str, out_text: str) -> str:
+        """翻訳の完了を記録し、訳文をキャッシュする"""
+        logging.info(f"翻訳完了: {out_text[:20]}...")
+        get_tracer().incr("translation.ok")
+        if out_text:
+            self._put_cache(text, out_text, instruction)
+        return out_text
+
+    def translate_en_to_jp(
+        self,
+        texts: List[str],
+        on_chunk: Optional[Callable[[int, str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[str]:
+        """
+        英文を日本語に翻訳する（cfg.max_workers > 1 なら並列に送信、結果の順序は入力順）
+        英文は cfg.preprocess に従って前処理してから送信する（キャッシュのキーも前処理後の英文）
         Args:
             texts (List[str]): 翻訳したい英文リスト
+            on_chunk (Optional[Callable[[int, str], None]]): 途中経過を (入力の位置, それまでの訳文) で受け取る関数
+                （翻訳スレッドから呼ばれる。cfg.stream ならトークンの生成ごとに呼ばれる）
+            is_cancelled (Optional[Callable[[], bool]]): この呼び出しのキャンセル状態を返す関数
+                （省略時は set_cancel_flag の関数。True になったら未送信の英文は送信せず TranslationCanceledException）
+            usage_run (Optional[UsageRun]): トークン使用量の集計・実行ごとの予算を適用する実行
+                （並行する検索・ジョブごとに分けるときに渡す。省略時は usage.start_run で始めた既定の実行）
         Returns:
             List[str]: 翻訳した日本語リスト
+        Raises:
+            ThrottledError: 再送しても流量制限が続いた（翻訳済みの英文はキャッシュされ、再試行時は送信しない）
         """
 
         logging.info(f"翻訳開始: {len(texts)}件")
+        texts = [preprocess_abstract(text, self.cfg.preprocess) for text in texts]
+        return self._run_batch(texts, self.cfg.system_prompt, on_chunk, is_cancelled, usage_run)
 
-        # 指示文は contents に前置して渡す（models.generate_content には system_instruction 引数が無い）
-        instruction = self.cfg.system_prompt
+    def summarize_en_to_jp(
+        self,
+        texts: List[str],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[str]:
+        """
+        英語の論文本文（抜粋）を日本語で要約する（cfg.summary_prompt を使用）
+        Args:
+            texts (List[str]): 要約したい英文リスト
+            is_cancelled (Optional[Callable[[], bool]]): この呼び出しのキャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): トークン使用量の集計・実行ごとの予算を適用する実行
+        Returns:
+            List[str]: 要約した日本語リスト
+        """
+        logging.info(f"要約開始: {len(texts)}件")
+        return self._run_batch(texts, self.cfg.summary_prompt, is_cancelled=is_cancelled, usage_run=usage_run)
 
-        translated_texts = []
-        for text in texts:
-            # キャンセルチェック
-            if self._is_cancelled_getter and self._is_cancelled_getter():
-                logging.info("翻訳処理がキャンセルされました")
-                raise TranslationCanceledException("翻訳がユーザーによりキャンセルされました")
-
-            # 空文字の場合は、空文字を返す
-            if not text:
-                translated_texts.append("")
-                continue
+    async def translate_en_to_jp_async(
+        self,
+        texts: List[str],
+        on_chunk: Optional[Callable[[int, str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[str]:
+        """
+        英文を日本語に翻訳する（translate_en_to_jp の非同期版）
+        英文ごとにタスクを作り、同時実行数は limiter（上限 cfg.max_workers）で抑える。
+        呼び出し元のタスクをキャンセルすると、送信中のリクエストも打ち切る
+        Args:
+            texts (List[str]): 翻訳したい英文リスト
+            on_chunk (Optional[Callable[[int, str], None]]): 途中経過を (入力の位置, それまでの訳文) で受け取る関数
+                （イベントループのスレッドから呼ばれる）
+            is_cancelled (Optional[Callable[[], bool]]): この呼び出しのキャンセル状態を返す関数
+            usage_run (Optional[UsageRun]): トークン使用量の集計・実行ごとの予算を適用する実行
+        Returns:
+            List[str]: 翻訳した日本語リスト
+        Raises:
+            ThrottledError: 再送しても流量制限が続いた
+        """
+        logging.info(f"翻訳開始: {len(texts)}件")
+        texts = [preprocess_abstract(text, self.cfg.preprocess) for text in texts]
+        return await self._run_batch_async(texts, self.cfg.system_prompt, on_chunk, is_cancelled, usage_run)
+
+    async def summarize_en_to_jp_async(
+        self,
+        texts: List[str],
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[str]:
+        """英語の論文本文（抜粋）を日本語で要約する（summarize_en_to_jp の非同期版）"""
+        logging.info(f"要約開始: {len(texts)}件")
+        return await self._run_batch_async(texts, self.cfg.summary_prompt, is_cancelled=is_cancelled, usage_run=usage_run)
+
+    def _run_batch(
+        self,
+        texts: List[str],
+        instruction: str,
+        on_chunk: Optional[Callable[[int, str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[str]:
+        """
+        複数の英文を指示文に従って処理する（cfg.max_workers > 1 なら並列に送信、結果の順序は入力順）
+        予算が設定されていれば、送信前に入力順で見積もりを予約し、予算に収まらない英文は送信しない
+        """
+        def _chunk_cb(i: int) -> Optional[Callable[[str], None]]:
+            return None if on_chunk is None else (lambda partial: on_chunk(i, partial))
 
-            # 進捗ログ
-            logging.info(f"翻訳中: {text[:20]}...")
+        estimates = self._reserve_budget(texts, instruction, usage_run)
+        # 予約の解放は1件につき1回（キャンセル・失敗で実行されなかった英文の予約も最後に解放する）
+        released = [False] * len(texts)
+        release_lock = threading.Lock()
 
+        def _release(i: int):
+            with release_lock:
+                if released[i]:
+                    return
+                released[i] = True
+            if estimates[i] is not None:
+                self.usage.release(*estimates[i], run=usage_run)
+
+        def _run(i: int, text: str) -> str:
+            if estimates[i] is None:
+                return ""
+            try:
+                return self._translate_one(text, instruction, _chunk_cb(i), is_cancelled, usage_run)
+            finally:
+                _release(i)
+
+        try:
+            if self.cfg.max_workers <= 1 or len(texts) <= 1:
+                return [_run(i, text) for i, text in enumerate(texts)]
+
+            with ThreadPoolExecutor(max_workers=self.cfg.max_workers) as pool:
+                futures = [pool.submit(_run, i, text) for i, text in enumerate(texts)]
+                try:
+                    return [f.result() for f in futures]
+                except (TranslationCanceledException, ThrottledError):
+                    # 未着手の翻訳は送信しない
+                    for f in futures:
+                        f.cancel()
+                    raise
+        finally:
+            for i in range(len(texts)):
+                _release(i)
+
+    async def _run_batch_async(
+        self,
+        texts: List[str],
+        instruction: str,
+        on_chunk: Optional[Callable[[int, str], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        usage_run: Optional[UsageRun] = None,
+    ) -> List[str]:
+        """
+        複数の英文を指示文に従って処理する（_run_batch の非同期版）
+        1件が失敗・キャンセルされたら残りのタスクをキャンセルし、終了を待ってから送出する
+        """
+        def _chunk_cb(i: int) -> Optional[Callable[[str], None]]:
+            return None if on_chunk is None else (lambda partial: on_chunk(i, partial))
+
+        estimates = self._reserve_budget(texts, instruction, usage_run)
+        # 予約の解放は1件につき1回（ループのスレッドだけで触るためロックは不要）
+        released = [False] * len(texts)
+
+        def _release(i: int):
+            if released[i]:
+                return
+            released[i] = True
+            if estimates[i] is not None:
+                self.usage.release(*estimates[i], run=usage_run)
+
+        async def _run(i: int, text: str) -> str:
+            if estimates[i] is None:
+                return ""
             try:
-                # Gemini へ送信（google-genai 最新API）
-                res = self.client.models.generate_content(
-                    model=self.cfg.model,
-                    contents=[
-                        {
-                            "role": "user",
-                            "parts": [
-                                {"text": f"{instruction}\n\n{text}"}
-                            ]
-                        }
-                    ]
-                )
-                # レスポンステキストを安全に抽出
-                out_text = getattr(res, "text", None)
-                if not out_text:
-                    out_text = getattr(res, "output_text", "") or ""
-                logging.info(f"翻訳完了: {out_text[:20]}...")
-                translated_texts.append(out_text)
-            except Exception as e:
-                logging.exception("翻訳失敗: %s", e)
-                translated_texts.append("")
-
-        # Google GenAI クライアントは明示的な close 不要
-        self.client = None
-
-        return translated_texts
+                return await self._translate_one_async(text, instruction, _chunk_cb(i), is_cancelled, usage_run)
+            finally:
+                _release(i)
+
+        try:
+            if self.cfg.max_workers <= 1 or len(texts) <= 1:
+                return [await _run(i, text) for i, text in enumerate(texts)]
+
+            tasks = [asyncio.ensure_future(_run(i, text)) for i, text in enumerate(texts)]
+            try:
+                return list(await asyncio.gather(*tasks))
+            except BaseException:
+                # 未完了の翻訳は打ち切る
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        finally:
+            for i in range(len(texts)):
+                _release(i)
+
+    def _reserve_budget(
+        self, texts: List[str], instruction: str, usage_run: Optional[UsageRun] = None
+    ) -> List[Optional[Tuple[int, int]]]:
+        """
+        入力順（優先度順）に見積もりのトークン数を予約する
+        出力は上限の cfg.max_tokens で見積もるため、実際の使用量が予算を超えることはない
+        Returns:
+            List[Optional[Tuple[int, int]]]: 英文ごとの予約 (入力, 出力)。予算を超えて送信しないものは None
+        """
+        estimates: List[Optional[Tuple[int, int]]] = []
+        skipped = 0
+        for text in texts:
+            # 予算が無い・空文字・キャッシュ済みなら予約しない
+            if not self.usage.has_budget or not text or self.get_cached(text, instruction) is not None:
+                estimates.append((0, 0))
+                continue
+            estimate = (estimate_tokens(f"{instruction}\n\n{text}"), self.cfg.max_tokens)
+            if self.usage.reserve(*estimate, run=usage_run):
+                estimates.append(estimate)
+            else:
+                estimates.append(None)
+                skipped += 1
+        if skipped:
+            logging.warning("トークンの予算を超えるため %d件を翻訳しません", skipped)
+            get_tracer().incr("translation.budget_skipped", skipped)
+        return estimates
 
 
 class TranslationCanceledException(Exception):
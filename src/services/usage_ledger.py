@@ -0,0 +1,240 @@
+from __future__ import annotations
+from typing import Dict, Optional
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+import json
+import logging
+import math
+import os
+import threading
+
+from services.instrumentation import get_tracer
+
+# 保存先（論文ストアと同じディレクトリ）
+DEFAULT_USAGE_PATH = os.path.join("src", "data", "usage.json")
+# 日ごとの集計を保持する日数
+KEEP_DAYS = 90
+
+
+@dataclass
+class TokenUsage:
+    """1リクエストのトークン数"""
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+
+@dataclass
+class UsageTotals:
+    """トークン数・コストの集計"""
+    requests: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def add(self, usage: TokenUsage, cost: float):
+        self.requests += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.output_tokens += usage.output_tokens
+        self.cost_usd += cost
+
+
+@dataclass
+class UsageRun:
+    """
+    実行（検索1回・ウォッチ実行1回・サーバーのジョブ1件）ごとの集計と予約中のトークン数
+    並行する実行ごとに生成して翻訳に渡す（UsageLedger のロック内で更新する）
+    """
+    totals: UsageTotals = field(default_factory=UsageTotals)
+    reserved_tokens: int = 0
+
+
+def usage_from_response(res) -> Optional[TokenUsage]:
+    """
+    Gemini の応答（ストリーミングでは最後のチャンク）の usage_metadata からトークン数を取り出す
+    Args:
+        res: GenerateContentResponse 互換の応答
+    Returns:
+        Optional[TokenUsage]: トークン数（usage_metadata が無ければ None）
+    """
+    meta = getattr(res, "usage_metadata", None)
+    if meta is None:
+        return None
+    prompt = getattr(meta, "prompt_token_count", None) or 0
+    # 思考トークンも出力として課金される
+    output = (getattr(meta, "candidates_token_count", None) or 0) + (getattr(meta, "thoughts_token_count", None) or 0)
+    if not prompt and not output:
+        return None
+    return TokenUsage(prompt_tokens=int(prompt), output_tokens=int(output))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    送信前のトークン数の概算（英数字は4文字で1トークン、それ以外は1文字1トークン）
+    Args:
+        text (str): テキスト
+    Returns:
+        int: 概算トークン数
+    """
+    n_ascii = len(text.encode("ascii", "ignore"))
+    return math.ceil(n_ascii / 4) + (len(text) - n_ascii)
+
+
+class UsageLedger:
+    """
+    トークン使用量・コストの記録と予算管理（スレッドセーフ）
+    - 実行（検索1回・ウォッチ実行1回）ごとの集計と、日ごとの集計（ファイルに保存）を持つ
+      （並行する実行は UsageRun を渡して分ける。省略時は start_run で始めた既定の実行）
+    - 予算を超えるリクエストは reserve で断る（送信前に見積もりを予約し、完了後に実績に置き換える）
+    - 計測のカウンタ translation.tokens_in / tokens_out / cost_usd とゲージ translation.tokens_per_paper に出力する
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_USAGE_PATH,
+        input_cost_per_mtok: float = 0.0,
+        output_cost_per_mtok: float = 0.0,
+        run_token_budget: int = 0,
+        daily_token_budget: int = 0,
+        daily_cost_budget: float = 0.0,
+    ):
+        """
+        Args:
+            path (Optional[str]): 日ごとの集計の保存先（None なら保存しない）
+            input_cost_per_mtok (float): 入力100万トークンあたりの料金（米ドル）
+            output_cost_per_mtok (float): 出力100万トークンあたりの料金（米ドル）
+            run_token_budget (int): 1回の実行のトークン数の上限（0 なら無制限）
+            daily_token_budget (int): 1日のトークン数の上限（0 なら無制限）
+            daily_cost_budget (float): 1日のコストの上限（米ドル。0 なら無制限）
+        """
+        self.path = path
+        self.input_cost_per_mtok = input_cost_per_mtok
+        self.output_cost_per_mtok = output_cost_per_mtok
+        self.run_token_budget = run_token_budget
+        self.daily_token_budget = daily_token_budget
+        self.daily_cost_budget = daily_cost_budget
+        self._lock = threading.Lock()
+        self._run = UsageRun()
+        self._reserved_tokens = 0
+        self._reserved_cost = 0.0
+        self._days: Dict[str, UsageTotals] = self._load()
+
+    @property
+    def has_budget(self) -> bool:
+        """予算が設定されているか"""
+        return bool(self.run_token_budget or self.daily_token_budget or self.daily_cost_budget)
+
+    def _load(self) -> Dict[str, UsageTotals]:
+        """日ごとの集計を読み込む"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {day: UsageTotals(**totals) for day, totals in data.get("days", {}).items()}
+        except Exception:
+            logging.exception("トークン使用量の読み込みに失敗しました: %s", self.path)
+            return {}
+
+    def _save(self):
+        """日ごとの集計を保存する（直近 KEEP_DAYS 日分。ロック内で呼ぶ）"""
+        if not self.path:
+            return
+        oldest = (date.today() - timedelta(days=KEEP_DAYS)).isoformat()
+        self._days = {day: t for day, t in self._days.items() if day >= oldest}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"days": {day: asdict(t) for day, t in sorted(self._days.items())}}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            logging.exception("トークン使用量の保存に失敗しました: %s", self.path)
+
+    def cost(self, prompt_tokens: int, output_tokens: int) -> float:
+        """トークン数からコスト（米ドル）を計算"""
+        return (prompt_tokens * self.input_cost_per_mtok + output_tokens * self.output_cost_per_mtok) / 1_000_000
+
+    def start_run(self):
+        """既定の実行の集計を0に戻す（検索・ウォッチ実行の開始時に呼ぶ）"""
+        with self._lock:
+            self._run = UsageRun()
+
+    def run_totals(self, run: Optional[UsageRun] = None) -> UsageTotals:
+        """実行の集計（コピー。run 省略時は既定の実行）"""
+        with self._lock:
+            return UsageTotals(**asdict((run or self._run).totals))
+
+    def today_totals(self) -> UsageTotals:
+        """今日の集計（コピー）"""
+        with self._lock:
+            return UsageTotals(**asdict(self._days.get(date.today().isoformat(), UsageTotals())))
+
+    def reserve(self, prompt_tokens: int, output_tokens: int, run: Optional[UsageRun] = None) -> bool:
+        """
+        見積もったトークン数を予約する（予算を超えるなら予約せず False）
+        Args:
+            prompt_tokens (int): 入力トークン数の見積もり
+            output_tokens (int): 出力トークン数の見積もり（出力上限 max_tokens を渡せば予算を超えない）
+            run (Optional[UsageRun]): 実行ごとの予算を適用する実行（省略時は既定の実行）
+        Returns:
+            bool: 予約できたかどうか（送信してよいか）
+        """
+        tokens = prompt_tokens + output_tokens
+        cost = self.cost(prompt_tokens, output_tokens)
+        with self._lock:
+            run = run or self._run
+            today = self._days.get(date.today().isoformat(), UsageTotals())
+            if self.run_token_budget and run.totals.total_tokens + run.reserved_tokens + tokens > self.run_token_budget:
+                return False
+            if self.daily_token_budget and today.total_tokens + self._reserved_tokens + tokens > self.daily_token_budget:
+                return False
+            if self.daily_cost_budget and today.cost_usd + self._reserved_cost + cost > self.daily_cost_budget:
+                return False
+            run.reserved_tokens += tokens
+            self._reserved_tokens += tokens
+            self._reserved_cost += cost
+            return True
+
+    def release(self, prompt_tokens: int, output_tokens: int, run: Optional[UsageRun] = None):
+        """reserve した見積もりを解放する（送信の完了・中止後に呼ぶ。run は reserve と同じもの）"""
+        with self._lock:
+            run = run or self._run
+            run.reserved_tokens = max(0, run.reserved_tokens - prompt_tokens - output_tokens)
+            self._reserved_tokens = max(0, self._reserved_tokens - prompt_tokens - output_tokens)
+            self._reserved_cost = max(0.0, self._reserved_cost - self.cost(prompt_tokens, output_tokens))
+
+    def reserved_tokens(self) -> int:
+        """予約中（送信中・送信待ち）のトークン数"""
+        with self._lock:
+            return self._reserved_tokens
+
+    def record(self, usage: TokenUsage, run: Optional[UsageRun] = None) -> float:
+        """
+        1リクエストの使用量を実行ごと・日ごとの集計に加える
+        Args:
+            usage (TokenUsage): トークン数
+            run (Optional[UsageRun]): 集計する実行（省略時は既定の実行）
+        Returns:
+            float: このリクエストのコスト（米ドル）
+        """
+        cost = self.cost(usage.prompt_tokens, usage.output_tokens)
+        tracer = get_tracer()
+        with self._lock:
+            totals = (run or self._run).totals
+            totals.add(usage, cost)
+            self._days.setdefault(date.today().isoformat(), UsageTotals()).add(usage, cost)
+            self._save()
+            tokens_per_paper = totals.total_tokens / totals.requests
+        tracer.incr("translation.tokens_in", usage.prompt_tokens)
+        tracer.incr("translation.tokens_out", usage.output_tokens)
+        tracer.incr("translation.cost_usd", cost)
+        tracer.set_gauge("translation.tokens_per_paper", tokens_per_paper)
+        return cost
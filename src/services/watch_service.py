@@ -0,0 +1,181 @@
+from __future__ import annotations
+from typing import List, Optional, Union
+from datetime import datetime, timezone
+import json
+import logging
+import os
+
+from domain.models import CanonicalQuery, Paper, Watch
+from services.arxiv_service import ArxivService
+
+# 保存先（RequestView の keywords.json と同じディレクトリ）
+DEFAULT_WATCH_PATH = os.path.join("src", "config", "watches.json")
+LEGACY_KEYWORDS_PATH = os.path.join("src", "config", "keywords.json")
+# 前回と同じ日時の処理済み論文を除くために保持する既知IDの上限
+MAX_KNOWN_IDS = 200
+
+
+def _as_list(keywords: Union[str, List[str]]) -> List[str]:
+    """1つのキーワードの文字列もキーワードのリストとして扱う"""
+    return [keywords] if isinstance(keywords, str) else list(keywords)
+
+
+class WatchService:
+    """
+    ウォッチ（保存済み検索）の管理と差分検索
+    - ウォッチはキーワードとカテゴリの正規化した検索条件（CanonicalQuery.key）で区別する
+      （キーワードの表記ゆれ・順序は同じウォッチ、キーワードの追加・カテゴリの違いは別のウォッチ）
+    - ウォッチごとに処理済みの最新 published（ハイウォーターマーク）を保持する
+    - 再実行時は arXiv にそれ以降の新着のみを古い順に問い合わせる（max_results を超えた新着は次回に続きから取得する）
+    """
+
+    def __init__(self, store_path: str = DEFAULT_WATCH_PATH, arxiv_service: Optional[ArxivService] = None):
+        self._store_path = store_path
+        self.arxiv_service = arxiv_service or ArxivService()
+        self._watches: List[Watch] = self._load()
+
+    def _load(self) -> List[Watch]:
+        """ウォッチを読み込む（未作成なら保存済みキーワード keywords.json から移行）"""
+        try:
+            if os.path.exists(self._store_path):
+                with open(self._store_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                return [self._normalized(Watch(**w)) for w in data.get("watches", [])]
+            legacy_path = os.path.join(os.path.dirname(self._store_path), os.path.basename(LEGACY_KEYWORDS_PATH))
+            if os.path.exists(legacy_path):
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                items = data.get("keywords", [])
+                return [self._normalized(Watch(keyword=x.strip())) for x in items if isinstance(x, str) and x.strip()]
+        except Exception:
+            logging.exception("ウォッチの読み込みに失敗しました: %s", self._store_path)
+        return []
+
+    def _normalized(self, watch: Watch) -> Watch:
+        """検索条件を持たない以前の形式のウォッチに、キーワードから正規化した検索条件を設定する"""
+        if not watch.terms:
+            q = self.watch_query([watch.keyword], watch.categories)
+            watch.terms, watch.categories = list(q.terms), list(q.categories)
+        return watch
+
+    def watch_query(self, keywords: Union[str, List[str]], categories: Optional[List[str]] = None) -> CanonicalQuery:
+        """
+        キーワード・カテゴリからウォッチの検索条件を作る（arXiv ID と期間は含めない）
+        Args:
+            keywords (Union[str, List[str]]): 検索キーワード
+            categories (Optional[List[str]]): カテゴリの指定
+        Returns:
+            CanonicalQuery: 正規化した検索条件
+        """
+        q = self.arxiv_service.canonical_query(_as_list(keywords), categories=categories)
+        return CanonicalQuery(terms=q.terms, categories=q.categories)
+
+    def _save(self):
+        """ウォッチを保存する（一時ファイルに書いてから置き換える）"""
+        os.makedirs(os.path.dirname(self._store_path) or ".", exist_ok=True)
+        tmp_path = self._store_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"watches": [w.model_dump() for w in self._watches]}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._store_path)
+
+    def list(self) -> List[Watch]:
+        """ウォッチ一覧（最近使った順）"""
+        return list(self._watches)
+
+    def keywords(self) -> List[str]:
+        """ウォッチのキーワード一覧（最近使った順）"""
+        return [w.keyword for w in self._watches]
+
+    def get(self, keywords: Union[str, List[str]], categories: Optional[List[str]] = None) -> Optional[Watch]:
+        """
+        検索条件に対応するウォッチを取得（キーワードの大文字小文字・空白・順序の違いは同じ条件とみなす）
+        Args:
+            keywords (Union[str, List[str]]): 検索キーワード
+            categories (Optional[List[str]]): カテゴリの指定
+        Returns:
+            Optional[Watch]: ウォッチ（無ければ None）
+        """
+        key = self.watch_query(keywords, categories).key()
+        for w in self._watches:
+            if w.query().key() == key:
+                return w
+        return None
+
+    def add(self, keywords: Union[str, List[str]], categories: Optional[List[str]] = None) -> Optional[Watch]:
+        """
+        ウォッチを追加（既存なら先頭に移動。ハイウォーターマークは維持）
+        Args:
+            keywords (Union[str, List[str]]): 検索キーワード
+            categories (Optional[List[str]]): カテゴリの指定
+        Returns:
+            Optional[Watch]: 追加したウォッチ（キーワードが無ければ None）
+        """
+        q = self.watch_query(keywords, categories)
+        if not q.terms:
+            return None
+        keyword = " ".join(" ".join(str(k or "") for k in _as_list(keywords)).split())
+        watch = self.get(keywords, categories) or Watch(
+            keyword=keyword, terms=list(q.terms), categories=list(q.categories)
+        )
+        self._watches = [watch] + [w for w in self._watches if w is not watch]
+        self._save()
+        return watch
+
+    def fetch_new(self, watch: Watch, max_results: int) -> List[Paper]:
+        """
+        前回処理した論文より新しい論文のみを、ウォッチの検索条件（キーワード・カテゴリ）で取得する
+        （新着が max_results を超える場合は古いものから max_results 件）
+        Args:
+            watch (Watch): ウォッチ
+            max_results (int): 最大取得数
+        Returns:
+            List[Paper]: 新着論文リスト
+        """
+        since = datetime.fromisoformat(watch.last_published) if watch.last_published else None
+        return self.arxiv_service.search_new_papers(
+            keywords=list(watch.terms),
+            since=since,
+            known_ids=watch.known_ids,
+            max_results=max_results,
+            categories=list(watch.categories),
+        )
+
+    async def fetch_new_async(self, watch: Watch, max_results: int) -> List[Paper]:
+        """前回処理した論文より新しい論文のみを取得する（fetch_new の非同期版）"""
+        since = datetime.fromisoformat(watch.last_published) if watch.last_published else None
+        return await self.arxiv_service.search_new_papers_async(
+            keywords=list(watch.terms),
+            since=since,
+            known_ids=watch.known_ids,
+            max_results=max_results,
+            categories=list(watch.categories),
+        )
+
+    def mark_processed(
+        self,
+        keywords: Union[str, List[str]],
+        papers: List[Paper],
+        categories: Optional[List[str]] = None,
+    ):
+        """
+        取得済みの論文でハイウォーターマークを更新して保存する
+        Args:
+            keywords (Union[str, List[str]]): 検索キーワード
+            papers (List[Paper]): 処理済みの論文リスト（ウォッチの検索条件で取得したもの）
+            categories (Optional[List[str]]): カテゴリの指定
+        """
+        watch = self.get(keywords, categories)
+        if watch is None:
+            return
+        latest = watch.last_published
+        for p in papers:
+            try:
+                if latest is None or datetime.fromisoformat(p.published_date) > datetime.fromisoformat(latest):
+                    latest = p.published_date
+            except ValueError:
+                continue
+        new_ids = [p.id for p in papers]
+        watch.last_published = latest
+        watch.known_ids = (new_ids + [i for i in watch.known_ids if i not in set(new_ids)])[:MAX_KNOWN_IDS]
+        watch.last_run_at = datetime.now(timezone.utc).isoformat()
+        self._save()
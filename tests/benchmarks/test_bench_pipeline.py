@@ -0,0 +1,171 @@
+"""
+オフラインのベンチマーク（pytest-benchmark）
+記録済みフィードとフェイクのサービスを使い、ネットワーク無しで計測する
+
+実行例:
+    uv run pytest tests/benchmarks --benchmark-only
+    uv run pytest tests/benchmarks --benchmark-only --benchmark-save=baseline   # 結果を保存
+    uv run pytest tests/benchmarks --benchmark-only --benchmark-compare         # 保存結果と比較
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from domain.models import SearchConfig  # noqa: E402
+from services.arxiv_service import ArxivService  # noqa: E402
+from services.notion_service import NotionService  # noqa: E402
+from services.pipeline import PaperPipeline  # noqa: E402
+from services.ranking_service import RelevanceRanker  # noqa: E402
+from services.paper_store import PaperStore  # noqa: E402
+from services.snapshot_importer import SnapshotFilter, import_snapshot  # noqa: E402
+from services.abstract_preprocessor import measure_reduction, preprocess_abstract  # noqa: E402
+from services.translation_service import TranslationConfig, TranslationService  # noqa: E402
+from fakes import FIXTURES, FakeArxivSession, FakeGenAIClient, FakeNotionClient  # noqa: E402
+
+SIZES = [10, 100, 1000]
+
+
+def _record_rate(benchmark, key: str, count: int):
+    """平均の実行時間から1秒あたりの処理件数を記録する（--benchmark-disable では計測しないため記録しない）"""
+    if benchmark.stats is not None:
+        benchmark.extra_info[key] = count / benchmark.stats.stats.mean
+
+
+def _config(n: int) -> SearchConfig:
+    # 日付範囲は無期限（記録済みフィードの日付に依存しない）
+    # 記録済みフィードを複製した entry は近似重複になるため、重複の判定はしない
+    return SearchConfig(keyword=["transformer"], max_results=n, start_date="", end_date="", dedup="off")
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_parse(benchmark, n):
+    """フィードの取得（遅延なし）・パース・Paper 変換"""
+    service = ArxivService(session=FakeArxivSession(n_entries=n))
+    papers = benchmark(service.search_papers, ["transformer"], n, "", "")
+    assert len(papers) == n
+
+
+@pytest.mark.parametrize("workers", [1, 4, 16])
+def test_bench_translation_concurrency(benchmark, workers):
+    """翻訳の同時実行数によるスケーリング（1件 20ms の LLM、50件）"""
+    client = FakeGenAIClient(latency=0.02)
+    service = TranslationService(TranslationConfig(max_workers=workers), client=client)
+    texts = [f"abstract number {i}" for i in range(50)]
+    result = benchmark.pedantic(service.translate_en_to_jp, args=(texts,), rounds=3, iterations=1)
+    assert len(result) == 50 and all(result)
+
+
+@pytest.mark.parametrize("quota", [2, 8])
+def test_bench_translation_adaptive(benchmark, quota):
+    """同時実行数の割り当て（quota）を超えると 429 を返す LLM に対する適応制御（1件 20ms、50件）"""
+    def run():
+        client = FakeGenAIClient(latency=0.02, quota=quota)
+        cfg = TranslationConfig(max_workers=16, initial_concurrency=2, retry_base_delay=0.02)
+        service = TranslationService(cfg, client=client)
+        result = service.translate_en_to_jp([f"abstract number {i}" for i in range(50)])
+        run.last = (service.limiter.limit, client.throttled)
+        return result
+
+    result = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert all(result)
+    benchmark.extra_info["final_limit"], benchmark.extra_info["throttled"] = run.last
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_pipeline_end_to_end(benchmark, n):
+    """検索 → 翻訳 → Notion保存 のスループット（LLM 2ms, Notion 1ms）"""
+    def run():
+        pipeline = PaperPipeline(
+            arxiv_service=ArxivService(session=FakeArxivSession(n_entries=n)),
+            translator=TranslationService(TranslationConfig(max_workers=8), client=FakeGenAIClient(latency=0.002)),
+            notion_service=NotionService(client=FakeNotionClient(latency=0.001), database_id="db"),
+        )
+        papers = pipeline.search(_config(n))
+        return pipeline.save(papers)
+
+    saved = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert len(saved) == n
+    _record_rate(benchmark, "papers_per_sec", n)
+
+
+def test_bench_preprocess(benchmark):
+    """abstract の前処理（記録済みフィード 1,000件）と文字数・概算トークン数の削減率"""
+    papers = ArxivService(session=FakeArxivSession(n_entries=1000)).search_papers(["transformer"], 1000, "", "")
+    abstracts = [p.abstract for p in papers]
+
+    benchmark(lambda: [preprocess_abstract(a) for a in abstracts])
+    report = measure_reduction(abstracts)
+    benchmark.extra_info["report"] = report.format()
+    benchmark.extra_info["char_reduction"] = round(report.char_reduction, 3)
+    benchmark.extra_info["token_reduction"] = round(report.token_reduction, 3)
+    assert report.tokens_after < report.tokens_before
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_rerank(benchmark, n):
+    """関連度による並べ替え（ベクトルのキャッシュ無し）"""
+    papers = ArxivService(session=FakeArxivSession(n_entries=n)).search_papers(["transformer"], n, "", "")
+
+    def run():
+        return RelevanceRanker().rank("kv cache eviction for transformer inference", papers, top_k=10)
+
+    ranked = benchmark(run)
+    assert len(ranked) == min(10, n)
+
+
+@pytest.fixture(scope="module")
+def snapshot_file(tmp_path_factory):
+    """サンプルのスナップショットを複製した 20,000 行の JSON Lines"""
+    import json
+
+    lines = (FIXTURES / "arxiv_snapshot_sample.jsonl").read_text(encoding="utf-8").splitlines()
+    path = tmp_path_factory.mktemp("snapshot") / "snapshot.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(20000):
+            rec = json.loads(lines[i % len(lines)])
+            rec["id"] = f"2401.{i:05d}"
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_bench_snapshot_import(benchmark, tmp_path, snapshot_file, workers):
+    """スナップショットの取り込み（cs.* で絞り込み、20,000行）"""
+    def run():
+        store = PaperStore(str(tmp_path / f"papers-{run.calls}.db"))
+        run.calls += 1
+        return import_snapshot(snapshot_file, store, SnapshotFilter(categories=["cs.*"]), workers=workers, chunk_size=256 * 1024)
+    run.calls = 0
+
+    stats = benchmark.pedantic(run, rounds=2, iterations=1)
+    assert stats.scanned == 20000
+    _record_rate(benchmark, "records_per_sec", stats.scanned)
+
+
+@pytest.fixture
+def tk_root():
+    """ResultView 計測用のルートウィンドウ（ディスプレイが無い環境では省略）"""
+    ctk = pytest.importorskip("customtkinter")
+    try:
+        root = ctk.CTk()
+    except Exception as e:
+        pytest.skip(f"ディスプレイが無いため省略: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_bench_result_view(benchmark, tk_root, n):
+    """ResultView の構築時間"""
+    from app.ui.views.result_view import ResultView
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=n)).search_papers(["transformer"], n, "", "")
+
+    def build():
+        view = ResultView(tk_root, papers=papers)
+        view.pack(fill="both", expand=True)
+        tk_root.update_idletasks()
+        view.destroy()
+
+    benchmark.pedantic(build, rounds=3 if n < 1000 else 1, iterations=1)
@@ -7,3 +7,8 @@ ROOT = Path(__file__).resolve().parents[1]
 SRC = os.path.join(str(ROOT), "src")
 if SRC not in sys.path:
     sys.path.append(SRC)
+
+# テスト用フェイク（tests/fakes.py）を import できるようにする
+TESTS = os.path.join(str(ROOT), "tests")
+if TESTS not in sys.path:
+    sys.path.append(TESTS)
@@ -0,0 +1,493 @@
+"""
+ネットワーク無しでテスト・ベンチマークを行うためのフェイク
+- 記録済み arXiv Atom フィード（tests/fixtures）を返す HTTP セッション（requests 互換・httpx.AsyncClient 互換）
+- 応答遅延を設定できる LLM クライアント（genai.Client 互換。client.aio の非同期版も持つ）
+- Notion クライアントのスタブ（notion_client.Client 互換・AsyncClient 互換）
+- tests/fixtures/pdf の PDF を返す HTTP セッション（requests 互換・httpx.AsyncClient 互換）
+- テスト用の論文（Paper）
+"""
+from __future__ import annotations
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+import asyncio
+import contextvars
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from domain.models import Paper
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+_ENTRY_RE = re.compile(r"  <entry>.*?</entry>\n", re.DOTALL)
+
+
+def load_fixture(name: str) -> str:
+    """fixtures 配下のファイルを読み込む"""
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def make_paper(arxiv_id: str = "2501.00001v1", **overrides) -> Paper:
+    """
+    テスト用の論文を作る（ID・URL は arXiv ID から組み立て、その他の項目は overrides で上書きする）
+    """
+    data = dict(
+        id=f"http://arxiv.org/abs/{arxiv_id}",
+        title=f"Paper {arxiv_id}",
+        url=f"http://arxiv.org/abs/{arxiv_id}",
+        authors=["A. Author"],
+        published_date="2025-01-01",
+        category="cs.CL",
+        abstract="abstract",
+        abstract_ja="",
+    )
+    data.update(overrides)
+    return Paper(**data)
+
+
+def make_entries(n: int, fixture: str = "arxiv_transformer.xml") -> List[str]:
+    """
+    記録済みフィードの entry を複製し、ID と日付を振り直した n 件の entry XML を生成する
+    日付は新しい順（arXiv の sortBy=submittedDate, descending と同じ並び）
+    """
+    templates = _ENTRY_RE.findall(load_fixture(fixture))
+    base = datetime(2025, 9, 18, 18, 0, tzinfo=timezone.utc)
+    entries = []
+    for i in range(n):
+        src = templates[i % len(templates)]
+        old_id = re.search(r"<id>http://arxiv.org/abs/([^<]+)</id>", src).group(1)
+        new_id = f"2509.{90000 - i:05d}v1"
+        ts = (base - timedelta(hours=6 * i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        entry = src.replace(old_id, new_id)
+        entry = re.sub(r"<(updated|published)>[^<]+</\1>", lambda m: f"<{m.group(1)}>{ts}</{m.group(1)}>", entry)
+        entries.append(entry)
+    return entries
+
+
+def make_feed(entries: List[str]) -> str:
+    """entry XML のリストから Atom フィードを組み立てる"""
+    head = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        '  <title type="html">ArXiv Query: fake</title>\n'
+    )
+    return head + "".join(entries) + "</feed>\n"
+
+
+class FakeResponse:
+    """requests.Response 互換の最小実装"""
+
+    def __init__(self, text: str = "", status_code: int = 200, content: Optional[bytes] = None):
+        self.text = text
+        self.content = text.encode("utf-8") if content is None else content
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+_SUBMITTED_RE = re.compile(r"submittedDate:\[(\d{12}) TO")
+_PUBLISHED_RE = re.compile(r"<published>(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})")
+
+
+class FakeArxivSession:
+    """
+    arXiv API の代わりに記録済みフィードを返す HTTP セッション
+    start / max_results によるページング、sortOrder（投稿日時順）、submittedDate の下限（分単位）に対応
+    """
+
+    def __init__(self, n_entries: int = 12, latency: float = 0.0):
+        self.entries = make_entries(n_entries)
+        self.latency = latency
+        self.calls: List[dict] = []
+
+    def get(self, url: str, params: Optional[dict] = None, timeout: float = 0):
+        params = dict(params or {})
+        self.calls.append(params)
+        if self.latency:
+            time.sleep(self.latency)
+        return self._page(params)
+
+    def _page(self, params: dict) -> FakeResponse:
+        entries = self.entries
+        m = _SUBMITTED_RE.search(str(params.get("search_query", "")))
+        if m:
+            entries = [e for e in entries if "".join(_PUBLISHED_RE.search(e).groups()) >= m.group(1)]
+        if params.get("sortOrder") == "ascending":
+            entries = entries[::-1]
+        start = int(params.get("start", 0))
+        size = int(params.get("max_results", 10))
+        return FakeResponse(make_feed(entries[start:start + size]))
+
+
+class FakeAsyncArxivSession(FakeArxivSession):
+    """FakeArxivSession の httpx.AsyncClient 互換版（遅延は asyncio.sleep で待つ。同時リクエスト数の最大値を記録する）"""
+
+    def __init__(self, n_entries: int = 12, latency: float = 0.0):
+        super().__init__(n_entries, latency)
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def get(self, url: str, params: Optional[dict] = None, timeout: float = 0):
+        params = dict(params or {})
+        self.calls.append(params)
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self._in_flight -= 1
+        return self._page(params)
+
+
+class FakePdfSession:
+    """
+    arxiv.org/pdf の代わりに tests/fixtures/pdf の PDF を返す HTTP セッション
+    - URL 末尾の ID に対応するファイルが無ければ 404
+    - 同時リクエスト数の最大値を記録する
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: List[str] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float = 0, **kwargs):
+        with self._lock:
+            self.calls.append(url)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return self._file(url)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _file(self, url: str) -> FakeResponse:
+        path = FIXTURES / "pdf" / (url.rsplit("/pdf/", 1)[-1].replace("/", "_") + ".pdf")
+        if not path.exists():
+            return FakeResponse("not found", status_code=404)
+        return FakeResponse(content=path.read_bytes())
+
+
+class FakeAsyncPdfSession(FakePdfSession):
+    """FakePdfSession の httpx.AsyncClient 互換版（遅延は asyncio.sleep で待つ）"""
+
+    async def get(self, url: str, timeout: float = 0, **kwargs):
+        with self._lock:
+            self.calls.append(url)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self._file(url)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+class FakeThrottleError(Exception):
+    """流量制限の応答（google-genai の APIError 429 / RESOURCE_EXHAUSTED 相当）"""
+
+    def __init__(self):
+        super().__init__("429 RESOURCE_EXHAUSTED")
+        self.code = 429
+        self.status = "RESOURCE_EXHAUSTED"
+
+
+class _FakeModels:
+    def __init__(self, owner: "FakeGenAIClient"):
+        self._owner = owner
+
+    def generate_content(self, model: str, contents, config=None):
+        return self._owner._respond(contents, config)
+
+    def generate_content_stream(self, model: str, contents, config=None):
+        """応答を数文字ずつのチャンクに分けて返す（遅延は最初のチャンクの前にかかる。使用量は最後のチャンクに付ける）"""
+        res = self._owner._respond(contents, config)
+        self._owner.stream_calls += 1
+        yield from _chunks(res)
+
+
+class _FakeAsyncModels:
+    """client.aio.models 互換（遅延は asyncio.sleep で待つ）"""
+
+    def __init__(self, owner: "FakeGenAIClient"):
+        self._owner = owner
+
+    async def generate_content(self, model: str, contents, config=None):
+        return await self._owner._respond_async(contents, config)
+
+    async def generate_content_stream(self, model: str, contents, config=None):
+        res = await self._owner._respond_async(contents, config)
+        self._owner.stream_calls += 1
+
+        async def _stream():
+            for chunk in _chunks(res):
+                yield chunk
+        return _stream()
+
+
+def _chunks(res):
+    """応答を8文字ずつのチャンクにする（使用量は最後のチャンクに付ける）"""
+    text = res.text
+    for i in range(0, len(text), 8):
+        last = i + 8 >= len(text)
+        yield SimpleNamespace(text=text[i:i + 8], usage_metadata=res.usage_metadata if last else None)
+
+
+class FakeGenAIClient:
+    """
+    genai.Client 互換の LLM クライアント
+    - latency: 1リクエストあたりの応答遅延（秒）
+    - 応答は入力英文の先頭を含む固定文（翻訳結果の対応確認用）
+    - quota: 同時リクエスト数の割り当て（超えたリクエストは FakeThrottleError。throttled に件数を記録）
+    - usage_metadata: 入力は4文字、出力は1文字を1トークンとして返す（config の max_output_tokens で出力を打ち切る）
+    """
+
+    def __init__(self, latency: float = 0.0, quota: Optional[int] = None):
+        self.latency = latency
+        self.quota = quota
+        self.models = _FakeModels(self)
+        self.aio = SimpleNamespace(models=_FakeAsyncModels(self))
+        self.calls = 0
+        self.stream_calls = 0
+        self.throttled = 0
+        self.max_in_flight = 0
+        self.configs: List[dict] = []
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, contents, config=None):
+        self._enter(config)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            self._leave()
+        return self._reply(contents, config)
+
+    async def _respond_async(self, contents, config=None):
+        self._enter(config)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self._leave()
+        return self._reply(contents, config)
+
+    def _enter(self, config=None):
+        with self._lock:
+            if self.quota is not None and self._in_flight >= self.quota:
+                self.throttled += 1
+                raise FakeThrottleError()
+            self.calls += 1
+            self.configs.append(dict(config or {}))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def _leave(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _reply(self, contents, config=None):
+        text = contents[0]["parts"][0]["text"]
+        body = text.split("\n\n", 1)[-1]
+        out = f"[訳] {body[:40]}"
+        finish = "STOP"
+        limit = (config or {}).get("max_output_tokens")
+        if limit is not None and len(out) > limit:
+            out, finish = out[:limit], "MAX_TOKENS"
+        usage = SimpleNamespace(prompt_token_count=len(text) // 4 + 1, candidates_token_count=len(out))
+        return SimpleNamespace(text=out, usage_metadata=usage, candidates=[SimpleNamespace(finish_reason=finish)])
+
+
+class _FakePages:
+    def __init__(self, owner: "FakeNotionClient"):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        if self._owner.fail_create:
+            raise RuntimeError("HTTP 502")
+        page = self._owner._record("pages.create", kwargs)
+        with self._owner._lock:
+            self._owner.db_pages[page["id"]] = dict(
+                page,
+                parent=dict(kwargs.get("parent") or {}),
+                properties=dict(kwargs.get("properties") or {}),
+                last_edited_time=self._owner._tick(),
+            )
+        if self._owner.fail_after_create:
+            raise RuntimeError("timeout")
+        return page
+
+    def update(self, page_id: str, properties: Optional[dict] = None, **kwargs):
+        """ページのプロパティを更新する（Notion のアプリでの編集の再現にも使う）"""
+        self._owner._record("pages.update", dict(kwargs, page_id=page_id, properties=properties))
+        with self._owner._lock:
+            page = self._owner.db_pages[page_id]
+            page["properties"].update(properties or {})
+            page["last_edited_time"] = self._owner._tick()
+            return dict(page)
+
+
+class _FakeBlockChildren:
+    def __init__(self, owner: "FakeNotionClient"):
+        self._owner = owner
+
+    def append(self, **kwargs):
+        return self._owner._record("blocks.children.append", kwargs)
+
+
+def default_schema() -> Dict[str, dict]:
+    """既定のプロパティ名（名前 / Progress / Authors / Time / URL）のデータベースのスキーマ"""
+    return {
+        "名前": {"id": "title", "type": "title", "title": {}},
+        "Progress": {
+            "id": "p1",
+            "type": "status",
+            "status": {"options": [{"name": "未読"}, {"name": "途中"}, {"name": "読了"}]},
+        },
+        "Authors": {"id": "p2", "type": "rich_text", "rich_text": {}},
+        "Time": {"id": "p3", "type": "rich_text", "rich_text": {}},
+        "URL": {"id": "p4", "type": "url", "url": {}},
+    }
+
+
+class _FakeDatabases:
+    def __init__(self, owner: "FakeNotionClient"):
+        self._owner = owner
+
+    def retrieve(self, database_id: str, **kwargs):
+        """データベースのスキーマ（client.schemas に無ければ既定のスキーマ）"""
+        with self._owner._lock:
+            self._owner.retrieves.append(database_id)
+            properties = self._owner.schemas.get(database_id) or default_schema()
+        return {"object": "database", "id": database_id, "properties": properties}
+
+    def query(
+        self,
+        database_id: str,
+        filter: Optional[dict] = None,
+        start_cursor: Optional[str] = None,
+        page_size: int = 100,
+        **kwargs,
+    ):
+        """データベース・URL の一致・最終編集日時（on_or_after）の条件と、start_cursor / next_cursor によるページングに対応"""
+        filter = filter or {}
+        url = (filter.get("url") or {}).get("equals")
+        url_property = filter.get("property", "URL")
+        since = (filter.get("last_edited_time") or {}).get("on_or_after")
+        with self._owner._lock:
+            self._owner.queries.append(dict(kwargs, filter=filter, start_cursor=start_cursor, page_size=page_size))
+            pages = [
+                dict(p) for p in self._owner.db_pages.values()
+                if p["parent"].get("database_id") == database_id
+                and (url is None or (p["properties"].get(url_property) or {}).get("url") == url)
+                and (since is None or p["last_edited_time"] >= since)
+            ]
+        if kwargs.get("sorts"):
+            pages.sort(key=lambda p: p["last_edited_time"])
+        start = int(start_cursor or 0)
+        has_more = start + page_size < len(pages)
+        return {
+            "object": "list",
+            "results": pages[start:start + page_size],
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None,
+        }
+
+
+# FakeAsyncNotionClient からの呼び出し中か（遅延は呼び出し元が asyncio.sleep で待つ）
+_IN_ASYNC_CALL: contextvars.ContextVar[bool] = contextvars.ContextVar("fake_notion_async_call", default=False)
+
+
+class FakeNotionClient:
+    """
+    notion_client.Client 互換のスタブ（リクエスト内容を記録する）
+    - latency: 1リクエストあたりの応答遅延（秒）
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.pages = _FakePages(self)
+        self.blocks = SimpleNamespace(children=_FakeBlockChildren(self))
+        self.databases = _FakeDatabases(self)
+        # True の間は pages.create を失敗させる（作成後の失敗を再現する場合は fail_after_create）
+        self.fail_create = False
+        self.fail_after_create = False
+        self.requests: List[tuple] = []
+        # 作成したページ（databases.query の対象）と、databases.query の呼び出し
+        self.db_pages: Dict[str, dict] = {}
+        self.queries: List[dict] = []
+        # データベースID → スキーマ（databases.retrieve の結果。無ければ既定のスキーマ）と、retrieve の呼び出し
+        self.schemas: Dict[str, Dict[str, dict]] = {}
+        self.retrieves: List[str] = []
+        self._clock = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self._lock = threading.Lock()
+
+    def _tick(self) -> str:
+        """最終編集日時（呼び出しごとに1分進める。Notion と同じく分単位）"""
+        self._clock += timedelta(minutes=1)
+        return self._clock.strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+    def _record(self, method: str, payload: dict) -> dict:
+        if self.latency and not _IN_ASYNC_CALL.get():
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests.append((method, payload))
+            return {"object": "page", "id": f"page-{len(self.requests)}"}
+
+
+class _FakeAsyncEndpoint:
+    """FakeNotionClient のエンドポイント（pages など）のメソッドをコルーチン関数として呼べるようにする"""
+
+    def __init__(self, owner: "FakeAsyncNotionClient", target):
+        self._owner = owner
+        self._target = target
+
+    def __getattr__(self, name: str):
+        fn = getattr(self._target, name)
+
+        async def _call(**kwargs):
+            return await self._owner._call(fn, **kwargs)
+        return _call
+
+
+class FakeAsyncNotionClient:
+    """
+    notion_client.AsyncClient 互換のスタブ（FakeNotionClient のページ・記録を共有する）
+    - 遅延は FakeNotionClient の latency を asyncio.sleep で待つ
+    - 同時リクエスト数の最大値を記録する
+    """
+
+    def __init__(self, client: FakeNotionClient):
+        self.client = client
+        self.pages = _FakeAsyncEndpoint(self, client.pages)
+        self.blocks = SimpleNamespace(children=_FakeAsyncEndpoint(self, client.blocks.children))
+        self.databases = _FakeAsyncEndpoint(self, client.databases)
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def _call(self, fn, **kwargs):
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.client.latency:
+                await asyncio.sleep(self.client.latency)
+            token = _IN_ASYNC_CALL.set(True)
+            try:
+                return fn(**kwargs)
+            finally:
+                _IN_ASYNC_CALL.reset(token)
+        finally:
+            self._in_flight -= 1
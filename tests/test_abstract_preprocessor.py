@@ -0,0 +1,57 @@
+from services.abstract_preprocessor import (
+    PreprocessConfig,
+    measure_reduction,
+    preprocess_abstract,
+    simplify_latex,
+    truncate_text,
+)
+
+
+def test_simplify_latex():
+    """
+    数式の $ を外し、記号を Unicode に、書式コマンドを中身に置き換える
+    """
+    assert simplify_latex(r"cost $\mathcal{O}(n \sqrt{n})$") == "cost O(n √n)"
+    assert simplify_latex(r"error $\epsilon < 2^{-8}$ within 8\%") == "error ε < 2^-8 within 8%"
+    assert simplify_latex(r"uses 6.1$\times$ less memory") == "uses 6.1× less memory"
+
+
+def test_preprocess_strips_whitespace_urls_and_boilerplate():
+    """
+    改行・連続空白を正規化し、コード公開先・採択先の文を取り除く（URL 以外に意味のある文は URL だけを除く）
+    """
+    raw = (
+        "  We propose a zero-\npadding method.\nResults improve by 8\\%.  Code is available\n"
+        "at https://github.com/example/kv-\nevict. See https://example.org for the leaderboard\n"
+        "details. This paper has been accepted to the ML workshop.\n"
+    )
+    assert preprocess_abstract(raw) == (
+        "We propose a zero-padding method. Results improve by 8%. See for the leaderboard details."
+    )
+    assert preprocess_abstract(raw, PreprocessConfig(enabled=False)) == raw
+
+
+def test_truncation_policies():
+    """
+    sentence は収まる文までを残し、char は単語の境界で切る
+    """
+    text = "First sentence here. Second sentence is longer than the first."
+    assert truncate_text(text, 30) == "First sentence here."
+    assert truncate_text(text, 30, "char") == "First sentence here. Second"
+    assert truncate_text(text, 0) == text
+    # 最初の文が収まらなければ文字数で切る
+    assert truncate_text(text, 10) == "First"
+
+
+def test_reduction_on_recorded_feed():
+    """
+    記録済みフィードの abstract で文字数・概算トークン数が減る
+    """
+    from fakes import FakeArxivSession
+    from services.arxiv_service import ArxivService
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=12)).search_papers(["transformer"], 12, "", "")
+    report = measure_reduction(p.abstract for p in papers)
+
+    assert report.documents == 12
+    assert report.char_reduction > 0.05 and report.token_reduction > 0.05
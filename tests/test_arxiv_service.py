@@ -0,0 +1,84 @@
+import pytest
+
+from services.arxiv_service import ArxivService, normalize_categories
+from fakes import FakeArxivSession
+
+
+def test_categories_are_pushed_into_query():
+    """
+    カテゴリの指定は cat: の OR としてキーワードと AND で結合し、arXiv 側で絞り込む
+    """
+    session = FakeArxivSession(n_entries=12)
+    service = ArxivService(session=session)
+
+    papers = service.search_papers(["transformer", "attention"], 12, "", "", categories=["cs.CL, cs.LG"])
+
+    assert session.calls[-1]["search_query"] == "(abs:attention OR abs:transformer) AND (cat:cs.CL OR cat:cs.LG)"
+    assert papers and all({"cs.CL", "cs.LG"} & set(p.category.split(",")) for p in papers)
+
+
+def test_category_wildcards():
+    """
+    末尾の * はクエリに含め、クエリで表せない指定（先頭のワイルドカードなど）は取得後に絞り込む
+    """
+    session = FakeArxivSession(n_entries=12)
+    service = ArxivService(session=session)
+
+    service.search_papers(["transformer"], 12, "", "", categories=["cs.*"])
+    assert session.calls[-1]["search_query"] == "(abs:transformer) AND (cat:cs.*)"
+
+    papers = service.search_papers(["transformer"], 12, "", "", categories=["*.LG"])
+    assert "cat:" not in session.calls[-1]["search_query"]
+    assert 0 < len(papers) < 12
+    assert all(any(c.endswith(".LG") for c in p.category.split(",")) for p in papers)
+
+
+def test_invalid_category():
+    """
+    カテゴリとして使えない文字を含む指定はエラー
+    """
+    assert normalize_categories(["cs.CL cs.CL", "", "astro-ph*"]) == ["cs.CL", "astro-ph*"]
+    with pytest.raises(ValueError):
+        normalize_categories(["cs.CL) OR (abs:x"])
+
+
+def test_canonical_query_and_exact_dates():
+    """
+    表記ゆれのある検索条件は同じ正規形・同じクエリになり、期間は指定した日付どおり（両端を含む）に arXiv 側で絞り込む
+    """
+    session = FakeArxivSession(n_entries=12)
+    service = ArxivService(session=session)
+
+    a = service.canonical_query(["  Transformer ", "attention"], "2025-09-15", "2025-09-16", ["cs.LG", "cs.CL"])
+    b = service.canonical_query(["ATTENTION", "transformer", "attention"], "2025-09-16", "2025-09-15", ["cs.CL cs.LG"])
+    assert a == b and a.key() == b.key()
+    assert a.terms == ("attention", "transformer") and str(a.end_date) == "2025-09-16"
+
+    papers = service.search_papers(["Transformer"], 12, "2025-09-15", "2025-09-16")
+    assert session.calls[-1]["search_query"] == "(abs:transformer) AND submittedDate:[202509150000 TO 202509162359]"
+    # 記録済みフィードは 2025-09-18 18:00 から6時間おき（範囲外の論文は除く）
+    assert papers and all(p.published_date[:10] in ("2025-09-15", "2025-09-16") for p in papers)
+
+
+def test_async_search_matches_sync():
+    """
+    非同期版の検索・差分検索は httpx.AsyncClient 互換のクライアントで通信し、同期版と同じ結果を返す
+    （ID の指定とテキスト検索は同時に問い合わせる）
+    """
+    import asyncio
+    from datetime import datetime, timezone
+    from fakes import FakeAsyncArxivSession
+
+    session, async_session = FakeArxivSession(n_entries=30), FakeAsyncArxivSession(n_entries=30, latency=0.02)
+    service = ArxivService(session=session, async_session=async_session)
+    keywords = ["transformer", "http://arxiv.org/abs/2509.89999v1"]
+
+    papers = asyncio.run(service.search_papers_async(keywords, 12, "", "", categories=["cs.*"]))
+    assert [p.id for p in papers] == [p.id for p in service.search_papers(keywords, 12, "", "", categories=["cs.*"])]
+    assert async_session.calls == session.calls
+    assert async_session.max_in_flight == 2
+
+    since = datetime(2025, 9, 14, tzinfo=timezone.utc)
+    new = asyncio.run(service.search_new_papers_async(["transformer"], since, max_results=10, page_size=4))
+    assert [p.id for p in new] == [p.id for p in service.search_new_papers(["transformer"], since, max_results=10, page_size=4)]
+    assert len(async_session.calls) == len(session.calls) > 3
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from services.async_runtime import AsyncRuntime
+
+
+@pytest.fixture
+def runtime():
+    rt = AsyncRuntime(name="test-core", max_blocking=4)
+    yield rt
+    rt.shutdown()
+
+
+def test_many_concurrent_waits_share_one_thread(runtime):
+    """
+    数百の待ち（I/O 相当）を1つのループのスレッドで同時に処理する
+    """
+    threads = set()
+
+    async def op(i: int) -> int:
+        threads.add(threading.get_ident())
+        await asyncio.sleep(0.05)
+        return i
+
+    t0 = time.perf_counter()
+    futures = [runtime.submit(op(i)) for i in range(300)]
+    assert [f.result(timeout=5) for f in futures] == list(range(300))
+    assert time.perf_counter() - t0 < 1.0
+    assert len(threads) == 1
+
+
+def test_timeout_and_errors_propagate(runtime):
+    """
+    timeout を超えると TimeoutError、コルーチンの例外は Future から受け取れる
+    """
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(asyncio.TimeoutError):
+        runtime.submit(slow(), timeout=0.05).result(timeout=2)
+    with pytest.raises(ValueError):
+        runtime.submit(broken()).result(timeout=2)
+
+
+def test_cancel_group_only_cancels_that_group(runtime):
+    """
+    cancel_group は指定したグループのタスクのみをキャンセルし、キャンセル時の後始末を実行する
+    """
+    cleaned = threading.Event()
+
+    async def wait_forever():
+        try:
+            await asyncio.sleep(60)
+        finally:
+            cleaned.set()
+
+    async def quick():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    searching = runtime.submit(wait_forever(), group="search")
+    other = runtime.submit(quick(), group="save")
+    assert runtime.cancel_group("search") == 1
+    with pytest.raises(CancelledError):
+        searching.result(timeout=2)
+    assert cleaned.wait(2)
+    assert other.result(timeout=2) == "ok"
+    assert runtime.running("search") == 0
+
+
+def test_run_blocking_uses_worker_threads(runtime):
+    """
+    同期関数はループのスレッドを塞がずにスレッドプールで実行する
+    """
+    async def op():
+        loop_ident = threading.get_ident()
+        worker_ident = await runtime.run_blocking(threading.get_ident)
+        return loop_ident, worker_ident
+
+    loop_ident, worker_ident = runtime.submit(op()).result(timeout=2)
+    assert loop_ident != worker_ident
+
+
+def test_tk_bridge_posts_results_via_after(runtime):
+    """
+    結果・例外のコールバックは window.after で（Tk のメインスレッドに）投入し、キャンセル時は呼ばない
+    """
+    from app.tk_bridge import TkBridge
+
+    class FakeWindow:
+        def __init__(self):
+            self.posted = []
+
+        def after(self, ms, fn):
+            self.posted.append(fn)
+
+    window = FakeWindow()
+    bridge = TkBridge(window, runtime)
+    results = []
+
+    async def value():
+        return 42
+
+    async def broken():
+        raise RuntimeError("x")
+
+    async def forever():
+        await asyncio.sleep(60)
+
+    bridge.run(value(), on_done=results.append).result(timeout=2)
+    with pytest.raises(RuntimeError):
+        bridge.run(broken(), on_error=lambda e: results.append(type(e).__name__)).result(timeout=2)
+    cancelled = bridge.run(forever(), on_done=results.append, group="g")
+    runtime.cancel_group("g")
+    with pytest.raises(CancelledError):
+        cancelled.result(timeout=2)
+
+    time.sleep(0.05)
+    assert results == []
+    for fn in window.posted:
+        fn()
+    assert results == [42, "RuntimeError"]
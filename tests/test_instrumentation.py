@@ -0,0 +1,82 @@
+import json
+
+from services.instrumentation import Tracer
+
+
+def test_span_and_summary():
+    """
+    区間の記録と集計ができる
+    """
+    tracer = Tracer()
+    for _ in range(3):
+        with tracer.span("arxiv.fetch") as span:
+            span["bytes"] = 10
+    tracer.incr("arxiv.bytes", 30)
+
+    summary = tracer.summary()
+    assert summary["arxiv.fetch"]["count"] == 3
+    assert tracer.counters()["arxiv.bytes"] == 30
+    assert all(s.attrs["bytes"] == 10 for s in tracer.spans())
+
+
+def test_span_records_error():
+    """
+    例外発生時も区間が記録され、例外名が属性に残る
+    """
+    tracer = Tracer()
+    try:
+        with tracer.span("notion.create_page"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert tracer.spans()[0].attrs["error"] == "RuntimeError"
+
+
+def test_export_chrome_trace(tmp_path):
+    """
+    Chrome trace 形式で書き出せる
+    """
+    tracer = Tracer()
+    with tracer.span("translation.request", chars_in=100):
+        pass
+    tracer.incr("translation.ok")
+    path = tracer.export_chrome_trace(str(tmp_path / "trace.json"))
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    phases = [e["ph"] for e in data["traceEvents"]]
+    assert "X" in phases and "C" in phases
+    assert data["counters"]["translation.ok"] == 1
+
+
+def test_mark_reports_only_later_measurements():
+    """
+    区切り以降の区間とカウンタの増分のみを集計し、それ以前の計測は破棄しない
+    """
+    tracer = Tracer()
+    with tracer.span("notion.create_page"):
+        pass
+    tracer.incr("outbox.done", 2)
+    mark = tracer.mark()
+    with tracer.span("arxiv.fetch"):
+        pass
+    tracer.incr("arxiv.requests")
+    tracer.incr("outbox.done")
+
+    assert set(tracer.summary(since=mark)) == {"arxiv.fetch"}
+    assert tracer.counters(since=mark) == {"arxiv.requests": 1, "outbox.done": 1}
+    assert [s.name for s in tracer.spans()] == ["notion.create_page", "arxiv.fetch"]
+    assert tracer.counters()["outbox.done"] == 3
+
+
+def test_span_buffer_is_bounded():
+    """
+    区間は直近の max_spans 件のみを保持し、破棄した件数を数える
+    """
+    tracer = Tracer(max_spans=3)
+    for i in range(5):
+        with tracer.span(f"job.{i}"):
+            pass
+
+    assert [s.name for s in tracer.spans()] == ["job.2", "job.3", "job.4"]
+    assert tracer.counters()["tracer.dropped_spans"] == 2
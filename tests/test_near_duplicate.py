@@ -0,0 +1,117 @@
+import pytest
+
+from domain.models import Paper, SearchConfig
+from services.arxiv_service import ArxivService
+from services.near_duplicate import NearDuplicateDetector
+from services.notion_outbox import NotionOutbox
+from services.paper_store import PaperStore
+from services.pipeline import PaperPipeline
+from services.translation_service import TranslationService
+from services.watch_service import WatchService
+from fakes import FakeArxivSession, FakeGenAIClient, make_paper
+
+_ABSTRACT = (
+    "We introduce a sparse mixture of experts language model that routes each token to a small subset of "
+    "feed forward experts. Routing is learned jointly with the experts using a load balancing objective, "
+    "which keeps expert utilization uniform during pretraining. On standard reasoning and translation "
+    "benchmarks the model matches dense baselines while using four times less compute per token, and "
+    "scaling the number of experts improves perplexity without increasing inference latency."
+)
+
+
+def _revised() -> Paper:
+    """同じ論文の改訂版（別ID・改題・abstract の一部を変更）"""
+    abstract = _ABSTRACT.replace("four times less", "4x less").replace("standard reasoning", "common reasoning")
+    return make_paper("2502.00002", id="2502.00002", title="Sparse Mixture-of-Experts Language Models at Scale", abstract=abstract)
+
+
+def test_detects_near_duplicate_in_store(tmp_path):
+    """
+    ストアの論文の改訂版を重複と判定し、無関係な論文・同じIDの論文は判定しない
+    """
+    store = PaperStore(str(tmp_path / "papers.db"))
+    original = make_paper("2501.00001", id="2501.00001", title="Sparse Mixture of Experts Language Models", abstract=_ABSTRACT)
+    store.upsert_papers([original])
+    detector = NearDuplicateDetector(store)
+    assert detector.backfill() == 1
+    assert detector.backfill() == 0
+
+    unrelated = make_paper("2503.00003", id="2503.00003", title="Diffusion Models for Protein Design",
+                           abstract="We generate protein backbones with "
+                                    "a denoising diffusion model conditioned on secondary structure and evaluate designability.")
+    matches = detector.find([original, _revised(), unrelated])
+    assert [(m.paper_id, m.duplicate_of, m.in_batch) for m in matches] == [("2502.00002", "2501.00001", True)]
+
+    matches = detector.find([_revised(), unrelated])
+    assert [(m.paper_id, m.duplicate_of, m.in_batch) for m in matches] == [("2502.00002", "2501.00001", False)]
+    assert matches[0].similarity >= detector.cfg.threshold
+
+
+def _pipeline(tmp_path, client, n_entries: int) -> PaperPipeline:
+    arxiv = ArxivService(session=FakeArxivSession(n_entries=n_entries))
+    return PaperPipeline(
+        arxiv_service=arxiv,
+        translator=TranslationService(client=client),
+        watch_service=WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+        outbox=NotionOutbox(str(tmp_path / "outbox.db")),
+    )
+
+
+def test_search_folds_duplicates_before_translation(tmp_path):
+    """
+    結果内の近似重複（記録済みフィードを複製した別IDの entry）を翻訳前にまとめる（flag では印のみ）
+    """
+    config = SearchConfig(keyword=["transformer"], max_results=24, start_date="", end_date="")
+    client = FakeGenAIClient()
+    papers = _pipeline(tmp_path, client, n_entries=24).search(config)
+
+    assert len(papers) == 12
+    assert client.calls == 12
+    assert all(len(p.duplicates) == 1 and not p.duplicate_of for p in papers)
+
+    flagged = _pipeline(tmp_path, FakeGenAIClient(), n_entries=24).search(
+        config.model_copy(update={"dedup": "flag", "translation_mode": "on_demand"})
+    )
+    assert len(flagged) == 24
+    assert sum(1 for p in flagged if p.duplicate_of) == 12
+
+
+def test_enqueue_save_skips_saved_duplicate(tmp_path):
+    """
+    Notion に保存待ちの論文の近似重複は保存キューに登録しない
+    """
+    pipeline = _pipeline(tmp_path, FakeGenAIClient(), n_entries=1)
+    original = make_paper("2501.00001", id="2501.00001", title="Sparse Mixture of Experts Language Models", abstract=_ABSTRACT)
+    assert pipeline.enqueue_save([original]).enqueued == 1
+    result = pipeline.enqueue_save([_revised()])
+    assert result.enqueued == 0
+    assert result.skipped == {"2502.00002": "2501.00001"}
+    assert pipeline.get_outbox().latest_status(["2502.00002"]) == {}
+
+
+def test_controller_returns_skipped_duplicate_to_list(tmp_path):
+    """
+    近似重複のため保存されなかった論文は、保存待ちの追跡をやめて検索結果の一覧に戻す
+    """
+    pytest.importorskip("customtkinter")
+    from app.controller import AppController
+
+    pipeline = _pipeline(tmp_path, FakeGenAIClient(), n_entries=1)
+    pipeline.enqueue_save([make_paper("2501.00001", id="2501.00001", title="Sparse Mixture of Experts Language Models", abstract=_ABSTRACT)])
+    revised, other = _revised(), make_paper("2503.00003", id="2503.00003", title="Protein Folding", abstract="Graph networks for protein structure.")
+    # Tk のウィンドウを作らずに、保存の登録後の処理のみを確かめる
+    controller = AppController.__new__(AppController)
+    controller.pipeline = pipeline
+    controller._current_view = None
+    controller._last_papers = []
+    controller._pending_saves = {revised.id: revised, other.id: other}
+    # 保存状態の取得はバックグラウンドのループで行うため、ここでは呼び出しのみ記録する
+    refreshed = []
+    controller._update_save_status = lambda: refreshed.append(True)
+
+    controller._on_save_enqueued(pipeline.enqueue_save([revised, other]))
+
+    assert list(controller._pending_saves) == [other.id]
+    assert [p.id for p in controller._last_papers] == [revised.id]
+    assert refreshed
@@ -0,0 +1,111 @@
+from services.notion_outbox import NotionOutbox, OutboxWorker
+from services.notion_service import NotionService
+from fakes import FakeNotionClient, default_schema, make_paper
+
+
+def _worker(outbox, client, **kwargs) -> OutboxWorker:
+    service = NotionService(client=client, database_id="db")
+    return OutboxWorker(outbox, lambda: service, rate_per_sec=1000, backoff=0, **kwargs)
+
+
+def _created(client):
+    return [p["properties"]["URL"]["url"] for m, p in client.requests if m == "pages.create"]
+
+
+def test_enqueue_deduplicates_and_drains(tmp_path):
+    """
+    未完了の同じ論文は二重に登録せず、ワーカーが順に保存して完了にする
+    """
+    outbox = NotionOutbox(str(tmp_path / "outbox.db"))
+    papers = [make_paper(f"2509.{i:05d}v1") for i in range(3)]
+    assert outbox.enqueue(papers) == 3
+    assert outbox.enqueue(papers[:2]) == 0
+
+    client = FakeNotionClient()
+    assert _worker(outbox, client).drain() == 3
+    assert sorted(_created(client)) == [p.url for p in papers]
+    assert outbox.counts() == {"done": 3}
+
+
+def test_resume_after_crash_does_not_duplicate(tmp_path):
+    """
+    保存中に終了した場合、次回起動時に再開する（作成済みのページは作り直さない）
+    """
+    path = str(tmp_path / "outbox.db")
+    outbox = NotionOutbox(path)
+    outbox.enqueue([make_paper("2509.00001v1"), make_paper("2509.00002v1")])
+    client = FakeNotionClient()
+    # 1件目はページ作成後・完了記録前に終了したものとする
+    job = outbox.claim()
+    client.pages.create(parent={"database_id": "db"}, properties={"URL": {"url": job.paper.url}})
+    outbox.close()
+
+    reopened = NotionOutbox(path)
+    assert reopened.counts() == {"pending": 2}
+    assert _worker(reopened, client).drain() == 2
+    assert sorted(_created(client)) == [make_paper("2509.00001v1").url, make_paper("2509.00002v1").url]
+    assert reopened.counts() == {"done": 2}
+
+
+def test_retry_after_ambiguous_failure(tmp_path):
+    """
+    作成後にエラーになった場合（タイムアウト等）も、再試行時に作成済みを確認して二重作成しない
+    """
+    outbox = NotionOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue([make_paper("2509.00001v1")])
+    client = FakeNotionClient()
+    client.fail_after_create = True
+
+    _worker(outbox, client).drain()
+    assert _created(client) == [make_paper("2509.00001v1").url]
+    assert outbox.counts() == {"done": 1}
+
+
+def test_gives_up_after_max_attempts_and_retries_on_restart(tmp_path):
+    """
+    max_attempts 回失敗したジョブは失敗にし、retry_failed で再試行対象に戻す
+    """
+    outbox = NotionOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue([make_paper("2509.00001v1")])
+    client = FakeNotionClient()
+    client.fail_create = True
+
+    worker = _worker(outbox, client, max_attempts=3)
+    assert worker.drain() == 3
+    assert outbox.counts() == {"failed": 1}
+
+    client.fail_create = False
+    assert outbox.retry_failed() == 1
+    worker.drain()
+    assert outbox.counts() == {"done": 1} and len(_created(client)) == 1
+
+
+def test_latest_status_and_reenqueue_after_failure(tmp_path):
+    """
+    論文ごとの最新のジョブの状態を返し、失敗した論文を再登録すると失敗のジョブは置き換える
+    """
+    outbox = NotionOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue([make_paper("2509.00001v1"), make_paper("2509.00002v1")])
+    client = FakeNotionClient()
+    client.fail_create = True
+    _worker(outbox, client, max_attempts=1).drain()
+    ids = [make_paper(f"2509.{i:05d}v1").id for i in (1, 2, 3)]
+    assert outbox.latest_status(ids) == {ids[0]: "failed", ids[1]: "failed"}
+
+    assert outbox.enqueue([make_paper("2509.00001v1")]) == 1
+    assert outbox.latest_status(ids[:1]) == {ids[0]: "pending"}
+    assert outbox.counts() == {"pending": 1, "failed": 1}
+
+
+def test_invalid_paper_fails_without_retry(tmp_path):
+    """
+    保存先のスキーマと合わない論文は送信せず、再試行せずに失敗にする
+    """
+    outbox = NotionOutbox(str(tmp_path / "outbox.db"))
+    outbox.enqueue([make_paper("2509.00001v1"), make_paper("2509.00002v1")])
+    client = FakeNotionClient()
+    client.schemas["db"] = {k: v for k, v in default_schema().items() if k != "Authors"}
+
+    assert _worker(outbox, client, max_attempts=3).drain() == 2
+    assert outbox.counts() == {"failed": 2}
+    assert _created(client) == [] and client.retrieves == ["db"]
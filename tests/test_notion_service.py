@@ -0,0 +1,146 @@
+import pytest
+
+from domain.models import NotionDatabase
+from services.notion_schema import NotionValidationError, SchemaCache
+from services.notion_service import MAX_TEXT_LENGTH, NotionService, build_blocks, split_text
+from fakes import FakeNotionClient, default_schema, make_paper
+
+
+LORA = make_paper(
+    "2106.09685v2",
+    title="LoRA",
+    authors=["Edward J. Hu"],
+    published_date="2021-06-17T00:00:00+00:00",
+    abstract="We propose LoRA.\nIt freezes the weights.",
+    abstract_ja="LoRAを提案する。",
+)
+
+
+def test_split_text_respects_limit_and_sentences():
+    """
+    上限文字数以内に、なるべく文の区切りで分割する
+    """
+    text = "これはテストの文です。" * 500
+    chunks = split_text(text)
+    assert all(len(c) <= MAX_TEXT_LENGTH for c in chunks)
+    assert all(c.endswith("。") for c in chunks)
+    assert "".join(chunks) == text
+    # 区切りの無い長い文字列も上限で切る
+    assert [len(c) for c in split_text("x" * 4500)] == [2000, 2000, 500]
+
+
+def test_create_page_with_body_blocks():
+    """
+    翻訳・abstract を本文ブロックとして作成リクエストに含める（折り返しの改行は空白に）
+    """
+    client = FakeNotionClient()
+    assert NotionService(client=client, database_id="db").create_page(LORA)
+
+    assert [m for m, _ in client.requests] == ["pages.create"]
+    children = client.requests[0][1]["children"]
+    texts = [b[b["type"]]["rich_text"][0]["text"]["content"] for b in children]
+    assert texts == ["Abstract（日本語）", "LoRAを提案する。", "Abstract", "We propose LoRA. It freezes the weights."]
+
+
+def test_many_blocks_are_appended_in_batches():
+    """
+    100ブロックを超える分は blocks.children.append で100件ずつ追加する
+    """
+    client = FakeNotionClient()
+    abstract = "\n\n".join(f"Paragraph {i}." for i in range(250))
+    paper = LORA.model_copy(update={"abstract": abstract, "abstract_ja": ""})
+    blocks = build_blocks(paper)
+    assert len(blocks) == 251
+
+    assert NotionService(client=client, database_id="db").create_page(paper)
+    calls = client.requests
+    assert [m for m, _ in calls] == ["pages.create", "blocks.children.append", "blocks.children.append"]
+    assert [len(p["children"]) for _, p in calls] == [100, 100, 51]
+    assert calls[1][1]["block_id"] == "page-1"
+
+
+def _databases():
+    return [
+        NotionDatabase(name="論文", database_id="db-main"),
+        NotionDatabase(name="LLM", database_id="db-llm", keywords=["language model"]),
+        NotionDatabase(
+            name="Vision",
+            database_id="db-cv",
+            categories=["cs.CV"],
+            properties={"title": "Title", "url": "Link", "published": "Date", "category": "Tags", "status": ""},
+        ),
+    ]
+
+
+def test_route_by_name_keyword_and_category():
+    """
+    保存先は論文の指定、キーワード、カテゴリ、既定の順に決め、スキーマはデータベースごとに1回だけ取得する
+    """
+    client = FakeNotionClient()
+    client.schemas["db-cv"] = {
+        "Title": {"type": "title"},
+        "Link": {"type": "url"},
+        "Date": {"type": "date"},
+        "Tags": {"type": "multi_select"},
+    }
+    service = NotionService(client=client, databases=_databases(), default_database="論文")
+    papers = [
+        LORA,
+        LORA.model_copy(update={"abstract": "A large language model."}),
+        LORA.model_copy(update={"category": "cs.CV, cs.LG"}),
+        LORA.model_copy(update={"category": "cs.CV", "notion_database": "LLM"}),
+        LORA.model_copy(update={"title": "LoRA 2"}),
+    ]
+    assert all(service.create_page(p) for p in papers)
+
+    parents = [p["parent"]["database_id"] for m, p in client.requests if m == "pages.create"]
+    assert parents == ["db-main", "db-llm", "db-cv", "db-llm", "db-main"]
+    assert sorted(client.retrieves) == ["db-cv", "db-llm", "db-main"]
+    # 型に合わせて変換する（日付は YYYY-MM-DD、複数選択はカテゴリごと）
+    props = client.requests[2][1]["properties"]
+    assert props["Date"] == {"date": {"start": "2021-06-17"}}
+    assert props["Tags"] == {"multi_select": [{"name": "cs.CV"}, {"name": "cs.LG"}]}
+    assert set(props) == {"Title", "Link", "Date", "Tags"}
+
+
+def test_schema_mismatch_fails_before_sending():
+    """
+    スキーマに無いプロパティ・選択肢や未設定の保存先は送信せずに NotionValidationError
+    """
+    client = FakeNotionClient()
+    schema = default_schema()
+    schema["Progress"]["status"]["options"] = [{"name": "Not started"}]
+    client.schemas["db-main"] = schema
+    client.schemas["db-llm"] = {k: v for k, v in default_schema().items() if k != "URL"}
+    service = NotionService(client=client, databases=_databases())
+
+    with pytest.raises(NotionValidationError, match="未読"):
+        service.create_page(LORA)
+    with pytest.raises(NotionValidationError, match="URL"):
+        service.create_page(LORA.model_copy(update={"notion_database": "LLM"}))
+    with pytest.raises(NotionValidationError, match="Unknown"):
+        service.create_page(LORA.model_copy(update={"notion_database": "Unknown"}))
+    assert client.requests == []
+
+
+def test_schema_cache_expires():
+    """
+    スキーマは有効期限内はキャッシュから返し、期限切れ・破棄後は取得し直す
+    """
+    now = [0.0]
+    fetched = []
+
+    def fetch(database_id):
+        fetched.append(database_id)
+        return {"properties": default_schema()}
+
+    cache = SchemaCache(fetch, ttl=60, clock=lambda: now[0])
+    assert cache.get("db") == cache.get("db") == default_schema()
+    now[0] = 59
+    cache.get("db")
+    assert fetched == ["db"]
+    now[0] = 61
+    cache.get("db")
+    cache.invalidate("db")
+    cache.get("db")
+    assert fetched == ["db", "db", "db"]
@@ -0,0 +1,109 @@
+import asyncio
+
+from domain.models import SearchConfig
+from services.arxiv_service import ArxivService
+from services.notion_service import STATUS_PROPERTY, STATUS_READ, NotionService
+from services.notion_sync import NotionStatusSync, reading_key
+from services.paper_store import PaperStore
+from services.pipeline import PaperPipeline
+from services.translation_service import TranslationService
+from services.watch_service import WatchService
+from fakes import FakeArxivSession, FakeAsyncArxivSession, FakeAsyncNotionClient, FakeGenAIClient, FakeNotionClient, make_paper
+
+
+def _mark_read(client: FakeNotionClient, page_id: str):
+    """Notion のアプリで読了にしたことを再現する"""
+    client.pages.update(page_id=page_id, properties={STATUS_PROPERTY: {"status": {"name": STATUS_READ}}})
+
+
+def test_reading_key_ignores_version():
+    """
+    arXiv の URL・ID は版を除いた ID に揃える
+    """
+    assert reading_key("http://arxiv.org/abs/2106.09685v2") == "2106.09685"
+    assert reading_key("https://arxiv.org/pdf/2106.09685v1.pdf") == "2106.09685"
+    assert reading_key("astro-ph/0601001v3") == "astro-ph/0601001"
+    assert reading_key("https://example.com/paper") == "https://example.com/paper"
+
+
+def test_pull_is_incremental_and_paginated(tmp_path):
+    """
+    初回は全ページをページングして取り込み、以降は前回の最終編集日時以降に編集されたページのみを取得する
+    """
+    client = FakeNotionClient()
+    service = NotionService(client=client, database_id="db")
+    for arxiv_id in ("2501.00001v1", "2501.00002v1", "2501.00003v1"):
+        assert service.create_page(make_paper(arxiv_id))
+    sync = NotionStatusSync(service, PaperStore(str(tmp_path / "papers.db")), page_size=2)
+
+    assert sync.pull() == 3
+    assert [q["start_cursor"] for q in client.queries] == [None, "2"]
+    assert "last_edited_time" not in client.queries[0]["filter"]
+
+    _mark_read(client, "page-1")
+    client.queries.clear()
+    # 前回の最後のページ（同じ分）と、読了にしたページのみ
+    assert sync.pull() == 2
+    assert len(client.queries) == 1
+    assert client.queries[0]["filter"]["last_edited_time"]["on_or_after"]
+
+    papers = sync.annotate([make_paper("2501.00001v2"), make_paper("2501.00002v1"), make_paper("2501.00009v1")])
+    assert [p.reading_status for p in papers] == [STATUS_READ, "未読", ""]
+
+
+def test_search_hides_read_papers(tmp_path):
+    """
+    検索結果に読書状況を付与し、hide_read なら読了の論文を除く（論文ごとの API 呼び出しは無い）
+    """
+    arxiv = ArxivService(session=FakeArxivSession(n_entries=12))
+    client = FakeNotionClient()
+    pipeline = PaperPipeline(
+        arxiv_service=arxiv,
+        translator=TranslationService(client=FakeGenAIClient()),
+        notion_service=NotionService(client=client, database_id="db"),
+        watch_service=WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+    )
+    config = SearchConfig(keyword=["transformer"], max_results=10, start_date="", end_date="", translation_mode="on_demand")
+    papers = pipeline.search(config)
+    assert len(papers) == 10 and all(p.reading_status == "" for p in papers)
+
+    assert pipeline.save(papers[:2]) == [papers[0].id, papers[1].id]
+    _mark_read(client, "page-1")
+    assert pipeline.sync_reading_status() == 2
+
+    client.queries.clear()
+    shown = pipeline.search(config.model_copy(update={"hide_read": True}))
+    assert papers[0].id not in [p.id for p in shown]
+    assert len(shown) == 9 and shown[0].reading_status == "未読"
+    # 前回の取り込みから間もないため取り込まない
+    assert client.queries == []
+
+
+def test_async_search_pulls_with_async_client(tmp_path):
+    """
+    非同期版の検索は Notion の非同期のクライアントで読書状況を取り込み、同期版と同じ結果を返す
+    """
+    arxiv = ArxivService(session=FakeArxivSession(n_entries=12), async_session=FakeAsyncArxivSession(n_entries=12))
+    client = FakeNotionClient(latency=0.01)
+    async_client = FakeAsyncNotionClient(client)
+    pipeline = PaperPipeline(
+        arxiv_service=arxiv,
+        translator=TranslationService(client=FakeGenAIClient()),
+        notion_service=NotionService(client=client, database_id="db", async_client=async_client),
+        watch_service=WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+    )
+    config = SearchConfig(keyword=["transformer"], max_results=10, start_date="", end_date="", translation_mode="eager")
+    papers = pipeline.search(config)
+    assert pipeline.save(papers[:2]) == [papers[0].id, papers[1].id]
+    _mark_read(client, "page-1")
+    client.queries.clear()
+    assert asyncio.run(pipeline.sync_reading_status_async()) == 2
+    assert len(client.queries) == 1 and async_client.max_in_flight == 1
+
+    shown = asyncio.run(pipeline.search_async(config.model_copy(update={"hide_read": True})))
+    # 前回の取り込みから間もないため取り込まない
+    assert len(client.queries) == 1
+    assert [p.id for p in shown] == [p.id for p in papers[1:]]
+    assert shown[0].reading_status == "未読" and all(p.abstract_ja for p in shown)
@@ -0,0 +1,105 @@
+from services.paper_store import PaperStore
+from services.pdf_service import PdfConfig, PdfService, paper_key, summary_source
+from services.pipeline import PaperPipeline
+from services.translation_service import TranslationService
+from fakes import FakeGenAIClient, FakePdfSession, make_paper
+
+
+def _service(tmp_path, session, **kwargs) -> PdfService:
+    cfg = PdfConfig(cache_dir=str(tmp_path / "pdf"), rate_per_sec=1000, burst=100, extract_workers=0, **kwargs)
+    return PdfService(cfg, session=session)
+
+
+def test_paper_key_keeps_version():
+    """
+    キャッシュのキーはバージョン付きの arXiv ID（旧形式の "/" は置換）
+    """
+    assert paper_key(make_paper("2106.09685v2")) == "2106.09685v2"
+    assert paper_key(make_paper("hep-th/9901001v1")) == "hep-th_9901001v1"
+
+
+def test_fetch_extracts_sections_and_caches(tmp_path):
+    """
+    PDF から本文・章を抽出し、2回目は PDF も抽出結果もキャッシュから読み込む（取得失敗は空のまま）
+    """
+    session = FakePdfSession()
+    service = _service(tmp_path, session)
+    papers = [make_paper("2106.09685v2"), make_paper("2010.11929v2"), make_paper("9999.99999v1")]
+
+    done = service.fetch_full_texts(papers)
+
+    assert {p.id for p in done} == {papers[0].id, papers[1].id}
+    assert list(papers[0].sections) == ["Abstract", "Introduction", "Method", "Experiments", "Conclusion", "References"]
+    # 行末のハイフネーションは結合される
+    assert "fine-tuning updates" in papers[0].full_text
+    assert papers[2].full_text == ""
+    assert len(session.calls) == 3
+
+    again = [make_paper("2106.09685v2"), make_paper("2010.11929v2")]
+    service.fetch_full_texts(again)
+    assert len(session.calls) == 3
+    assert again[0].sections == papers[0].sections
+
+
+def test_downloads_run_concurrently_in_process_pool(tmp_path):
+    """
+    ダウンロードは max_connections まで並列に行い、抽出はプロセスプールで行う
+    """
+    session = FakePdfSession(latency=0.05)
+    service = _service(tmp_path, session, max_connections=4)
+    service.cfg.extract_workers = 2
+    # 存在する2件と、404 になる6件
+    papers = [make_paper("2106.09685v2"), make_paper("2010.11929v2")] + [make_paper(f"2106.09685v{i}") for i in range(3, 9)]
+
+    try:
+        done = service.fetch_full_texts(papers)
+    finally:
+        service.close()
+
+    assert session.max_in_flight > 1
+    assert len(done) == 2
+
+
+def test_pipeline_full_text_search_and_summary(tmp_path):
+    """
+    取得した本文はローカルストアの全文検索の対象になり、要約には本文の抜粋が渡される
+    """
+    client = FakeGenAIClient()
+    pipeline = PaperPipeline(
+        translator=TranslationService(client=client),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+        pdf_service=_service(tmp_path, FakePdfSession()),
+    )
+    paper = make_paper("2106.09685v2")
+
+    pipeline.fetch_full_texts([paper])
+
+    assert [p.id for p in pipeline.get_paper_store().search(["rank decomposition matrices"])] == [paper.id]
+    assert paper.summary_ja and client.calls == 1
+    source = summary_source(paper)
+    assert source.startswith("Abstract") and "Conclusion" in source and "Method" not in source
+
+
+def test_async_fetch_downloads_concurrently_and_summarizes(tmp_path):
+    """
+    非同期版は httpx.AsyncClient 互換のクライアントで同時にダウンロードし、本文の登録・要約まで行う
+    """
+    import asyncio
+    from fakes import FakeAsyncPdfSession
+
+    client = FakeGenAIClient()
+    session = FakeAsyncPdfSession(latency=0.05)
+    cfg = PdfConfig(cache_dir=str(tmp_path / "pdf"), rate_per_sec=1000, burst=100, extract_workers=0, max_connections=4)
+    pipeline = PaperPipeline(
+        translator=TranslationService(client=client),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+        pdf_service=PdfService(cfg, session=FakePdfSession(), async_session=session),
+    )
+    papers = [make_paper("2106.09685v2"), make_paper("2010.11929v2")] + [make_paper(f"2106.09685v{i}") for i in range(3, 9)]
+
+    done = asyncio.run(pipeline.fetch_full_texts_async(papers))
+
+    assert [p.id for p in done] == [papers[0].id, papers[1].id]
+    assert 1 < session.max_in_flight <= 4
+    assert [p.id for p in pipeline.get_paper_store().search(["rank decomposition matrices"])] == [papers[0].id]
+    assert papers[0].summary_ja and client.calls == 2
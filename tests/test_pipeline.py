@@ -0,0 +1,97 @@
+from domain.models import SearchConfig
+from services.arxiv_service import ArxivService
+from services.paper_store import PaperStore
+from services.pipeline import PaperPipeline
+from services.translation_service import TranslationService
+from services.watch_service import WatchService
+from fakes import FakeArxivSession, FakeGenAIClient
+
+
+def _pipeline(tmp_path, client, n_entries=12):
+    arxiv = ArxivService(session=FakeArxivSession(n_entries=n_entries))
+    return PaperPipeline(
+        arxiv_service=arxiv,
+        translator=TranslationService(client=client),
+        watch_service=WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+    )
+
+
+def _config(**kwargs) -> SearchConfig:
+    return SearchConfig(keyword=["transformer"], max_results=10, start_date="", end_date="", **kwargs)
+
+
+def test_translation_mode_on_demand(tmp_path):
+    """
+    on_demand では検索時に翻訳せず、後から1件ずつ翻訳できる（結果はキャッシュされる）
+    """
+    client = FakeGenAIClient()
+    pipeline = _pipeline(tmp_path, client)
+    papers = pipeline.search(_config(translation_mode="on_demand"))
+
+    assert len(papers) == 10
+    assert client.calls == 0
+    assert all(p.abstract_ja == "" for p in papers)
+
+    pipeline.translate_papers([papers[3]])
+    assert client.calls == 1 and papers[3].abstract_ja
+
+    # 同じ abstract は再送信しない
+    again = papers[3].model_copy(update={"abstract_ja": ""})
+    pipeline.translate_papers([again])
+    assert client.calls == 1 and again.abstract_ja == papers[3].abstract_ja
+
+
+def test_translation_mode_top_k(tmp_path):
+    """
+    top_k では上位 translate_top_k 件のみを検索時に翻訳する
+    """
+    client = FakeGenAIClient()
+    papers = _pipeline(tmp_path, client).search(_config(translation_mode="top_k", translate_top_k=3))
+
+    assert client.calls == 3
+    assert [bool(p.abstract_ja) for p in papers] == [True] * 3 + [False] * 7
+
+
+def test_run_watches_survives_unconfigured_notion(tmp_path, monkeypatch):
+    """
+    Notion が未設定でもウォッチの実行は完了し、新着の保存ジョブは保存待ちのまま残る
+    """
+    from services.notion_outbox import NotionOutbox
+
+    pipeline = _pipeline(tmp_path, FakeGenAIClient())
+    pipeline.outbox = NotionOutbox(str(tmp_path / "outbox.db"))
+
+    def _unconfigured():
+        raise EnvironmentError("NOTION_API_KEY is not set")
+
+    monkeypatch.setattr(pipeline, "get_notion_service", _unconfigured)
+    pipeline.watch_service.add("transformer", ["cs.*"])
+
+    result = pipeline.run_watches(max_results=5)
+
+    assert result == {"transformer [cs.*]": 5}
+    assert pipeline.outbox.counts().get("pending") == 5
+
+
+def test_async_watch_search_fetches_only_new(tmp_path):
+    """
+    非同期版の検索もウォッチの差分検索・ハイウォーターマークの更新・検索時の翻訳を同期版と同じく行う
+    """
+    import asyncio
+    from fakes import FakeAsyncArxivSession
+
+    client = FakeGenAIClient(latency=0.01)
+    async_session = FakeAsyncArxivSession(n_entries=12)
+    pipeline = _pipeline(tmp_path, client)
+    pipeline.arxiv_service._async_session = async_session
+    config = _config(translation_mode="eager", watch=True)
+    pipeline.watch_service.add(config.keyword)
+
+    first = asyncio.run(pipeline.search_async(config))
+    assert len(first) == 10 and all(p.abstract_ja for p in first)
+    assert client.calls == 10
+
+    again = asyncio.run(pipeline.search_async(config))
+    assert again == []
+    assert async_session.calls[-1]["sortOrder"] == "ascending"
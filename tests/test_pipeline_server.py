@@ -0,0 +1,170 @@
+import threading
+import time
+
+import pytest
+
+from domain.models import SearchConfig
+from services.arxiv_service import ArxivService
+from services.notion_outbox import NotionOutbox
+from services.paper_store import PaperStore
+from services.pipeline import PaperPipeline
+from services.pipeline_server import PipelineServer
+from services.rate_limiter import ThrottledError
+from services.remote_pipeline import RemotePipeline
+from services.translation_service import TranslationCanceledException, TranslationService
+from services.watch_service import WatchService
+from fakes import FakeArxivSession, FakeGenAIClient
+
+
+@pytest.fixture
+def server(tmp_path):
+    """フェイクのサービスで組み立てたパイプラインを共有するサーバー（空いているポートで起動）"""
+    session = FakeArxivSession(n_entries=12)
+    arxiv = ArxivService(session=session)
+    client = FakeGenAIClient(latency=0.01)
+    pipeline = PaperPipeline(
+        arxiv_service=arxiv,
+        translator=TranslationService(client=client),
+        watch_service=WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv),
+        outbox=NotionOutbox(str(tmp_path / "outbox.db")),
+        paper_store=PaperStore(str(tmp_path / "papers.db")),
+    )
+    srv = PipelineServer(pipeline, port=0).start()
+    srv.session, srv.client = session, client
+    yield srv
+    srv.shutdown()
+
+
+def _config(**kwargs) -> SearchConfig:
+    return SearchConfig(keyword=["transformer"], max_results=5, start_date="", end_date="", **kwargs)
+
+
+def test_clients_share_one_backend(server):
+    """
+    複数のクライアントの検索・翻訳は1つのパイプラインで実行され、同じ abstract の翻訳は再送信されない
+    """
+    a, b = RemotePipeline(server.url), RemotePipeline(server.url)
+
+    papers = a.search(_config(translation_mode="on_demand"))
+    assert len(papers) == 5 and server.client.calls == 0
+
+    chunks = []
+    a.translate_papers(papers[:2], on_chunk=lambda p, text: chunks.append((p.id, text)))
+    assert all(p.abstract_ja for p in papers[:2])
+    assert chunks and {pid for pid, _ in chunks} == {p.id for p in papers[:2]}
+
+    # 別の利用者の同じ論文はサーバーのキャッシュから返る
+    again = b.search(_config(translation_mode="eager"))
+    assert [p.abstract_ja for p in again[:2]] == [p.abstract_ja for p in papers[:2]]
+    assert server.client.calls == 5
+
+    assert b.enqueue_save(again[:1]).enqueued == 1
+    assert b.get_outbox().latest_status([again[0].id]) == {again[0].id: "pending"}
+    b.watch_service.add("diffusion")
+    assert "diffusion" in a.watch_service.keywords()
+
+
+def test_each_job_has_its_own_usage_run(server):
+    """
+    トークン使用量の実行ごとの集計はジョブごとに持つ（他の利用者のジョブ・共有の集計を0に戻さない）
+    """
+    a, b = RemotePipeline(server.url), RemotePipeline(server.url)
+    a.search(_config(translation_mode="eager"))
+    # 2回目の検索の翻訳はキャッシュから返るため、このジョブの使用量は0
+    b.search(_config(translation_mode="eager"))
+
+    usage = server.pipeline.translator.usage
+    first, second = [j for j in server.jobs._jobs.values() if j.kind == "search"]
+    assert usage.run_totals(first.usage_run).requests == 5
+    assert usage.run_totals(second.usage_run).requests == 0
+    assert usage.run_totals().requests == 0
+
+
+def test_translate_job_keeps_only_text_deltas(server):
+    """
+    翻訳のジョブの途中経過は訳文の差分のみを保持し、クライアントは全文を組み立て直して受け取る
+    """
+    remote = RemotePipeline(server.url)
+    papers = remote.search(_config(translation_mode="on_demand"))[:2]
+    partials = {}
+    remote.translate_papers(papers, on_chunk=lambda p, text: partials.setdefault(p.id, []).append(text))
+
+    job = next(j for j in server.jobs._jobs.values() if j.kind == "translate")
+    chunks = [e for e in job.events if e["type"] == "chunk"]
+    assert any("delta" in e for e in chunks)
+    for i, paper in enumerate(papers):
+        stored = sum(len(e.get("text", e.get("delta", ""))) for e in chunks if e["index"] == i)
+        assert stored == len(paper.abstract_ja)
+        assert partials[paper.id][-1] == paper.abstract_ja
+        assert all(paper.abstract_ja.startswith(t) for t in partials[paper.id])
+
+
+def test_cancel_remote_job(server):
+    """
+    キャンセルされたらサーバーのジョブもキャンセルして打ち切り、TranslationCanceledException を送出する
+    """
+    server.client.latency = 0.5
+    # 1件ずつ送信する（キャンセル後に次の英文を送信しないことを確認する）
+    server.pipeline.translator.cfg.max_workers = 1
+    remote = RemotePipeline(server.url)
+    papers = remote.search(_config(translation_mode="on_demand"))
+    stop = threading.Event()
+    threading.Timer(0.2, stop.set).start()
+
+    with pytest.raises(TranslationCanceledException):
+        remote.translate_papers(papers, is_cancelled=stop.is_set)
+    assert all(not p.abstract_ja for p in papers)
+
+    # サーバーのジョブも未送信の翻訳を送信せずに終わる
+    job = next(j for j in server.jobs._jobs.values() if j.kind == "translate")
+    assert job.status == "cancelled" and job.cancelled()
+    time.sleep(1.0)
+    assert server.client.calls < len(papers)
+
+
+def test_throttled_job_raises_throttled_error(server, monkeypatch):
+    """
+    サーバーで流量制限が続いたジョブは、クライアントでも PaperPipeline と同じく ThrottledError を送出する
+    """
+    remote = RemotePipeline(server.url)
+    papers = remote.search(_config(translation_mode="on_demand"))
+
+    def _throttled(*args, **kwargs):
+        raise ThrottledError("rate limited")
+    monkeypatch.setattr(server.pipeline.translator, "translate_en_to_jp", _throttled)
+
+    with pytest.raises(ThrottledError):
+        remote.translate_papers(papers)
+    job = next(j for j in server.jobs._jobs.values() if j.kind == "translate")
+    assert job.to_dict()["error_type"] == "ThrottledError"
+
+
+def test_async_client_streams_and_cancels_job(server):
+    """
+    非同期版のクライアントも途中経過を受け取り、タスクがキャンセルされたらサーバーのジョブもキャンセルする
+    """
+    import asyncio
+
+    async def _run():
+        remote = RemotePipeline(server.url)
+        try:
+            papers = await remote.search_async(_config(translation_mode="on_demand"))
+            chunks = []
+            await remote.translate_papers_async(papers[:2], on_chunk=lambda p, text: chunks.append(p.id))
+            assert all(p.abstract_ja for p in papers[:2]) and set(chunks) == {p.id for p in papers[:2]}
+
+            server.client.latency = 0.5
+            server.pipeline.translator.cfg.max_workers = 1
+            task = asyncio.ensure_future(remote.translate_papers_async(papers[2:]))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return papers
+        finally:
+            await remote.aclose()
+
+    papers = asyncio.run(_run())
+    assert all(not p.abstract_ja for p in papers[2:])
+    job = [j for j in server.jobs._jobs.values() if j.kind == "translate"][-1]
+    assert job.cancelled()
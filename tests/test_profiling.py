@@ -0,0 +1,35 @@
+import pstats
+
+from services.profiling import PROFILE_DIR_ENV, profile_run, profiled
+
+
+def _work(n: int) -> list:
+    return [str(i) * 10 for i in range(n)]
+
+
+def test_profile_run_writes_files(tmp_path, monkeypatch):
+    """
+    出力先を設定すると、区間ごとに pstats とサマリを出力する（入れ子の区間は外側に含める）
+    """
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path))
+    with profile_run("search"):
+        assert len(profiled("inner", _work)(1000)) == 1000
+
+    profs = list(tmp_path.glob("profile-search-*.prof"))
+    assert len(profs) == 1
+    assert not list(tmp_path.glob("profile-inner-*"))
+    stats = pstats.Stats(str(profs[0]))
+    assert any(func[2] == "_work" for func in stats.stats)
+    summary = profs[0].with_suffix(".txt").read_text(encoding="utf-8")
+    assert "cProfile" in summary and "tracemalloc" in summary
+
+
+def test_profile_run_disabled(tmp_path, monkeypatch):
+    """
+    出力先が未設定なら何も出力しない
+    """
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    monkeypatch.chdir(tmp_path)
+    with profile_run("search"):
+        _work(10)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,44 @@
+from services.arxiv_service import ArxivService
+from services.instrumentation import get_tracer
+from services.ranking_service import RelevanceRanker
+from fakes import FakeArxivSession
+
+
+def _papers():
+    return ArxivService(session=FakeArxivSession(n_entries=12)).search_papers(["transformer"], 12, "", "")
+
+
+def test_rank_orders_by_relevance():
+    """
+    クエリに関連する論文が上位になり、上位 top_k 件に絞り込まれる
+    """
+    ranker = RelevanceRanker()
+    ranked = ranker.rank("quantum error correcting surface codes decoder", _papers(), top_k=3)
+
+    assert len(ranked) == 3
+    assert "Quantum Error-Correcting" in ranked[0].title
+    assert ranked[0].relevance >= ranked[1].relevance >= ranked[2].relevance
+
+
+def test_embedding_cache_by_paper_id():
+    """
+    同じ論文IDのベクトルは再計算せずキャッシュを使う
+    """
+    tracer = get_tracer()
+    tracer.reset()
+    ranker = RelevanceRanker()
+    papers = _papers()
+    ranker.rank("kv cache eviction", papers)
+    ranker.rank("time series forecasting", papers)
+
+    counters = tracer.counters()
+    assert counters["ranking.cache_miss"] == 12
+    assert counters["ranking.cache_hit"] == 12
+
+
+def test_min_score_filters_irrelevant():
+    """
+    関連度の下限未満の論文は除外する
+    """
+    ranked = RelevanceRanker().rank("zebrafish embryo", _papers(), min_score=0.05)
+    assert ranked == []
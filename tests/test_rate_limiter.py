@@ -0,0 +1,94 @@
+import pytest
+
+from services.instrumentation import get_tracer
+from services.rate_limiter import AimdLimiter, ThrottledError, TokenBucket, is_throttle_error
+from services.translation_service import TranslationConfig, TranslationService
+from fakes import FakeGenAIClient, FakeThrottleError
+
+
+def test_token_bucket_burst_then_refill():
+    """
+    burst 分は待たずに取得でき、それ以降は補充を待つ
+    """
+    bucket = TokenBucket(rate=1000, burst=3)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert bucket.acquire(timeout=1.0)
+
+
+def test_aimd_increase_and_decrease():
+    """
+    成功で加算的に増え、流量制限で半減する（同時期に送ったリクエストの制限による減少は1回）
+    """
+    limiter = AimdLimiter("test", initial=4, max_limit=8)
+    for _ in range(8):
+        limiter.release(limiter.acquire())
+    assert 5.5 < limiter.limit < 6.5
+
+    started = [limiter.acquire() for _ in range(3)]
+    for s in started:
+        limiter.release(s, throttled=True, ok=False)
+    assert 2.5 < limiter.limit < 3.5
+    assert get_tracer().gauges()["test.concurrency_limit"] == limiter.limit
+
+
+def test_is_throttle_error():
+    """
+    429 / RESOURCE_EXHAUSTED / rate_limited を流量制限として判定する
+    """
+    assert is_throttle_error(FakeThrottleError())
+    err = RuntimeError("rate limited")
+    err.status, err.code = 429, "rate_limited"
+    assert is_throttle_error(err)
+    assert not is_throttle_error(RuntimeError("HTTP 500"))
+
+
+def test_translation_adapts_to_quota_without_dropping():
+    """
+    同時実行数の割り当てを超えた翻訳は破棄せず再送し、上限は割り当て付近に収まる
+    """
+    client = FakeGenAIClient(latency=0.01, quota=3)
+    cfg = TranslationConfig(max_workers=16, initial_concurrency=8, retry_base_delay=0.01)
+    svc = TranslationService(cfg, client=client)
+
+    texts = [f"text {i}" for i in range(60)]
+    translated = svc.translate_en_to_jp(texts)
+
+    assert translated == [f"[訳] text {i}" for i in range(60)]
+    assert client.throttled > 0
+    assert client.max_in_flight <= 3
+    assert svc.limiter.limit <= 6
+
+
+def test_persistent_throttle_raises_instead_of_empty_translation():
+    """
+    再送しても流量制限が続いた翻訳は空の訳文にせず ThrottledError にし、未着手の翻訳は送信しない
+    """
+    client = FakeGenAIClient(quota=0)
+    cfg = TranslationConfig(max_workers=2, initial_concurrency=1, max_retries=1, retry_base_delay=0)
+    svc = TranslationService(cfg, client=client)
+
+    with pytest.raises(ThrottledError):
+        svc.translate_en_to_jp([f"text {i}" for i in range(20)])
+    assert client.calls == 0
+    assert client.throttled < 40
+    assert svc.get_cached("text 0") is None
+
+
+def test_async_translation_adapts_to_quota_without_dropping():
+    """
+    非同期版でも割り当てを超えた翻訳は破棄せず、ループを塞がずにバックオフして再送する
+    """
+    import asyncio
+
+    client = FakeGenAIClient(latency=0.01, quota=3)
+    cfg = TranslationConfig(max_workers=16, initial_concurrency=8, retry_base_delay=0.01)
+    svc = TranslationService(cfg, client=client)
+
+    texts = [f"text {i}" for i in range(60)]
+    translated = asyncio.run(svc.translate_en_to_jp_async(texts))
+
+    assert translated == [f"[訳] text {i}" for i in range(60)]
+    assert client.throttled > 0
+    assert client.max_in_flight <= 3
+    assert svc.limiter.limit <= 6
@@ -0,0 +1,79 @@
+from services.result_index import ResultFilter, ResultIndex
+from fakes import make_paper
+
+
+PAPERS = [
+    make_paper("p0", id="p0", category="cs.CL,cs.LG", authors=["Ashish Vaswani", "Noam Shazeer"], published_date="2017-06-12T00:00:00+00:00",
+               title="Attention Is All You Need", abstract="transformer"),
+    make_paper("p1", id="p1", category="cs.CV", authors=["Alexey Dosovitskiy"], published_date="2020-10-22T00:00:00+00:00",
+               title="An Image is Worth 16x16 Words", abstract="vision transformer"),
+    make_paper("p2", id="p2", category="stat.ML", authors=["Jane Smith"], published_date="2024-05-01T00:00:00+00:00",
+               title="Bayesian Optimization", abstract="gaussian process", relevance=0.9),
+    make_paper("p3", id="p3", category="cs.LG", authors=["John Smithson", "Ashish Kumar"], published_date="2024-05-31T00:00:00+00:00",
+               title="Kernel Methods", abstract="attention kernels", relevance=0.2),
+]
+
+
+def test_filters_by_category_author_and_date():
+    """
+    カテゴリ（ワイルドカード）・著者名（前方一致）・投稿日の範囲で絞り込み、条件間は AND
+    """
+    index = ResultIndex(PAPERS)
+    ids = lambda f: [p.id for p in index.query(f)]  # noqa: E731
+
+    assert ids(ResultFilter(categories=["cs.*"])) == ["p0", "p1", "p3"]
+    assert ids(ResultFilter(authors=["smith"])) == ["p2", "p3"]
+    assert ids(ResultFilter(authors=["ashish vas"])) == ["p0"]
+    assert ids(ResultFilter(start_date="2024-05", end_date="2024-05")) == ["p2", "p3"]
+    assert ids(ResultFilter(categories=["cs.LG"], authors=["ashish"], end_date="2020")) == ["p0"]
+
+
+def test_text_narrowing_and_sort():
+    """
+    全ての語を含む論文に絞り込み、指定の順に並べる
+    """
+    index = ResultIndex(PAPERS)
+
+    assert [p.id for p in index.query(ResultFilter(text="attention"))] == ["p0", "p3"]
+    assert [p.id for p in index.query(ResultFilter(text="vision TRANSFORMER"))] == ["p1"]
+    assert [p.id for p in index.query(ResultFilter(sort="date_desc"))] == ["p3", "p2", "p1", "p0"]
+    assert [p.id for p in index.query(ResultFilter(sort="title"))] == ["p1", "p0", "p2", "p3"]
+    assert [p.id for p in index.query(ResultFilter(sort="relevance"))][:2] == ["p2", "p3"]
+    assert index.category_counts()[0] == ("cs.LG", 2)
+
+
+def test_parse_query():
+    """
+    絞り込み欄の cat: / author: / since: / until: を条件に、それ以外を語として扱う
+    """
+    filt = ResultFilter.parse("cat:cs.* author:smith since:2024-01 until:2024-12 kernel methods", sort="date_asc")
+    assert filt.categories == ["cs.*"] and filt.authors == ["smith"]
+    assert (filt.start_date, filt.end_date) == ("2024-01", "2024-12")
+    assert filt.text == "kernel methods" and filt.sort == "date_asc"
+    assert ResultFilter.parse("   ").is_empty()
+
+
+def test_filters_by_reading_status():
+    """
+    Notion の読書状況で絞り込む（"なし" は Notion に無い論文）
+    """
+    papers = [p.model_copy(update={"reading_status": s}) for p, s in zip(PAPERS, ["読了", "未読", "", "未読"])]
+    index = ResultIndex(papers)
+
+    assert [p.id for p in index.query(ResultFilter.parse("status:未読"))] == ["p1", "p3"]
+    assert [p.id for p in index.query(ResultFilter.parse("status:なし"))] == ["p2"]
+    assert [p.id for p in index.query(ResultFilter.parse("status:読了 status:なし"))] == ["p0", "p2"]
+
+
+def test_update_translation_refreshes_search_text():
+    """
+    索引の構築後に届いた訳文（途中経過を含む）でも語による絞り込みができる
+    """
+    index = ResultIndex(PAPERS)
+    assert index.query(ResultFilter(text="注意機構")) == []
+
+    assert index.update_translation("p3", "注意機構")
+    assert [p.id for p in index.query(ResultFilter(text="注意機構"))] == ["p3"]
+    assert index.update_translation("p3", "注意機構を用いたカーネル法")
+    assert [p.id for p in index.query(ResultFilter(text="カーネル法"))] == ["p3"]
+    assert not index.update_translation("missing", "訳文")
@@ -0,0 +1,140 @@
+import pytest
+
+from fakes import FakeArxivSession
+from services.arxiv_service import ArxivService
+
+
+@pytest.fixture
+def tk_root():
+    """ResultView 用のルートウィンドウ（ディスプレイが無い環境では省略）"""
+    ctk = pytest.importorskip("customtkinter")
+    try:
+        root = ctk.CTk()
+    except Exception as e:
+        pytest.skip(f"ディスプレイが無いため省略: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_set_papers_updates_rows_in_place(tk_root):
+    """
+    set_papers は削除・追加された行のみを破棄・生成し、残りの行のウィジェットはそのまま使う
+    """
+    from app.ui.views.result_view import ResultView
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=6)).search_papers(["transformer"], 6, "", "")
+    view = ResultView(tk_root, papers=papers[:4])
+    view.pack(fill="both", expand=True)
+    kept = {p.id: view._item_frames[p.id] for p in papers[1:4]}
+
+    # 1件目を保存して除外し、新しい2件を末尾と先頭に追加
+    view.set_papers([papers[4]] + papers[1:4] + [papers[5]])
+    tk_root.update_idletasks()
+
+    assert [p.id for p in view.papers] == [papers[i].id for i in (4, 1, 2, 3, 5)]
+    assert papers[0].id not in view._item_frames
+    assert all(view._item_frames[pid] is frame for pid, frame in kept.items())
+    # 画面上の並びも論文の順序どおり
+    rows = [w for w in view.list_frame.pack_slaves() if w in view._item_frames.values()]
+    assert rows == [view._item_frames[p.id] for p in view.papers]
+
+    view.mark_failed(papers[4].id)
+    assert papers[4].id in view._status_labels
+    view.set_papers([])
+    assert view._empty_label is not None and not view._item_frames
+
+
+def test_relayout_applies_one_wrap_width_to_all_rows(tk_root):
+    """
+    リサイズ時は一覧の幅から折り返し幅を1回だけ計算し、全行（表示領域外はアイドル時）に反映する
+    """
+    from app.ui.views.result_view import ResultView, _ROW_CHROME_PX
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=120)).search_papers(["transformer"], 120, "", "")
+    view = ResultView(tk_root, papers=papers)
+    view.pack(fill="both", expand=True)
+    tk_root.deiconify()
+    tk_root.geometry("900x700")
+    tk_root.update()
+    view._relayout()
+    tk_root.update()
+
+    expected = max(view.list_frame.winfo_width() - _ROW_CHROME_PX, 160)
+    assert view._wrap_width == expected
+    assert set(view._applied_wrap.values()) == {expected}
+    # 行ごとの <Configure> ハンドラは持たない
+    assert not any(view._info_frames[p.id].bind("<Configure>") for p in papers)
+
+
+def test_filter_shows_only_matching_rows(tk_root):
+    """
+    絞り込み・並べ替えは行を生成・破棄せず、一致する行のみをこの順に表示する
+    """
+    from app.ui.views.result_view import ResultView
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=6)).search_papers(["transformer"], 6, "", "")
+    view = ResultView(tk_root, papers=papers)
+    view.pack(fill="both", expand=True)
+    frames = dict(view._item_frames)
+
+    view.filter_entry.insert(0, papers[2].title)
+    view._apply_filter()
+    tk_root.update_idletasks()
+    assert [p.id for p in view.shown_papers] == [papers[2].id]
+    assert [w for w in view.list_frame.pack_slaves() if w in frames.values()] == [frames[papers[2].id]]
+
+    view.filter_entry.delete(0, "end")
+    view.sort_var.set("古い順")
+    view._apply_filter()
+    tk_root.update_idletasks()
+    expected = sorted(papers, key=lambda p: p.published_date)
+    assert [w for w in view.list_frame.pack_slaves() if w in frames.values()] == [frames[p.id] for p in expected]
+    assert view._item_frames == frames
+
+
+def test_remove_papers_and_translation_update_filtered_rows(tk_root):
+    """
+    絞り込み中に行を削除すると件数の表示が更新され、届いた訳文も絞り込みの対象になる
+    """
+    from app.ui.views.result_view import ResultView
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=6)).search_papers(["transformer"], 6, "", "")
+    view = ResultView(tk_root, papers=papers)
+    view.pack(fill="both", expand=True)
+    view.filter_entry.insert(0, "transformer")
+    view._apply_filter()
+    matched = len(view.shown_papers)
+
+    view.remove_papers([view.shown_papers[0].id])
+    assert view.count_label.cget("text") == f"{matched - 1} / {len(papers) - 1} 件"
+
+    view.filter_entry.delete(0, "end")
+    view.filter_entry.insert(0, "変換器")
+    view._apply_filter()
+    assert view.shown_papers == []
+    view.update_abstract(view.papers[0].id, "変換器による翻訳")
+    view._apply_filter()
+    assert [p.id for p in view.shown_papers] == [view.papers[0].id]
+
+
+def test_set_papers_keeps_streaming_text(tk_root):
+    """
+    翻訳中の論文の行は、set_papers で英文に戻さず途中経過の訳文を残す
+    """
+    from types import SimpleNamespace
+    from app.ui.views.result_view import ResultView
+
+    papers = ArxivService(session=FakeArxivSession(n_entries=3)).search_papers(["transformer"], 3, "", "")
+    translating = {papers[0].id}
+    controller = SimpleNamespace(is_translating=lambda pid: pid in translating, cancel_request=lambda: None)
+    view = ResultView(tk_root, controller=controller, papers=papers)
+    view.pack(fill="both", expand=True)
+
+    view.update_abstract(papers[0].id, "途中までの訳")
+    view.set_papers(list(papers))
+    assert view._abstract_labels[papers[0].id].cget("text") == "途中までの訳"
+
+    translating.clear()
+    view.set_papers(list(papers))
+    assert view._abstract_labels[papers[0].id].cget("text") == papers[0].abstract
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from services.arxiv_service import ArxivService
+from services.single_flight import SingleFlight
+from services.translation_service import TranslationConfig, TranslationService
+from fakes import FakeArxivSession, FakeGenAIClient
+
+
+def _run_concurrently(fn, n=4):
+    """fn を n スレッドで同時に呼び出し、結果のリストを返す"""
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def _worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    """
+    同じキーの同時呼び出しは1回だけ実行し、結果を共有する（完了後は再実行する）
+    """
+    flight = SingleFlight("test")
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "result"
+
+    assert _run_concurrently(lambda: flight.do("k", slow)) == ["result"] * 4
+    assert len(calls) == 1
+    flight.do("k", slow)
+    assert len(calls) == 2
+
+
+def test_exception_is_shared():
+    """
+    実行中の処理の例外は待っていた呼び出し元にも送出される
+    """
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def follower():
+        started.wait()
+        try:
+            flight.do("k", fail)
+        except RuntimeError as e:
+            errors.append(e)
+
+    t = threading.Thread(target=follower)
+    t.start()
+    with pytest.raises(RuntimeError):
+        flight.do("k", fail)
+    t.join()
+    assert len(errors) == 1
+
+
+def test_identical_arxiv_queries_are_coalesced():
+    """
+    同じ検索（キーワードの大文字小文字・空白の違いを含む）を同時に行っても arXiv への通信は1回
+    """
+    session = FakeArxivSession(n_entries=5, latency=0.05)
+    service = ArxivService(session=session)
+    keywords = iter([["transformer"], ["Transformer"], [" transformer"], ["TRANSFORMER "]])
+    lock = threading.Lock()
+
+    def search():
+        with lock:
+            kw = next(keywords)
+        return service.search_papers(kw, 5, "", "")
+
+    results = _run_concurrently(search)
+    assert len(session.calls) == 1
+    assert all([p.id for p in r] == [p.id for p in results[0]] for r in results)
+
+
+def test_identical_translations_are_coalesced():
+    """
+    同じ abstract の翻訳を同時に依頼しても LLM への送信は1回
+    """
+    client = FakeGenAIClient(latency=0.05)
+    service = TranslationService(TranslationConfig(), client=client)
+
+    results = _run_concurrently(lambda: service.translate_en_to_jp(["same abstract"]))
+    assert results == [["[訳] same abstract"]] * 4
+    assert client.calls == 1
+
+
+def test_async_callers_share_one_call():
+    """
+    do_async の同時呼び出しは1回だけ実行し、待っている呼び出し元のキャンセルでは共有の処理を止めない
+    """
+    import asyncio
+
+    flight = SingleFlight("test")
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def _run():
+        tasks = [asyncio.ensure_future(flight.do_async("k", slow)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        tasks[-1].cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return results
+
+    results = asyncio.run(_run())
+    assert results[:4] == ["result"] * 4
+    assert isinstance(results[4], asyncio.CancelledError)
+    assert len(calls) == 1
@@ -0,0 +1,65 @@
+from datetime import date
+
+from services.paper_store import PaperStore
+from services.snapshot_importer import SnapshotFilter, import_snapshot, split_chunks
+from fakes import FIXTURES
+
+SNAPSHOT = str(FIXTURES / "arxiv_snapshot_sample.jsonl")
+
+
+def test_split_chunks_on_line_boundaries():
+    """
+    チャンクは行境界で区切られ、ファイル全体を隙間なく覆う
+    """
+    data = open(SNAPSHOT, "rb").read()
+    chunks = split_chunks(SNAPSHOT, chunk_size=300)
+
+    assert len(chunks) > 1
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start and data[end - 1:end] == b"\n"
+
+
+def test_import_with_filter(tmp_path):
+    """
+    カテゴリ（ワイルドカード）・日付・キーワードで絞り込んで取り込み、ローカル検索できる
+    """
+    store = PaperStore(str(tmp_path / "papers.db"))
+    filt = SnapshotFilter(categories=["cs.*"], start_date=date(2018, 1, 1), keywords=["language"])
+    stats = import_snapshot(SNAPSHOT, store, filt, workers=2, chunk_size=500)
+
+    assert stats.scanned == 8
+    assert stats.imported == store.count() == 5
+
+    papers = store.search(["low-rank adaptation"])
+    assert [p.title for p in papers] == ["LoRA: Low-Rank Adaptation of Large Language Models"]
+    assert papers[0].authors == ["Edward J. Hu"]
+    assert papers[0].published_date.startswith("2021-06-17")
+
+    recent = store.search([], start_date=date(2022, 1, 1))
+    assert {p.title[:8] for p in recent} == {"Training", "Tree of "}
+
+
+def test_triggers_restored_after_bulk_load(tmp_path):
+    """
+    一括取り込み後も、通常の登録で全文検索インデックスが更新される
+    """
+    store = PaperStore(str(tmp_path / "papers.db"))
+    import_snapshot(SNAPSHOT, store, workers=1)
+    paper = store.search(["low-rank adaptation"])[0]
+    paper.title = "Renamed paper about quasar spectra"
+    store.upsert_papers([paper])
+
+    assert [p.id for p in store.search(["quasar spectra"])] == [paper.id]
+
+
+def test_search_by_category(tmp_path):
+    """
+    ローカル検索でもカテゴリ（ワイルドカード）で絞り込める
+    """
+    store = PaperStore(str(tmp_path / "papers.db"))
+    import_snapshot(SNAPSHOT, store, SnapshotFilter(categories=["cs.*"], start_date=date(2018, 1, 1)), workers=1)
+
+    assert {p.title[:4] for p in store.search([], categories=["cs.CV"])} == {"An I"}
+    assert all("cs.CL" in p.category.split(",") for p in store.search([], categories=["*.CL"]))
+    assert store.search([], categories=["hep-*"]) == []
@@ -1,5 +1,10 @@
+import threading
+
+import pytest
+
 from services.translation_service import TranslationConfig, TranslationService
 
+
 def test_empty_input():
     """
     空文字列を翻訳すると空文字列を返す
@@ -9,6 +14,7 @@ def test_empty_input():
     inputs = [""]
     assert svc.translate_en_to_jp(inputs) == [""]
 
+
 def test_en_to_jp():
     """
     英文を日本語に翻訳する
@@ -22,4 +28,192 @@ def test_en_to_jp():
     assert translated[0] != ""
 
     # 2つ分の翻訳結果を確認
-    assert len(translated) == 2
\ No newline at end of file
+    assert len(translated) == 2
+
+
+def test_concurrent_translation_keeps_order():
+    """
+    並列翻訳でも入力順に結果を返す（フェイクの LLM クライアントを使用）
+    """
+    from fakes import FakeGenAIClient
+
+    cfg = TranslationConfig(max_workers=4)
+    svc = TranslationService(cfg, client=FakeGenAIClient(latency=0.01))
+    inputs = [f"text {i}" for i in range(10)] + [""]
+    translated = svc.translate_en_to_jp(inputs)
+
+    assert translated[:10] == [f"[訳] text {i}" for i in range(10)]
+    assert translated[10] == ""
+
+
+def test_streaming_emits_partial_text():
+    """
+    on_chunk 指定時はストリーミングで生成し、途中経過（それまでの全文）を入力の位置とともに渡す
+    """
+    from fakes import FakeGenAIClient
+
+    client = FakeGenAIClient()
+    svc = TranslationService(TranslationConfig(max_workers=1), client=client)
+    chunks = []
+    translated = svc.translate_en_to_jp(["a fairly long english abstract"], on_chunk=lambda i, t: chunks.append((i, t)))
+
+    assert client.stream_calls == 1
+    assert translated == ["[訳] a fairly long english abstract"]
+    partials = [t for _, t in chunks]
+    assert len(partials) > 2 and all(i == 0 for i, _ in chunks)
+    assert all(b.startswith(a) for a, b in zip(partials, partials[1:]))
+    assert partials[-1] == translated[0]
+
+    # キャッシュ済みなら送信せず全文を1回渡す
+    chunks.clear()
+    svc.translate_en_to_jp(["a fairly long english abstract"], on_chunk=lambda i, t: chunks.append((i, t)))
+    assert client.calls == 1 and chunks == [(0, translated[0])]
+
+
+def test_max_tokens_and_usage_are_recorded():
+    """
+    max_tokens を max_output_tokens として送信し、応答のトークン数を実行ごとに集計する
+    """
+    from fakes import FakeGenAIClient
+
+    client = FakeGenAIClient()
+    svc = TranslationService(TranslationConfig(max_workers=1, max_tokens=10), client=client)
+    translated = svc.translate_en_to_jp(["first abstract text", "second abstract text"])
+
+    assert all(c["max_output_tokens"] == 10 for c in client.configs)
+    assert all(len(t) == 10 for t in translated)
+    totals = svc.usage.run_totals()
+    assert totals.requests == 2 and totals.output_tokens == 20 and totals.prompt_tokens > 0
+    assert totals.cost_usd > 0
+
+
+def test_budget_trims_lower_priority_texts():
+    """
+    トークンの予算を超える英文は送信せず未翻訳のまま返す（先頭＝優先度の高い順に割り当てる）
+    """
+    from fakes import FakeGenAIClient
+
+    client = FakeGenAIClient()
+    # 1件あたりの見積もりは 入力42 + 出力上限50 トークン
+    cfg = TranslationConfig(max_workers=4, max_tokens=50, run_token_budget=250)
+    svc = TranslationService(cfg, client=client)
+    translated = svc.translate_en_to_jp([f"abstract number {i}" for i in range(5)])
+
+    assert [bool(t) for t in translated] == [True, True, False, False, False]
+    assert client.calls == 2
+    assert svc.usage.run_totals().total_tokens <= 250
+
+    # 次の実行では予算が戻る（翻訳済みはキャッシュから返し予算を使わない）
+    svc.usage.start_run()
+    translated = svc.translate_en_to_jp([f"abstract number {i}" for i in range(5)])
+    assert [bool(t) for t in translated] == [True, True, True, True, False]
+
+
+def test_budget_reservations_released_after_cancel():
+    """
+    途中でキャンセルした場合も、送信しなかった英文の予約を解放する（次の実行が予算不足にならない）
+    """
+    from fakes import FakeGenAIClient
+    from services.translation_service import TranslationCanceledException
+
+    for workers in (1, 4):
+        client = FakeGenAIClient(latency=0.01)
+        cfg = TranslationConfig(max_workers=workers, initial_concurrency=1, max_tokens=50, run_token_budget=100000)
+        svc = TranslationService(cfg, client=client)
+
+        with pytest.raises(TranslationCanceledException):
+            svc.translate_en_to_jp([f"abstract number {i}" for i in range(20)], is_cancelled=lambda: client.calls >= 2)
+        assert client.calls < 20
+        assert svc.usage.reserved_tokens() == 0
+
+
+def test_cancel_applies_only_to_its_own_call():
+    """
+    is_cancelled は渡した呼び出しのみを打ち切り、並行する他の翻訳・要約には影響しない
+    """
+    from fakes import FakeGenAIClient
+    from services.translation_service import TranslationCanceledException
+
+    client = FakeGenAIClient(latency=0.01)
+    svc = TranslationService(TranslationConfig(max_workers=2), client=client)
+    cancelled = threading.Event()
+    cancelled.set()
+    results = {}
+
+    def _other():
+        results["other"] = svc.translate_en_to_jp([f"other abstract {i}" for i in range(4)])
+
+    other = threading.Thread(target=_other)
+    other.start()
+    with pytest.raises(TranslationCanceledException):
+        svc.translate_en_to_jp([f"abstract number {i}" for i in range(4)], is_cancelled=cancelled.is_set)
+    other.join()
+
+    assert all(results["other"])
+    assert all(svc.summarize_en_to_jp(["some body text"]))
+
+
+def test_async_translation_waits_on_one_thread():
+    """
+    非同期版は client.aio で送信し、数百件の翻訳を1本のスレッドで同時に待つ（結果は入力順）
+    """
+    import asyncio
+    import time
+    from fakes import FakeGenAIClient
+
+    client = FakeGenAIClient(latency=0.1)
+    cfg = TranslationConfig(max_workers=300, initial_concurrency=300)
+    svc = TranslationService(cfg, client=client)
+    inputs = [f"text {i}" for i in range(300)]
+
+    threads_before = threading.active_count()
+    t0 = time.perf_counter()
+    translated = asyncio.run(svc.translate_en_to_jp_async(inputs))
+
+    assert translated == [f"[訳] text {i}" for i in range(300)]
+    assert time.perf_counter() - t0 < 2.0
+    assert client.max_in_flight > 32
+    assert threading.active_count() == threads_before
+
+
+def test_async_translation_cancel_stops_pending_requests():
+    """
+    非同期版の呼び出し元のタスクをキャンセルすると、未送信の翻訳は送信せず予約も解放する
+    """
+    import asyncio
+    from fakes import FakeGenAIClient
+
+    client = FakeGenAIClient(latency=0.05)
+    cfg = TranslationConfig(max_workers=4, initial_concurrency=2, max_tokens=50, run_token_budget=100000)
+    svc = TranslationService(cfg, client=client)
+
+    async def _run():
+        task = asyncio.ensure_future(svc.translate_en_to_jp_async([f"abstract number {i}" for i in range(20)]))
+        await asyncio.sleep(0.07)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_run())
+    assert client.calls < 20
+    assert svc.usage.reserved_tokens() == 0
+
+
+def test_async_streaming_emits_partial_text():
+    """
+    非同期版でもストリーミングで生成し、途中経過を入力の位置とともに渡す
+    """
+    import asyncio
+    from fakes import FakeGenAIClient
+
+    client = FakeGenAIClient()
+    svc = TranslationService(TranslationConfig(max_workers=2), client=client)
+    chunks = []
+    translated = asyncio.run(
+        svc.translate_en_to_jp_async(["a fairly long english abstract"], on_chunk=lambda i, t: chunks.append((i, t)))
+    )
+
+    assert client.stream_calls == 1
+    assert translated == ["[訳] a fairly long english abstract"]
+    assert len(chunks) > 2 and chunks[-1] == (0, translated[0])
+    assert svc.usage.run_totals().requests == 1
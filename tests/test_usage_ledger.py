@@ -0,0 +1,63 @@
+from services.usage_ledger import TokenUsage, UsageLedger, UsageRun, estimate_tokens, usage_from_response
+from types import SimpleNamespace
+
+
+def test_usage_from_response():
+    """
+    usage_metadata の入力・出力（思考を含む）トークン数を取り出す。無ければ None
+    """
+    meta = SimpleNamespace(prompt_token_count=120, candidates_token_count=30, thoughts_token_count=5)
+    assert usage_from_response(SimpleNamespace(usage_metadata=meta)) == TokenUsage(120, 35)
+    assert usage_from_response(SimpleNamespace(text="x")) is None
+
+
+def test_estimate_tokens():
+    """
+    英数字は4文字で1トークン、日本語は1文字1トークンで概算する
+    """
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("翻訳") == 2
+
+
+def test_daily_totals_are_persisted(tmp_path):
+    """
+    日ごとの集計はファイルに保存され、次回起動時に読み込まれる（実行ごとの集計は引き継がない）
+    """
+    path = str(tmp_path / "usage.json")
+    ledger = UsageLedger(path, input_cost_per_mtok=1.0, output_cost_per_mtok=2.0)
+    ledger.record(TokenUsage(1000, 500))
+    ledger.record(TokenUsage(1000, 500))
+    assert ledger.run_totals().cost_usd == 0.004
+
+    reopened = UsageLedger(path)
+    today = reopened.today_totals()
+    assert (today.requests, today.total_tokens) == (2, 3000)
+    assert reopened.run_totals().requests == 0
+
+
+def test_reserve_respects_daily_cost_budget(tmp_path):
+    """
+    予約中の見積もりも含めて日ごとのコストの予算を超える予約は断り、解放すると再び予約できる
+    """
+    ledger = UsageLedger(None, input_cost_per_mtok=1.0, output_cost_per_mtok=1.0, daily_cost_budget=0.0025)
+    assert ledger.reserve(1000, 0)
+    assert ledger.reserve(1000, 0)
+    assert not ledger.reserve(1000, 0)
+    ledger.release(1000, 0)
+    assert ledger.reserve(500, 0)
+
+
+def test_concurrent_runs_have_separate_budgets():
+    """
+    UsageRun ごとに実行ごとの集計・予算を持ち、並行する実行の使用量・予約に影響されない
+    """
+    ledger = UsageLedger(None, run_token_budget=1500)
+    a, b = UsageRun(), UsageRun()
+    ledger.record(TokenUsage(1000, 0), a)
+    assert ledger.reserve(400, 0, run=a)
+    assert not ledger.reserve(400, 0, run=a)
+    assert ledger.reserve(1200, 0, run=b)
+    ledger.release(1200, 0, run=b)
+    assert b.reserved_tokens == 0 and a.reserved_tokens == 400
+    assert ledger.run_totals(a).requests == 1
+    assert ledger.run_totals(b).requests == 0 and ledger.run_totals().requests == 0
@@ -0,0 +1,106 @@
+import json
+from datetime import datetime
+
+from services.arxiv_service import ArxivService
+from services.watch_service import WatchService
+from fakes import FakeArxivSession
+
+
+def test_search_new_papers_pages_from_since():
+    """
+    前回の日時以降を古い順にページングし、処理済みの論文は除いて新しい順で返す
+    """
+    session = FakeArxivSession(n_entries=30)
+    service = ArxivService(session=session)
+    all_papers = service.search_papers(["transformer"], 30, "", "")
+    since = datetime.fromisoformat(all_papers[10].published_date)
+
+    papers = service.search_new_papers(
+        ["transformer"], since=since, known_ids=[all_papers[10].id], max_results=100, page_size=4,
+    )
+
+    assert [p.id for p in papers] == [p.id for p in all_papers[:10]]
+    # 30件全件ではなく、since 以降の11件（3ページ）のみ取得する
+    assert len(session.calls) - 1 == 3
+    assert "submittedDate:[" in session.calls[-1]["search_query"]
+    assert session.calls[-1]["sortOrder"] == "ascending"
+
+
+def test_watch_high_water_mark(tmp_path):
+    """
+    処理済みの最新日時を記録し、次回は新着のみを取得する
+    """
+    session = FakeArxivSession(n_entries=20)
+    arxiv = ArxivService(session=session)
+    store = WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv)
+    store.add("transformer")
+
+    # 初回: 10件目以降を処理済みとする
+    first = arxiv.search_papers(["transformer"], 20, "", "")
+    store.mark_processed("transformer", first[5:])
+    watch = WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv).get("transformer")
+    assert watch.last_published == first[5].published_date
+    # 大文字小文字・空白の違いは同じウォッチ
+    assert store.get("  Transformer ") is store.get("transformer")
+
+    papers = store.fetch_new(watch, max_results=50)
+    assert [p.id for p in papers] == [p.id for p in first[:5]]
+
+
+def test_watch_catches_up_when_new_papers_exceed_max_results(tmp_path):
+    """
+    新着が max_results を超えても、残りの論文は次回以降に取得する（取りこぼさない）
+    """
+    arxiv = ArxivService(session=FakeArxivSession(n_entries=20))
+    store = WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv)
+    store.add("transformer")
+    first = arxiv.search_papers(["transformer"], 20, "", "")
+    store.mark_processed("transformer", first[15:])
+
+    delivered = []
+    for _ in range(4):
+        papers = store.fetch_new(store.get("transformer"), max_results=6)
+        store.mark_processed("transformer", papers)
+        delivered.extend(p.id for p in papers)
+
+    assert sorted(delivered) == sorted(p.id for p in first[:15])
+    assert len(delivered) == 15
+    assert store.get("transformer").last_published == first[0].published_date
+
+
+def test_watches_are_keyed_by_terms_and_categories(tmp_path):
+    """
+    ウォッチはキーワード（表記ゆれ・順序を除く）とカテゴリの組で区別し、新着は保存した条件で問い合わせる
+    """
+    session = FakeArxivSession(n_entries=20)
+    arxiv = ArxivService(session=session)
+    store = WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv)
+    plain = store.add("llm")
+    narrowed = store.add(["llm", "rag"], ["cs.CL"])
+
+    assert narrowed is not plain
+    assert store.get(["RAG ", "llm"], ["cs.CL"]) is narrowed
+    assert store.get(["llm", "rag"]) is None
+    assert store.get("llm") is plain
+
+    # 絞り込んだウォッチの結果は、絞り込みの無いウォッチのハイウォーターマークを動かさない
+    first = arxiv.search_papers(["llm"], 20, "", "")
+    store.mark_processed(["llm", "rag"], first[5:], categories=["cs.CL"])
+    assert plain.last_published is None
+    assert narrowed.last_published == first[5].published_date
+
+    store.fetch_new(store.get(["llm", "rag"], ["cs.CL"]), max_results=10)
+    query = session.calls[-1]["search_query"]
+    assert "abs:llm" in query and "abs:rag" in query and "cat:cs.CL" in query
+
+    reloaded = WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=arxiv)
+    assert [(w.terms, w.categories) for w in reloaded.list()] == [(["llm", "rag"], ["cs.CL"]), (["llm"], [])]
+
+
+def test_migrate_saved_keywords(tmp_path):
+    """
+    既存の保存済みキーワード（keywords.json）をウォッチとして引き継ぐ
+    """
+    (tmp_path / "keywords.json").write_text(json.dumps({"keywords": ["llm", "diffusion"]}), encoding="utf-8")
+    store = WatchService(store_path=str(tmp_path / "watches.json"), arxiv_service=ArxivService(session=FakeArxivSession()))
+    assert store.keywords() == ["llm", "diffusion"]